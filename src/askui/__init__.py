@@ -9,12 +9,14 @@ os.environ["FASTMCP_EXPERIMENTAL_ENABLE_NEW_OPENAPI_PARSER"] = "true"
 
 from .agent_base import Agent
 from .agent_settings import AgentSettings
+from .async_agent import AsyncAgent
 from .callbacks import ConversationCallback
 from .computer_agent import ComputerAgent, VisionAgent
 from .locators import Locator
 from .models import (
     Base64ImageSourceParam,
     CacheControlEphemeralParam,
+    CaptureRegion,
     CitationCharLocationParam,
     CitationContentBlockLocationParam,
     CitationPageLocationParam,
@@ -37,6 +39,7 @@ from .models.shared.settings import (
     DEFAULT_LOCATE_RESOLUTION,
     ActSettings,
     GetSettings,
+    ImageEncoding,
     LocateSettings,
     MessageSettings,
     Resolution,
@@ -70,6 +73,7 @@ logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 __all__ = [
     "Agent",
+    "AsyncAgent",
     "AutomationError",
     "ComputerAgent",
     "VisionAgent",
@@ -77,6 +81,7 @@ __all__ = [
     "ActSettings",
     "Base64ImageSourceParam",
     "CacheControlEphemeralParam",
+    "CaptureRegion",
     "CitationCharLocationParam",
     "CitationContentBlockLocationParam",
     "CitationPageLocationParam",
@@ -87,6 +92,7 @@ __all__ = [
     "DEFAULT_LOCATE_RESOLUTION",
     "GetSettings",
     "ImageBlockParam",
+    "ImageEncoding",
     "ImageSource",
     "InputSource",
     "Locator",
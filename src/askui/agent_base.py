@@ -42,7 +42,7 @@ from askui.utils.source_utils import InputSource, load_image_source, load_source
 
 from .models.exceptions import ElementNotFoundError, WaitUntilError
 from .models.models import DetectedElement
-from .models.types.geometry import Point, PointList
+from .models.types.geometry import CaptureRegion, Point, PointList
 from .models.types.response_schemas import ResponseSchema
 from .reporting import CompositeReporter, Reporter
 from .retry import ConfigurableRetry, Retry
@@ -96,7 +96,8 @@ class Agent:
         # Provider-based tools
         self._get_tool: GetTool = GetTool(provider=_settings.image_qa_provider)
         self._locate_tool: LocateTool = LocateTool(
-            provider=_settings.detection_provider
+            provider=_settings.detection_provider,
+            locate_cache=_settings.locate_cache,
         )
 
         self._retry = retry or ConfigurableRetry(
@@ -522,6 +523,7 @@ class Agent:
         screenshot: Optional[InputSource] = None,
         retry: Optional[Retry] = None,
         locate_settings: LocateSettings | None = None,
+        region: CaptureRegion | None = None,
     ) -> PointList:
         _locate_settings = locate_settings or self.locate_settings
 
@@ -532,13 +534,27 @@ class Agent:
                 )
                 raise RuntimeError(error_msg)
             _screenshot = load_image_source(
-                self._agent_os.screenshot() if screenshot is None else screenshot  # type: ignore[union-attr]
+                self._agent_os.screenshot(region=region)  # type: ignore[union-attr]
+                if screenshot is None
+                else screenshot
             )
-            return self._locate_tool.run(
+            captured_region: CaptureRegion | None = None
+            if region is not None and screenshot is None:
+                captured_region = region.captured_area(*_screenshot.root.size)
+            elif region is not None:
+                captured_region = region.clip(*_screenshot.root.size)
+                if captured_region is None:
+                    error_msg = f"Region {region!r} is outside of the screenshot"
+                    raise ValueError(error_msg)
+                _screenshot = ImageSource(_screenshot.root.crop(captured_region.box))
+            points = self._locate_tool.run(
                 locator=locator,
                 image=_screenshot,
                 locate_settings=_locate_settings,
             )
+            if captured_region is None:
+                return points
+            return [captured_region.offset(point) for point in points]
 
         retry = retry or self._retry
         points = retry.attempt(locate_with_screenshot)
@@ -553,6 +569,7 @@ class Agent:
         locator: str | Locator,
         screenshot: Optional[InputSource] = None,
         locate_settings: LocateSettings | None = None,
+        region: CaptureRegion | None = None,
     ) -> Point:
         """
         Locates the first matching UI element identified by the provided locator.
@@ -568,6 +585,10 @@ class Agent:
                 locate operation. If `None`, uses the agent's default locate settings.
             locate_model (LocateModel | None, optional): Model to use for this
                 locate operation. If `None`, uses the agent's default locate model.
+            region (CaptureRegion | None, optional): The region of the screen to
+                search in. Only this region is captured (or cut out of the
+                `screenshot`). The returned coordinates are relative to the whole
+                screen nevertheless. If `None`, searches the whole screen.
 
         Returns:
             Point: The coordinates of the element as a tuple (x, y).
@@ -590,6 +611,7 @@ class Agent:
             locator=locator,
             screenshot=screenshot,
             locate_settings=locate_settings,
+            region=region,
         )[0]
 
     @telemetry.record_call(exclude={"locator", "screenshot", "locate_settings"})
@@ -599,6 +621,7 @@ class Agent:
         locator: str | Locator,
         screenshot: Optional[InputSource] = None,
         locate_settings: LocateSettings | None = None,
+        region: CaptureRegion | None = None,
     ) -> PointList:
         """
         Locates all matching UI elements identified by the provided locator.
@@ -617,6 +640,10 @@ class Agent:
                 locate operation. If `None`, uses the agent's default locate settings.
             locate_model (LocateModel | None, optional): Model to use for this
                 locate operation. If `None`, uses the agent's default locate model.
+            region (CaptureRegion | None, optional): The region of the screen to
+                search in. Only this region is captured (or cut out of the
+                `screenshot`). The returned coordinates are relative to the whole
+                screen nevertheless. If `None`, searches the whole screen.
 
         Returns:
             PointList: The coordinates of the elements as a list of tuples (x, y).
@@ -639,6 +666,7 @@ class Agent:
             locator=locator,
             screenshot=screenshot,
             locate_settings=locate_settings,
+            region=region,
         )
 
     @telemetry.record_call(exclude={"screenshot"})
@@ -752,6 +780,7 @@ class Agent:
         retry_count: Optional[Annotated[int, Field(gt=0)]] = None,
         delay: Optional[Annotated[float, Field(gt=0.0)]] = None,
         until_condition: Literal["appear", "disappear"] = "appear",
+        region: CaptureRegion | None = None,
     ) -> None:
         """
         Pauses execution or waits until a UI element appears or disappears.
@@ -767,6 +796,9 @@ class Agent:
                 waiting for a UI element. Defaults to 1 second if None.
             until_condition (Literal["appear", "disappear"]): The condition to wait
                 until the element satisfies. Defaults to "appear".
+            region (CaptureRegion | None, optional): The region of the screen the
+                element is expected in. Only this region is captured on every
+                poll. Defaults to `None`, i.e., the whole screen.
 
         Raises:
             WaitUntilError: If the UI element is not found after all retries.
@@ -802,15 +834,16 @@ class Agent:
         delay = delay if delay is not None else 1
 
         if until_condition == "appear":
-            self._wait_for_appear(until, retry_count, delay)
+            self._wait_for_appear(until, retry_count, delay, region)
         else:
-            self._wait_for_disappear(until, retry_count, delay)
+            self._wait_for_disappear(until, retry_count, delay, region)
 
     def _wait_for_appear(
         self,
         locator: str | Locator,
         retry_count: int,
         delay: float,
+        region: CaptureRegion | None = None,
     ) -> None:
         """Wait for an element to appear on screen."""
         try:
@@ -822,6 +855,7 @@ class Agent:
                     retry_count=retry_count,
                     on_exception_types=(ElementNotFoundError,),
                 ),
+                region=region,
             )
             self._reporter.add_message(
                 "Agent", f"element '{locator}' appeared successfully"
@@ -840,6 +874,7 @@ class Agent:
         locator: str | Locator,
         retry_count: int,
         delay: float,
+        region: CaptureRegion | None = None,
     ) -> None:
         """Wait for an element to disappear from screen."""
         for i in range(retry_count):
@@ -852,6 +887,7 @@ class Agent:
                         retry_count=1,
                         on_exception_types=(),
                     ),
+                    region=region,
                 )
                 logger.debug(
                     "Element still present, retrying... %d/%d", i + 1, retry_count
@@ -873,6 +909,7 @@ class Agent:
     def close(self) -> None:
         if self._agent_os is not None:
             self._agent_os.disconnect()
+        self.act_tool_collection.close()
         self._reporter.generate()
 
     @telemetry.record_call()
@@ -20,13 +20,14 @@ from askui.models.shared.agent_message_param import (
     ThinkingConfigParam,
     ToolChoiceParam,
 )
-from askui.models.shared.messages_api import MessagesApi
+from askui.models.shared.messages_api import MessagesApi, MessageStream
 from askui.models.shared.prompts import SystemPrompt
 from askui.models.shared.settings import GetSettings, LocateSettings
 from askui.models.shared.tools import ToolCollection
 from askui.models.types.geometry import PointList
 from askui.models.types.response_schemas import ResponseSchema
 from askui.utils.image_utils import ImageSource
+from askui.utils.locate_cache import LocateCache
 from askui.utils.source_utils import Source
 
 
@@ -64,6 +65,30 @@ class _VlmProviderMessagesApiAdapter(MessagesApi):
             provider_options=provider_options,
         )
 
+    @override
+    def create_message_stream(
+        self,
+        messages: list[MessageParam],
+        model_id: str,  # noqa: ARG002
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageStream:
+        return self._provider.create_message_stream(
+            messages=messages,
+            tools=tools,
+            max_tokens=max_tokens,
+            system=system,
+            thinking=thinking,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            provider_options=provider_options,
+        )
+
 
 class _ImageQAProviderGetModelAdapter(GetModel):
     """Internal adapter that wraps an ImageQAProvider as a GetModel."""
@@ -146,6 +171,10 @@ class AgentSettings:
         detection_provider (DetectionProvider | None, optional): Provider for
             UI element coordinate detection (used by `locate()`). Defaults to
             `AskUIDetectionProvider`.
+        locate_cache (LocateCache | None, optional): Cache of the results of the
+            detection provider so that an element is not located again on an
+            unchanged screen (used by `locate()`, `wait()` etc.). Defaults to
+            `None`, i.e., every locate calls the detection provider.
 
     Example:
         ```python
@@ -164,10 +193,12 @@ class AgentSettings:
         vlm_provider: VlmProvider | None = None,
         image_qa_provider: ImageQAProvider | None = None,
         detection_provider: DetectionProvider | None = None,
+        locate_cache: LocateCache | None = None,
     ) -> None:
         self._vlm_provider = vlm_provider
         self._image_qa_provider = image_qa_provider
         self._detection_provider = detection_provider
+        self.locate_cache = locate_cache
 
     @cached_property
     def vlm_provider(self) -> VlmProvider:
@@ -0,0 +1,316 @@
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import types
+import weakref
+from collections.abc import Callable
+from typing import Optional, ParamSpec, Type, TypeVar
+
+from dotenv import load_dotenv
+from typing_extensions import Self
+
+from askui.agent_settings import AgentSettings
+from askui.locators.locators import Locator
+from askui.model_providers.async_detection_provider import (
+    AsyncDetectionProvider,
+    to_async_detection_provider,
+)
+from askui.model_providers.async_vlm_provider import (
+    AsyncVlmProvider,
+    to_async_vlm_provider,
+)
+from askui.model_providers.detection_provider import DetectionProvider
+from askui.model_providers.vlm_provider import VlmProvider
+from askui.models.shared.agent_message_param import MessageParam
+from askui.models.shared.async_conversation import AsyncConversation
+from askui.models.shared.settings import ActSettings, LocateSettings
+from askui.models.shared.tools import Tool, ToolCollection
+from askui.models.shared.truncation_strategies import TruncationStrategy
+from askui.tools.agent_os import AgentOs
+from askui.tools.async_agent_os import (
+    AsyncAgentOs,
+    AsyncAgentOsAdapter,
+    BlockingAgentOs,
+    to_async_agent_os,
+)
+from askui.utils.image_utils import ImageSource
+from askui.utils.source_utils import InputSource, load_image_source
+
+from .models.exceptions import ElementNotFoundError
+from .models.types.geometry import CaptureRegion, Point, PointList
+from .reporting import CompositeReporter, Reporter
+
+logger = logging.getLogger(__name__)
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+
+class AsyncAgent:
+    """Asyncio counterpart of `Agent` for driving many agents from one process.
+
+    All public methods are coroutines that never block the event loop: requests
+    to the providers are awaited and the (synchronous) tools are run on a
+    worker thread owned by the agent. Agents running concurrently on the same
+    event loop, e.g., through `asyncio.gather()`, therefore make progress
+    independently of each other.
+
+    Providers and agent OSs may either be native asyncio implementations
+    (`AsyncVlmProvider`, `AsyncDetectionProvider`, `AsyncAgentOs`) or existing
+    synchronous ones, which are adapted automatically.
+
+    Args:
+        reporter (Reporter | None, optional): Reporter for logging messages.
+        tools (list[Tool] | None, optional): Tools available to `act()`.
+        agent_os (AsyncAgentOs | AgentOs | None, optional): The agent OS the
+            tools act on and screenshots are taken from.
+        settings (AgentSettings | None, optional): Provides the default
+            providers if `vlm_provider` or `detection_provider` are not given.
+        vlm_provider (AsyncVlmProvider | VlmProvider | None, optional): Provider
+            used by `act()`. Defaults to `settings.vlm_provider`.
+        detection_provider (AsyncDetectionProvider | DetectionProvider | None,
+            optional): Provider used by `locate()`. Defaults to
+            `settings.detection_provider`.
+        truncation_strategy (TruncationStrategy | None, optional): Truncation
+            strategy of the conversation.
+
+    Example:
+        ```python
+        import asyncio
+
+        from askui import AsyncAgent
+
+        async def main() -> None:
+            async with AsyncAgent() as agent_1, AsyncAgent() as agent_2:
+                await asyncio.gather(
+                    agent_1.act("Open the settings menu"),
+                    agent_2.act("Search for 'printer'"),
+                )
+
+        asyncio.run(main())
+        ```
+    """
+
+    def __init__(
+        self,
+        reporter: Reporter | None = None,
+        tools: list[Tool] | None = None,
+        agent_os: AsyncAgentOs | AgentOs | None = None,
+        settings: AgentSettings | None = None,
+        vlm_provider: AsyncVlmProvider | VlmProvider | None = None,
+        detection_provider: AsyncDetectionProvider | DetectionProvider | None = None,
+        truncation_strategy: TruncationStrategy | None = None,
+    ) -> None:
+        load_dotenv()
+        self._reporter: Reporter = reporter or CompositeReporter(reporters=None)
+        self._tools = list(tools or [])
+        _settings = settings or AgentSettings()
+        self._vlm_provider = to_async_vlm_provider(
+            vlm_provider or _settings.vlm_provider
+        )
+        self._detection_provider = to_async_detection_provider(
+            detection_provider or _settings.detection_provider
+        )
+
+        # Tools and the adapted agent OS share one thread, which keeps their
+        # calls in order and supports agent OSs bound to a thread
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="askui-agent"
+        )
+        self._agent_os = (
+            to_async_agent_os(agent_os, executor=self._executor)
+            if agent_os is not None
+            else None
+        )
+        self._conversation = AsyncConversation(
+            vlm_provider=self._vlm_provider,
+            reporter=self._reporter,
+            truncation_strategy=truncation_strategy,
+            executor=self._executor,
+        )
+        # Tool collections built for `act()`, closed together with the agent
+        self._tool_collections: weakref.WeakSet[ToolCollection] = weakref.WeakSet()
+
+        self.act_settings = ActSettings()
+        self.locate_settings = LocateSettings()
+
+    async def act(
+        self,
+        goal: str | list[MessageParam],
+        act_settings: ActSettings | None = None,
+        tools: list[Tool] | ToolCollection | None = None,
+    ) -> None:
+        """Instructs the agent to achieve a specified goal through autonomous actions.
+
+        See `Agent.act()`. Caching is not supported.
+
+        Args:
+            goal (str | list[MessageParam]): A description of what the agent should
+                achieve.
+            act_settings (ActSettings | None, optional): Settings for this act
+                execution. Overrides the agent's default settings if provided.
+            tools (list[Tool] | ToolCollection | None, optional): Additional tools
+                for this act execution.
+        """
+        goal_str = (
+            goal
+            if isinstance(goal, str)
+            else "\n".join(msg.model_dump_json() for msg in goal)
+        )
+        await self._run_in_executor(
+            self._reporter.add_message, "User", f'act: "{goal_str}"'
+        )
+        logger.debug(
+            "Agent received instruction to act towards the goal '%s'", goal_str
+        )
+        messages: list[MessageParam] = (
+            [MessageParam(role="user", content=goal)] if isinstance(goal, str) else goal
+        )
+        await self._conversation.execute_conversation(
+            messages=messages,
+            tools=self._build_tools(tools),
+            settings=act_settings or self.act_settings,
+        )
+
+    def _build_tools(self, tools: list[Tool] | ToolCollection | None) -> ToolCollection:
+        # Tools must not leave the agent's single thread (see `__init__`)
+        tool_collection = ToolCollection(tools=self._tools, max_concurrent_tool_calls=1)
+        tool_agent_os = self._get_tool_agent_os()
+        if tool_agent_os is not None:
+            tool_collection.add_agent_os(tool_agent_os)
+        if isinstance(tools, list):
+            tool_collection.append_tool(*tools)
+        if isinstance(tools, ToolCollection):
+            tool_collection += tools
+        self._tool_collections.add(tool_collection)
+        return tool_collection
+
+    def _get_tool_agent_os(self) -> AgentOs | None:
+        """Get the agent OS the (synchronous) tools act on."""
+        if self._agent_os is None:
+            return None
+        if isinstance(self._agent_os, AsyncAgentOsAdapter):
+            return self._agent_os.agent_os
+        return BlockingAgentOs(self._agent_os, asyncio.get_running_loop())
+
+    async def locate(
+        self,
+        locator: str | Locator,
+        screenshot: Optional[InputSource] = None,
+        locate_settings: LocateSettings | None = None,
+        region: CaptureRegion | None = None,
+    ) -> Point:
+        """Locates the first matching UI element identified by the provided locator.
+
+        Args:
+            locator (str | Locator): The identifier or description of the element to
+                locate.
+            screenshot (InputSource | None, optional): The screenshot to use for
+                locating the element. If `None`, takes a screenshot of the currently
+                selected display.
+            locate_settings (LocateSettings | None, optional): Settings for this
+                locate operation. If `None`, uses the agent's default locate settings.
+            region (CaptureRegion | None, optional): The region of the screen to
+                search in. See `Agent.locate()`.
+
+        Returns:
+            Point: The coordinates of the element as a tuple (x, y).
+
+        Raises:
+            ElementNotFoundError: If no matching element is found.
+        """
+        await self._run_in_executor(
+            self._reporter.add_message,
+            "User",
+            f"locate first matching element {locator}",
+        )
+        points = await self.locate_all(locator, screenshot, locate_settings, region)
+        if not points:
+            raise ElementNotFoundError(locator, locator)
+        return points[0]
+
+    async def locate_all(
+        self,
+        locator: str | Locator,
+        screenshot: Optional[InputSource] = None,
+        locate_settings: LocateSettings | None = None,
+        region: CaptureRegion | None = None,
+    ) -> PointList:
+        """Locates all matching UI elements identified by the provided locator.
+
+        Args:
+            locator (str | Locator): The identifier or description of the elements
+                to locate.
+            screenshot (InputSource | None, optional): The screenshot to use. If
+                `None`, takes a screenshot of the currently selected display.
+            locate_settings (LocateSettings | None, optional): Settings for this
+                locate operation. If `None`, uses the agent's default locate settings.
+            region (CaptureRegion | None, optional): The region of the screen to
+                search in. See `Agent.locate_all()`.
+
+        Returns:
+            PointList: The coordinates of the elements.
+        """
+        captured_region: CaptureRegion | None = None
+        if screenshot is None:
+            if self._agent_os is None:
+                error_msg = (
+                    "A 'screenshot' must be provided when the agent has no agent_os."
+                )
+                raise RuntimeError(error_msg)
+            image = load_image_source(await self._agent_os.screenshot(region=region))
+            if region is not None:
+                captured_region = region.captured_area(*image.root.size)
+        else:
+            image = load_image_source(screenshot)
+            if region is not None:
+                captured_region = region.clip(*image.root.size)
+                if captured_region is None:
+                    error_msg = f"Region {region!r} is outside of the screenshot"
+                    raise ValueError(error_msg)
+                image = ImageSource(image.root.crop(captured_region.box))
+        points = await self._detection_provider.detect(
+            locator=locator,
+            image=image,
+            locate_settings=locate_settings or self.locate_settings,
+        )
+        await self._run_in_executor(
+            self._reporter.add_message, "LocateModel", f"locate {len(points)} elements"
+        )
+        if captured_region is None:
+            return points
+        return [captured_region.offset(point) for point in points]
+
+    async def open(self) -> None:
+        if self._agent_os is not None:
+            await self._agent_os.connect()
+
+    async def close(self) -> None:
+        try:
+            if self._agent_os is not None:
+                await self._agent_os.disconnect()
+            for tool_collection in list(self._tool_collections):
+                await self._run_in_executor(tool_collection.close)
+            await self._run_in_executor(self._reporter.generate)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def _run_in_executor(
+        self, func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs
+    ) -> _T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def __aenter__(self) -> Self:
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        await self.close()
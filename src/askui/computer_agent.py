@@ -196,9 +196,10 @@ class ComputerAgent(Agent):
         offset: Optional[Point],
         locate_settings: LocateSettings | None,
     ) -> None:
-        if locator is not None:
-            self._mouse_move(locator, offset, locate_settings)
-        self.tools.os.click(button, repeat)
+        with self.tools.os.batch():
+            if locator is not None:
+                self._mouse_move(locator, offset, locate_settings)
+            self.tools.os.click(button, repeat)
 
     def _mouse_move(
         self,
@@ -321,23 +322,26 @@ class ComputerAgent(Agent):
             ```
         """
         msg = f'type "{text}"'
-        if locator is not None:
-            msg += f" into {locator}"
-            if clear:
-                repeat = 3
-                msg += " clearing the current content (line/paragraph) of input field"
-            else:
-                repeat = 1
-            self._click(
-                locator=locator,
-                button="left",
-                repeat=repeat,
-                offset=offset,
-                locate_settings=locate_settings,
-            )
-        logger.debug("Agent received instruction to %s", msg)
-        self._reporter.add_message("User", msg)
-        self.tools.os.type(text)
+        with self.tools.os.batch():
+            if locator is not None:
+                msg += f" into {locator}"
+                if clear:
+                    repeat = 3
+                    msg += (
+                        " clearing the current content (line/paragraph) of input field"
+                    )
+                else:
+                    repeat = 1
+                self._click(
+                    locator=locator,
+                    button="left",
+                    repeat=repeat,
+                    offset=offset,
+                    locate_settings=locate_settings,
+                )
+            logger.debug("Agent received instruction to %s", msg)
+            self._reporter.add_message("User", msg)
+            self.tools.os.type(text)
 
     @telemetry.record_call()
     @validate_call
@@ -4,6 +4,9 @@ Provider interfaces:
 - `VlmProvider` — multimodal input + tool-calling (for `act` and LLM-backed tools)
 - `ImageQAProvider` — multimodal Q&A and structured output (for `get`)
 - `DetectionProvider` — UI element coordinates from screenshot + locator (for `locate`)
+- `AsyncVlmProvider`, `AsyncDetectionProvider` — asyncio counterparts (for
+  `AsyncAgent`); sync providers are adapted with `AsyncVlmProviderAdapter` and
+  `AsyncDetectionProviderAdapter`
 
 Built-in providers:
 - `AskUIVlmProvider` — VLM via AskUI's hosted Anthropic proxy
@@ -19,6 +22,14 @@ from askui.model_providers.anthropic_vlm_provider import AnthropicVlmProvider
 from askui.model_providers.askui_detection_provider import AskUIDetectionProvider
 from askui.model_providers.askui_image_qa_provider import AskUIImageQAProvider
 from askui.model_providers.askui_vlm_provider import AskUIVlmProvider
+from askui.model_providers.async_detection_provider import (
+    AsyncDetectionProvider,
+    AsyncDetectionProviderAdapter,
+)
+from askui.model_providers.async_vlm_provider import (
+    AsyncVlmProvider,
+    AsyncVlmProviderAdapter,
+)
 from askui.model_providers.detection_provider import DetectionProvider
 from askui.model_providers.google_image_qa_provider import GoogleImageQAProvider
 from askui.model_providers.image_qa_provider import ImageQAProvider
@@ -31,6 +42,10 @@ __all__ = [
     "AskUIDetectionProvider",
     "AskUIImageQAProvider",
     "AskUIVlmProvider",
+    "AsyncDetectionProvider",
+    "AsyncDetectionProviderAdapter",
+    "AsyncVlmProvider",
+    "AsyncVlmProviderAdapter",
     "DetectionProvider",
     "GoogleImageQAProvider",
     "ImageQAProvider",
@@ -14,6 +14,7 @@ from askui.models.shared.agent_message_param import (
     ThinkingConfigParam,
     ToolChoiceParam,
 )
+from askui.models.shared.messages_api import MessageStream
 from askui.models.shared.prompts import SystemPrompt
 from askui.models.shared.tools import ToolCollection
 from askui.utils.model_pricing import ModelPricing
@@ -133,3 +134,27 @@ class AnthropicVlmProvider(VlmProvider):
             provider_options=provider_options,
         )
         return result
+
+    @override
+    def create_message_stream(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageStream:
+        return self._messages_api.create_message_stream(
+            messages=messages,
+            model_id=self._model_id_value,
+            tools=tools,
+            max_tokens=max_tokens,
+            system=system,
+            thinking=thinking,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            provider_options=provider_options,
+        )
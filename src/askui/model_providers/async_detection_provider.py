@@ -0,0 +1,121 @@
+"""AsyncDetectionProvider interface and adapter for sync detection providers."""
+
+import asyncio
+from abc import ABC, abstractmethod
+
+from typing_extensions import override
+
+from askui.locators.locators import Locator
+from askui.model_providers.detection_provider import DetectionProvider
+from askui.models.models import DetectedElement
+from askui.models.shared.settings import LocateSettings
+from askui.models.types.geometry import PointList
+from askui.utils.image_utils import ImageSource
+
+
+class AsyncDetectionProvider(ABC):
+    """Asynchronous counterpart of `DetectionProvider` used by `AsyncAgent`.
+
+    Existing `DetectionProvider`s can be used through
+    `AsyncDetectionProviderAdapter`.
+    """
+
+    @abstractmethod
+    async def detect(
+        self,
+        locator: str | Locator,
+        image: ImageSource,
+        locate_settings: LocateSettings,
+    ) -> PointList:
+        """Find coordinates of a UI element in the given image.
+
+        Args:
+            locator (str | Locator): Description or structured locator of the element.
+            image (ImageSource): The screenshot or image to search in.
+            locate_settings (LocateSettings): Settings controlling detection behavior.
+
+        Returns:
+            PointList: List of (x, y) coordinate tuples for matching elements.
+
+        Raises:
+            ElementNotFoundError: If no matching elements are found.
+        """
+
+    async def detect_all(
+        self,
+        image: ImageSource,
+        locate_settings: LocateSettings,
+    ) -> list[DetectedElement]:
+        """Locate all detectable elements in the given image.
+
+        Args:
+            image (ImageSource): The screenshot or image to analyze.
+            locate_settings (LocateSettings): Settings controlling detection behavior.
+
+        Returns:
+            list[DetectedElement]: All detected elements with names, text, and bounds.
+        """
+        del image, locate_settings
+        return []
+
+
+class AsyncDetectionProviderAdapter(AsyncDetectionProvider):
+    """Makes a (synchronous) `DetectionProvider` usable as an
+    `AsyncDetectionProvider`.
+
+    Each request is run in a worker thread so that it does not block the event
+    loop.
+
+    Args:
+        provider (DetectionProvider): The provider to adapt.
+    """
+
+    def __init__(self, provider: DetectionProvider) -> None:
+        self._provider = provider
+
+    @property
+    def provider(self) -> DetectionProvider:
+        """The adapted provider."""
+        return self._provider
+
+    @override
+    async def detect(
+        self,
+        locator: str | Locator,
+        image: ImageSource,
+        locate_settings: LocateSettings,
+    ) -> PointList:
+        return await asyncio.to_thread(
+            self._provider.detect,
+            locator=locator,
+            image=image,
+            locate_settings=locate_settings,
+        )
+
+    @override
+    async def detect_all(
+        self,
+        image: ImageSource,
+        locate_settings: LocateSettings,
+    ) -> list[DetectedElement]:
+        return await asyncio.to_thread(
+            self._provider.detect_all,
+            image=image,
+            locate_settings=locate_settings,
+        )
+
+
+def to_async_detection_provider(
+    provider: AsyncDetectionProvider | DetectionProvider,
+) -> AsyncDetectionProvider:
+    """Return `provider` as `AsyncDetectionProvider`, adapting it if necessary.
+
+    Args:
+        provider (AsyncDetectionProvider | DetectionProvider): The provider.
+
+    Returns:
+        AsyncDetectionProvider: The provider itself or an adapter of it.
+    """
+    if isinstance(provider, AsyncDetectionProvider):
+        return provider
+    return AsyncDetectionProviderAdapter(provider)
@@ -0,0 +1,193 @@
+"""AsyncVlmProvider interface and adapters between sync and async VLM providers."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any
+
+from typing_extensions import override
+
+from askui.model_providers.vlm_provider import VlmProvider
+from askui.models.shared.agent_message_param import (
+    MessageParam,
+    ThinkingConfigParam,
+    ToolChoiceParam,
+)
+from askui.models.shared.prompts import SystemPrompt
+from askui.models.shared.tools import ToolCollection
+from askui.utils.async_utils import run_coroutine_blocking
+from askui.utils.model_pricing import ModelPricing
+
+
+class AsyncVlmProvider(ABC):
+    """Asynchronous counterpart of `VlmProvider` used by `AsyncAgent`.
+
+    Implement this interface to bring a VLM with a native asyncio client. Existing
+    `VlmProvider`s can be used through `AsyncVlmProviderAdapter`.
+
+    Example:
+        ```python
+        from askui import AsyncAgent
+        from askui.model_providers import AnthropicVlmProvider, AsyncVlmProviderAdapter
+
+        provider = AsyncVlmProviderAdapter(AnthropicVlmProvider())
+        agent = AsyncAgent(vlm_provider=provider)
+        ```
+    """
+
+    @property
+    @abstractmethod
+    def model_id(self) -> str:
+        """The model identifier used by this provider."""
+
+    @property
+    def pricing(self) -> ModelPricing | None:
+        """Pricing information for this provider's model.
+
+        Returns ``None`` if no pricing information is available.
+        """
+        return None
+
+    @abstractmethod
+    async def create_message(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageParam:
+        """Create a message using this provider's VLM.
+
+        Takes the same arguments as `VlmProvider.create_message()`.
+
+        Returns:
+            MessageParam: The model's response message.
+        """
+
+
+class AsyncVlmProviderAdapter(AsyncVlmProvider):
+    """Makes a (synchronous) `VlmProvider` usable as an `AsyncVlmProvider`.
+
+    Each request is run in a worker thread so that it does not block the event
+    loop. Cancelling a request stops waiting for it immediately; the response of
+    the request, which cannot be interrupted, is discarded.
+
+    Args:
+        provider (VlmProvider): The provider to adapt.
+    """
+
+    def __init__(self, provider: VlmProvider) -> None:
+        self._provider = provider
+
+    @property
+    def provider(self) -> VlmProvider:
+        """The adapted provider."""
+        return self._provider
+
+    @property
+    @override
+    def model_id(self) -> str:
+        return self._provider.model_id
+
+    @property
+    @override
+    def pricing(self) -> ModelPricing | None:
+        return self._provider.pricing
+
+    @override
+    async def create_message(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageParam:
+        return await asyncio.to_thread(
+            self._provider.create_message,
+            messages=messages,
+            tools=tools,
+            max_tokens=max_tokens,
+            system=system,
+            thinking=thinking,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            provider_options=provider_options,
+        )
+
+
+class BlockingVlmProvider(VlmProvider):
+    """Makes an `AsyncVlmProvider` usable as a (synchronous) `VlmProvider`.
+
+    Requests are run on the given event loop, so the provider must be called
+    from a thread other than the one running the loop, e.g., by a truncation
+    strategy that is executed in a worker thread.
+
+    Args:
+        provider (AsyncVlmProvider): The provider to adapt.
+        loop (asyncio.AbstractEventLoop): The event loop to run requests on.
+    """
+
+    def __init__(
+        self, provider: AsyncVlmProvider, loop: asyncio.AbstractEventLoop
+    ) -> None:
+        self._provider = provider
+        self._loop = loop
+
+    @property
+    @override
+    def model_id(self) -> str:
+        return self._provider.model_id
+
+    @property
+    @override
+    def pricing(self) -> ModelPricing | None:
+        return self._provider.pricing
+
+    @override
+    def create_message(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageParam:
+        return run_coroutine_blocking(
+            self._provider.create_message(
+                messages=messages,
+                tools=tools,
+                max_tokens=max_tokens,
+                system=system,
+                thinking=thinking,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                provider_options=provider_options,
+            ),
+            self._loop,
+        )
+
+
+def to_async_vlm_provider(
+    provider: AsyncVlmProvider | VlmProvider,
+) -> AsyncVlmProvider:
+    """Return `provider` as `AsyncVlmProvider`, adapting it if necessary.
+
+    Args:
+        provider (AsyncVlmProvider | VlmProvider): The provider.
+
+    Returns:
+        AsyncVlmProvider: The provider itself or an adapter of it.
+    """
+    if isinstance(provider, AsyncVlmProvider):
+        return provider
+    return AsyncVlmProviderAdapter(provider)
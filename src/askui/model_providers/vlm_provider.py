@@ -8,6 +8,7 @@ from askui.models.shared.agent_message_param import (
     ThinkingConfigParam,
     ToolChoiceParam,
 )
+from askui.models.shared.messages_api import MessageStream
 from askui.models.shared.prompts import SystemPrompt
 from askui.models.shared.tools import ToolCollection
 from askui.utils.model_pricing import ModelPricing
@@ -84,3 +85,40 @@ class VlmProvider(ABC):
         Returns:
             MessageParam: The model's response message.
         """
+
+    def create_message_stream(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageStream:
+        """Create a message, streaming its content blocks as they are completed.
+
+        Takes the same arguments as `create_message()`. Allows callers, e.g.,
+        the `AgentSpeaker`, to start executing a tool call as soon as its input
+        is complete instead of waiting for the whole response.
+
+        The default implementation falls back to `create_message()` and yields
+        all content blocks once the whole message has been received. Override
+        it if your VLM supports streaming.
+
+        Returns:
+            MessageStream: The stream of the model's response message.
+        """
+        return MessageStream.from_message(
+            self.create_message(
+                messages=messages,
+                tools=tools,
+                max_tokens=max_tokens,
+                system=system,
+                thinking=thinking,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                provider_options=provider_options,
+            )
+        )
@@ -23,12 +23,13 @@ from .shared.agent_message_param import (
     UrlImageSourceParam,
 )
 from .shared.agent_on_message_cb import OnMessageCb, OnMessageCbParam
-from .types.geometry import Point, PointList
+from .types.geometry import CaptureRegion, Point, PointList
 
 __all__ = [
     "ActModel",
     "Base64ImageSourceParam",
     "CacheControlEphemeralParam",
+    "CaptureRegion",
     "ChatCompletionsCreateSettings",
     "CitationCharLocationParam",
     "CitationContentBlockLocationParam",
@@ -82,7 +82,9 @@ class AnthropicGetModel(GetModel):
                 source.root,
                 get_settings.resolution,
             )
-            messages = built_messages_for_get_and_locate(scaled_image, query)
+            messages = built_messages_for_get_and_locate(
+                scaled_image, query, get_settings.image_encoding
+            )
             message = self._messages_api.create_message(
                 messages=messages,
                 model_id=self._model_id,
@@ -1,6 +1,7 @@
-from typing import Any, Tuple, cast
+from typing import Any, Generator, Tuple, TypeAlias, cast
 
 from anthropic import (
+    Anthropic,
     APIConnectionError,
     APIError,
     APIStatusError,
@@ -8,16 +9,19 @@ from anthropic import (
     Omit,
     omit,
 )
+from anthropic.lib.streaming import BetaMessageStream
 from anthropic.types import AnthropicBetaParam
 from anthropic.types.beta import (
     BetaCacheControlEphemeralParam,
     BetaContentBlockParam,
     BetaMessageParam,
+    BetaTextBlockParam,
     BetaThinkingConfigParam,
     BetaToolChoiceParam,
     BetaToolUnionParam,
 )
 from PIL.Image import Image
+from pydantic import TypeAdapter
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from typing_extensions import override
 
@@ -37,10 +41,25 @@ from askui.models.shared.agent_message_param import (
     ToolChoiceParam,
     ToolUseBlockParam,
 )
-from askui.models.shared.messages_api import MessagesApi
+from askui.models.shared.message_cache import SerializedMessageCache
+from askui.models.shared.messages_api import MessagesApi, MessageStream
 from askui.models.shared.prompts import SystemPrompt
+from askui.models.shared.settings import ImageEncoding
 from askui.models.shared.tools import ToolCollection
-from askui.utils.image_utils import image_to_base64
+from askui.utils.image_utils import encode_image
+
+_CONTENT_BLOCK_ADAPTER: TypeAdapter[ContentBlockParam] = TypeAdapter(ContentBlockParam)
+
+# Maximum number of cache breakpoints per request accepted by the Anthropic API
+# (including the one of the top-level `cache_control`)
+_MAX_CACHE_BREAKPOINTS = 4
+_CACHEABLE_BLOCK_TYPES = frozenset(
+    {"document", "image", "text", "tool_result", "tool_use"}
+)
+
+# Position of a content block within the messages: (message index, block index)
+# or (message index, tool result block index, nested block index)
+_BlockPosition: TypeAlias = tuple[int, ...]
 
 
 def _is_retryable_error(exception: BaseException) -> bool:
@@ -84,8 +103,9 @@ def from_message_param(message: MessageParam) -> BetaMessageParam:
 
 
 def built_messages_for_get_and_locate(
-    scaled_image: Image, prompt: str
+    scaled_image: Image, prompt: str, image_encoding: ImageEncoding | None = None
 ) -> list[MessageParam]:
+    encoded_image = encode_image(scaled_image, image_encoding)
     return [
         MessageParam(
             role="user",
@@ -94,8 +114,8 @@ def built_messages_for_get_and_locate(
                 [
                     ImageBlockParam(
                         source=Base64ImageSourceParam(
-                            data=image_to_base64(scaled_image),
-                            media_type="image/png",
+                            data=encoded_image.data,
+                            media_type=encoded_image.media_type,
                         ),
                     ),
                     TextBlockParam(
@@ -165,12 +185,193 @@ def _parse_to_anthropic_types(
     )
 
 
+def _find_cache_breakpoints(messages: list[BetaMessageParam]) -> list[_BlockPosition]:
+    """Find the content blocks with a cache breakpoint in order of the messages."""
+    positions: list[_BlockPosition] = []
+    for i, message in enumerate(messages):
+        content = message["content"]
+        if isinstance(content, str):
+            continue
+        for j, block in enumerate(cast("list[dict[str, Any]]", content)):
+            nested_content = block.get("content")
+            if block["type"] == "tool_result" and isinstance(nested_content, list):
+                positions.extend(
+                    (i, j, k)
+                    for k, nested_block in enumerate(nested_content)
+                    if nested_block.get("cache_control") is not None
+                )
+            if block.get("cache_control") is not None:
+                positions.append((i, j))
+    return positions
+
+
+def _find_rolling_cache_breakpoint(
+    messages: list[BetaMessageParam],
+) -> _BlockPosition | None:
+    """Find the last cacheable content block of the last message."""
+    if not messages:
+        return None
+    i = len(messages) - 1
+    content = messages[i]["content"]
+    if isinstance(content, str):
+        return (i, 0) if content else None
+    blocks = cast("list[dict[str, Any]]", content)
+    for j in range(len(blocks) - 1, -1, -1):
+        if blocks[j]["type"] in _CACHEABLE_BLOCK_TYPES:
+            return (i, j)
+    return None
+
+
+def _with_cache_control(
+    messages: list[BetaMessageParam],
+    position: _BlockPosition,
+    cache_control: BetaCacheControlEphemeralParam | None,
+) -> list[BetaMessageParam]:
+    """Set (or unset) the cache breakpoint of a content block.
+
+    The messages are shared between requests (see `SerializedMessageCache`), so
+    the messages, content lists and blocks along the position are copied instead
+    of modified.
+    """
+    i, j, *nested = position
+    message = messages[i]
+    content = message["content"]
+    blocks: list[Any] = (
+        [{"type": "text", "text": content}]
+        if isinstance(content, str)
+        else list(content)
+    )
+    if nested:
+        (k,) = nested
+        nested_blocks = list(blocks[j]["content"])
+        nested_blocks[k] = {**nested_blocks[k], "cache_control": cache_control}
+        blocks[j] = {**blocks[j], "content": nested_blocks}
+    else:
+        blocks[j] = {**blocks[j], "cache_control": cache_control}
+    result = list(messages)
+    result[i] = BetaMessageParam(role=message["role"], content=blocks)
+    return result
+
+
+def _plan_cache_breakpoints(
+    messages: list[BetaMessageParam],
+    tools: list[BetaToolUnionParam] | Omit,
+    system: str | Omit,
+    cache_control: BetaCacheControlEphemeralParam | Omit,
+) -> tuple[
+    list[BetaMessageParam],
+    list[BetaToolUnionParam] | Omit,
+    str | list[BetaTextBlockParam] | Omit,
+]:
+    """Place the cache breakpoints (`cache_control`) of a request.
+
+    The prompt cache of Anthropic stores the prefix of a request (tools, system
+    prompt and messages in this order) up to each cache breakpoint. Existing
+    breakpoints, i.e., the ones set on the messages by the truncation strategy and
+    on the last tool by `ToolCollection.to_params()`, are kept and complemented
+    by a breakpoint on the system prompt so that tools and system prompt are read
+    from the cache even after the history was rewritten, e.g., summarized, and by
+    a rolling breakpoint on the last message if no message has a breakpoint (and
+    there is no top-level `cache_control`) so that the history of this request is
+    read from the cache in the next one.
+
+    If this exceeds `_MAX_CACHE_BREAKPOINTS`, breakpoints are dropped in order of
+    the tools (also covered by the one of the system prompt), the messages from
+    oldest to newest and the system prompt.
+
+    Args:
+        messages (list[BetaMessageParam]): The messages of the request. They are
+            not modified but copied where breakpoints change.
+        tools (list[BetaToolUnionParam] | Omit): The tools of the request.
+        system (str | Omit): The system prompt of the request.
+        cache_control (BetaCacheControlEphemeralParam | Omit): The top-level cache
+            control of the request which takes up one breakpoint.
+
+    Returns:
+        tuple: The messages, tools and system prompt with the planned breakpoints.
+    """
+    message_breakpoints = _find_cache_breakpoints(messages)
+    rolling_breakpoint = (
+        _find_rolling_cache_breakpoint(messages)
+        if not message_breakpoints and isinstance(cache_control, Omit)
+        else None
+    )
+    tool_breakpoints = (
+        []
+        if isinstance(tools, Omit)
+        else [
+            i
+            for i, tool in enumerate(cast("list[dict[str, Any]]", tools))
+            if tool.get("cache_control") is not None
+        ]
+    )
+
+    # in order of priority, i.e., the breakpoints kept if exceeding the limit
+    candidates: list[tuple[str, Any]] = []
+    if rolling_breakpoint is not None:
+        candidates.append(("message", rolling_breakpoint))
+    candidates.extend(("message", position) for position in message_breakpoints[-1:])
+    if isinstance(system, str) and system:
+        candidates.append(("system", None))
+    candidates.extend(
+        ("message", position) for position in reversed(message_breakpoints[:-1])
+    )
+    candidates.extend(("tool", i) for i in reversed(tool_breakpoints))
+    n_breakpoints = _MAX_CACHE_BREAKPOINTS
+    if not isinstance(cache_control, Omit):
+        n_breakpoints -= 1
+    kept = candidates[:n_breakpoints]
+
+    breakpoint_ = BetaCacheControlEphemeralParam(type="ephemeral")
+    if rolling_breakpoint is not None and ("message", rolling_breakpoint) in kept:
+        messages = _with_cache_control(messages, rolling_breakpoint, breakpoint_)
+    for position in message_breakpoints:
+        if ("message", position) not in kept:
+            messages = _with_cache_control(messages, position, None)
+    _system: str | list[BetaTextBlockParam] | Omit = system
+    if isinstance(system, str) and ("system", None) in kept:
+        _system = [
+            BetaTextBlockParam(type="text", text=system, cache_control=breakpoint_)
+        ]
+    if not isinstance(tools, Omit) and any(
+        ("tool", i) not in kept for i in tool_breakpoints
+    ):
+        tools = [
+            cast("BetaToolUnionParam", {**tool, "cache_control": None})
+            if i in tool_breakpoints and ("tool", i) not in kept
+            else tool
+            for i, tool in enumerate(tools)
+        ]
+    return messages, tools, _system
+
+
 class AnthropicMessagesApi(MessagesApi):
+    """Messages API of Anthropic (and of the AskUI proxy of it).
+
+    Messages are converted to the request payload only once and only again after
+    they were changed (see `SerializedMessageCache`).
+
+    Requests with tools, i.e., the requests of the act control loop (including
+    summarizations by the truncation strategy), get cache breakpoints on the
+    tools, the system prompt and the history (see `_plan_cache_breakpoints`) so
+    that the unchanged prefix of a request is read from the prompt cache. The
+    cache reads and writes are reported in the `usage` of the returned message.
+
+    Args:
+        client (AnthropicApiClient): The client to send requests with.
+        prompt_caching (bool, optional): Whether to place cache breakpoints
+            automatically. If `False`, only the breakpoints set on the messages
+            and tools are sent. Defaults to `True`.
+    """
+
     def __init__(
         self,
         client: AnthropicApiClient,
+        prompt_caching: bool = True,
     ) -> None:
         self._client = client
+        self._prompt_caching = prompt_caching
+        self._message_cache = SerializedMessageCache(from_message_param)
 
     @retry(
         stop=stop_after_attempt(4),  # 3 retries
@@ -193,8 +394,105 @@ class AnthropicMessagesApi(MessagesApi):
         temperature: float | None = None,
         provider_options: dict[str, Any] | None = None,
     ) -> MessageParam:
+        response = self._client.beta.messages.create(  # type: ignore[misc]
+            **self._build_request_params(
+                messages=messages,
+                model_id=model_id,
+                tools=tools,
+                max_tokens=max_tokens,
+                system=system,
+                thinking=thinking,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                provider_options=provider_options,
+            ),
+        )
+        return MessageParam.model_validate(response.model_dump())
+
+    @override
+    def create_message_stream(
+        self,
+        messages: list[MessageParam],
+        model_id: str,
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageStream:
+        if not isinstance(self._client, Anthropic):
+            # The Bedrock and Vertex clients do not support streaming beta messages
+            return super().create_message_stream(
+                messages=messages,
+                model_id=model_id,
+                tools=tools,
+                max_tokens=max_tokens,
+                system=system,
+                thinking=thinking,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                provider_options=provider_options,
+            )
+        request_params = self._build_request_params(
+            messages=messages,
+            model_id=model_id,
+            tools=tools,
+            max_tokens=max_tokens,
+            system=system,
+            thinking=thinking,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            provider_options=provider_options,
+        )
+        return MessageStream(self._stream_content_blocks(self._client, request_params))
+
+    def _stream_content_blocks(
+        self, client: Anthropic, request_params: dict[str, Any]
+    ) -> Generator[ContentBlockParam, None, MessageParam]:
+        # Only opening the stream is retried: once content blocks have been
+        # yielded (and possibly acted upon), the request must not be repeated.
+        stream = self._open_stream(client, request_params)
+        try:
+            for event in stream:
+                if event.type == "content_block_stop":
+                    yield _CONTENT_BLOCK_ADAPTER.validate_python(
+                        event.content_block.model_dump()
+                    )
+            response = stream.get_final_message()
+        finally:
+            stream.close()
+        return MessageParam.model_validate(response.model_dump())
+
+    @retry(
+        stop=stop_after_attempt(4),  # 3 retries
+        wait=wait_for_retry_after_header(
+            wait_exponential(multiplier=30, min=30, max=120)
+        ),  # retry after or as a fallback 30s, 60s, 120s
+        retry=retry_if_exception(_is_retryable_error),
+        reraise=True,
+    )
+    def _open_stream(
+        self, client: Anthropic, request_params: dict[str, Any]
+    ) -> BetaMessageStream:
+        stream_manager = client.beta.messages.stream(**request_params)
+        return stream_manager.__enter__()
+
+    def _build_request_params(
+        self,
+        messages: list[MessageParam],
+        model_id: str,
+        tools: ToolCollection | None,
+        max_tokens: int | None,
+        system: SystemPrompt | None,
+        thinking: ThinkingConfigParam | None,
+        tool_choice: ToolChoiceParam | None,
+        temperature: float | None,
+        provider_options: dict[str, Any] | None,
+    ) -> dict[str, Any]:
         # convert each message to anthropic BetaMessageParam type
-        _messages = [from_message_param(message) for message in messages]
+        _messages = self._message_cache.serialize_all(messages)
 
         # Extract betas from provider_options
         betas: list[str] | None = None
@@ -214,18 +512,22 @@ class AnthropicMessagesApi(MessagesApi):
         ) = _parse_to_anthropic_types(
             tools, betas, cache_control, system, thinking, tool_choice, temperature
         )
+        system_param: str | list[BetaTextBlockParam] | Omit = _system
+        if self._prompt_caching and tools is not None:
+            _messages, _tools, system_param = _plan_cache_breakpoints(
+                _messages, _tools, _system, _cache_control
+            )
 
-        response = self._client.beta.messages.create(  # type: ignore[misc]
-            messages=_messages,
-            max_tokens=max_tokens or 8192,
-            cache_control=_cache_control,
-            model=model_id,
-            tools=_tools,
-            betas=_betas,
-            system=_system,
-            thinking=_thinking,
-            tool_choice=_tool_choice,
-            temperature=_temperature,
-            timeout=300.0,
-        )
-        return MessageParam.model_validate(response.model_dump())
+        return {
+            "messages": _messages,
+            "max_tokens": max_tokens or 8192,
+            "cache_control": _cache_control,
+            "model": model_id,
+            "tools": _tools,
+            "betas": _betas,
+            "system": system_param,
+            "thinking": _thinking,
+            "tool_choice": _tool_choice,
+            "temperature": _temperature,
+            "timeout": 300.0,
+        }
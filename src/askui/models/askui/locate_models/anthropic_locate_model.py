@@ -83,7 +83,9 @@ class AnthropicLocateModel(LocateModel):
                 image.root,
                 resolution,
             )
-            messages = built_messages_for_get_and_locate(scaled_image, prompt)
+            messages = built_messages_for_get_and_locate(
+                scaled_image, prompt, locate_settings.image_encoding
+            )
             system = build_system_prompt_locate(str(screen_width), str(screen_height))
             message = self._messages_api.create_message(
                 messages=messages,
@@ -181,7 +181,7 @@ class OpenRouterModel(GetModel):
         system_prompt = get_settings.system_prompt or SYSTEM_PROMPT_GET
 
         response = self._predict(
-            image_url=source.to_data_url(),
+            image_url=source.to_encoded(get_settings.image_encoding).data_url,
             instruction=query,
             prompt=system_prompt,
             response_schema=response_schema,
@@ -1,7 +1,17 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from pydantic import (
+    BaseModel,
+    ModelWrapValidatorHandler,
+    PrivateAttr,
+    SerializerFunctionWrapHandler,
+    model_serializer,
+    model_validator,
+)
+from pydantic_core import PydanticCustomError
+from typing_extensions import Literal, Self
 
-from pydantic import BaseModel
-from typing_extensions import Literal
+from askui.utils.blob_store import BlobRef, get_blob_store
 
 
 class CitationCharLocationParam(BaseModel):
@@ -43,10 +53,65 @@ class UrlImageSourceParam(BaseModel):
     url: str
 
 
+ImageMediaType = Literal["image/jpeg", "image/png", "image/gif", "image/webp"]
+
+
 class Base64ImageSourceParam(BaseModel):
-    data: str
-    media_type: Literal["image/jpeg", "image/png", "image/gif", "image/webp"]
+    """Base64 encoded image source.
+
+    The base64 `data` is kept in the content-addressed blob store
+    (see `askui.utils.blob_store`) so that the message history only holds a
+    lightweight handle and identical images are stored once. The base64 string
+    is materialized on access of `data` and on serialization (e.g., when
+    building a provider payload or a report).
+    """
+
+    media_type: ImageMediaType
     type: Literal["base64"] = "base64"
+    _blob: BlobRef = PrivateAttr()
+
+    if TYPE_CHECKING:
+
+        def __init__(
+            self,
+            *,
+            data: str,
+            media_type: ImageMediaType,
+            type: Literal["base64"] = "base64",  # noqa: A002
+        ) -> None: ...
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _store_data(cls, value: Any, handler: ModelWrapValidatorHandler[Self]) -> Self:
+        if not isinstance(value, dict):
+            return handler(value)
+        fields = dict(value)
+        data = fields.pop("data", None)
+        if data is None:
+            error_type = "missing"
+            raise PydanticCustomError(error_type, "data: Field required")
+        if not isinstance(data, str):
+            error_type = "string_type"
+            raise PydanticCustomError(
+                error_type, "data: Input should be a valid string"
+            )
+        instance = handler(fields)
+        instance._blob = get_blob_store().put(data.encode("utf-8"))  # noqa: SLF001
+        return instance
+
+    @model_serializer(mode="wrap")
+    def _serialize_data(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
+        return {"data": self.data, **handler(self)}
+
+    @property
+    def data(self) -> str:
+        """The base64 encoded image data."""
+        return self._blob.read().decode("utf-8")
+
+    @property
+    def blob_key(self) -> str:
+        """Content hash identifying the image data within the blob store."""
+        return self._blob.key
 
 
 class CacheControlEphemeralParam(BaseModel):
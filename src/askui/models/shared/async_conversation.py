@@ -0,0 +1,202 @@
+"""Asyncio counterpart of `Conversation` for driving many agents in one process."""
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import uuid
+from collections.abc import Callable
+from typing import ParamSpec, TypeVar
+
+from askui.model_providers.async_vlm_provider import (
+    AsyncVlmProvider,
+    BlockingVlmProvider,
+)
+from askui.models.exceptions import MaxTokensExceededError, ModelRefusalError
+from askui.models.shared.agent_message_param import MessageParam
+from askui.models.shared.settings import ActSettings
+from askui.models.shared.tools import ToolCollection
+from askui.models.shared.truncation_strategies import (
+    SummarizingTruncationStrategy,
+    TruncationStrategy,
+)
+from askui.reporting import NULL_REPORTER, Reporter
+
+logger = logging.getLogger(__name__)
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+
+class AsyncConversation:
+    """Runs the agent control loop on an asyncio event loop.
+
+    Each step awaits the next assistant message from the `AsyncVlmProvider` and
+    executes the tool calls it contains. Many conversations can run concurrently
+    on one event loop: while one awaits its VLM, the others make progress.
+
+    The (synchronous) tools, the reporter and the truncation strategy are
+    executed in a worker thread, either on the given executor or on the loop's
+    default executor, so they never block the event loop. Pass a
+    single-threaded executor to run all tool calls of a conversation on the
+    same thread, e.g., for agent OSs bound to a thread such as Playwright.
+
+    Cancelling the task running `execute_conversation()` stops the control loop
+    at its next `await`: no further messages are requested and no further tools
+    are called. A tool call already running in a worker thread cannot be
+    interrupted; it finishes but its result is discarded.
+
+    Unlike `Conversation`, there is a single (agent) speaker, i.e., speaker
+    handoff and cache execution are not supported.
+
+    Args:
+        vlm_provider (AsyncVlmProvider): VLM provider for LLM API calls.
+        reporter (Reporter, optional): Reporter for logging messages. Defaults
+            to `NULL_REPORTER`.
+        truncation_strategy (TruncationStrategy | None, optional): Truncation
+            strategy. Defaults to `SummarizingTruncationStrategy()`.
+        executor (concurrent.futures.Executor | None, optional): Executor to run
+            tools, reporter and truncation on. Defaults to the event loop's default
+            executor.
+    """
+
+    def __init__(
+        self,
+        vlm_provider: AsyncVlmProvider,
+        reporter: Reporter = NULL_REPORTER,
+        truncation_strategy: TruncationStrategy | None = None,
+        executor: concurrent.futures.Executor | None = None,
+    ) -> None:
+        self.conversation_id: str = str(uuid.uuid4())
+        self.vlm_provider = vlm_provider
+        self._reporter = reporter
+        self._executor = executor
+
+        self.settings: ActSettings = ActSettings()
+        self.tools: ToolCollection = ToolCollection()
+        self._step_index: int = 0
+
+        self._truncation_strategy: TruncationStrategy = (
+            truncation_strategy or SummarizingTruncationStrategy()
+        )
+        # The summarizing VLM is bound to the loop the conversation runs on
+        self._inject_vlm_provider = self._truncation_strategy.vlm_provider is None
+        self._truncation_strategy.reporter = reporter
+
+    async def execute_conversation(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        settings: ActSettings | None = None,
+    ) -> None:
+        """Setup conversation state and run the control loop until it is done.
+
+        Args:
+            messages (list[MessageParam]): Initial message history.
+            tools (ToolCollection | None, optional): Available tools.
+            settings (ActSettings | None, optional): Agent settings.
+        """
+        logger.info("Starting async conversation %s", self.conversation_id)
+        self.settings = settings or ActSettings()
+        self.tools = tools or ToolCollection()
+        if self._inject_vlm_provider:
+            self._truncation_strategy.vlm_provider = BlockingVlmProvider(
+                self.vlm_provider, asyncio.get_running_loop()
+            )
+        self._truncation_strategy.reset(messages)
+
+        self._step_index = 0
+        continue_execution = True
+        while continue_execution:
+            continue_execution = await self._execute_step()
+            self._step_index += 1
+            if self._is_max_steps_reached():
+                continue_execution = False
+
+    def _is_max_steps_reached(self) -> bool:
+        if self.settings.max_steps is None:
+            return False
+        if self._step_index >= self.settings.max_steps:
+            logger.error(
+                "Reached max_steps limit %d, stopping execution",
+                self.settings.max_steps,
+            )
+            return True
+        return False
+
+    async def _execute_step(self) -> bool:
+        """Execute one step of the conversation loop.
+
+        Returns:
+            True if loop should continue, False if done
+        """
+        messages = self._truncation_strategy.truncated_messages
+        if not messages or messages[-1].role != "user":
+            logger.debug("Last message not from user, nothing to do")
+            return False
+
+        response = await self.vlm_provider.create_message(
+            messages=messages,
+            tools=self.tools,
+            max_tokens=self.settings.messages.max_tokens,
+            system=self.settings.messages.system,
+            thinking=self.settings.messages.thinking,
+            tool_choice=self.settings.messages.tool_choice,
+            temperature=self.settings.messages.temperature,
+            provider_options=self.settings.messages.provider_options,
+        )
+        await self._add_message(response)
+
+        if response.stop_reason == "max_tokens":
+            logger.error(
+                "Agent stopped with error",
+                exc_info=MaxTokensExceededError(self.settings.messages.max_tokens),
+            )
+            return False
+        if response.stop_reason == "refusal":
+            logger.error("Agent stopped with error", exc_info=ModelRefusalError())
+            return False
+
+        if isinstance(response.content, str):
+            return False
+        tool_use_blocks = [
+            block for block in response.content if block.type == "tool_use"
+        ]
+        if not tool_use_blocks:
+            logger.info("Conversation completed successfully")
+            return False
+
+        logger.debug("Executing %d tool(s)", len(tool_use_blocks))
+        tool_results = await self._run_in_executor(self.tools.run, tool_use_blocks)
+        await self._add_message(MessageParam(content=tool_results, role="user"))
+        return True
+
+    async def _add_message(self, message: MessageParam) -> None:
+        await self._run_in_executor(
+            self._reporter.add_message, "AgentSpeaker", message.model_dump(mode="json")
+        )
+        # Appending may summarize the history using the (blocking) VLM provider
+        await self._run_in_executor(self._truncation_strategy.append_message, message)
+
+    async def _run_in_executor(
+        self, func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs
+    ) -> _T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def get_messages(self) -> list[MessageParam]:
+        """Get current message history from truncation strategy.
+
+        Returns:
+            List of messages in current conversation
+        """
+        return self._truncation_strategy.full_messages
+
+    def get_truncation_strategy(self) -> TruncationStrategy:
+        """Get current truncation strategy.
+
+        Returns:
+            Current truncation strategy
+        """
+        return self._truncation_strategy
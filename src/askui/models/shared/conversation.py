@@ -9,7 +9,11 @@ from opentelemetry import trace
 from askui.model_providers.detection_provider import DetectionProvider
 from askui.model_providers.image_qa_provider import ImageQAProvider
 from askui.model_providers.vlm_provider import VlmProvider
-from askui.models.shared.agent_message_param import MessageParam
+from askui.models.shared.agent_message_param import (
+    ContentBlockParam,
+    MessageParam,
+    ToolUseBlockParam,
+)
 from askui.models.shared.settings import ActSettings
 from askui.models.shared.tools import ToolCollection
 from askui.models.shared.truncation_strategies import (
@@ -97,6 +101,14 @@ class Conversation:
         self._reporters: list[Reporter] = []
         self._step_index: int = 0
 
+        # Results of tool calls dispatched while the assistant message was still
+        # being received (see `dispatch_tool_use()`), keyed by tool use id
+        self._dispatched_tool_results: dict[str, ContentBlockParam] = {}
+        self._dispatched_tool_error: Exception | None = None
+        # Dispatched tool calls held back to be run together with the following
+        # ones (see `ToolCollection.grouping_key()`)
+        self._held_tool_uses: list[ToolUseBlockParam] = []
+
         # Truncation strategy. Conversation-owned dependencies are
         # auto-injected so users can pass a custom strategy with only
         # strategy-specific config (e.g. n_messages_to_keep) without
@@ -200,6 +212,9 @@ class Conversation:
         self.settings = settings or ActSettings()
         self.tools = tools or ToolCollection()
         self._reporters = reporters or []
+        self._dispatched_tool_results = {}
+        self._dispatched_tool_error = None
+        self._held_tool_uses = []
 
         # Auto-populate speaker descriptions and switch_speaker tool
         self._setup_speaker_handoff()
@@ -352,12 +367,28 @@ class Conversation:
         if not tool_use_blocks:
             return None
 
-        # Execute tools
-        tool_names = [block.name for block in tool_use_blocks]
-        logger.debug("Executing %d tool(s)", len(tool_use_blocks))
-        self._on_tool_execution_start(tool_names)
-        tool_results = self.tools.run(tool_use_blocks)
-        self._on_tool_execution_end(tool_names)
+        # Collect results of tools already dispatched while streaming
+        self._run_held_tool_uses()
+        dispatched_results = self._dispatched_tool_results
+        dispatched_error = self._dispatched_tool_error
+        self._dispatched_tool_results = {}
+        self._dispatched_tool_error = None
+        if dispatched_error is not None:
+            raise dispatched_error
+
+        # Execute remaining tools
+        pending_blocks = [
+            block for block in tool_use_blocks if block.id not in dispatched_results
+        ]
+        if pending_blocks:
+            logger.debug("Executing %d tool(s)", len(pending_blocks))
+            pending_results = self.run_tools(pending_blocks)
+            dispatched_results.update(
+                zip(
+                    (block.id for block in pending_blocks), pending_results, strict=True
+                )
+            )
+        tool_results = [dispatched_results[block.id] for block in tool_use_blocks]
 
         if not tool_results:
             return None
@@ -365,6 +396,86 @@ class Conversation:
         # Return tool results as a user message
         return MessageParam(content=tool_results, role="user")
 
+    def run_tools(
+        self, tool_use_blocks: list[ToolUseBlockParam]
+    ) -> list[ContentBlockParam]:
+        """Execute tool calls with the tools of the conversation.
+
+        Notifies the callbacks about the tool execution and encodes images as
+        configured in the settings. Used for all tool calls of the conversation,
+        including the ones executed by speakers themselves, e.g., the
+        `CacheExecutor` replaying a trajectory.
+
+        Args:
+            tool_use_blocks: The tool use blocks to execute.
+
+        Returns:
+            The tool results in order of the tool use blocks.
+        """
+        tool_names = [block.name for block in tool_use_blocks]
+        self._on_tool_execution_start(tool_names)
+        try:
+            return self.tools.run(
+                tool_use_blocks, image_encoding=self.settings.image_encoding
+            )
+        finally:
+            self._on_tool_execution_end(tool_names)
+
+    def dispatch_tool_use(self, tool_use_block: ToolUseBlockParam) -> None:
+        """Execute a tool call before the assistant message is complete.
+
+        Called by speakers that stream the model's response so that a tool call
+        is executed as soon as its input is complete. Tool calls are executed
+        in the order they are dispatched. The results are added to the history
+        together with the results of the remaining tool calls of the message
+        by `_execute_tools_if_present()`.
+
+        Consecutive tool calls that are best run together (see
+        `ToolCollection.grouping_key()`), e.g., read-only tool calls that can
+        run concurrently or input actions that are sent to the device in one
+        batch, are held back until a tool call that does not belong to them is
+        dispatched or the message is complete.
+
+        If a tool raises, no further tool calls are executed and the exception
+        is re-raised once the message is complete, like without streaming.
+
+        Args:
+            tool_use_block: The complete tool use block to execute.
+        """
+        if (
+            self._dispatched_tool_error is not None
+            or tool_use_block.id in self._dispatched_tool_results
+            or any(block.id == tool_use_block.id for block in self._held_tool_uses)
+        ):
+            return
+        grouping_key = self.tools.grouping_key(tool_use_block)
+        if self._held_tool_uses and (
+            grouping_key is None
+            or grouping_key != self.tools.grouping_key(self._held_tool_uses[0])
+        ):
+            self._run_held_tool_uses()
+        self._held_tool_uses.append(tool_use_block)
+        if grouping_key is None:
+            self._run_held_tool_uses()
+
+    def _run_held_tool_uses(self) -> None:
+        """Execute the dispatched tool calls held back so far."""
+        tool_use_blocks = self._held_tool_uses
+        self._held_tool_uses = []
+        if not tool_use_blocks or self._dispatched_tool_error is not None:
+            return
+        logger.debug(
+            "Dispatching tool(s) %s", ", ".join(block.name for block in tool_use_blocks)
+        )
+        try:
+            results = self.run_tools(tool_use_blocks)
+        except Exception as e:  # noqa: BLE001 - re-raised in _execute_tools_if_present
+            self._dispatched_tool_error = e
+            return
+        self._dispatched_tool_results.update(
+            zip((block.id for block in tool_use_blocks), results, strict=True)
+        )
+
     def _add_message(self, message: MessageParam) -> None:
         """Add message to conversation history.
 
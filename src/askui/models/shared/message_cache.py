@@ -0,0 +1,116 @@
+"""Cache of provider-ready serializations of messages.
+
+Most of the message history sent to a model does not change from one step to
+the next, but converting it to the payload of a provider is costly, mostly
+because the base64 data of every image has to be loaded from the blob store
+(see `askui.utils.blob_store`) again. `SerializedMessageCache` keeps the
+serialization of each message and reuses it as long as the message is
+unchanged.
+"""
+
+import threading
+import weakref
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    MessageParam,
+)
+
+_T = TypeVar("_T")
+
+
+def _fingerprint(value: object) -> Hashable:
+    """Fingerprint of the state of a (nested) message (part).
+
+    Cheap to compute compared to serialization as the data of base64 images is
+    represented by its content hash (blob key) instead of the data itself.
+    """
+    if isinstance(value, Base64ImageSourceParam):
+        return (Base64ImageSourceParam, value.media_type, value.blob_key)
+    if isinstance(value, BaseModel):
+        return (
+            type(value),
+            tuple(
+                (name, _fingerprint(field_value))
+                for name, field_value in value.__dict__.items()
+            ),
+        )
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_fingerprint(item) for item in value))
+    if isinstance(value, dict):
+        return (
+            dict,
+            tuple((key, _fingerprint(item)) for key, item in value.items()),
+        )
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value), id(value))
+    return (type(value), value)
+
+
+class SerializedMessageCache(Generic[_T]):
+    """Serializes messages and keeps the serialization of each message.
+
+    A message is only serialized again if it changed since it was last
+    serialized, e.g., because a truncation strategy set or removed a cache
+    breakpoint or replaced its images. Messages that are replaced within the
+    history (e.g., by a summary) are new messages and, hence, serialized anew.
+    The serialization of a message is dropped once the message is garbage
+    collected.
+
+    The serializations are shared between calls and must not be modified.
+
+    Args:
+        serialize (Callable[[MessageParam], _T]): Converts a message into the
+            payload of the provider.
+    """
+
+    def __init__(self, serialize: Callable[[MessageParam], _T]) -> None:
+        self._serialize = serialize
+        self._entries: dict[int, tuple[Hashable, _T]] = {}
+        self._lock = threading.Lock()
+
+    def serialize(self, message: MessageParam) -> _T:
+        """Serialize a message, reusing its cached serialization if unchanged.
+
+        Args:
+            message (MessageParam): The message to serialize.
+
+        Returns:
+            _T: The serialization of the message.
+        """
+        key = id(message)
+        fingerprint = _fingerprint(message)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        serialized = self._serialize(message)
+        with self._lock:
+            if key not in self._entries:
+                weakref.finalize(message, self._discard, key)
+            self._entries[key] = (fingerprint, serialized)
+        return serialized
+
+    def serialize_all(self, messages: list[MessageParam]) -> list[_T]:
+        """Serialize messages, reusing the cached serializations of unchanged ones.
+
+        Args:
+            messages (list[MessageParam]): The messages to serialize.
+
+        Returns:
+            list[_T]: The serializations of the messages in order.
+        """
+        return [self.serialize(message) for message in messages]
+
+    def _discard(self, key: int) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Generator, Iterator
 
 from askui.models.shared.agent_message_param import (
+    ContentBlockParam,
     MessageParam,
     ThinkingConfigParam,
     ToolChoiceParam,
@@ -10,6 +11,73 @@ from askui.models.shared.prompts import SystemPrompt
 from askui.models.shared.tools import ToolCollection
 
 
+class MessageStream:
+    """Stream of a message that is being created by a model.
+
+    Iterating over the stream yields the content blocks of the message, each as
+    soon as it is complete (e.g., a `ToolUseBlockParam` once its input JSON has
+    been fully received). The complete message, including `stop_reason` and
+    `usage`, is available via `get_final_message()`.
+
+    Args:
+        blocks (Generator[ContentBlockParam, None, MessageParam]): Generator
+            yielding the completed content blocks and returning the final
+            message.
+
+    Example:
+        ```python
+        stream = vlm_provider.create_message_stream(messages=messages)
+        for block in stream:
+            print(block.type)
+        message = stream.get_final_message()
+        ```
+    """
+
+    def __init__(
+        self, blocks: Generator[ContentBlockParam, None, MessageParam]
+    ) -> None:
+        self._blocks = blocks
+        self._message: MessageParam | None = None
+
+    @classmethod
+    def from_message(cls, message: MessageParam) -> "MessageStream":
+        """Create a stream from an already complete message.
+
+        Args:
+            message (MessageParam): The complete message.
+
+        Returns:
+            MessageStream: A stream yielding all content blocks of the message.
+        """
+
+        def _blocks() -> Generator[ContentBlockParam, None, MessageParam]:
+            if not isinstance(message.content, str):
+                yield from message.content
+            return message
+
+        return cls(_blocks())
+
+    def __iter__(self) -> Iterator[ContentBlockParam]:
+        if self._message is not None:
+            return
+        try:
+            while True:
+                yield next(self._blocks)
+        except StopIteration as e:
+            self._message = e.value
+
+    def get_final_message(self) -> MessageParam:
+        """Consume the rest of the stream and return the complete message.
+
+        Returns:
+            MessageParam: The complete message.
+        """
+        for _ in self:
+            pass
+        assert self._message is not None
+        return self._message
+
+
 class MessagesApi(ABC):
     """Interface for creating messages using different APIs."""
 
@@ -51,3 +119,39 @@ class MessagesApi(ABC):
             dictionaries. See the specific MessagesApi implementation for details.
         """
         raise NotImplementedError
+
+    def create_message_stream(
+        self,
+        messages: list[MessageParam],
+        model_id: str,
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageStream:
+        """Create a message, streaming its content blocks as they are completed.
+
+        Takes the same arguments as `create_message()`. The default
+        implementation falls back to `create_message()` and yields all content
+        blocks once the whole message has been received. Override it for APIs
+        that support streaming.
+
+        Returns:
+            MessageStream: The stream of the created message.
+        """
+        return MessageStream.from_message(
+            self.create_message(
+                messages=messages,
+                model_id=model_id,
+                tools=tools,
+                max_tokens=max_tokens,
+                system=system,
+                thinking=thinking,
+                tool_choice=tool_choice,
+                temperature=temperature,
+                provider_options=provider_options,
+            )
+        )
@@ -37,6 +37,30 @@ DEFAULT_GET_RESOLUTION = Resolution(1280, 800)
 CACHING_STRATEGY = Literal["execute", "record", "auto"]
 CACHE_PARAMETER_IDENTIFICATION_STRATEGY = Literal["llm", "preset"]
 CACHING_VISUAL_VERIFICATION_METHOD = Literal["phash", "ahash", "none"]
+CACHE_REPLAY_MODE = Literal["direct", "conversation"]
+IMAGE_ENCODING_FORMAT = Literal["png", "jpeg", "webp", "auto"]
+
+
+class ImageEncoding(BaseModel):
+    """How images (e.g., screenshots) are encoded when sent to a model.
+
+    Lossy formats reduce the size of the request and, hence, upload time, at the
+    cost of image quality.
+
+    Args:
+        format (IMAGE_ENCODING_FORMAT): The image format. `"png"` is lossless,
+            `"jpeg"` is lossy, `"webp"` is lossy or lossless (see `lossless`) and
+            `"auto"` chooses by content: lossless WebP for screenshots of user
+            interfaces and JPEG for photos. Default: `"png"`.
+        quality (int): Quality (1-100) of lossy encodings. Default: 85.
+        lossless (bool): Whether to encode WebP losslessly. Default: False.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    format: IMAGE_ENCODING_FORMAT = "png"
+    quality: int = Field(default=85, ge=1, le=100)
+    lossless: bool = False
 
 
 class MessageSettings(BaseModel):
@@ -63,6 +87,11 @@ class MessageSettings(BaseModel):
             Each provider can define its own keys. Common options include:
             - "betas": List of beta features to enable (e.g., for Anthropic)
             Default: None.
+        stream (bool): Whether to stream the model's response. When enabled,
+            each tool call is started as soon as its input is complete instead
+            of after the whole response has been received. Providers that do
+            not support streaming fall back to non-streaming requests.
+            Default: False.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -73,6 +102,7 @@ class MessageSettings(BaseModel):
     tool_choice: ToolChoiceParam | None = None
     temperature: float | None = Field(default=None, ge=0.0, le=1.0)
     provider_options: dict[str, Any] | None = None
+    stream: bool = False
 
 
 class ActSettings(BaseModel):
@@ -84,12 +114,15 @@ class ActSettings(BaseModel):
     Args:
         messages (MessageSettings): Settings for message creation including
             max tokens, temperature, and system prompt configuration.
+        image_encoding (ImageEncoding): Encoding of images returned by tools
+            (e.g., screenshots). Default: PNG.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     messages: MessageSettings = Field(default_factory=MessageSettings)
     max_steps: int | None = None
+    image_encoding: ImageEncoding = Field(default_factory=ImageEncoding)
 
 
 class GetSettings(BaseModel):
@@ -115,6 +148,9 @@ class GetSettings(BaseModel):
             processing. Images are scaled to fit within this resolution while
             maintaining aspect ratio. This affects quality vs. token usage.
             Default: 1280x800.
+        image_encoding (ImageEncoding): Encoding of the image sent to the
+            model. Default: PNG.
+            Note: Not all providers currently use this setting.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -124,6 +160,7 @@ class GetSettings(BaseModel):
     system_prompt: GetSystemPrompt | None = None
     timeout: float | None = None
     resolution: Resolution = DEFAULT_GET_RESOLUTION
+    image_encoding: ImageEncoding = Field(default_factory=ImageEncoding)
 
 
 class LocateSettings(BaseModel):
@@ -152,6 +189,9 @@ class LocateSettings(BaseModel):
         resolution (Resolution): Target resolution for scaling images before
             processing. Images are scaled to fit within this resolution while
             maintaining aspect ratio. Default: 1280x800.
+        image_encoding (ImageEncoding): Encoding of the screenshot sent to the
+            model. Default: PNG.
+            Note: Not all providers currently use this setting.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -162,6 +202,7 @@ class LocateSettings(BaseModel):
     timeout: float | None = None
     system_prompt: LocateSystemPrompt | None = None
     resolution: Resolution = DEFAULT_LOCATE_RESOLUTION
+    image_encoding: ImageEncoding = Field(default_factory=ImageEncoding)
 
 
 class CacheFailure(BaseModel):
@@ -186,6 +227,21 @@ class VisualValidationMetadata(BaseModel):
     region_size: int
 
 
+class ScreenSettleTiming(BaseModel):
+    """Time the screen took to settle after a step of a cached trajectory.
+
+    Learned from replays of the trajectory (see `ScreenSettleSettings`).
+
+    Args:
+        settle_time: Estimated time in seconds after the step until the screen
+            stopped changing
+        settled: Whether the screen settled within the max wait at the last replay
+    """
+
+    settle_time: float
+    settled: bool = True
+
+
 class CacheMetadata(BaseModel):
     """Metadata for a cache file including execution history and validation state.
 
@@ -200,6 +256,10 @@ class CacheMetadata(BaseModel):
         is_valid: Whether cache is still valid
         invalidation_reason: Why cache was invalidated (if applicable)
         visual_validation: Visual validation configuration
+        journal_sequence: Sequence number of the last entry of the metadata
+            journal folded into this metadata
+        screen_settle_timings: Learned time the screen takes to settle after
+            each step (by step index)
     """
 
     version: str = "0.2"
@@ -212,6 +272,8 @@ class CacheMetadata(BaseModel):
     is_valid: bool = True
     invalidation_reason: str | None = None
     visual_validation: VisualValidationMetadata | None = None
+    journal_sequence: int = 0
+    screen_settle_timings: dict[int, ScreenSettleTiming] = Field(default_factory=dict)
 
 
 class CacheFile(BaseModel):
@@ -245,18 +307,59 @@ class CacheWritingSettings(BaseModel):
     visual_validation_region_size: int = 100
 
 
+class ScreenSettleSettings(BaseModel):
+    """Settings for waiting for the screen to settle after a replayed action.
+
+    Low-resolution frames of the screen are sampled until consecutive frames stay
+    unchanged for `stable_duration` seconds or `max_wait` seconds have passed.
+
+    Args:
+        sample_interval: Delay in seconds between sampling frames
+        stable_duration: Time in seconds frames must stay unchanged
+        tolerance: Max mean absolute pixel difference (0.0-1.0) between
+            consecutive frames for them to count as unchanged
+        max_wait: Max time in seconds to wait for the screen to settle. If None,
+            `delay_time_between_actions` of the cache execution settings.
+        frame_size: Width and height in pixels frames are downscaled to
+        region_size: Width and height in pixels of the region around the
+            coordinate of an action (e.g., of a click) that frames are captured
+            of. If None or if the action has no coordinate, the whole screen is
+            captured.
+    """
+
+    sample_interval: float = Field(default=0.1, gt=0.0)
+    stable_duration: float = Field(default=0.3, ge=0.0)
+    tolerance: float = Field(default=0.005, ge=0.0, le=1.0)
+    max_wait: float | None = Field(default=None, ge=0.0)
+    frame_size: int = Field(default=64, gt=0)
+    region_size: int | None = Field(default=400, gt=0)
+
+
 class CacheExecutionSettings(BaseModel):
     """Settings for executing/replaying cached trajectories.
 
     Args:
-        delay_time_between_actions: Delay in seconds between actions
+        delay_time_between_actions: Delay in seconds between actions if the
+            screen cannot be observed or did not settle at the last replay
         skip_visual_validation: Override to disable visual validation
         visual_validation_threshold: Max Hamming distance for validation
+        replay_mode: How cached steps are executed:
+            - "conversation" (default): Each step is executed as a step of the
+              conversation (e.g., with conversation callbacks for each step)
+            - "direct": All steps are executed straight against the tools and
+              added to the conversation at once when the agent takes over
+        screen_settle: Settings for waiting after each action until the screen
+            settled instead of waiting `delay_time_between_actions`. If None, the
+            fixed delay is used.
     """
 
     delay_time_between_actions: float = 1.0  # keep >1s to give UI time to materialize
     skip_visual_validation: bool = False
     visual_validation_threshold: int = 10
+    replay_mode: CACHE_REPLAY_MODE = "conversation"
+    screen_settle: ScreenSettleSettings | None = Field(
+        default_factory=ScreenSettleSettings
+    )
 
 
 class CachingSettings(BaseModel):
@@ -1,6 +1,6 @@
-import base64
 import json
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
 import httpx
 from typing_extensions import override
@@ -15,11 +15,19 @@ from askui.models.shared.agent_message_param import (
 )
 from askui.models.shared.prompts import SystemPrompt
 from askui.models.shared.settings import ActSystemPrompt
-from askui.utils.image_utils import base64_to_image
+from askui.utils.image_utils import read_base64_image_size, read_image_size
+
+# Maximum number of image sizes cached by `SimpleTokenCounter`
+_IMAGE_SIZE_CACHE_MAX_SIZE = 1024
 
 
 class TokenCounts:
-    """Token counts for a message."""
+    """Token counts for a message history.
+
+    Keeps one entry per message together with a running total so that the
+    counts can be maintained incrementally (append, update, reset) instead of
+    recounting the whole history after every change.
+    """
 
     def __init__(
         self,
@@ -40,6 +48,10 @@ class TokenCounts:
     def retrieve_message_tokens(self, index: int) -> int:
         return self._messages[index]
 
+    def update_message_tokens(self, index: int, tokens: int) -> None:
+        self._total += tokens - self._messages[index]
+        self._messages[index] = tokens
+
     def reset_message_tokens(self, tokens: list[int]) -> None:
         self._messages = tokens
         self._total = self._static + sum(tokens)
@@ -78,6 +90,20 @@ class TokenCounter(ABC):
         """
         raise NotImplementedError
 
+    def count_message_tokens(self, message: MessageParam) -> int:
+        """Count tokens (estimated) for a single message.
+
+        Used to maintain `TokenCounts` incrementally, i.e., each message is only
+        counted once when it is added to (or changed within) the history.
+
+        Args:
+            message (MessageParam): The message to count tokens for.
+
+        Returns:
+            int: The estimated number of tokens of the message.
+        """
+        return self.count_tokens(messages=[message]).total
+
 
 class SimpleTokenCounter(TokenCounter):
     """Simple token counter implementation that estimates tokens by dividing string
@@ -97,6 +123,35 @@ class SimpleTokenCounter(TokenCounter):
         """
         self._chars_per_token = chars_per_token
         self._url_cache: dict[str, tuple[int, int] | None] = {}
+        self._image_size_cache: OrderedDict[str, tuple[int, int]] = OrderedDict()
+
+    def _get_image_dimensions_from_base64(
+        self, source: Base64ImageSourceParam
+    ) -> tuple[int, int]:
+        """Read image dimensions from the header of a base64 image with caching.
+
+        The cache is keyed by the content hash of the image data and keeps the
+        dimensions of the most recently used images.
+
+        Args:
+            source (Base64ImageSourceParam): The image source.
+
+        Returns:
+            tuple[int, int]: The (width, height) of the image.
+
+        Raises:
+            ValueError: If the image cannot be read.
+        """
+        key = source.blob_key
+        dimensions = self._image_size_cache.get(key)
+        if dimensions is not None:
+            self._image_size_cache.move_to_end(key)
+            return dimensions
+        dimensions = read_base64_image_size(source.data)
+        self._image_size_cache[key] = dimensions
+        if len(self._image_size_cache) > _IMAGE_SIZE_CACHE_MAX_SIZE:
+            self._image_size_cache.popitem(last=False)
+        return dimensions
 
     def _get_image_dimensions_from_url(self, url: str) -> tuple[int, int] | None:
         """Fetch image dimensions from a URL with caching.
@@ -123,10 +178,7 @@ class SimpleTokenCounter(TokenCounter):
                     self._url_cache[url] = None
                     return None
 
-                # Convert response content to PIL Image to get dimensions
-                image_data_base64 = base64.b64encode(response.content).decode("utf-8")
-                image = base64_to_image(image_data_base64)
-                dimensions = image.size
+                dimensions = read_image_size(response.content)
                 self._url_cache[url] = dimensions
                 return dimensions
         except (httpx.HTTPError, httpx.TimeoutException, ValueError, TypeError):
@@ -161,6 +213,10 @@ class SimpleTokenCounter(TokenCounter):
             messages=message_tokens,
         )
 
+    @override
+    def count_message_tokens(self, message: MessageParam) -> int:
+        return self._count_tokens_for_message(message)
+
     def _count_tokens_for_message(self, message: MessageParam) -> int:
         """Count tokens for a message by processing content blocks individually.
 
@@ -228,9 +284,7 @@ class SimpleTokenCounter(TokenCounter):
         estimated_tokens = int((2000 * 2000) / 750)
         try:
             if isinstance(block.source, Base64ImageSourceParam):
-                # Decode base64 image to get dimensions
-                image = base64_to_image(block.source.data)
-                width, height = image.size
+                width, height = self._get_image_dimensions_from_base64(block.source)
                 return int((width * height) / 750)
 
             # For URL-based images, try to fetch the image to get actual dimensions
@@ -2,14 +2,15 @@ import logging
 import re
 import types
 import uuid
+import weakref
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import timedelta
 from functools import wraps
-from typing import Any, Callable, Literal, Protocol, Type
+from typing import Any, Callable, Literal, Mapping, Protocol, Type
 
 import jsonref
 import mcp
-from asyncer import syncify
 from fastmcp.client.client import CallToolResult, ProgressHandler
 from fastmcp.tools import Tool as FastMcpTool
 from fastmcp.utilities.types import Image as FastMcpImage
@@ -31,8 +32,10 @@ from askui.models.shared.agent_message_param import (
     ToolResultBlockParam,
     ToolUseBlockParam,
 )
+from askui.models.shared.settings import ImageEncoding
 from askui.tools import AgentOs
 from askui.tools.android.agent_os import AndroidAgentOs
+from askui.tools.mcp.session_pool import McpSessionPool
 from askui.utils.image_utils import ImageSource, base64_to_image
 
 logger = logging.getLogger(__name__)
@@ -47,6 +50,10 @@ ToolCallResult = (
 )
 
 
+_INVALID_NAME_CHARS_PATTERN = re.compile(r"[^a-zA-Z0-9_-]")
+# Suffix of a tool name starting with a UUID (pattern: _xxxxxxxx-xxxx-...)
+_UUID_SUFFIX_PATTERN = re.compile(r"_[0-9a-f]{8}-[0-9a-f]{4}.*$", re.IGNORECASE)
+
 IMAGE_MEDIA_TYPES_SUPPORTED: list[
     Literal["image/jpeg", "image/png", "image/gif", "image/webp"]
 ] = ["image/jpeg", "image/png", "image/gif", "image/webp"]
@@ -54,6 +61,7 @@ IMAGE_MEDIA_TYPES_SUPPORTED: list[
 
 def _convert_to_content(
     result: ToolCallResult,
+    image_encoding: ImageEncoding | None = None,
 ) -> list[TextBlockParam | ImageBlockParam]:
     if result is None:
         return []
@@ -93,18 +101,21 @@ def _convert_to_content(
     if isinstance(result, list | tuple):
         return [
             item
-            for sublist in [_convert_to_content(item) for item in result]
+            for sublist in [
+                _convert_to_content(item, image_encoding) for item in result
+            ]
             for item in sublist
         ]
 
     if isinstance(result, BaseModel):
         return [TextBlockParam(text=result.model_dump_json())]
 
+    encoded_image = ImageSource(result).to_encoded(image_encoding)
     return [
         ImageBlockParam(
             source=Base64ImageSourceParam(
-                media_type="image/png",
-                data=ImageSource(result).to_base64(),
+                media_type=encoded_image.media_type,
+                data=encoded_image.data,
             )
         )
     ]
@@ -197,6 +208,13 @@ class Tool(BaseModel, ABC):
     )
 
     _unique_id: str = PrivateAttr(default_factory=lambda: str(uuid.uuid4()))
+    # Memoized `name` and `to_params()`, keyed by the fields they are built from
+    _name_cache: tuple[tuple[str, tuple[str, ...]], str] | None = PrivateAttr(
+        default=None
+    )
+    _params_cache: tuple[tuple[str, str, int], ToolParam] | None = PrivateAttr(
+        default=None
+    )
 
     @abstractmethod
     def __call__(self, *args: Any, **kwargs: Any) -> ToolCallResult:
@@ -207,21 +225,27 @@ class Tool(BaseModel, ABC):
     @property
     def name(self) -> str:
         """Returns the unique name for this tool instance."""
+        key = (self.base_name, tuple(self.required_tags))
+        if self._name_cache is None or self._name_cache[0] != key:
+            self._name_cache = (key, self._build_name())
+        return self._name_cache[1]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        """Sets the base name of the tool."""
+        self.base_name = value
+
+    def _build_name(self) -> str:
         name_parts = [self.base_name]
         if len(self.required_tags) > 0:
             name_parts.append(f"tags_{'_'.join(self.required_tags)}")
         name_parts.append(self._unique_id)
         name = "_".join(name_parts)
         # Ensure name matches pattern ^[a-zA-Z0-9_-]$
-        name = re.sub(r"[^a-zA-Z0-9_-]", "_", name)
+        name = _INVALID_NAME_CHARS_PATTERN.sub("_", name)
         # Ensure name is not longer than 64 characters
         return name[:64]
 
-    @name.setter
-    def name(self, value: str) -> None:
-        """Sets the base name of the tool."""
-        self.base_name = value
-
     is_cacheable: bool = Field(
         default=False,
         description=(
@@ -230,15 +254,36 @@ class Tool(BaseModel, ABC):
             "results and where side-effects during replay are unlikely or tolerable."
         ),
     )
+    is_read_only: bool = Field(
+        default=False,
+        description=(
+            "Whether this tool is free of side effects, e.g., only observes the "
+            "device (screenshots, mouse position, display information). Read-only "
+            "tools called within the same assistant message may run concurrently "
+            "on a thread pool, so they must be safe to call from any thread. "
+            "False by default, i.e., the tool is assumed to mutate the device."
+        ),
+    )
 
     def to_params(
         self,
     ) -> ToolParam:
-        return ToolParam(
-            name=self.name,
-            description=self.description,
-            input_schema=self.input_schema,
-        )
+        """Returns the tool parameters passed to the model.
+
+        The returned dict is memoized and shared between calls, so it must not
+        be modified.
+        """
+        key = (self.name, self.description, id(self.input_schema))
+        if self._params_cache is None or self._params_cache[0] != key:
+            self._params_cache = (
+                key,
+                ToolParam(
+                    name=self.name,
+                    description=self.description,
+                    input_schema=self.input_schema,
+                ),
+            )
+        return self._params_cache[1]
 
     def to_mcp_tool(
         self, tags: set[str], name_prefix: str | None = None
@@ -400,6 +445,7 @@ class McpClientProtocol(Protocol):
         self,
         name: str,
         arguments: dict[str, Any] | None = None,
+        *,
         timeout: timedelta | float | None = None,  # noqa: ASYNC109
         progress_handler: ProgressHandler | None = None,
         raise_on_error: bool = True,
@@ -433,6 +479,40 @@ def _replace_refs(tool_name: str, input_schema: dict[str, Any]) -> dict[str, Any
         return input_schema
 
 
+class _ToolRegistry:
+    """Immutable snapshot of the tools of a `ToolCollection`.
+
+    Builds the tool map, the map of name prefixes (tool names without UUID
+    suffix) and the tool parameters passed to the model once per version of the
+    collection instead of on every step.
+
+    Args:
+        version (int): The version of the collection the snapshot was built for.
+        tools (list[Tool]): The tools of the collection.
+        include (set[str] | None): The names of the tools to pass to the model.
+            `None` includes all tools.
+    """
+
+    def __init__(
+        self, version: int, tools: list[Tool], include: set[str] | None
+    ) -> None:
+        self.version = version
+        self.tool_map: Mapping[str, Tool] = types.MappingProxyType(
+            {tool.name: tool for tool in tools}
+        )
+        prefix_map: dict[str, Tool] = {}
+        for tool_name, tool in self.tool_map.items():
+            prefix_map.setdefault(_UUID_SUFFIX_PATTERN.sub("", tool_name), tool)
+        self.prefix_map: Mapping[str, Tool] = types.MappingProxyType(prefix_map)
+        self.params: Mapping[str, ToolParam] = types.MappingProxyType(
+            {
+                tool_name: tool.to_params()
+                for tool_name, tool in self.tool_map.items()
+                if include is None or tool_name in include
+            }
+        )
+
+
 class ToolCollection:
     """A collection of tools.
 
@@ -441,9 +521,24 @@ class ToolCollection:
     **Important**: Tools must have unique names. A tool with the same name as a tool
     added before will override the tool added before.
 
+    The tool map and the tool parameters passed to the model are built once and
+    only rebuilt after tools or agent OSs are added or replaced. Changes to a tool
+    after it was added (e.g., of its name or description) are not picked up
+    until then.
+
+    Tool calls of the same assistant message are executed concurrently where
+    this is safe: read-only tools (see `Tool.is_read_only`) run on a bounded
+    thread pool while all other tools run one after another on the calling
+    thread. A mutating tool call waits for preceding read-only calls on the
+    same agent OS (or for all of them if it has no agent OS, e.g., MCP tools),
+    and read-only calls only start after all preceding mutating calls have
+    finished, so every call observes the same device state as if the calls
+    were executed in order. Results are returned in the order of the calls.
+    If no calls run concurrently, consecutive mutating calls on the same
+    `AgentOs` run within one `AgentOs.batch()`; if performing the batched input
+    actions fails, all calls of the batch are reported as failed.
 
     Vision:
-    - Could be used for parallelizing tool calls configurable through init arg
     - Could be used for raising on an exception
       (instead of just returning `ContentBlockParam`)
       within tool call or doing tool call or if tool is not found
@@ -453,6 +548,16 @@ class ToolCollection:
             Defaults to `None`.
         mcp_client (McpClientProtocol | None, optional): The client to use for
             the tools. Defaults to `None`.
+        max_concurrent_tool_calls (int, optional): Maximum number of read-only
+            tool calls executed concurrently. `1` executes all tool calls one
+            after another on the calling thread, which agent OSs bound to a
+            thread (e.g., synchronous Playwright) require. Defaults to `1`.
+        mcp_session_pool (McpSessionPool | None, optional): The pool keeping the
+            session of the `mcp_client` open and caching its tool listing.
+            Defaults to `None`, i.e., a pool owned by the collection which is
+            closed by `close()` or once the collection is garbage collected.
+        image_encoding (ImageEncoding | None, optional): The encoding of images
+            returned by tools if not passed to `run()`. Defaults to PNG.
     """
 
     def __init__(
@@ -461,11 +566,32 @@ class ToolCollection:
         mcp_client: McpClientProtocol | None = None,
         include: set[str] | None = None,
         agent_os_list: list[AgentOs | AndroidAgentOs] | None = None,
+        max_concurrent_tool_calls: int = 1,
+        mcp_session_pool: McpSessionPool | None = None,
+        image_encoding: ImageEncoding | None = None,
     ) -> None:
+        if max_concurrent_tool_calls < 1:
+            msg = "max_concurrent_tool_calls must be at least 1"
+            raise ValueError(msg)
+        self._max_concurrent_tool_calls = max_concurrent_tool_calls
+        self.image_encoding = image_encoding
         self._mcp_client = mcp_client
+        self._mcp_session_pool = mcp_session_pool
+        self._owns_mcp_session_pool = (
+            mcp_client is not None and mcp_session_pool is None
+        )
+        if self._owns_mcp_session_pool:
+            self._mcp_session_pool = McpSessionPool()
+            weakref.finalize(self, self._mcp_session_pool.close)
+        # MCP tools and params derived from the (pooled) listing they are built of
+        self._mcp_tools_cache: (
+            tuple[list[McpTool], dict[str, McpTool], dict[str, ToolParam]] | None
+        ) = None
         self._include = include
         self._agent_os_list: list[AgentOs | AndroidAgentOs] = []
-        self._tools: list[Tool] = tools or []
+        self._tools: list[Tool] = list(tools or [])
+        self._version = 0
+        self._registry_cache: _ToolRegistry | None = None
         if agent_os_list:
             for agent_os in agent_os_list:
                 self.add_agent_os(agent_os)
@@ -477,6 +603,7 @@ class ToolCollection:
             agent_os (AgentOs | AndroidAgentOs): The agent OS instance to add.
         """
         self._agent_os_list.append(agent_os)
+        self._version += 1
 
     def retrieve_tool_beta_flags(self) -> list[str]:
         result: set[str] = set()
@@ -491,28 +618,33 @@ class ToolCollection:
         return list(result)
 
     def to_params(self) -> list[ToolParam]:
-        tool_map = {
-            **self._get_mcp_tool_params(),
-            **{
-                tool_name: tool.to_params() for tool_name, tool in self.tool_map.items()
-            },
-        }
-        filtered_tool_map = {
-            tool_name: tool
-            for tool_name, tool in tool_map.items()
-            if self._include is None or tool_name in self._include
-        }
-        result = list(filtered_tool_map.values())
+        params = self._registry.params
+        if self._mcp_client:
+            mcp_params = {
+                tool_name: tool
+                for tool_name, tool in self._get_mcp_tool_params().items()
+                if self._include is None or tool_name in self._include
+            }
+            params = {**mcp_params, **params}
+        result = list(params.values())
         if result:
-            result[-1]["cache_control"] = CacheControlEphemeralParam(
-                type="ephemeral",
-            )
+            # copy as the tool params are shared between calls
+            result[-1] = {
+                **result[-1],
+                "cache_control": CacheControlEphemeralParam(type="ephemeral"),
+            }
         return result
 
     def _get_mcp_tool_params(self) -> dict[str, ToolParam]:
         if not self._mcp_client:
             return {}
-        mcp_tools = self._get_mcp_tools()
+        if not self._get_mcp_tools() or self._mcp_tools_cache is None:
+            return {}
+        return self._mcp_tools_cache[2]
+
+    def _build_mcp_tool_params(
+        self, mcp_tools: dict[str, McpTool]
+    ) -> dict[str, ToolParam]:
         result: dict[str, ToolParam] = {}
         for tool_name, tool in mcp_tools.items():
             if params := (tool.meta or {}).get("params"):
@@ -529,10 +661,12 @@ class ToolCollection:
     def append_tool(self, *tools: Tool) -> None:
         """Append a tool to the collection."""
         self._tools.extend(tools)
+        self._version += 1
 
     def reset_tools(self, tools: list[Tool] | None = None) -> None:
         """Reset the tools in the collection with new tools."""
-        self._tools = tools or []
+        self._tools = list(tools or [])
+        self._version += 1
 
     def get_agent_os_by_tags(self, tags: list[str]) -> AgentOs | AndroidAgentOs:
         """Get an agent OS by tags."""
@@ -550,32 +684,217 @@ class ToolCollection:
                 tool.agent_os = agent_os
 
     @property
-    def tool_map(self) -> dict[str, Tool]:
-        """Get the tool map."""
-        self._initialize_tools()
-        return {tool.name: tool for tool in self._tools}
+    def _registry(self) -> _ToolRegistry:
+        """Get the registry of the current version, building it if necessary."""
+        registry = self._registry_cache
+        if registry is None or registry.version != self._version:
+            version = self._version
+            self._initialize_tools()
+            registry = _ToolRegistry(version, self._tools, self._include)
+            self._registry_cache = registry
+        return registry
+
+    @property
+    def tool_map(self) -> Mapping[str, Tool]:
+        """Get the (read-only) tool map."""
+        return self._registry.tool_map
+
+    def grouping_key(self, tool_use_block_param: ToolUseBlockParam) -> object | None:
+        """Get the key of tool calls that are best run together by `run()`.
+
+        Consecutive tool calls with the same key gain from being passed to `run()`
+        at once instead of one by one, e.g., read-only tool calls run
+        concurrently and mutating tool calls on the same `AgentOs` run within
+        one `AgentOs.batch()`. Used for holding back tool calls that are
+        dispatched while the assistant message is still being received or that
+        are replayed from a cached trajectory.
+
+        Args:
+            tool_use_block_param (ToolUseBlockParam): The tool call.
+
+        Returns:
+            object | None: The key, or `None` if the tool call does not gain from
+                being run together with other tool calls.
+        """
+        tool = self.tool_map.get(tool_use_block_param.name)
+        if (
+            self._max_concurrent_tool_calls > 1
+            and tool is not None
+            and tool.is_read_only
+        ):
+            return "read_only"
+        return self._batch_agent_os(tool_use_block_param)
 
     def run(
-        self, tool_use_block_params: list[ToolUseBlockParam]
+        self,
+        tool_use_block_params: list[ToolUseBlockParam],
+        image_encoding: ImageEncoding | None = None,
     ) -> list[ContentBlockParam]:
-        return [
-            self._run_tool(tool_use_block_param)
+        """Run tool calls and return their results in the order of the calls.
+
+        Args:
+            tool_use_block_params (list[ToolUseBlockParam]): The tool calls.
+            image_encoding (ImageEncoding | None, optional): The encoding of images
+                returned by the tools. Defaults to `None`, i.e., the
+                `image_encoding` of the collection.
+
+        Returns:
+            list[ContentBlockParam]: The results of the tool calls.
+        """
+        image_encoding = image_encoding or self.image_encoding
+        tool_map = self.tool_map
+        read_only = [
+            (tool := tool_map.get(tool_use_block_param.name)) is not None
+            and tool.is_read_only
             for tool_use_block_param in tool_use_block_params
         ]
+        if self._max_concurrent_tool_calls == 1 or sum(read_only) < 2:  # noqa: PLR2004
+            return self._run_sequentially(tool_use_block_params, image_encoding)
+        return self._run_concurrently(
+            tool_use_block_params, read_only, tool_map, image_encoding
+        )
 
-    def _run_tool(
+    def _run_sequentially(
+        self,
+        tool_use_block_params: list[ToolUseBlockParam],
+        image_encoding: ImageEncoding | None,
+    ) -> list[ContentBlockParam]:
+        results: list[ContentBlockParam] = []
+        start = 0
+        while start < len(tool_use_block_params):
+            # Consecutive mutating calls on the same agent OS are run within one
+            # `AgentOs.batch()` so that their input actions are sent together
+            agent_os = self._batch_agent_os(tool_use_block_params[start])
+            end = start + 1
+            while (
+                agent_os is not None
+                and end < len(tool_use_block_params)
+                and self._batch_agent_os(tool_use_block_params[end]) is agent_os
+            ):
+                end += 1
+            if agent_os is not None and end - start > 1:
+                results.extend(
+                    self._run_batch(
+                        agent_os, tool_use_block_params[start:end], image_encoding
+                    )
+                )
+            else:
+                results.extend(
+                    self._run_tool(tool_use_block_param, image_encoding)
+                    for tool_use_block_param in tool_use_block_params[start:end]
+                )
+            start = end
+        return results
+
+    def _batch_agent_os(
         self, tool_use_block_param: ToolUseBlockParam
+    ) -> AgentOs | None:
+        tool = self.tool_map.get(tool_use_block_param.name) or self.find_tool_by_prefix(
+            tool_use_block_param.name
+        )
+        if (
+            isinstance(tool, ToolWithAgentOS)
+            and not tool.is_read_only
+            and tool.is_agent_os_initialized()
+            and isinstance(tool.agent_os, AgentOs)
+        ):
+            return tool.agent_os
+        return None
+
+    def _run_batch(
+        self,
+        agent_os: AgentOs,
+        tool_use_block_params: list[ToolUseBlockParam],
+        image_encoding: ImageEncoding | None,
+    ) -> list[ToolResultBlockParam]:
+        try:
+            with agent_os.batch():
+                results = [
+                    self._run_tool(tool_use_block_param, image_encoding)
+                    for tool_use_block_param in tool_use_block_params
+                ]
+        except (AgentError, AutomationError):
+            raise
+        except Exception as e:  # noqa: BLE001
+            # The input actions of the calls are only performed when the batch is
+            # left, so it is unknown which of the calls failed
+            error_message = getattr(e, "message", str(e))
+            logger.info(
+                "Batch of tool calls failed",
+                extra={
+                    "tool_names": [p.name for p in tool_use_block_params],
+                    "error": error_message,
+                },
+            )
+            return [
+                ToolResultBlockParam(
+                    content=f"Tool raised an unexpected error: {error_message}",
+                    is_error=True,
+                    tool_use_id=tool_use_block_param.id,
+                )
+                for tool_use_block_param in tool_use_block_params
+            ]
+        return results
+
+    def _run_concurrently(
+        self,
+        tool_use_block_params: list[ToolUseBlockParam],
+        read_only: list[bool],
+        tool_map: Mapping[str, Tool],
+        image_encoding: ImageEncoding | None,
+    ) -> list[ContentBlockParam]:
+        results: list[Future[ToolResultBlockParam] | ToolResultBlockParam] = []
+        # Read-only calls that may still be running, per agent OS (None if the
+        # tool does not have an agent OS)
+        running: dict[int | None, list[Future[ToolResultBlockParam]]] = {}
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrent_tool_calls,
+            thread_name_prefix="askui-tool",
+        ) as executor:
+            for tool_use_block_param, is_read_only in zip(
+                tool_use_block_params, read_only, strict=True
+            ):
+                tool = tool_map.get(tool_use_block_param.name)
+                agent_os_key = self._agent_os_key(tool)
+                if is_read_only:
+                    future = executor.submit(
+                        self._run_tool, tool_use_block_param, image_encoding
+                    )
+                    running.setdefault(agent_os_key, []).append(future)
+                    results.append(future)
+                    continue
+                if agent_os_key is None:
+                    wait([f for futures in running.values() for f in futures])
+                    running.clear()
+                else:
+                    wait(running.pop(agent_os_key, []) + running.pop(None, []))
+                results.append(self._run_tool(tool_use_block_param, image_encoding))
+        return [
+            result.result() if isinstance(result, Future) else result
+            for result in results
+        ]
+
+    @staticmethod
+    def _agent_os_key(tool: Tool | None) -> int | None:
+        if isinstance(tool, ToolWithAgentOS) and tool.is_agent_os_initialized():
+            return id(tool.agent_os)
+        return None
+
+    def _run_tool(
+        self,
+        tool_use_block_param: ToolUseBlockParam,
+        image_encoding: ImageEncoding | None,
     ) -> ToolResultBlockParam:
         tool = self.tool_map.get(tool_use_block_param.name)
         if tool:
-            return self._run_regular_tool(tool_use_block_param, tool)
+            return self._run_regular_tool(tool_use_block_param, tool, image_encoding)
         mcp_tool = self._get_mcp_tools().get(tool_use_block_param.name)
         if mcp_tool:
-            return self._run_mcp_tool(tool_use_block_param)
+            return self._run_mcp_tool(tool_use_block_param, image_encoding)
         # Fallback: try prefix matching (for cached trajectories with different UUIDs)
         tool = self.find_tool_by_prefix(tool_use_block_param.name)
         if tool:
-            return self._run_regular_tool(tool_use_block_param, tool)
+            return self._run_regular_tool(tool_use_block_param, tool, image_encoding)
         msg = f"no matching tool found with name {tool_use_block_param.name}"
         logger.error(msg)
         return ToolResultBlockParam(
@@ -599,51 +918,55 @@ class ToolCollection:
         Returns:
             Matching Tool if found, None otherwise
         """
-        # Extract prefix by removing trailing UUID (pattern: _xxxxxxxx-xxxx-...)
-        # UUIDs start with 8 hex chars after an underscore
-        uuid_pattern = re.compile(r"_[0-9a-f]{8}-[0-9a-f]{4}.*$", re.IGNORECASE)
-        cached_prefix = uuid_pattern.sub("", cached_name)
+        cached_prefix = _UUID_SUFFIX_PATTERN.sub("", cached_name)
 
         if not cached_prefix or cached_prefix == cached_name:
             # No UUID found or name unchanged, can't match by prefix
             return None
 
-        # Find a tool whose name starts with the same prefix
-        for tool_name, tool in self.tool_map.items():
-            tool_prefix = uuid_pattern.sub("", tool_name)
-            if tool_prefix == cached_prefix:
-                return tool
+        return self._registry.prefix_map.get(cached_prefix)
 
-        return None
+    @property
+    def mcp_session_pool(self) -> McpSessionPool | None:
+        """The pool keeping the session of the MCP client open, if any."""
+        return self._mcp_session_pool
+
+    def close(self) -> None:
+        """Close the session of the MCP client if the collection owns its pool.
 
-    async def _list_mcp_tools(self, mcp_client: McpClientProtocol) -> list[McpTool]:
-        async with mcp_client:
-            return await mcp_client.list_tools()
+        The session is reopened if the collection is used afterwards.
+        """
+        if self._owns_mcp_session_pool and self._mcp_session_pool is not None:
+            self._mcp_session_pool.close()
 
     def _get_mcp_tools(self) -> dict[str, McpTool]:
         """Get cached MCP tools or fetch them if not cached."""
         try:
-            if not self._mcp_client:
+            if not self._mcp_client or not self._mcp_session_pool:
                 return {}
-            list_mcp_tools_sync = syncify(self._list_mcp_tools, raise_sync_error=False)
-            tools_list = list_mcp_tools_sync(self._mcp_client)
+            tools_list = self._mcp_session_pool.list_tools(self._mcp_client)
         except Exception:  # noqa: BLE001
             logger.exception(
                 "Failed to list MCP tools",
             )
             return {}
-        else:
-            return {tool.name: tool for tool in tools_list}
+        cache = self._mcp_tools_cache
+        if cache is None or cache[0] is not tools_list:
+            mcp_tools = {tool.name: tool for tool in tools_list}
+            cache = (tools_list, mcp_tools, self._build_mcp_tool_params(mcp_tools))
+            self._mcp_tools_cache = cache
+        return cache[1]
 
     def _run_regular_tool(
         self,
         tool_use_block_param: ToolUseBlockParam,
         tool: Tool,
+        image_encoding: ImageEncoding | None,
     ) -> ToolResultBlockParam:
         try:
             tool_result: ToolCallResult = tool(**tool_use_block_param.input)  # type: ignore
             return ToolResultBlockParam(
-                content=_convert_to_content(tool_result),
+                content=_convert_to_content(tool_result, image_encoding),
                 tool_use_id=tool_use_block_param.id,
             )
         except (AgentError, AutomationError):
@@ -661,33 +984,26 @@ class ToolCollection:
                 tool_use_id=tool_use_block_param.id,
             )
 
-    async def _call_mcp_tool(
-        self,
-        mcp_client: McpClientProtocol,
-        tool_use_block_param: ToolUseBlockParam,
-    ) -> ToolCallResult:
-        async with mcp_client:
-            return await mcp_client.call_tool(
-                tool_use_block_param.name,
-                tool_use_block_param.input,  # type: ignore[arg-type]
-            )
-
     def _run_mcp_tool(
         self,
         tool_use_block_param: ToolUseBlockParam,
+        image_encoding: ImageEncoding | None,
     ) -> ToolResultBlockParam:
         """Run an MCP tool using the client."""
-        if not self._mcp_client:
+        if not self._mcp_client or not self._mcp_session_pool:
             return ToolResultBlockParam(
                 content="MCP client not available",
                 is_error=True,
                 tool_use_id=tool_use_block_param.id,
             )
         try:
-            call_mcp_tool_sync = syncify(self._call_mcp_tool, raise_sync_error=False)
-            result = call_mcp_tool_sync(self._mcp_client, tool_use_block_param)
+            result = self._mcp_session_pool.call_tool(
+                self._mcp_client,
+                tool_use_block_param.name,
+                tool_use_block_param.input,  # type: ignore[arg-type]
+            )
             return ToolResultBlockParam(
-                content=_convert_to_content(result),
+                content=_convert_to_content(result, image_encoding),
                 tool_use_id=tool_use_block_param.id,
             )
         except AutomationError:
@@ -710,8 +1026,14 @@ class ToolCollection:
             )
 
     def __add__(self, other: "ToolCollection") -> "ToolCollection":
+        # Shares the pool (and, thereby, the open session) of the MCP client
+        mcp_source = other if other._mcp_client else self
         return ToolCollection(
             tools=self._tools + other._tools,
-            mcp_client=other._mcp_client or self._mcp_client,
+            mcp_client=mcp_source._mcp_client,
             agent_os_list=self._agent_os_list + other._agent_os_list,
+            max_concurrent_tool_calls=min(
+                self._max_concurrent_tool_calls, other._max_concurrent_tool_calls
+            ),
+            mcp_session_pool=mcp_source._mcp_session_pool,
         )
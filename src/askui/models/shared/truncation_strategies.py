@@ -18,12 +18,14 @@ from askui.models.shared.agent_message_param import (
     ToolUseBlockParam,
 )
 from askui.models.shared.prompts import SystemPrompt
-from askui.models.shared.token_counter import SimpleTokenCounter
+from askui.models.shared.token_counter import SimpleTokenCounter, TokenCounts
 from askui.models.shared.tools import ToolCollection
 from askui.prompts.truncation import SUMMARIZE_INSTRUCTION_PROMPT
 from askui.reporting import Reporter
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from askui.callbacks.conversation_callback import ConversationCallback
     from askui.models.shared.conversation import Conversation
 
@@ -149,22 +151,31 @@ def _extract_summary_text(response: MessageParam) -> str:
     )
 
 
-def _clear_cache_control(msg: MessageParam) -> None:
-    """Clear ``cache_control`` on all blocks of a message."""
+def _clear_cache_control(msg: MessageParam) -> bool:
+    """Clear ``cache_control`` on all blocks of a message.
+
+    Returns:
+        ``True`` if any block had ``cache_control`` set, i.e., the
+        message was changed.
+    """
     if isinstance(msg.content, str):
-        return
+        return False
     cacheable = (
         ImageBlockParam,
         TextBlockParam,
         ToolResultBlockParam,
         ToolUseBlockParam,
     )
+    changed = False
     for block in msg.content:
         if isinstance(block, cacheable):
+            changed = changed or block.cache_control is not None
             block.cache_control = None
         if isinstance(block, ToolResultBlockParam) and isinstance(block.content, list):
             for nested in block.content:
+                changed = changed or nested.cache_control is not None
                 nested.cache_control = None
+    return changed
 
 
 def _set_cache_breakpoint(msg: MessageParam) -> None:
@@ -206,6 +217,14 @@ class TruncationStrategy(ABC):
     ``vlm_provider`` can be pre-set to override the conversation's
     default VLM for summarization (e.g. to use a cheaper model).
 
+    Token counts of the truncated history are kept in an incremental
+    ledger (`token_counts`): every message is counted once when it
+    enters the truncated history and only recounted when the strategy
+    changes it (image stripping, cache breakpoints). Subclasses should
+    go through `_append_truncated_message`, `_set_truncated_message`,
+    `_recount_truncated_message` and `_replace_truncated_history`
+    instead of mutating ``_truncated_message_history`` directly.
+
     Args:
         max_messages: Maximum number of messages before
             forcing truncation.
@@ -226,6 +245,8 @@ class TruncationStrategy(ABC):
         self._absolute_truncation_threshold = int(
             max_input_tokens * truncation_threshold
         )
+        self._token_counter = SimpleTokenCounter()
+        self._token_counts = TokenCounts(system=0, tools=0, messages=[])
         # Conversation-owned dependencies, auto-injected by Conversation.
         # Can be set manually before passing the strategy to the
         # conversation (e.g. vlm_provider override, tests in isolation).
@@ -277,6 +298,70 @@ class TruncationStrategy(ABC):
         else:
             self._full_message_history = []
             self._truncated_message_history = []
+        self._token_counts.reset_message_tokens(
+            [
+                self._token_counter.count_message_tokens(msg)
+                for msg in self._truncated_message_history
+            ]
+        )
+
+    def _append_truncated_message(self, message: MessageParam) -> None:
+        """Append a message to the truncated history and count its tokens."""
+        self._truncated_message_history.append(message)
+        self._token_counts.append_message_tokens(
+            self._token_counter.count_message_tokens(message)
+        )
+
+    def _set_truncated_message(self, index: int, message: MessageParam) -> None:
+        """Replace a message of the truncated history and recount its tokens."""
+        self._truncated_message_history[index] = message
+        self._recount_truncated_message(index)
+
+    def _recount_truncated_message(self, index: int) -> None:
+        """Recount the tokens of a message changed in place."""
+        self._token_counts.update_message_tokens(
+            index,
+            self._token_counter.count_message_tokens(
+                self._truncated_message_history[index]
+            ),
+        )
+
+    def _replace_truncated_history(
+        self,
+        new_messages: list[MessageParam],
+        kept_from: int,
+    ) -> None:
+        """Replace the truncated history after summarization.
+
+        Args:
+            new_messages: Newly created messages (e.g. the summary) that are
+                placed in front of the kept messages.
+            kept_from: Index of the first message of the current truncated
+                history that is kept. The token counts of the kept
+                messages are reused instead of being recounted.
+        """
+        kept = self._truncated_message_history[kept_from:]
+        kept_tokens = [
+            self._token_counts.retrieve_message_tokens(i)
+            for i in range(kept_from, len(self._truncated_message_history))
+        ]
+        self._truncated_message_history = [*new_messages, *kept]
+        self._token_counts.reset_message_tokens(
+            [self._token_counter.count_message_tokens(msg) for msg in new_messages]
+            + kept_tokens
+        )
+
+    def _exceeds_limits(self) -> bool:
+        """Check whether the truncated history exceeds message or token limits."""
+        return (
+            len(self._truncated_message_history) > self._max_messages
+            or self._token_counts.total > self._absolute_truncation_threshold
+        )
+
+    @property
+    def token_counts(self) -> TokenCounts:
+        """Get the (estimated) token counts of the truncated messages."""
+        return self._token_counts
 
     @property
     def truncated_messages(self) -> list[MessageParam]:
@@ -341,9 +426,15 @@ class SlidingImageWindowSummarizingTruncationStrategy(TruncationStrategy):
         self.vlm_provider = vlm_provider
         self._n_images_to_keep = n_images_to_keep
         self._n_messages_to_keep = n_messages_to_keep
-        self._token_counter = SimpleTokenCounter()
         self._image_removal_boundary_index: int | None = None
         self._debug_writer = None
+        # Bookkeeping that keeps appends independent of history length:
+        # number of base64 images in the truncated history, index before
+        # which no base64 images are left and indices of the messages
+        # holding cache breakpoints (``None`` = unknown, clear all).
+        self._n_base64_images = 0
+        self._image_scan_start = 0
+        self._cache_breakpoint_indices: set[int] | None = None
 
         logger.warning(
             "%s is experimental and may change, misbehave or crash "
@@ -361,7 +452,8 @@ class SlidingImageWindowSummarizingTruncationStrategy(TruncationStrategy):
             message: The message to append.
         """
         self._full_message_history.append(message)
-        self._truncated_message_history.append(message)
+        self._append_truncated_message(message)
+        self._n_base64_images += self._count_base64_images([message])
 
         # Strip old base64 images (sets _image_removal_boundary_index)
         self._remove_images()
@@ -370,14 +462,9 @@ class SlidingImageWindowSummarizingTruncationStrategy(TruncationStrategy):
         self._move_cache_breakpoints()
 
         # Check if truncation is needed
-        token_counts = self._token_counter.count_tokens(
-            messages=self._truncated_message_history,
-        )
+        token_estimate = self._token_counts.total
         truncated = False
-        if (
-            len(self._truncated_message_history) > self._max_messages
-            or token_counts.total > self._absolute_truncation_threshold
-        ):
+        if self._exceeds_limits():
             self.truncate()
             truncated = True
 
@@ -387,7 +474,7 @@ class SlidingImageWindowSummarizingTruncationStrategy(TruncationStrategy):
                 event="truncate" if truncated else "append",
                 full_messages=self._full_message_history,
                 truncated_messages=self._truncated_message_history,
-                token_estimate=token_counts.total,
+                token_estimate=token_estimate,
                 threshold=self._absolute_truncation_threshold,
                 image_boundary_idx=self._image_removal_boundary_index,
             )
@@ -462,9 +549,21 @@ class SlidingImageWindowSummarizingTruncationStrategy(TruncationStrategy):
                 )
             )
 
-        new_messages.extend(recent)
-        self._truncated_message_history = new_messages
+        self._replace_truncated_history(new_messages, kept_from=cut)
         self._image_removal_boundary_index = None
+        self._reset_bookkeeping()
+
+    @override
+    def reset(self, messages: list[MessageParam] | None = None) -> None:
+        super().reset(messages)
+        self._reset_bookkeeping()
+
+    def _reset_bookkeeping(self) -> None:
+        self._n_base64_images = self._count_base64_images(
+            self._truncated_message_history
+        )
+        self._image_scan_start = 0
+        self._cache_breakpoint_indices = None
 
     # ------------------------------------------------------------------
     # Image removal
@@ -478,15 +577,17 @@ class SlidingImageWindowSummarizingTruncationStrategy(TruncationStrategy):
         recurses into `ToolResultBlockParam.content` lists.
         URL-based images are never stripped.
         """
-        total = self._count_base64_images(self._truncated_message_history)
-        to_remove = total - self._n_images_to_keep
+        to_remove = self._n_base64_images - self._n_images_to_keep
         if to_remove <= 0:
             return
 
         removed = 0
-        for i, msg in enumerate(self._truncated_message_history):
+        for i in range(self._image_scan_start, len(self._truncated_message_history)):
             if removed >= to_remove:
                 break
+            # all messages before ``i`` are free of base64 images
+            self._image_scan_start = i
+            msg = self._truncated_message_history[i]
             if isinstance(msg.content, str):
                 continue
 
@@ -494,14 +595,18 @@ class SlidingImageWindowSummarizingTruncationStrategy(TruncationStrategy):
                 msg.content, to_remove - removed
             )
             if removed_in_msg > 0:
-                self._truncated_message_history[i] = MessageParam(
-                    role=msg.role,
-                    content=new_content,
-                    stop_reason=msg.stop_reason,
-                    usage=msg.usage,
+                self._set_truncated_message(
+                    i,
+                    MessageParam(
+                        role=msg.role,
+                        content=new_content,
+                        stop_reason=msg.stop_reason,
+                        usage=msg.usage,
+                    ),
                 )
                 self._image_removal_boundary_index = i
                 removed += removed_in_msg
+        self._n_base64_images -= removed
 
     @staticmethod
     def _count_base64_images(
@@ -596,10 +701,26 @@ class SlidingImageWindowSummarizingTruncationStrategy(TruncationStrategy):
 
         - **Breakpoint 1** – image-removal boundary.
         - **Breakpoint 2** – last user message.
+
+        Only the previous breakpoints and the newly appended message
+        are cleared (all messages after a reset or summarization), and
+        only messages whose ``cache_control`` was touched are recounted.
         """
+        n_messages = len(self._truncated_message_history)
+        changed: set[int] = set()
+        breakpoints: set[int] = set()
+
         # Clear all existing cache_control
-        for msg in self._truncated_message_history:
-            self._clear_cache_control(msg)
+        to_clear: Iterable[int] = (
+            range(n_messages)
+            if self._cache_breakpoint_indices is None
+            else {*self._cache_breakpoint_indices, n_messages - 1}
+        )
+        for i in to_clear:
+            if i < n_messages and self._clear_cache_control(
+                self._truncated_message_history[i]
+            ):
+                changed.add(i)
 
         # Breakpoint 1: at image removal boundary
         if (
@@ -610,17 +731,24 @@ class SlidingImageWindowSummarizingTruncationStrategy(TruncationStrategy):
             self._set_cache_breakpoint(
                 self._truncated_message_history[self._image_removal_boundary_index]
             )
+            breakpoints.add(self._image_removal_boundary_index)
 
         # Breakpoint 2: last user message
-        for msg in reversed(self._truncated_message_history):
+        for i in range(n_messages - 1, -1, -1):
+            msg = self._truncated_message_history[i]
             if msg.role == "user":
                 self._set_cache_breakpoint(msg)
+                breakpoints.add(i)
                 break
 
+        self._cache_breakpoint_indices = breakpoints
+        for i in changed | breakpoints:
+            self._recount_truncated_message(i)
+
     @staticmethod
-    def _clear_cache_control(msg: MessageParam) -> None:
+    def _clear_cache_control(msg: MessageParam) -> bool:
         """Clear ``cache_control`` on all blocks."""
-        _clear_cache_control(msg)
+        return _clear_cache_control(msg)
 
     @staticmethod
     def _set_cache_breakpoint(msg: MessageParam) -> None:
@@ -673,7 +801,6 @@ class SummarizingTruncationStrategy(TruncationStrategy):
         )
         self.vlm_provider = vlm_provider
         self._n_messages_to_keep = n_messages_to_keep
-        self._token_counter = SimpleTokenCounter()
 
     @override
     def append_message(self, message: MessageParam) -> None:
@@ -688,18 +815,12 @@ class SummarizingTruncationStrategy(TruncationStrategy):
             message: The message to append.
         """
         self._full_message_history.append(message)
-        self._truncated_message_history.append(message)
+        self._append_truncated_message(message)
 
         # Move cache breakpoint to last user message
         self._move_cache_breakpoint()
 
-        token_counts = self._token_counter.count_tokens(
-            messages=self._truncated_message_history,
-        )
-        if (
-            len(self._truncated_message_history) > self._max_messages
-            or token_counts.total > self._absolute_truncation_threshold
-        ):
+        if self._exceeds_limits():
             self.truncate()
 
     def _move_cache_breakpoint(self) -> None:
@@ -709,14 +830,17 @@ class SummarizingTruncationStrategy(TruncationStrategy):
         message first so only one breakpoint exists at a time.
         """
         found_last = False
-        for msg in reversed(self._truncated_message_history):
+        for i in range(len(self._truncated_message_history) - 1, -1, -1):
+            msg = self._truncated_message_history[i]
             if msg.role != "user":
                 continue
             if not found_last:
                 found_last = True
                 _set_cache_breakpoint(msg)
+                self._recount_truncated_message(i)
             else:
-                _clear_cache_control(msg)
+                if _clear_cache_control(msg):
+                    self._recount_truncated_message(i)
                 break
 
     @override
@@ -785,5 +909,4 @@ class SummarizingTruncationStrategy(TruncationStrategy):
                 )
             )
 
-        new_messages.extend(recent)
-        self._truncated_message_history = new_messages
+        self._replace_truncated_history(new_messages, kept_from=cut)
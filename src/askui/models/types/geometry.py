@@ -2,7 +2,7 @@
 
 from typing import Annotated
 
-from pydantic import Field
+from pydantic import BaseModel, ConfigDict, Field
 
 Point = tuple[int, int]
 """
@@ -13,3 +13,122 @@ PointList = Annotated[list[Point], Field(min_length=1)]
 """
 A list of points representing the coordinates of elements on the screen.
 """
+
+
+class CaptureRegion(BaseModel):
+    """A rectangular region of the screen (or of an image) in pixels.
+
+    Used to capture only part of the screen, e.g.,
+    `agent_os.screenshot(region=CaptureRegion(x=0, y=0, width=100, height=50))`.
+
+    Args:
+        x (int): The horizontal coordinate of the left edge.
+        y (int): The vertical coordinate of the top edge.
+        width (int): The width of the region. Must be greater than 0.
+        height (int): The height of the region. Must be greater than 0.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    x: int
+    y: int
+    width: int = Field(gt=0)
+    height: int = Field(gt=0)
+
+    @property
+    def right(self) -> int:
+        """The horizontal coordinate of the right edge (exclusive)."""
+        return self.x + self.width
+
+    @property
+    def bottom(self) -> int:
+        """The vertical coordinate of the bottom edge (exclusive)."""
+        return self.y + self.height
+
+    @property
+    def box(self) -> tuple[int, int, int, int]:
+        """The region as `(left, top, right, bottom)` box, e.g., for
+        `PIL.Image.Image.crop()`."""
+        return (self.x, self.y, self.right, self.bottom)
+
+    @classmethod
+    def from_box(
+        cls, left: int, top: int, right: int, bottom: int
+    ) -> "CaptureRegion | None":
+        """Create a region from a `(left, top, right, bottom)` box.
+
+        Returns:
+            CaptureRegion | None: The region or `None` if the box is empty.
+        """
+        if right <= left or bottom <= top:
+            return None
+        return cls(x=left, y=top, width=right - left, height=bottom - top)
+
+    @classmethod
+    def around(cls, center: Point, size: int) -> "CaptureRegion":
+        """Create a square region centered on a point.
+
+        Args:
+            center (Point): The center of the region.
+            size (int): The edge length of the region, rounded down to an even
+                number (of at least 2).
+
+        Returns:
+            CaptureRegion: The region. May extend beyond the screen; use `clip()`
+                to cut it off.
+        """
+        half_size = max(1, size // 2)
+        return cls(
+            x=center[0] - half_size,
+            y=center[1] - half_size,
+            width=2 * half_size,
+            height=2 * half_size,
+        )
+
+    def clip(self, width: int, height: int) -> "CaptureRegion | None":
+        """Cut off the parts of the region outside of a screen or image.
+
+        Args:
+            width (int): The width of the screen or image.
+            height (int): The height of the screen or image.
+
+        Returns:
+            CaptureRegion | None: The clipped region or `None` if the region lies
+                completely outside.
+        """
+        return self.from_box(
+            max(0, self.x),
+            max(0, self.y),
+            min(width, self.right),
+            min(height, self.bottom),
+        )
+
+    def captured_area(self, width: int, height: int) -> "CaptureRegion":
+        """Get the part of the screen covered by a capture of the region.
+
+        Parts of the region outside of the screen are cut off when capturing it,
+        so the captured image starts at the left or top edge of the screen if the
+        region extends beyond it.
+
+        Args:
+            width (int): The width of the captured image.
+            height (int): The height of the captured image.
+
+        Returns:
+            CaptureRegion: The captured part of the region, e.g., to `offset()`
+                points found in the captured image.
+        """
+        return CaptureRegion(
+            x=max(0, self.x), y=max(0, self.y), width=width, height=height
+        )
+
+    def offset(self, point: Point) -> Point:
+        """Translate a point relative to the region into screen coordinates.
+
+        Args:
+            point (Point): The point relative to the top-left corner of the region.
+
+        Returns:
+            Point: The point in the coordinates the region is defined in.
+        """
+        return (point[0] + self.x, point[1] + self.y)
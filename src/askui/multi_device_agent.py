@@ -9,7 +9,7 @@ from askui.computer_agent import ComputerAgent
 from askui.locators.locators import Locator
 from askui.models.shared.settings import GetSettings, LocateSettings
 from askui.models.shared.tools import Tool
-from askui.models.types.geometry import Point
+from askui.models.types.geometry import CaptureRegion, Point
 from askui.models.types.response_schemas import ResponseSchema
 from askui.prompts.act_prompts import create_multidevice_agent_prompt
 from askui.reporting import CompositeReporter, Reporter
@@ -138,6 +138,7 @@ class MultiDeviceAgent(Agent):
         locator: str | Locator,
         screenshot: Optional[InputSource] = None,
         locate_settings: LocateSettings | None = None,
+        region: CaptureRegion | None = None,
     ) -> Point:
         """Not supported on `MultiDeviceAgent`.
 
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import atexit
 import base64
+import collections
+import contextvars
+import hashlib
 import io
 import json
 import logging
@@ -8,12 +12,15 @@ import platform
 import random
 import shutil
 import sys
+import tempfile
+import threading
+import weakref
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 from importlib.metadata import distributions
 from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, Union
 
 from jinja2 import Template
 from typing_extensions import TypedDict, override
@@ -44,6 +51,18 @@ def normalize_to_pil_images(
     return [image]
 
 
+# Time at which the message currently forwarded by a `BackgroundReporter` was
+# added
+_message_time: contextvars.ContextVar[datetime | None] = contextvars.ContextVar(
+    "_message_time", default=None
+)
+
+
+def _now() -> datetime:
+    """Return the time at which the message being reported was added."""
+    return _message_time.get() or datetime.now(tz=timezone.utc)
+
+
 def _format_duration(seconds: float) -> str:
     """Format a duration given in seconds as ``HH:MM:SS`` or
     ``HH:MM:SS.mmm`` for sub-second precision.
@@ -271,6 +290,9 @@ class CompositeReporter(Reporter):
         self._reporters = [
             ReporterErrorHandler(reporter) for reporter in reporters or []
         ]
+        # Tools may run concurrently (see `ToolCollection`) and report from
+        # multiple threads
+        self._lock = threading.Lock()
 
     @override
     def add_message(
@@ -280,8 +302,9 @@ class CompositeReporter(Reporter):
         image: Optional[Image.Image | list[Image.Image] | AnnotatedImage] = None,
     ) -> None:
         """Add a message to the report."""
-        for reporter in self._reporters:
-            reporter.add_message(role, content, image)
+        with self._lock:
+            for reporter in self._reporters:
+                reporter.add_message(role, content, image)
 
     @override
     def add_usage_summary(self, usage: UsageSummary) -> None:
@@ -304,26 +327,308 @@ class CompositeReporter(Reporter):
             report.generate()
 
 
+BackpressurePolicy = Literal["block", "drop_images", "sample"]
+
+_EXIT_FLUSH_TIMEOUT = 30.0
+
+
+def _flush_background_reporters_at_exit() -> None:
+    for reporter in list(_background_reporters):
+        if not reporter.flush(timeout=_EXIT_FLUSH_TIMEOUT):
+            logger.warning(
+                "Not all messages could be reported by %s before exiting",
+                reporter,
+            )
+
+
+class BackgroundReporter(Reporter):
+    """A reporter that forwards to another reporter on a background thread.
+
+    Encoding and writing images (e.g., by `SimpleHtmlReporter` or
+    `AllureReporter`) is moved off the thread of the agent. Calls are queued and
+    forwarded one after another in the order they were made, with the time at
+    which they were made, so the report is the same as if the reporter was
+    called directly. Annotated images are captured before queuing as they take
+    the screenshot only when requested. An error of the reporter is logged and
+    does not stop the following calls from being forwarded.
+
+    `generate()` waits for all queued calls to be forwarded before the report is
+    generated. Afterwards, the background thread exits; it is started again by
+    the next call. Queued calls are also forwarded when the interpreter exits.
+
+    Example:
+        ```python
+        from askui import ComputerAgent
+        from askui.reporting import BackgroundReporter, SimpleHtmlReporter
+
+        with ComputerAgent(
+            reporters=[BackgroundReporter(SimpleHtmlReporter())]
+        ) as agent:
+            agent.act("Search for flights")
+        ```
+
+    Args:
+        reporter (Reporter): The reporter to forward to.
+        max_queue_size (int, optional): The maximum number of messages waiting
+            to be forwarded. Defaults to `64`.
+        backpressure (BackpressurePolicy, optional): What happens to a message
+            added while the queue is full:
+            - `"block"`: The caller waits until there is room in the queue.
+            - `"drop_images"`: The message is queued without its images. As
+              long as messages without images fill up a second
+              `max_queue_size`, the caller waits as with `"block"`.
+            - `"sample"`: Only every `sample_rate`-th of these messages is
+              queued, the others are dropped.
+            Defaults to `"block"`.
+        sample_rate (int, optional): See `backpressure`. Defaults to `10`.
+
+    Attributes:
+        dropped_messages (int): The number of messages dropped because the
+            queue was full.
+        dropped_images (int): The number of images dropped because the queue
+            was full.
+
+    Raises:
+        ValueError: If `max_queue_size` or `sample_rate` is smaller than `1`.
+    """
+
+    def __init__(
+        self,
+        reporter: Reporter,
+        max_queue_size: int = 64,
+        backpressure: BackpressurePolicy = "block",
+        sample_rate: int = 10,
+    ) -> None:
+        if max_queue_size < 1:
+            msg = "max_queue_size must be at least 1"
+            raise ValueError(msg)
+        if sample_rate < 1:
+            msg = "sample_rate must be at least 1"
+            raise ValueError(msg)
+        self._reporter = reporter
+        self._max_queue_size = max_queue_size
+        self._backpressure = backpressure
+        self._sample_rate = sample_rate
+        # Calls to forward with the time they were made; `None` stops the worker
+        self._queue: collections.deque[tuple[datetime, Callable[[], None] | None]] = (
+            collections.deque()
+        )
+        # Number of queued messages, i.e., calls of `add_message()`
+        self._queued_messages = 0
+        # Number of calls queued or being forwarded
+        self._unfinished = 0
+        self._overflow_count = 0
+        self._condition = threading.Condition()
+        self._worker: threading.Thread | None = None
+        self.dropped_messages = 0
+        self.dropped_images = 0
+        _background_reporters.add(self)
+
+    @override
+    def add_message(
+        self,
+        role: str,
+        content: Union[str, dict[str, Any], list[Any]],
+        image: Optional[Image.Image | list[Image.Image] | AnnotatedImage] = None,
+    ) -> None:
+        """Queue a message to be added to the report."""
+        timestamp = datetime.now(tz=timezone.utc)
+        images = normalize_to_pil_images(image) if image is not None else None
+        with self._condition:
+            if self._queued_messages >= self._max_queue_size:
+                match self._backpressure:
+                    case "block":
+                        self._condition.wait_for(
+                            lambda: self._queued_messages < self._max_queue_size
+                        )
+                    case "drop_images":
+                        if images:
+                            self.dropped_images += len(images)
+                            images = None
+                        self._condition.wait_for(
+                            lambda: self._queued_messages < 2 * self._max_queue_size
+                        )
+                    case "sample":
+                        self._overflow_count += 1
+                        if (self._overflow_count - 1) % self._sample_rate != 0:
+                            self.dropped_messages += 1
+                            return
+            else:
+                self._overflow_count = 0
+            self._queued_messages += 1
+            self._put(timestamp, self._forward_message(role, content, images))
+
+    def _forward_message(
+        self,
+        role: str,
+        content: Union[str, dict[str, Any], list[Any]],
+        images: list[Image.Image] | None,
+    ) -> Callable[[], None]:
+        def forward() -> None:
+            with self._condition:
+                self._queued_messages -= 1
+                self._condition.notify_all()
+            self._reporter.add_message(role, content, images)
+
+        return forward
+
+    @override
+    def add_usage_summary(self, usage: UsageSummary) -> None:
+        """Queue the usage summary to be added to the report."""
+        with self._condition:
+            self._put(
+                datetime.now(tz=timezone.utc),
+                lambda: self._reporter.add_usage_summary(usage),
+            )
+
+    @override
+    def add_cache_execution_statistics(
+        self, original_usage: dict[str, int | None]
+    ) -> None:
+        """Queue the cache execution statistics to be added to the report."""
+        with self._condition:
+            self._put(
+                datetime.now(tz=timezone.utc),
+                lambda: self._reporter.add_cache_execution_statistics(original_usage),
+            )
+
+    @override
+    def generate(self) -> None:
+        """Forward all queued calls and generate the report.
+
+        Raises:
+            Exception: Any exception raised by `generate()` of the reporter.
+        """
+        errors: list[Exception] = []
+
+        def generate() -> None:
+            try:
+                self._reporter.generate()
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+
+        with self._condition:
+            self._put(datetime.now(tz=timezone.utc), generate)
+            # Lets the worker (which references this reporter) exit afterwards
+            self._queue.append((datetime.now(tz=timezone.utc), None))
+        self.flush()
+        if errors:
+            raise errors[0]
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all queued calls have been forwarded to the reporter.
+
+        Args:
+            timeout (float | None, optional): The maximum time to wait in
+                seconds. Defaults to `None`, i.e., waiting indefinitely.
+
+        Returns:
+            bool: `True` if all calls have been forwarded, `False` if the
+                timeout was reached before.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._unfinished == 0, timeout=timeout
+            )
+
+    def _put(self, timestamp: datetime, call: Callable[[], None]) -> None:
+        """Queue a call; must be called while holding `self._condition`."""
+        self._queue.append((timestamp, call))
+        self._unfinished += 1
+        self._condition.notify_all()
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._work, name="askui-reporter", daemon=True
+            )
+            self._worker.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: len(self._queue) > 0)
+                timestamp, call = self._queue.popleft()
+                if call is None:
+                    if self._queue:
+                        # Calls queued after the stop are still forwarded
+                        continue
+                    self._worker = None
+                    return
+            token = _message_time.set(timestamp)
+            try:
+                call()
+            except Exception:  # noqa: BLE001
+                logger.exception("Reporter %s failed", self._reporter)
+            finally:
+                _message_time.reset(token)
+                with self._condition:
+                    self._unfinished -= 1
+                    self._condition.notify_all()
+
+
+_background_reporters: weakref.WeakSet[BackgroundReporter] = weakref.WeakSet()
+atexit.register(_flush_background_reporters_at_exit)
+
+
 class SystemInfo(TypedDict):
     platform: str
     python_version: str
     packages: list[str]
 
 
+ImageStorage = Literal["inline", "files"]
+AssetImageFormat = Literal["webp", "jpeg", "png"]
+
+_ASSETS_DIR_NAME = "assets"
+_ASSET_IMAGE_QUALITY = 85
+
+
+class _ReportImage(TypedDict):
+    src: str
+    href: str | None
+
+
 class SimpleHtmlReporter(Reporter):
     """A reporter that generates HTML reports with conversation logs and system information.
 
     Messages are streamed to a temporary file as they arrive so that base64-encoded
     screenshots are never held in memory all at once. The final report is assembled
-    as a single self-contained HTML file on `generate()`.
+    on `generate()`.
+
+    By default, the report is a single self-contained HTML file with all images
+    inlined. For long runs, `image_storage="files"` keeps the HTML file small:
+    every distinct image is written once to the `assets` directory next to the
+    report, named by the hash of its pixels, and the report shows a lazily loaded
+    thumbnail linking to it. The `assets` directory is shared by all reports in
+    `report_dir`.
 
     Args:
         report_dir (str, optional): Directory where reports will be saved.
             Defaults to `reports`.
+        image_storage (ImageStorage, optional): Whether images are inlined into
+            the report (`"inline"`) or written to files (`"files"`). Defaults to
+            `"inline"`.
+        image_format (AssetImageFormat, optional): The format of image files.
+            Only used with `image_storage="files"`. Defaults to `"webp"`.
+        thumbnail_size (tuple[int, int] | None, optional): The maximum size of
+            the thumbnails shown in the report. Only used with
+            `image_storage="files"`. `None` shows the images themselves.
+            Defaults to `(480, 360)`.
     """
 
-    def __init__(self, report_dir: str = "reports") -> None:
+    def __init__(
+        self,
+        report_dir: str = "reports",
+        image_storage: ImageStorage = "inline",
+        image_format: AssetImageFormat = "webp",
+        thumbnail_size: tuple[int, int] | None = (480, 360),
+    ) -> None:
         self.report_dir = Path(report_dir)
+        self._image_storage = image_storage
+        self._image_format = image_format
+        self._thumbnail_size = thumbnail_size
+        # Hashes of images written to the assets directory with their report
+        # images
+        self._written_assets: dict[str, _ReportImage] = {}
         self._temp_messages_file: Path | None = None
         self.system_info = self._collect_system_info()
         self.usage_summary: UsageSummary | None = None
@@ -345,6 +650,73 @@ class SimpleHtmlReporter(Reporter):
         image.save(buffered, format="PNG")
         return base64.b64encode(buffered.getvalue()).decode()
 
+    def _to_report_image(self, image: Image.Image) -> _ReportImage:
+        if self._image_storage == "inline":
+            return {
+                "src": f"data:image/png;base64,{self._image_to_base64(image)}",
+                "href": None,
+            }
+        return self._write_asset(image)
+
+    def _write_asset(self, image: Image.Image) -> _ReportImage:
+        """Write the image (and its thumbnail) to the assets directory once."""
+        digest = hashlib.sha256()
+        digest.update(f"{image.mode}:{image.width}x{image.height}:".encode())
+        digest.update(image.tobytes())
+        key = digest.hexdigest()[:32]
+        report_image = self._written_assets.get(key)
+        if report_image is not None:
+            return report_image
+        assets_dir = self.report_dir / _ASSETS_DIR_NAME
+        assets_dir.mkdir(parents=True, exist_ok=True)
+        extension = "jpg" if self._image_format == "jpeg" else self._image_format
+        name = f"{key}.{extension}"
+        self._save_asset(image, assets_dir / name)
+        report_image = {"src": f"{_ASSETS_DIR_NAME}/{name}", "href": None}
+        if self._thumbnail_size is not None and (
+            image.width > self._thumbnail_size[0]
+            or image.height > self._thumbnail_size[1]
+        ):
+            thumbnail = image.copy()
+            thumbnail.thumbnail(self._thumbnail_size)
+            thumbnail_name = f"{key}_thumb.{extension}"
+            self._save_asset(thumbnail, assets_dir / thumbnail_name)
+            report_image = {
+                "src": f"{_ASSETS_DIR_NAME}/{thumbnail_name}",
+                "href": f"{_ASSETS_DIR_NAME}/{name}",
+            }
+        self._written_assets[key] = report_image
+        return report_image
+
+    def _save_asset(self, image: Image.Image, path: Path) -> None:
+        """Save an image so that its path never points to a partial file.
+
+        The image is written to a temporary file first and renamed to `path`
+        once complete, so an asset written for an earlier report in the same
+        directory (e.g., by another process) can be reused as is.
+        """
+        if path.exists():
+            return
+        if self._image_format == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as file:
+            try:
+                if self._image_format == "png":
+                    image.save(file, format="PNG")
+                else:
+                    image.save(
+                        file,
+                        format=self._image_format.upper(),
+                        quality=_ASSET_IMAGE_QUALITY,
+                    )
+            except BaseException:
+                file.close()
+                Path(file.name).unlink()
+                raise
+        Path(file.name).replace(path)
+
     def _format_content(self, content: Union[str, dict[str, Any], list[Any]]) -> str:
         if isinstance(content, (dict, list)):
             return json.dumps(content, indent=2)
@@ -373,8 +745,17 @@ class SimpleHtmlReporter(Reporter):
         "{{ content }}"
         "{% endif %}"
         "{% for image in images %}"
-        '<br><img src="data:image/png;base64,{{ image }}" '
+        "{% if image.href %}"
+        '<br><a href="{{ image.href }}" target="_blank">'
+        '<img src="{{ image.src }}" loading="lazy" '
+        'class="message-image" alt="Message image"></a>'
+        "{% elif image.src.startswith('data:') %}"
+        '<br><img src="{{ image.src }}" '
+        'class="message-image" alt="Message image">'
+        "{% else %}"
+        '<br><img src="{{ image.src }}" loading="lazy" '
         'class="message-image" alt="Message image">'
+        "{% endif %}"
         "{% endfor %}"
         "</td>"
         "</tr>\n"
@@ -386,7 +767,7 @@ class SimpleHtmlReporter(Reporter):
         role: str,
         content: str,
         is_json: bool,
-        images: list[str],
+        images: list[_ReportImage],
     ) -> str:
         """Render a single conversation message as an HTML table row."""
         return self._MESSAGE_ROW_TEMPLATE.render(
@@ -411,18 +792,18 @@ class SimpleHtmlReporter(Reporter):
         base64 image data is not accumulated in memory during long runs.
         """
         if self._start_time is None:
-            self._start_time = datetime.now(tz=timezone.utc)
+            self._start_time = _now()
 
         _images = normalize_to_pil_images(image)
         _content = truncate_base64_images(content)
 
-        timestamp = datetime.now(tz=timezone.utc)
+        timestamp = _now()
         formatted_content = self._format_content(_content)
         is_json = isinstance(_content, (dict, list))
-        image_b64s = [self._image_to_base64(img) for img in _images]
+        report_images = [self._to_report_image(img) for img in _images]
 
         row_html = self._render_message_row(
-            timestamp, role, formatted_content, is_json, image_b64s
+            timestamp, role, formatted_content, is_json, report_images
         )
         with self._get_temp_messages_file().open(mode="a", encoding="utf-8") as f:
             f.write(row_html)
@@ -1,21 +1,60 @@
 """Agent speaker for normal LLM API interactions."""
 
 import logging
-from typing import TYPE_CHECKING, Any
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, Iterator
 
 from typing_extensions import override
 
 from askui.models.exceptions import MaxTokensExceededError, ModelRefusalError
-from askui.models.shared.agent_message_param import MessageParam
+from askui.models.shared.agent_message_param import ContentBlockParam, MessageParam
+from askui.models.shared.messages_api import MessageStream
 
 from .speaker import Speaker, SpeakerResult
 
 if TYPE_CHECKING:
     from askui.models.shared.conversation import Conversation
+    from askui.models.shared.truncation_strategies import TruncationStrategy
     from askui.utils.caching.cache_manager import CacheManager
 
 logger = logging.getLogger(__name__)
 
+_END_OF_STREAM = object()
+
+
+def _read_in_background(stream: MessageStream) -> Iterator[ContentBlockParam]:
+    """Iterate over a message stream that is read in a background thread.
+
+    Keeps receiving the response while the caller acts on the blocks received
+    so far, e.g., executes a tool call. The caller's thread is left to act on
+    the blocks as tools (e.g., Playwright) may be bound to it.
+
+    Args:
+        stream: The message stream to read.
+
+    Yields:
+        The completed content blocks in the order they were received.
+    """
+    items: queue.Queue[object] = queue.Queue()
+
+    def _read() -> None:
+        try:
+            for block in stream:
+                items.put(block)
+        except BaseException as e:  # noqa: BLE001 - re-raised in caller's thread
+            items.put(e)
+        else:
+            items.put(_END_OF_STREAM)
+
+    reader = threading.Thread(target=_read, name="askui-message-stream", daemon=True)
+    reader.start()
+    while (item := items.get()) is not _END_OF_STREAM:
+        if isinstance(item, BaseException):
+            raise item
+        yield item  # type: ignore[misc]
+    reader.join()
+
 
 class AgentSpeaker(Speaker):
     """Speaker that handles normal agent API calls.
@@ -80,16 +119,12 @@ class AgentSpeaker(Speaker):
             return SpeakerResult(status="done")
 
         # Make API call to get agent response using VlmProvider
-        response = conversation.vlm_provider.create_message(
-            messages=truncation_strategy.truncated_messages,
-            tools=conversation.tools,
-            max_tokens=conversation.settings.messages.max_tokens,
-            system=conversation.settings.messages.system,
-            thinking=conversation.settings.messages.thinking,
-            tool_choice=conversation.settings.messages.tool_choice,
-            temperature=conversation.settings.messages.temperature,
-            provider_options=conversation.settings.messages.provider_options,
-        )
+        if conversation.settings.messages.stream:
+            response = self._create_message_streaming(conversation, truncation_strategy)
+        else:
+            response = conversation.vlm_provider.create_message(
+                **self._build_request_kwargs(conversation, truncation_strategy)
+            )
 
         # Log response
         if logger.isEnabledFor(logging.DEBUG):  # avoid costly model_dump if possible
@@ -125,6 +160,45 @@ class AgentSpeaker(Speaker):
             usage=response.usage,
         )
 
+    def _create_message_streaming(
+        self,
+        conversation: "Conversation",
+        truncation_strategy: "TruncationStrategy",
+    ) -> MessageParam:
+        """Stream the agent response, dispatching each tool call once complete.
+
+        Args:
+            conversation: The conversation instance with current state
+            truncation_strategy: The truncation strategy holding the messages
+
+        Returns:
+            The complete agent response
+        """
+        stream = conversation.vlm_provider.create_message_stream(
+            **self._build_request_kwargs(conversation, truncation_strategy)
+        )
+        for block in _read_in_background(stream):
+            if block.type == "tool_use":
+                conversation.dispatch_tool_use(block)
+        return stream.get_final_message()
+
+    def _build_request_kwargs(
+        self,
+        conversation: "Conversation",
+        truncation_strategy: "TruncationStrategy",
+    ) -> dict[str, Any]:
+        """Build the arguments for creating the next agent message."""
+        return {
+            "messages": truncation_strategy.truncated_messages,
+            "tools": conversation.tools,
+            "max_tokens": conversation.settings.messages.max_tokens,
+            "system": conversation.settings.messages.system,
+            "thinking": conversation.settings.messages.thinking,
+            "tool_choice": conversation.settings.messages.tool_choice,
+            "temperature": conversation.settings.messages.temperature,
+            "provider_options": conversation.settings.messages.provider_options,
+        }
+
     def _extract_switch_speaker(
         self, message: MessageParam
     ) -> tuple[str, dict[str, Any]] | None:
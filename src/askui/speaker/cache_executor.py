@@ -5,24 +5,41 @@ import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import grpc
 from PIL import Image
 from pydantic import BaseModel, Field
 from typing_extensions import Literal, override
 
 from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    ContentBlockParam,
     MessageParam,
     TextBlockParam,
+    ToolResultBlockParam,
     ToolUseBlockParam,
 )
-from askui.models.shared.settings import CacheExecutionSettings
+from askui.models.shared.settings import (
+    CACHE_REPLAY_MODE,
+    CacheExecutionSettings,
+    ScreenSettleSettings,
+    ScreenSettleTiming,
+)
+from askui.models.shared.tools import ToolWithAgentOS
+from askui.models.types.geometry import CaptureRegion
+from askui.tools.agent_os import AgentOs
+from askui.tools.android.android_agent_os_error import AndroidAgentOsError
+from askui.tools.askui.exceptions import AskUiControllerError
 from askui.utils.caching.cache_manager import CacheManager
 from askui.utils.caching.cache_parameter_handler import CacheParameterHandler
+from askui.utils.image_utils import base64_to_image
+from askui.utils.screen_settle import ScreenSettleDetector
 from askui.utils.visual_validation import (
     compute_ahash,
     compute_hamming_distance,
     compute_phash,
     extract_region,
     find_recent_screenshot,
+    find_tool_result_screenshot_source,
     get_validation_coordinate,
 )
 
@@ -31,8 +48,9 @@ from .speaker import Speaker, SpeakerResult
 if TYPE_CHECKING:
     from askui.models.shared.conversation import Conversation
     from askui.models.shared.settings import CacheFile
-    from askui.models.shared.tools import ToolCollection
+    from askui.models.shared.tools import Tool, ToolCollection
     from askui.reporting import Reporter
+    from askui.tools.android.agent_os import AndroidAgentOs
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +61,9 @@ class ExecutionResult(BaseModel):
     Attributes:
         status: Execution status (SUCCESS, FAILED, NEEDS_AGENT, COMPLETED)
         step_index: Index of the step that was executed
-        tool_result: The tool result or tool use block for reference
+        step: The step to execute (with substituted parameters) or, if the
+            agent is needed, to hand over
+        tool_result: The tool result for reference
         error_message: Error message if execution failed
         screenshots_taken: List of screenshots captured during this step
         message_history: List of MessageParam representing the conversation history
@@ -51,12 +71,82 @@ class ExecutionResult(BaseModel):
 
     status: Literal["SUCCESS", "FAILED", "NEEDS_AGENT", "COMPLETED"]
     step_index: int
+    step: ToolUseBlockParam | None = None
     tool_result: Any | None = None
     error_message: str | None = None
     screenshots_taken: list[Any] = Field(default_factory=list)
     message_history: list[MessageParam] = Field(default_factory=list)
 
 
+class ReplayLogEntry(BaseModel):
+    """Entry of the log of a direct replay of a trajectory (one executed step).
+
+    Attributes:
+        step_index: Index of the step within the trajectory
+        tool_name: Name of the tool that was called
+        duration: Time in seconds it took to execute the step (together with
+            the steps it was executed in one batch with)
+        is_error: Whether the tool returned an error
+    """
+
+    step_index: int
+    tool_name: str
+    duration: float
+    is_error: bool = False
+
+
+# Errors of capturing the screen after which replaying falls back to the fixed delay
+_SCREEN_CAPTURE_ERRORS = (
+    AskUiControllerError,
+    AndroidAgentOsError,
+    grpc.RpcError,
+    OSError,
+    RuntimeError,
+    ValueError,
+)
+
+
+def _capture_screen(
+    agent_os: "AgentOs | AndroidAgentOs", region: CaptureRegion | None = None
+) -> Image.Image:
+    """Capture the screen (or a region of it) without reporting it."""
+    if isinstance(agent_os, AgentOs):
+        return agent_os.screenshot(report=False, region=region)
+    return agent_os.screenshot(region=region)
+
+
+class _ScreenshotTracker:
+    """Most recent screenshot during a replay, decoded only when needed.
+
+    Args:
+        messages: Conversation messages before the replay
+    """
+
+    def __init__(self, messages: list[MessageParam]) -> None:
+        self._messages = messages
+        self._source: Base64ImageSourceParam | None = None
+        self._screenshot: Image.Image | None = None
+
+    def add_tool_result(self, tool_result: ContentBlockParam) -> None:
+        """Track the screenshot of the result of an executed step, if any."""
+        source = find_tool_result_screenshot_source([tool_result])
+        if source is not None:
+            self._source = source
+            self._screenshot = None
+            self._messages = []
+
+    def get(self) -> Image.Image | None:
+        """Get the most recent screenshot, or None if not found."""
+        if self._screenshot is None:
+            if self._source is not None:
+                self._screenshot = base64_to_image(self._source.data)
+            elif self._messages:
+                self._screenshot = find_recent_screenshot(self._messages)
+                # Don't search the messages again if there is no screenshot
+                self._messages = []
+        return self._screenshot
+
+
 class CacheExecutor(Speaker):
     """Speaker that handles cached trajectory playback.
 
@@ -67,7 +157,20 @@ class CacheExecutor(Speaker):
     4. Handle completion (switch to agent for verification)
     5. Handle failures (update metadata, switch to agent)
 
-    Tool execution is handled by the Conversation class, not by this speaker.
+    After each step, the speaker waits until the screen settled (see
+    `CacheExecutionSettings.screen_settle`) and stores how long that took in the
+    cache metadata so that the screen is only observed once it is expected to
+    have settled at the next replay.
+
+    With `CacheExecutionSettings.replay_mode` "conversation" (default), tool
+    execution is handled by the Conversation class, one step at a time. With
+    "direct", this speaker executes all steps up to the completion, pause or
+    failure at once against the tools of the conversation and adds the messages
+    of the executed steps when handing over to the agent (see `replay_log` for
+    what was executed). Consecutive steps after which the screen settled right
+    away at the last replay are executed at once, e.g., so that their input
+    actions are sent to the device in one batch (see
+    `ToolCollection.grouping_key()`).
     """
 
     _DEFAULT_DESCRIPTION: str = (
@@ -112,6 +215,15 @@ class CacheExecutor(Speaker):
         self._skip_visual_validation: bool = _settings.skip_visual_validation
         self._visual_validation_threshold: int = _settings.visual_validation_threshold
         self._delay_time_between_actions: float = _settings.delay_time_between_actions
+        self._replay_mode: CACHE_REPLAY_MODE = _settings.replay_mode
+        self._screen_settle_settings: ScreenSettleSettings | None = (
+            _settings.screen_settle
+        )
+        self._screen_settle_detector: ScreenSettleDetector | None = (
+            ScreenSettleDetector(_settings.screen_settle)
+            if _settings.screen_settle is not None
+            else None
+        )
 
         self._trajectory: list[ToolUseBlockParam] = []
         self._toolbox: "ToolCollection | None" = None
@@ -122,6 +234,9 @@ class CacheExecutor(Speaker):
 
         self._current_step_index: int = 0
         self._message_history: list[MessageParam] = []
+        self._replay_log: list[ReplayLogEntry] = []
+        # Screen settle timings learned since the cache file was activated
+        self._screen_settle_timings: dict[int, ScreenSettleTiming] = {}
 
         # Activation context received via on_activate()
         self._activation_context: dict[str, Any] = {}
@@ -148,7 +263,8 @@ class CacheExecutor(Speaker):
         """Get next cached step message.
 
         This speaker only generates messages (tool use blocks from cache).
-        Tool execution is handled by the Conversation class.
+        Tool execution is handled by the Conversation class, except for
+        `replay_mode` "direct" (see `_replay()`).
 
         Args:
             conversation: The conversation instance with current state
@@ -202,9 +318,9 @@ class CacheExecutor(Speaker):
             if self._message_history and len(self._message_history) > 0:
                 # Tool was executed, move to next step
                 self._current_step_index += 1
-                # Add delay between actions
+                # Wait for the UI to materialize between actions
                 if self._current_step_index < len(self._trajectory):
-                    time.sleep(self._delay_time_between_actions)
+                    self._wait_for_screen_to_settle(self._current_step_index - 1)
 
         # Check if we have a trajectory
         if not self._trajectory or not self._toolbox:
@@ -214,9 +330,14 @@ class CacheExecutor(Speaker):
                 next_speaker="AgentSpeaker",
             )
 
+        if self._replay_mode == "direct":
+            return self._replay(conversation, cache_manager)
+
         # Get next step from cache (doesn't execute, just prepares the message)
         logger.debug("Getting next step from cache")
-        result: ExecutionResult = self._get_next_step(conversation_messages=messages)
+        result: ExecutionResult = self._get_next_step(
+            screenshots=_ScreenshotTracker(messages)
+        )
 
         # Handle result based on status
         return self._handle_result(result, cache_manager)
@@ -231,12 +352,249 @@ class CacheExecutor(Speaker):
         """
         self._activation_context = context
 
+    @property
+    def replay_log(self) -> list[ReplayLogEntry]:
+        """Steps executed by the last direct replay of a trajectory."""
+        return self._replay_log
+
+    def _replay(
+        self, conversation: "Conversation", cache_manager: "CacheManager"
+    ) -> SpeakerResult:
+        """Execute the steps of the trajectory straight against the tools.
+
+        Executes steps until the trajectory is completed or a step needs the
+        agent or fails. The messages of the executed steps are only synthesized
+        then, i.e., when the agent takes over, and are the same as if the steps
+        were executed as part of the conversation.
+
+        Args:
+            conversation: The conversation instance with current state
+            cache_manager: Cache manager for updating the cache metadata
+
+        Returns:
+            SpeakerResult switching to the agent with the messages of the
+            executed steps
+        """
+        screenshots = _ScreenshotTracker(conversation.get_messages())
+        executed_steps: list[tuple[ToolUseBlockParam, ContentBlockParam]] = []
+        self._replay_log = []
+        start = time.perf_counter()
+        while True:
+            result = self._get_next_step(screenshots=screenshots)
+            if result.status != "SUCCESS":
+                break
+            assert result.step is not None
+            steps: list[tuple[ToolUseBlockParam, int]] = [
+                (result.step, result.step_index)
+            ]
+            while self._can_execute_with_next_step(*steps[-1]):
+                self._current_step_index += 1
+                result = self._get_next_step(screenshots=screenshots)
+                # the next step is neither skipped, paused at nor validated
+                assert result.step is not None
+                steps.append((result.step, result.step_index))
+            tool_results = self._execute_steps(conversation, steps)
+            for (step, _), tool_result in zip(steps, tool_results, strict=True):
+                executed_steps.append((step, tool_result))
+                screenshots.add_tool_result(tool_result)
+            self._current_step_index += 1
+            if self._current_step_index < len(self._trajectory):
+                self._wait_for_screen_to_settle(result.step_index)
+        logger.info(
+            "Replayed %d step(s) of %s in %.2fs (%d error(s))",
+            len(self._replay_log),
+            self._cache_file_path,
+            time.perf_counter() - start,
+            sum(entry.is_error for entry in self._replay_log),
+        )
+
+        speaker_result = self._handle_result(result, cache_manager)
+        speaker_result.messages_to_add = [
+            *(
+                message
+                for step, tool_result in executed_steps
+                for message in (
+                    MessageParam(role="assistant", content=[step]),
+                    MessageParam(role="user", content=[tool_result]),
+                )
+            ),
+            *speaker_result.messages_to_add,
+        ]
+        return speaker_result
+
+    def _can_execute_with_next_step(
+        self, step: ToolUseBlockParam, step_index: int
+    ) -> bool:
+        """Check if the next step can be executed at once with a step.
+
+        Only the case if the screen settled right away after the step at the
+        last replay, so no wait is skipped, and both steps are best run together
+        (see `ToolCollection.grouping_key()`). Steps to skip, to pause at or to
+        validate visually are never executed at once with the step before.
+
+        Args:
+            step: The step (with substituted parameters)
+            step_index: Index of the step within the trajectory
+        """
+        next_step_index = step_index + 1
+        if (
+            self._toolbox is None
+            or self._cache_file is None
+            or self._screen_settle_settings is None
+            or next_step_index >= len(self._trajectory)
+        ):
+            return False
+        timing = self._cache_file.metadata.screen_settle_timings.get(step_index)
+        if (
+            timing is None
+            or not timing.settled
+            or timing.settle_time > self._screen_settle_settings.sample_interval
+        ):
+            return False
+        next_step = self._trajectory[next_step_index]
+        if (
+            self._should_skip_step(next_step)
+            or self._should_pause_for_agent(next_step)
+            or (self._visual_validation_enabled and next_step.visual_representation)
+        ):
+            return False
+        grouping_key = self._toolbox.grouping_key(step)
+        return grouping_key is not None and grouping_key == self._toolbox.grouping_key(
+            next_step
+        )
+
+    def _execute_steps(
+        self,
+        conversation: "Conversation",
+        steps: list[tuple[ToolUseBlockParam, int]],
+    ) -> list[ContentBlockParam]:
+        """Execute steps of a direct replay at once and add them to the replay log.
+
+        Args:
+            conversation: The conversation whose tools execute the steps
+            steps: The steps (with substituted parameters) and their indices
+
+        Returns:
+            The tool results of the steps
+        """
+        logger.debug(
+            "Executing step(s) %s: %s",
+            ", ".join(str(step_index) for _, step_index in steps),
+            ", ".join(step.name for step, _ in steps),
+        )
+        start = time.perf_counter()
+        tool_results = conversation.run_tools([step for step, _ in steps])
+        duration = time.perf_counter() - start
+        self._replay_log.extend(
+            ReplayLogEntry(
+                step_index=step_index,
+                tool_name=step.name,
+                duration=duration,
+                is_error=isinstance(tool_result, ToolResultBlockParam)
+                and tool_result.is_error,
+            )
+            for (step, step_index), tool_result in zip(steps, tool_results, strict=True)
+        )
+        return tool_results
+
+    def _wait_for_screen_to_settle(self, step_index: int) -> None:
+        """Wait after a step until the screen settled.
+
+        Waits the fixed delay between actions instead if screen settle detection
+        is disabled or the screen cannot be captured. If the screen did not settle
+        after the step at the last replay, waits at most the fixed delay.
+
+        Args:
+            step_index: Index of the step that was executed
+        """
+        tool = self._find_tool(self._trajectory[step_index])
+        if (
+            self._screen_settle_detector is None
+            or not isinstance(tool, ToolWithAgentOS)
+            or not tool.is_agent_os_initialized()
+        ):
+            time.sleep(self._delay_time_between_actions)
+            return
+
+        agent_os = tool.agent_os
+        region = self._screen_settle_region(step_index)
+        initial_wait = 0.0
+        max_wait = self._delay_time_between_actions
+        if (
+            self._screen_settle_settings is not None
+            and self._screen_settle_settings.max_wait is not None
+        ):
+            max_wait = self._screen_settle_settings.max_wait
+        timing = (
+            self._cache_file.metadata.screen_settle_timings.get(step_index)
+            if self._cache_file
+            else None
+        )
+        if timing is not None and timing.settled:
+            initial_wait = timing.settle_time
+        elif timing is not None:
+            max_wait = self._delay_time_between_actions
+        try:
+            result = self._screen_settle_detector.wait(
+                lambda: _capture_screen(agent_os, region),
+                initial_wait=initial_wait,
+                max_wait=max_wait,
+            )
+        except _SCREEN_CAPTURE_ERRORS:
+            logger.warning(
+                "Failed to observe the screen after step %d, waiting %.1fs instead",
+                step_index,
+                self._delay_time_between_actions,
+                exc_info=True,
+            )
+            time.sleep(self._delay_time_between_actions)
+            return
+
+        logger.debug(
+            "Screen %s after step %d within %.2fs (%d frame(s))",
+            "settled" if result.settled else "did not settle",
+            step_index,
+            result.duration,
+            result.n_frames,
+        )
+        self._screen_settle_timings[step_index] = ScreenSettleTiming(
+            settle_time=result.settle_time, settled=result.settled
+        )
+
+    def _screen_settle_region(self, step_index: int) -> CaptureRegion | None:
+        """Get the region to observe after a step, i.e., around its coordinate."""
+        if (
+            self._screen_settle_settings is None
+            or self._screen_settle_settings.region_size is None
+        ):
+            return None
+        step = self._trajectory[step_index]
+        tool_input: dict[str, Any] = step.input if isinstance(step.input, dict) else {}
+        coordinate = get_validation_coordinate(tool_input)
+        if coordinate is None:
+            return None
+        return CaptureRegion.around(
+            coordinate, self._screen_settle_settings.region_size
+        )
+
+    def _save_screen_settle_timings(self, cache_manager: "CacheManager") -> None:
+        """Store the screen settle timings learned so far in the cache metadata."""
+        if self._screen_settle_timings and self._cache_file and self._cache_file_path:
+            cache_manager.update_screen_settle_timings(
+                cache_file=self._cache_file,
+                cache_file_path=self._cache_file_path,
+                screen_settle_timings=self._screen_settle_timings,
+            )
+        self._screen_settle_timings = {}
+
     def _handle_result(
         self, result: ExecutionResult, cache_manager: "CacheManager"
     ) -> SpeakerResult:
         """Handle execution result and return appropriate SpeakerResult."""
         if result.status == "SUCCESS":
             return self._handle_success(result)
+        # The agent takes over
+        self._save_screen_settle_timings(cache_manager)
         if result.status == "NEEDS_AGENT":
             return self._handle_needs_agent(result)
         if result.status == "COMPLETED":
@@ -273,7 +631,7 @@ class CacheExecutor(Speaker):
         )
         self._executing_from_cache = False
 
-        tool_to_execute = result.tool_result
+        tool_to_execute = result.step
 
         if tool_to_execute:
             instruction_message = MessageParam(
@@ -454,6 +812,7 @@ class CacheExecutor(Speaker):
         self._parameter_values = parameter_values
         self._current_step_index = start_from_step_index
         self._message_history = []
+        self._screen_settle_timings = {}
         self._executing_from_cache = True
 
         # Configure visual validation
@@ -500,18 +859,20 @@ class CacheExecutor(Speaker):
         self._parameter_values = {}
         self._current_step_index = 0
         self._message_history = []
+        self._replay_log = []
+        self._screen_settle_timings = {}
         self._activation_context = {}
 
     def _get_next_step(
-        self, conversation_messages: list[MessageParam] | None = None
+        self, screenshots: _ScreenshotTracker | None = None
     ) -> ExecutionResult:
         """Get the next step message from the trajectory.
 
         This method does NOT execute tools - it only prepares the message.
-        Tool execution is handled by the Conversation class.
+        Tool execution is handled by the Conversation class or `_replay()`.
 
         Args:
-            conversation_messages: Optional conversation messages for visual validation
+            screenshots: Optional most recent screenshot for visual validation
 
         Returns:
             ExecutionResult with status and the prepared message
@@ -531,7 +892,7 @@ class CacheExecutor(Speaker):
         if self._should_skip_step(step):
             logger.debug("Skipping step %d: %s", step_index, step.name)
             self._current_step_index += 1
-            return self._get_next_step(conversation_messages=conversation_messages)
+            return self._get_next_step(screenshots=screenshots)
 
         # Check if step needs agent intervention (non-cacheable)
         if self._should_pause_for_agent(step):
@@ -544,14 +905,14 @@ class CacheExecutor(Speaker):
                 status="NEEDS_AGENT",
                 step_index=step_index,
                 message_history=self._message_history.copy(),
-                tool_result=step,
+                step=step,
             )
 
         # Visual validation
         if self._visual_validation_enabled:
             current_screenshot = None
-            if conversation_messages:
-                current_screenshot = find_recent_screenshot(conversation_messages)
+            if screenshots is not None:
+                current_screenshot = screenshots.get()
 
             is_valid, error_msg = self._validate_step_visually(
                 step, current_screenshot=current_screenshot
@@ -580,20 +941,27 @@ class CacheExecutor(Speaker):
         return ExecutionResult(
             status="SUCCESS",
             step_index=step_index,
-            tool_result=None,
+            step=substituted_step,
             message_history=[assistant_message],
         )
 
-    def _should_pause_for_agent(self, step: ToolUseBlockParam) -> bool:
-        """Check if execution should pause for agent intervention."""
+    def _find_tool(self, step: ToolUseBlockParam) -> "Tool | None":
+        """Find the tool of a step in the toolbox."""
         if not self._toolbox:
-            return False
+            return None
 
         # Try exact match first, then prefix match (for tools with UUID suffixes)
         tool = self._toolbox.tool_map.get(step.name)
         if tool is None:
             tool = self._toolbox.find_tool_by_prefix(step.name)
+        return tool
+
+    def _should_pause_for_agent(self, step: ToolUseBlockParam) -> bool:
+        """Check if execution should pause for agent intervention."""
+        if not self._toolbox:
+            return False
 
+        tool = self._find_tool(step)
         if tool is None:
             # Tool not found - should pause for agent to handle
             return True
@@ -1,11 +1,15 @@
 from .agent_os import AgentOs, Coordinate, ModifierKey, PcKey
 from .askui.askui_controller import RenderObjectStyle
+from .async_agent_os import AsyncAgentOs, AsyncAgentOsAdapter, BlockingAgentOs
 from .computer_agent_os_facade import ComputerAgentOsFacade
 from .toolbox import AgentToolbox
 
 __all__ = [
     "AgentOs",
     "AgentToolbox",
+    "AsyncAgentOs",
+    "AsyncAgentOsAdapter",
+    "BlockingAgentOs",
     "ModifierKey",
     "PcKey",
     "Coordinate",
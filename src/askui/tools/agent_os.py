@@ -1,10 +1,13 @@
+import contextlib
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import TYPE_CHECKING, Literal
 
 from PIL import Image
 from pydantic import BaseModel, ConfigDict, Field
 
 from askui.models.shared.tool_tags import ToolTags
+from askui.models.types.geometry import CaptureRegion
 
 if TYPE_CHECKING:
     from askui.tools.askui.askui_ui_controller_grpc.generated import (
@@ -263,13 +266,20 @@ class AgentOs(ABC):
         """
 
     @abstractmethod
-    def screenshot(self, report: bool = True) -> Image.Image:
+    def screenshot(
+        self, report: bool = True, region: CaptureRegion | None = None
+    ) -> Image.Image:
         """
         Captures a screenshot of the current display.
 
         Args:
             report (bool, optional): Whether to include the screenshot in
                 reporting. Defaults to `True`.
+            region (CaptureRegion | None, optional): The region of the display
+                to capture. Parts of the region outside of the display are cut
+                off. Capturing only the pixels needed (e.g., around an element
+                to validate) reduces the amount of data transferred and decoded.
+                Defaults to `None`, i.e., the whole display.
 
         Returns:
             Image.Image: A PIL Image object containing the screenshot.
@@ -393,6 +403,29 @@ class AgentOs(ABC):
         """
         raise NotImplementedError
 
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Coalesces the input actions (mouse and keyboard) performed within the
+        context so that they can be sent to the device together.
+
+        Actions are still performed in order: any other operation, e.g., taking a
+        screenshot, first performs the input actions collected before it. All
+        collected actions have been performed when the context is left. Errors
+        of collected actions may only be raised at that point. Contexts may be
+        nested; the outermost one determines when the actions are performed.
+
+        The default implementation performs every action right away.
+
+        Example:
+            ```python
+            with agent_os.batch():
+                agent_os.mouse_move(100, 200)
+                agent_os.click("left")
+            ```
+        """
+        yield
+
     def list_displays(self) -> DisplaysListResponse:
         """
         List all the available displays.
@@ -3,6 +3,7 @@ from typing import List, Literal
 
 from PIL import Image
 
+from askui.models.types.geometry import CaptureRegion
 from askui.tools.android.uiautomator_hierarchy import UIElementCollection
 
 ANDROID_KEY = Literal[  # pylint: disable=C0103
@@ -309,10 +310,15 @@ class AndroidAgentOs(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def screenshot(self) -> Image.Image:
+    def screenshot(self, region: CaptureRegion | None = None) -> Image.Image:
         """
         Captures a screenshot of the current display.
 
+        Args:
+            region (CaptureRegion | None, optional): The region of the display
+                to capture. Parts of the region outside of the display are cut
+                off. Defaults to `None`, i.e., the whole display.
+
         Returns:
             Image.Image: A PIL Image object containing the screenshot.
         """
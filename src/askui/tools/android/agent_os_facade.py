@@ -3,9 +3,14 @@ from typing import List, Optional, Tuple
 from PIL import Image
 
 from askui.models.shared.tool_tags import ToolTags
+from askui.models.types.geometry import CaptureRegion
 from askui.tools.android.agent_os import ANDROID_KEY, AndroidAgentOs, AndroidDisplay
 from askui.tools.android.uiautomator_hierarchy import UIElementCollection
-from askui.utils.image_utils import scale_coordinates, scale_image_to_fit
+from askui.utils.image_utils import (
+    capture_scaled_region,
+    scale_coordinates,
+    scale_image_to_fit,
+)
 
 
 class AndroidAgentOsFacade(AndroidAgentOs):
@@ -29,7 +34,16 @@ class AndroidAgentOsFacade(AndroidAgentOs):
         self._agent_os.disconnect()
         self._real_screen_resolution = None
 
-    def screenshot(self) -> Image.Image:
+    def screenshot(self, region: CaptureRegion | None = None) -> Image.Image:
+        if region is not None:
+            if self._real_screen_resolution is None:
+                self._real_screen_resolution = self._agent_os.screenshot().size
+            return capture_scaled_region(
+                lambda real_region: self._agent_os.screenshot(region=real_region),
+                region,
+                self._real_screen_resolution,
+                self._target_resolution,
+            )
         screenshot = self._agent_os.screenshot()
         self._real_screen_resolution = screenshot.size
         return scale_image_to_fit(
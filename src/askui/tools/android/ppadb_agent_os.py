@@ -9,6 +9,7 @@ from PIL import Image
 from ppadb.client import Client as AdbClient
 from ppadb.device import Device as AndroidDevice
 
+from askui.models.types.geometry import CaptureRegion
 from askui.reporting import NULL_REPORTER, Reporter
 from askui.tools.android.agent_os import (
     ANDROID_KEY,
@@ -216,8 +217,15 @@ class PpadbAgentOs(AndroidAgentOs):
             response = response.replace(b"\r\n", b"\n")
         return Image.open(io.BytesIO(response))
 
-    def screenshot(self) -> Image.Image:
+    def screenshot(self, region: CaptureRegion | None = None) -> Image.Image:
         screenshot = self._screenshot_without_reporting()
+        if region is not None:
+            # `screencap` always captures the whole display
+            clipped_region = region.clip(screenshot.width, screenshot.height)
+            if clipped_region is None:
+                error_msg = f"Region {region!r} is outside of the display"
+                raise ValueError(error_msg)
+            screenshot = screenshot.crop(clipped_region.box)
         self._reporter.add_message(self._REPORTER_ROLE_NAME, "screenshot()", screenshot)
         return screenshot
 
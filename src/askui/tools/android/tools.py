@@ -29,6 +29,7 @@ class AndroidScreenshotTool(AndroidBaseTool):
             required_tags=[ToolTags.SCALED_AGENT_OS.value],
         )
         self.is_cacheable = True
+        self.is_read_only = True
 
     @override
     def __call__(self) -> tuple[str, Image.Image]:
@@ -424,6 +425,7 @@ class AndroidGetConnectedDevicesSerialNumbersTool(AndroidBaseTool):
             agent_os=agent_os,
         )
         self.is_cacheable = True
+        self.is_read_only = True
 
     @override
     def __call__(self) -> str:
@@ -444,6 +446,7 @@ class AndroidGetConnectedDisplaysInfosTool(AndroidBaseTool):
             agent_os=agent_os,
         )
         self.is_cacheable = True
+        self.is_read_only = True
 
     @override
     def __call__(self) -> str:
@@ -466,6 +469,7 @@ class AndroidGetCurrentConnectedDeviceInfosTool(AndroidBaseTool):
             agent_os=agent_os,
         )
         self.is_cacheable = True
+        self.is_read_only = True
 
     @override
     def __call__(self) -> str:
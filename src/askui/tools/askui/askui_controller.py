@@ -1,4 +1,6 @@
 import base64
+import collections
+import contextlib
 import logging
 import pathlib
 import subprocess
@@ -6,14 +8,17 @@ import sys
 import time
 import types
 import uuid
+from collections.abc import Iterator
 from typing import Literal, Type
 
 import grpc
 from google.protobuf.json_format import MessageToDict
 from PIL import Image
+from pydantic import BaseModel, ConfigDict
 from typing_extensions import Self, override
 
 from askui.container import telemetry
+from askui.models.types.geometry import CaptureRegion
 from askui.reporting import NULL_REPORTER, Reporter
 from askui.tools.agent_os import (
     AgentOs,
@@ -76,7 +81,7 @@ from askui.tools.askui.askui_ui_controller_grpc.generated.AgentOS_Send_Response_
     GetSystemInfoResponseModel,
 )
 from askui.utils.annotated_image import AnnotatedImage
-from askui.utils.image_utils import base64_to_image
+from askui.utils.image_utils import base64_to_image, bgra_bitmap_to_image
 
 from ..utils import process_exists, wait_for_port
 from .exceptions import (
@@ -87,6 +92,46 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+_ACTION_LATENCIES_MAX_LEN = 1000
+
+# Input actions that are collected within `AskUiControllerClient.batch()`
+_BATCHABLE_ACTION_CLASS_IDS = frozenset(
+    {
+        controller_v1_pbs.ActionClassID_MouseMove,
+        controller_v1_pbs.ActionClassID_MouseButton_Press,
+        controller_v1_pbs.ActionClassID_MouseButton_Release,
+        controller_v1_pbs.ActionClassID_MouseButton_PressAndRelease,
+        controller_v1_pbs.ActionClassID_MouseWheelScroll,
+        controller_v1_pbs.ActionClassID_KeyboardKey_Press,
+        controller_v1_pbs.ActionClassID_KeyboardKey_Release,
+        controller_v1_pbs.ActionClassID_KeyboardKey_PressAndRelease,
+        controller_v1_pbs.ActionClassID_KeyboardType_UnicodeText,
+    }
+)
+
+
+class ActionLatency(BaseModel):
+    """Latency of an action run by the AskUI Remote Device Controller.
+
+    Args:
+        action_id (int): The id of the action assigned by the controller.
+        action_class (str): The class of the action, e.g.,
+            `"ActionClassID_MouseMove"`.
+        required_ms (int): The duration of the action estimated by the controller
+            in milliseconds.
+        latency_ms (float): The time from requesting the action until its
+            completion was observed in milliseconds.
+        poll_count (int): The number of polls needed to observe the completion.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    action_id: int
+    action_class: str
+    required_ms: int
+    latency_ms: float
+    poll_count: int
+
 
 class AskUiControllerServer:
     """
@@ -193,8 +238,19 @@ class AskUiControllerClient(AgentOs):
         self._channel: grpc.Channel | None = None
         self._session_info: controller_v1_pbs.SessionInfo | None = None
         self._pre_action_wait = 0
-        self._post_action_wait = 0.05
-        self._max_retries = 10
+        # Whether the controller holds polls until the polled event occurs;
+        # `None` until known
+        self._controller_holds_polls: bool | None = None
+        self._action_latencies: collections.deque[ActionLatency] = collections.deque(
+            maxlen=_ACTION_LATENCIES_MAX_LEN
+        )
+        self._batch_depth = 0
+        self._batched_actions: list[
+            tuple[controller_v1_pbs.ActionClassID, controller_v1_pbs.ActionParameters]
+        ] = []
+        # Reports of batched actions whose screenshots are only taken once the
+        # batch has been performed
+        self._batched_reports: list[tuple[str, AnnotatedImage]] = []
         self._display = display
         self._reporter = reporter
         self._controller_server = controller_server or AskUiControllerServer()
@@ -235,14 +291,24 @@ class AskUiControllerClient(AgentOs):
         assert isinstance(self._stub, controller_v1.ControllerAPIStub), (
             "Stub is not initialized. Call `connect()` first."
         )
+        if self._batched_actions:
+            # Perform the collected actions before any other request to keep
+            # the order of operations
+            self._flush_batch()
         return self._stub
 
+    @property
+    def action_latencies(self) -> list[ActionLatency]:
+        """The latencies of the most recent actions (up to 1000), oldest first."""
+        return list(self._action_latencies)
+
     def _run_recorder_action(
         self,
         acion_class_id: controller_v1_pbs.ActionClassID,
         action_parameters: controller_v1_pbs.ActionParameters,
     ) -> controller_v1_pbs.Response_RunRecordedAction:
         time.sleep(self._pre_action_wait)
+        start = time.perf_counter()
         response: controller_v1_pbs.Response_RunRecordedAction = (
             self._get_stub().RunRecordedAction(
                 controller_v1_pbs.Request_RunRecordedAction(
@@ -252,26 +318,217 @@ class AskUiControllerClient(AgentOs):
                 )
             )
         )
+        try:
+            poll_count = self._wait_for_action_finished(
+                response.actionID,
+                start,
+                required_ms=response.requiredMilliseconds,
+                timeout=self._settings.action_timeout,
+            )
+        except AskUiControllerOperationTimeoutError:
+            if self._settings.raise_on_action_timeout:
+                raise
+            logger.warning(
+                "Action %s did not finish within %.1f s, continuing anyway",
+                controller_v1_pbs.ActionClassID.Name(acion_class_id),
+                response.requiredMilliseconds / 1000 + self._settings.action_timeout,
+            )
+            return response
+        latency = ActionLatency(
+            action_id=response.actionID,
+            action_class=controller_v1_pbs.ActionClassID.Name(acion_class_id),
+            required_ms=response.requiredMilliseconds,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            poll_count=poll_count,
+        )
+        self._action_latencies.append(latency)
+        logger.debug(
+            "Action %s finished after %.1f ms (estimated: %d ms, polls: %d)",
+            latency.action_class,
+            latency.latency_ms,
+            latency.required_ms,
+            latency.poll_count,
+        )
+        return response
+
+    def _run_input_action(
+        self,
+        action_class_id: controller_v1_pbs.ActionClassID,
+        action_parameters: controller_v1_pbs.ActionParameters,
+    ) -> None:
+        if self._batch_depth > 0 and action_class_id in _BATCHABLE_ACTION_CLASS_IDS:
+            self._batched_actions.append((action_class_id, action_parameters))
+            return
+        self._run_recorder_action(action_class_id, action_parameters)
+
+    def _run_batched_actions(self) -> None:
+        """Perform the actions collected within `batch()` in a single batch run.
+
+        All actions are scheduled, run with one `StartBatchRun` and only the
+        completion of the last action is waited for. The batch is removed from
+        the controller afterwards. A single action is run as a recorded action.
+
+        Raises:
+            AskUiControllerOperationTimeoutError: If the batch has not finished
+                within `batch_run_timeout` seconds.
+        """
+        actions, self._batched_actions = self._batched_actions, []
+        if len(actions) == 1:
+            self._run_recorder_action(*actions[0])
+            return
+        stub = self._get_stub()
+        time.sleep(self._pre_action_wait)
+        start = time.perf_counter()
+        action_id = 0
+        try:
+            for action_class_id, action_parameters in actions:
+                response: controller_v1_pbs.Response_ScheduleBatchedAction = (
+                    stub.ScheduleBatchedAction(
+                        controller_v1_pbs.Request_ScheduleBatchedAction(
+                            sessionInfo=self._session_info,
+                            actionClassID=action_class_id,
+                            actionParameters=action_parameters,
+                        )
+                    )
+                )
+                action_id = response.actionID
+            stub.StartBatchRun(
+                controller_v1_pbs.Request_StartBatchRun(sessionInfo=self._session_info)
+            )
+            try:
+                poll_count = self._wait_for_action_finished(
+                    action_id,
+                    start,
+                    required_ms=0,
+                    timeout=self._settings.batch_run_timeout,
+                )
+            except AskUiControllerOperationTimeoutError:
+                stub.StopBatchRun(
+                    controller_v1_pbs.Request_StopBatchRun(
+                        sessionInfo=self._session_info
+                    )
+                )
+                raise
+        finally:
+            stub.RemoveAllActions(
+                controller_v1_pbs.Request_RemoveAllActions(
+                    sessionInfo=self._session_info
+                )
+            )
+        logger.debug(
+            "Batch of %d actions finished after %.1f ms (polls: %d)",
+            len(actions),
+            (time.perf_counter() - start) * 1000,
+            poll_count,
+        )
+
+    @contextlib.contextmanager
+    @override
+    def batch(self) -> Iterator[None]:
+        """
+        Coalesces the input actions (mouse and keyboard) performed within the
+        context into a single batch run of the controller.
 
-        time.sleep((response.requiredMilliseconds / 1000))
-        num_retries = 0
-        for _ in range(self._max_retries):
+        Instead of waiting for the completion of each action, the actions are
+        scheduled and run together when the context is left or before any other
+        request is sent to the controller, e.g., to take a screenshot. Contexts
+        may be nested; the outermost one determines when the actions are run.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batched_actions:
+                # The actions collected so far are still performed but an error
+                # doing so must not mask the one raised within the context
+                try:
+                    self._flush_batch()
+                except Exception:
+                    logger.exception("Failed to perform the batched actions")
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and self._batched_actions:
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        """Perform the batched actions and report them afterwards."""
+        reports, self._batched_reports = self._batched_reports, []
+        self._run_batched_actions()
+        for content, image in reports:
+            self._reporter.add_message("AgentOS", content, image)
+
+    def _wait_for_action_finished(
+        self,
+        action_id: int,
+        start: float,
+        required_ms: int,
+        timeout: float,
+    ) -> int:
+        """Wait until the controller reports that the action has finished.
+
+        Controllers that hold a poll until the polled event occurs report the
+        completion as soon as it happens, so the first poll is sent right away and
+        with a deadline. Older controllers answer polls immediately; for them, the
+        duration estimated by the controller is waited for before polling again
+        with an exponential backoff.
+
+        Args:
+            action_id (int): The id of the action assigned by the controller.
+            start (float): The `time.perf_counter()` at which the action was
+                requested.
+            required_ms (int): The duration of the action estimated by the
+                controller in milliseconds.
+            timeout (float): The time in seconds to wait beyond the estimated
+                duration.
+
+        Returns:
+            int: The number of polls sent.
+
+        Raises:
+            AskUiControllerOperationTimeoutError: If the action has not finished
+                within `timeout` seconds after the estimated duration.
+        """
+        expected_end = start + required_ms / 1000
+        deadline = expected_end + timeout
+        poll_count = 0
+        if self._controller_holds_polls is not False:
+            poll_count += 1
+            if self._poll_action_finished(action_id, deadline):
+                return poll_count
+            if time.perf_counter() < expected_end:
+                # The controller did not wait for the action to finish
+                self._controller_holds_polls = False
+        time.sleep(max(0.0, expected_end - time.perf_counter()))
+        interval = self._settings.action_poll_min_interval
+        while True:
+            poll_count += 1
+            if self._poll_action_finished(action_id, deadline):
+                return poll_count
+            if time.perf_counter() + interval > deadline:
+                raise AskUiControllerOperationTimeoutError(
+                    timeout_seconds=required_ms / 1000 + timeout
+                )
+            time.sleep(interval)
+            interval = min(2 * interval, self._settings.action_poll_max_interval)
+
+    def _poll_action_finished(self, action_id: int, deadline: float) -> bool:
+        timeout = max(
+            deadline - time.perf_counter(), self._settings.action_poll_min_interval
+        )
+        try:
             poll_response: controller_v1_pbs.Response_Poll = self._get_stub().Poll(
                 controller_v1_pbs.Request_Poll(
                     sessionInfo=self._session_info,
                     pollEventID=controller_v1_pbs.PollEventID.PollEventID_ActionFinished,
-                )
+                ),
+                timeout=timeout,
             )
-            if (
-                poll_response.pollEventParameters.actionFinished.actionID
-                == response.actionID
-            ):
-                break
-            time.sleep(self._post_action_wait)
-            num_retries += 1
-        if num_retries == self._max_retries - 1:
-            raise AskUiControllerOperationTimeoutError
-        return response
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                return False
+            raise
+        return poll_response.pollEventParameters.actionFinished.actionID == action_id
 
     @telemetry.record_call()
     @override
@@ -349,33 +606,51 @@ class AskUiControllerClient(AgentOs):
 
     @telemetry.record_call()
     @override
-    def screenshot(self, report: bool = True) -> Image.Image:
+    def screenshot(
+        self, report: bool = True, region: CaptureRegion | None = None
+    ) -> Image.Image:
         """
         Take a screenshot of the current screen.
 
         Args:
             report (bool, optional): Whether to include the screenshot in reporting.
                 Defaults to `True`.
+            region (CaptureRegion | None, optional): The region of the display to
+                capture. Only the pixels of the region are captured and
+                transferred by the controller. Defaults to `None`, i.e., the whole
+                display.
 
         Returns:
             Image.Image: A PIL Image object containing the screenshot.
 
         """
+        capture_parameters = controller_v1_pbs.CaptureParameters(
+            displayID=self._display
+        )
+        if region is not None:
+            capture_parameters.captureArea.CopyFrom(
+                controller_v1_pbs.CaptureArea(
+                    coordinate=controller_v1_pbs.Coordinate2(x=region.x, y=region.y),
+                    size=controller_v1_pbs.Size2(
+                        width=region.width, height=region.height
+                    ),
+                )
+            )
         screenResponse = self._get_stub().CaptureScreen(
             controller_v1_pbs.Request_CaptureScreen(
                 sessionInfo=self._session_info,
-                captureParameters=controller_v1_pbs.CaptureParameters(
-                    displayID=self._display
-                ),
+                captureParameters=capture_parameters,
             )
         )
-        r, g, b, _ = Image.frombytes(
-            "RGBA",
-            (screenResponse.bitmap.width, screenResponse.bitmap.height),
+        image = bgra_bitmap_to_image(
             screenResponse.bitmap.data,
-        ).split()
-        image = Image.merge("RGB", (b, g, r))
-        self._reporter.add_message("AgentOS", "screenshot()", image)
+            (screenResponse.bitmap.width, screenResponse.bitmap.height),
+        )
+        self._reporter.add_message(
+            "AgentOS",
+            "screenshot()" if region is None else f"screenshot(region={region!r})",
+            image,
+        )
         return image
 
     @telemetry.record_call()
@@ -389,13 +664,17 @@ class AskUiControllerClient(AgentOs):
             y (int): The vertical coordinate (in pixels) to move to.
             duration (int): The duration (in ms) the movement should take.
         """
-        self._reporter.add_message(
-            "AgentOS",
-            f"mouse_move({x}, {y}, duration={duration})",
-            AnnotatedImage(lambda: self.screenshot(report=False), point_list=[(x, y)]),
+        content = f"mouse_move({x}, {y}, duration={duration})"
+        image = AnnotatedImage(
+            lambda: self.screenshot(report=False), point_list=[(x, y)]
         )
-        self._run_recorder_action(
-            acion_class_id=controller_v1_pbs.ActionClassID_MouseMove,
+        if self._batch_depth > 0:
+            # Taking the screenshot now would perform the batched actions early
+            self._batched_reports.append((content, image))
+        else:
+            self._reporter.add_message("AgentOS", content, image)
+        self._run_input_action(
+            action_class_id=controller_v1_pbs.ActionClassID_MouseMove,
             action_parameters=controller_v1_pbs.ActionParameters(
                 mouseMove=controller_v1_pbs.ActionParameters_MouseMove(
                     position=controller_v1_pbs.Coordinate2(x=x, y=y),
@@ -416,8 +695,8 @@ class AskUiControllerClient(AgentOs):
                 Defaults to `50`.
         """
         self._reporter.add_message("AgentOS", f'type("{text}", {typing_speed})')
-        self._run_recorder_action(
-            acion_class_id=controller_v1_pbs.ActionClassID_KeyboardType_UnicodeText,
+        self._run_input_action(
+            action_class_id=controller_v1_pbs.ActionClassID_KeyboardType_UnicodeText,
             action_parameters=controller_v1_pbs.ActionParameters(
                 keyboardTypeUnicodeText=controller_v1_pbs.ActionParameters_KeyboardType_UnicodeText(
                     text=text.encode("utf-16-le"),
@@ -449,8 +728,8 @@ class AskUiControllerClient(AgentOs):
                 mouse_button = controller_v1_pbs.MouseButton_Middle
             case "right":
                 mouse_button = controller_v1_pbs.MouseButton_Right
-        self._run_recorder_action(
-            acion_class_id=controller_v1_pbs.ActionClassID_MouseButton_PressAndRelease,
+        self._run_input_action(
+            action_class_id=controller_v1_pbs.ActionClassID_MouseButton_PressAndRelease,
             action_parameters=controller_v1_pbs.ActionParameters(
                 mouseButtonPressAndRelease=controller_v1_pbs.ActionParameters_MouseButton_PressAndRelease(
                     mouseButton=mouse_button, count=count
@@ -477,8 +756,8 @@ class AskUiControllerClient(AgentOs):
                 mouse_button = controller_v1_pbs.MouseButton_Middle
             case "right":
                 mouse_button = controller_v1_pbs.MouseButton_Right
-        self._run_recorder_action(
-            acion_class_id=controller_v1_pbs.ActionClassID_MouseButton_Press,
+        self._run_input_action(
+            action_class_id=controller_v1_pbs.ActionClassID_MouseButton_Press,
             action_parameters=controller_v1_pbs.ActionParameters(
                 mouseButtonPress=controller_v1_pbs.ActionParameters_MouseButton_Press(
                     mouseButton=mouse_button
@@ -505,8 +784,8 @@ class AskUiControllerClient(AgentOs):
                 mouse_button = controller_v1_pbs.MouseButton_Middle
             case "right":
                 mouse_button = controller_v1_pbs.MouseButton_Right
-        self._run_recorder_action(
-            acion_class_id=controller_v1_pbs.ActionClassID_MouseButton_Release,
+        self._run_input_action(
+            action_class_id=controller_v1_pbs.ActionClassID_MouseButton_Release,
             action_parameters=controller_v1_pbs.ActionParameters(
                 mouseButtonRelease=controller_v1_pbs.ActionParameters_MouseButton_Release(
                     mouseButton=mouse_button
@@ -527,30 +806,31 @@ class AskUiControllerClient(AgentOs):
                 negative values scroll up.
         """
         self._reporter.add_message("AgentOS", f"mouse_scroll({dx}, {dy})")
-        if dx != 0:
-            self._run_recorder_action(
-                acion_class_id=controller_v1_pbs.ActionClassID_MouseWheelScroll,
-                action_parameters=controller_v1_pbs.ActionParameters(
-                    mouseWheelScroll=controller_v1_pbs.ActionParameters_MouseWheelScroll(
-                        direction=controller_v1_pbs.MouseWheelScrollDirection.MouseWheelScrollDirection_Horizontal,
-                        deltaType=controller_v1_pbs.MouseWheelDeltaType.MouseWheelDelta_Raw,
-                        delta=dx,
-                        milliseconds=50,
-                    )
-                ),
-            )
-        if dy != 0:
-            self._run_recorder_action(
-                acion_class_id=controller_v1_pbs.ActionClassID_MouseWheelScroll,
-                action_parameters=controller_v1_pbs.ActionParameters(
-                    mouseWheelScroll=controller_v1_pbs.ActionParameters_MouseWheelScroll(
-                        direction=controller_v1_pbs.MouseWheelScrollDirection.MouseWheelScrollDirection_Vertical,
-                        deltaType=controller_v1_pbs.MouseWheelDeltaType.MouseWheelDelta_Raw,
-                        delta=dy,
-                        milliseconds=50,
-                    )
-                ),
-            )
+        with self.batch():
+            if dx != 0:
+                self._run_input_action(
+                    action_class_id=controller_v1_pbs.ActionClassID_MouseWheelScroll,
+                    action_parameters=controller_v1_pbs.ActionParameters(
+                        mouseWheelScroll=controller_v1_pbs.ActionParameters_MouseWheelScroll(
+                            direction=controller_v1_pbs.MouseWheelScrollDirection.MouseWheelScrollDirection_Horizontal,
+                            deltaType=controller_v1_pbs.MouseWheelDeltaType.MouseWheelDelta_Raw,
+                            delta=dx,
+                            milliseconds=50,
+                        )
+                    ),
+                )
+            if dy != 0:
+                self._run_input_action(
+                    action_class_id=controller_v1_pbs.ActionClassID_MouseWheelScroll,
+                    action_parameters=controller_v1_pbs.ActionParameters(
+                        mouseWheelScroll=controller_v1_pbs.ActionParameters_MouseWheelScroll(
+                            direction=controller_v1_pbs.MouseWheelScrollDirection.MouseWheelScrollDirection_Vertical,
+                            deltaType=controller_v1_pbs.MouseWheelDeltaType.MouseWheelDelta_Raw,
+                            delta=dy,
+                            milliseconds=50,
+                        )
+                    ),
+                )
 
     @telemetry.record_call()
     @override
@@ -570,8 +850,8 @@ class AskUiControllerClient(AgentOs):
         )
         if modifier_keys is None:
             modifier_keys = []
-        self._run_recorder_action(
-            acion_class_id=controller_v1_pbs.ActionClassID_KeyboardKey_Press,
+        self._run_input_action(
+            action_class_id=controller_v1_pbs.ActionClassID_KeyboardKey_Press,
             action_parameters=controller_v1_pbs.ActionParameters(
                 keyboardKeyPress=controller_v1_pbs.ActionParameters_KeyboardKey_Press(
                     keyName=key, modifierKeyNames=modifier_keys
@@ -597,8 +877,8 @@ class AskUiControllerClient(AgentOs):
         )
         if modifier_keys is None:
             modifier_keys = []
-        self._run_recorder_action(
-            acion_class_id=controller_v1_pbs.ActionClassID_KeyboardKey_Release,
+        self._run_input_action(
+            action_class_id=controller_v1_pbs.ActionClassID_KeyboardKey_Release,
             action_parameters=controller_v1_pbs.ActionParameters(
                 keyboardKeyRelease=controller_v1_pbs.ActionParameters_KeyboardKey_Release(
                     keyName=key, modifierKeyNames=modifier_keys
@@ -629,15 +909,16 @@ class AskUiControllerClient(AgentOs):
         )
         if modifier_keys is None:
             modifier_keys = []
-        for _ in range(count):
-            self._run_recorder_action(
-                acion_class_id=controller_v1_pbs.ActionClassID_KeyboardKey_PressAndRelease,
-                action_parameters=controller_v1_pbs.ActionParameters(
-                    keyboardKeyPressAndRelease=controller_v1_pbs.ActionParameters_KeyboardKey_PressAndRelease(
-                        keyName=key, modifierKeyNames=modifier_keys
-                    )
-                ),
-            )
+        with self.batch():
+            for _ in range(count):
+                self._run_input_action(
+                    action_class_id=controller_v1_pbs.ActionClassID_KeyboardKey_PressAndRelease,
+                    action_parameters=controller_v1_pbs.ActionParameters(
+                        keyboardKeyPressAndRelease=controller_v1_pbs.ActionParameters_KeyboardKey_PressAndRelease(
+                            keyName=key, modifierKeyNames=modifier_keys
+                        )
+                    ),
+                )
 
     @telemetry.record_call()
     @override
@@ -30,5 +30,53 @@ class AskUiControllerClientSettings(BaseSettings):
         ),
     )
 
+    action_timeout: float = Field(
+        default=0.5,
+        ge=0,
+        description=(
+            "Time in seconds to wait for an action to finish beyond the duration"
+            " estimated by the controller before giving up. Default: 0.5"
+        ),
+    )
+
+    raise_on_action_timeout: bool = Field(
+        default=False,
+        description=(
+            "Whether to raise an `AskUiControllerOperationTimeoutError` if an"
+            " action has not finished within `action_timeout` seconds beyond its"
+            " estimated duration. If `False`, a warning is logged and the next"
+            " action is performed anyway. Default: False"
+        ),
+    )
+
+    action_poll_min_interval: float = Field(
+        default=0.005,
+        gt=0,
+        description=(
+            "Initial interval in seconds between polls for the completion of an"
+            " action if the controller does not hold polls until the action is"
+            " finished. The interval is doubled after every poll. Default: 0.005"
+        ),
+    )
+
+    action_poll_max_interval: float = Field(
+        default=0.05,
+        gt=0,
+        description=(
+            "Maximum interval in seconds between polls for the completion of an"
+            " action. Default: 0.05"
+        ),
+    )
+
+    batch_run_timeout: float = Field(
+        default=30.0,
+        ge=0,
+        description=(
+            "Time in seconds to wait for a batch of actions (see"
+            " `AskUiControllerClient.batch()`) to finish before giving up."
+            " Default: 30.0"
+        ),
+    )
+
 
 __all__ = ["AskUiControllerClientSettings"]
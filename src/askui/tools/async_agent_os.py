@@ -0,0 +1,366 @@
+"""AsyncAgentOs interface and adapters between sync and async agent OSs."""
+
+import asyncio
+import concurrent.futures
+import functools
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import ParamSpec, TypeVar
+
+from PIL import Image
+from typing_extensions import override
+
+from askui.models.shared.tool_tags import ToolTags
+from askui.models.types.geometry import CaptureRegion
+from askui.tools.agent_os import (
+    AgentOs,
+    Coordinate,
+    Display,
+    ModifierKey,
+    MouseButton,
+    PcKey,
+)
+from askui.utils.async_utils import run_coroutine_blocking
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+
+class AsyncAgentOs(ABC):
+    """Asynchronous counterpart of `AgentOs` used by `AsyncAgent`.
+
+    Covers the operations every `AgentOs` has to implement (plus
+    `get_mouse_position()`). See `AgentOs` for the documentation of the
+    individual operations. Existing `AgentOs`s can be used through
+    `AsyncAgentOsAdapter`.
+    """
+
+    @property
+    def tags(self) -> list[str]:
+        """Get the tags for this agent OS.
+
+        Returns:
+            list[str]: A list of tags that identify this agent OS type.
+        """
+        if not hasattr(self, "_tags"):
+            self._tags = [ToolTags.COMPUTER.value]
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags: list[str]) -> None:
+        self._tags = tags
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """Establishes a connection to the Agent OS."""
+
+    @abstractmethod
+    async def disconnect(self) -> None:
+        """Terminates the connection to the Agent OS."""
+
+    @abstractmethod
+    async def screenshot(
+        self, report: bool = True, region: CaptureRegion | None = None
+    ) -> Image.Image:
+        """Captures a screenshot of the current display."""
+
+    @abstractmethod
+    async def mouse_move(self, x: int, y: int, duration: int = 500) -> None:
+        """Moves the mouse cursor to specified screen coordinates."""
+
+    @abstractmethod
+    async def type(self, text: str, typing_speed: int = 50) -> None:
+        """Simulates typing text as if entered on a keyboard."""
+
+    @abstractmethod
+    async def click(self, button: MouseButton = "left", count: int = 1) -> None:
+        """Simulates clicking a mouse button."""
+
+    @abstractmethod
+    async def mouse_down(self, button: MouseButton = "left") -> None:
+        """Simulates pressing and holding a mouse button."""
+
+    @abstractmethod
+    async def mouse_up(self, button: MouseButton = "left") -> None:
+        """Simulates releasing a mouse button."""
+
+    @abstractmethod
+    async def mouse_scroll(self, dx: int, dy: int) -> None:
+        """Simulates scrolling the mouse wheel."""
+
+    @abstractmethod
+    async def keyboard_pressed(
+        self, key: PcKey | ModifierKey, modifier_keys: list[ModifierKey] | None = None
+    ) -> None:
+        """Simulates pressing and holding a keyboard key."""
+
+    @abstractmethod
+    async def keyboard_release(
+        self, key: PcKey | ModifierKey, modifier_keys: list[ModifierKey] | None = None
+    ) -> None:
+        """Simulates releasing a keyboard key."""
+
+    @abstractmethod
+    async def keyboard_tap(
+        self,
+        key: PcKey | ModifierKey,
+        modifier_keys: list[ModifierKey] | None = None,
+        count: int = 1,
+    ) -> None:
+        """Simulates pressing and immediately releasing a keyboard key."""
+
+    @abstractmethod
+    async def retrieve_active_display(self) -> Display:
+        """Retrieve the currently active display/screen."""
+
+    async def get_mouse_position(self) -> Coordinate:
+        """Get the current mouse cursor position."""
+        raise NotImplementedError
+
+
+class AsyncAgentOsAdapter(AsyncAgentOs):
+    """Makes a (synchronous) `AgentOs` usable as an `AsyncAgentOs`.
+
+    All operations are run one after another on a single worker thread so that
+    they keep their order and agent OSs bound to the thread they were first used
+    on (e.g., Playwright) keep working.
+
+    Args:
+        agent_os (AgentOs): The agent OS to adapt.
+        executor (concurrent.futures.ThreadPoolExecutor | None, optional): The
+            single-threaded executor to run the operations on. Pass the executor
+            that runs the tools using `agent_os` to share the thread with them.
+            Defaults to a new executor owned by the adapter.
+    """
+
+    def __init__(
+        self,
+        agent_os: AgentOs,
+        executor: concurrent.futures.ThreadPoolExecutor | None = None,
+    ) -> None:
+        self._agent_os = agent_os
+        self._owns_executor = executor is None
+        self._executor = executor or concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="askui-agent-os"
+        )
+
+    @property
+    def agent_os(self) -> AgentOs:
+        """The adapted agent OS."""
+        return self._agent_os
+
+    @property
+    @override
+    def tags(self) -> list[str]:
+        return self._agent_os.tags
+
+    @tags.setter
+    def tags(self, tags: list[str]) -> None:
+        self._agent_os.tags = tags
+
+    async def _run(
+        self, func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs
+    ) -> _T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    @override
+    async def connect(self) -> None:
+        await self._run(self._agent_os.connect)
+
+    @override
+    async def disconnect(self) -> None:
+        try:
+            await self._run(self._agent_os.disconnect)
+        finally:
+            if self._owns_executor:
+                self._executor.shutdown(wait=False)
+
+    @override
+    async def screenshot(
+        self, report: bool = True, region: CaptureRegion | None = None
+    ) -> Image.Image:
+        return await self._run(self._agent_os.screenshot, report=report, region=region)
+
+    @override
+    async def mouse_move(self, x: int, y: int, duration: int = 500) -> None:
+        await self._run(self._agent_os.mouse_move, x, y, duration=duration)
+
+    @override
+    async def type(self, text: str, typing_speed: int = 50) -> None:
+        await self._run(self._agent_os.type, text, typing_speed=typing_speed)
+
+    @override
+    async def click(self, button: MouseButton = "left", count: int = 1) -> None:
+        await self._run(self._agent_os.click, button=button, count=count)
+
+    @override
+    async def mouse_down(self, button: MouseButton = "left") -> None:
+        await self._run(self._agent_os.mouse_down, button=button)
+
+    @override
+    async def mouse_up(self, button: MouseButton = "left") -> None:
+        await self._run(self._agent_os.mouse_up, button=button)
+
+    @override
+    async def mouse_scroll(self, dx: int, dy: int) -> None:
+        await self._run(self._agent_os.mouse_scroll, dx, dy)
+
+    @override
+    async def keyboard_pressed(
+        self, key: PcKey | ModifierKey, modifier_keys: list[ModifierKey] | None = None
+    ) -> None:
+        await self._run(
+            self._agent_os.keyboard_pressed, key, modifier_keys=modifier_keys
+        )
+
+    @override
+    async def keyboard_release(
+        self, key: PcKey | ModifierKey, modifier_keys: list[ModifierKey] | None = None
+    ) -> None:
+        await self._run(
+            self._agent_os.keyboard_release, key, modifier_keys=modifier_keys
+        )
+
+    @override
+    async def keyboard_tap(
+        self,
+        key: PcKey | ModifierKey,
+        modifier_keys: list[ModifierKey] | None = None,
+        count: int = 1,
+    ) -> None:
+        await self._run(
+            self._agent_os.keyboard_tap, key, modifier_keys=modifier_keys, count=count
+        )
+
+    @override
+    async def retrieve_active_display(self) -> Display:
+        return await self._run(self._agent_os.retrieve_active_display)
+
+    @override
+    async def get_mouse_position(self) -> Coordinate:
+        return await self._run(self._agent_os.get_mouse_position)
+
+
+class BlockingAgentOs(AgentOs):
+    """Makes an `AsyncAgentOs` usable as a (synchronous) `AgentOs`.
+
+    Lets the existing (synchronous) tools act through an `AsyncAgentOs`.
+    Operations are run on the given event loop, so they must be called from a
+    thread other than the one running the loop, e.g., by tools executed in a
+    worker thread.
+
+    Args:
+        agent_os (AsyncAgentOs): The agent OS to adapt.
+        loop (asyncio.AbstractEventLoop): The event loop to run operations on.
+    """
+
+    def __init__(self, agent_os: AsyncAgentOs, loop: asyncio.AbstractEventLoop) -> None:
+        self._agent_os = agent_os
+        self._loop = loop
+
+    @property
+    @override
+    def tags(self) -> list[str]:
+        return self._agent_os.tags
+
+    @tags.setter
+    def tags(self, tags: list[str]) -> None:
+        self._agent_os.tags = tags
+
+    @override
+    def connect(self) -> None:
+        run_coroutine_blocking(self._agent_os.connect(), self._loop)
+
+    @override
+    def disconnect(self) -> None:
+        run_coroutine_blocking(self._agent_os.disconnect(), self._loop)
+
+    @override
+    def screenshot(
+        self, report: bool = True, region: CaptureRegion | None = None
+    ) -> Image.Image:
+        return run_coroutine_blocking(
+            self._agent_os.screenshot(report, region), self._loop
+        )
+
+    @override
+    def mouse_move(self, x: int, y: int, duration: int = 500) -> None:
+        run_coroutine_blocking(self._agent_os.mouse_move(x, y, duration), self._loop)
+
+    @override
+    def type(self, text: str, typing_speed: int = 50) -> None:
+        run_coroutine_blocking(self._agent_os.type(text, typing_speed), self._loop)
+
+    @override
+    def click(self, button: MouseButton = "left", count: int = 1) -> None:
+        run_coroutine_blocking(self._agent_os.click(button, count), self._loop)
+
+    @override
+    def mouse_down(self, button: MouseButton = "left") -> None:
+        run_coroutine_blocking(self._agent_os.mouse_down(button), self._loop)
+
+    @override
+    def mouse_up(self, button: MouseButton = "left") -> None:
+        run_coroutine_blocking(self._agent_os.mouse_up(button), self._loop)
+
+    @override
+    def mouse_scroll(self, dx: int, dy: int) -> None:
+        run_coroutine_blocking(self._agent_os.mouse_scroll(dx, dy), self._loop)
+
+    @override
+    def keyboard_pressed(
+        self, key: PcKey | ModifierKey, modifier_keys: list[ModifierKey] | None = None
+    ) -> None:
+        run_coroutine_blocking(
+            self._agent_os.keyboard_pressed(key, modifier_keys), self._loop
+        )
+
+    @override
+    def keyboard_release(
+        self, key: PcKey | ModifierKey, modifier_keys: list[ModifierKey] | None = None
+    ) -> None:
+        run_coroutine_blocking(
+            self._agent_os.keyboard_release(key, modifier_keys), self._loop
+        )
+
+    @override
+    def keyboard_tap(
+        self,
+        key: PcKey | ModifierKey,
+        modifier_keys: list[ModifierKey] | None = None,
+        count: int = 1,
+    ) -> None:
+        run_coroutine_blocking(
+            self._agent_os.keyboard_tap(key, modifier_keys, count), self._loop
+        )
+
+    @override
+    def retrieve_active_display(self) -> Display:
+        return run_coroutine_blocking(
+            self._agent_os.retrieve_active_display(), self._loop
+        )
+
+    @override
+    def get_mouse_position(self) -> Coordinate:
+        return run_coroutine_blocking(self._agent_os.get_mouse_position(), self._loop)
+
+
+def to_async_agent_os(
+    agent_os: AsyncAgentOs | AgentOs,
+    executor: concurrent.futures.ThreadPoolExecutor | None = None,
+) -> AsyncAgentOs:
+    """Return `agent_os` as `AsyncAgentOs`, adapting it if necessary.
+
+    Args:
+        agent_os (AsyncAgentOs | AgentOs): The agent OS.
+        executor (concurrent.futures.ThreadPoolExecutor | None, optional): The
+            executor to pass to `AsyncAgentOsAdapter`. Defaults to `None`.
+
+    Returns:
+        AsyncAgentOs: The agent OS itself or an adapter of it.
+    """
+    if isinstance(agent_os, AsyncAgentOs):
+        return agent_os
+    return AsyncAgentOsAdapter(agent_os, executor=executor)
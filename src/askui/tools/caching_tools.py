@@ -28,7 +28,8 @@ class RetrieveCachedTestExecutions(Tool):
                 "available trajectory files.\n\n"
                 "By default, only valid (non-invalidated) caches are returned. "
                 "Set include_invalid=True to see all caches including those "
-                "marked as invalid due to repeated failures."
+                "marked as invalid due to repeated failures. Set goal to only "
+                "see caches whose goal contains the given text."
             ),
             input_schema={
                 "type": "object",
@@ -42,6 +43,14 @@ class RetrieveCachedTestExecutions(Tool):
                         ),
                         "default": False,
                     },
+                    "goal": {
+                        "type": "string",
+                        "description": (
+                            "Only include caches whose goal contains this text "
+                            "(case-insensitive). Default is to include caches "
+                            "regardless of their goal."
+                        ),
+                    },
                 },
                 "required": [],
             },
@@ -52,19 +61,26 @@ class RetrieveCachedTestExecutions(Tool):
 
     @override
     @validate_call
-    def __call__(self, include_invalid: bool = False) -> list[str]:  # type: ignore
+    def __call__(  # type: ignore
+        self, include_invalid: bool = False, goal: str | None = None
+    ) -> list[str]:
         """Retrieve available cached trajectories.
 
+        The metadata of the cache files is looked up in the index of the cache
+        directory (see `CacheIndex`), so only new or changed cache files are read.
+
         Args:
             include_invalid: Whether to include invalid caches
+            goal: Only include caches whose goal contains this text
 
         Returns:
             List of strings with filename and parameters info.
         """
         logger.info(
-            "Retrieving cached trajectories from %s (include_invalid=%s)",
+            "Retrieving cached trajectories from %s (include_invalid=%s, goal=%s)",
             self._cache_dir,
             include_invalid,
+            goal,
         )
 
         if not Path.is_dir(self._cache_dir):
@@ -72,46 +88,37 @@ class RetrieveCachedTestExecutions(Tool):
             logger.error(error_msg)
             raise FileNotFoundError(error_msg)
 
-        all_files = [
-            f
-            for f in self._cache_dir.iterdir()
-            if str(f).endswith(self._trajectories_format)
-        ]
-        logger.debug("Found %d total cache files", len(all_files))
+        entries = CacheManager.find_cache_files(
+            self._cache_dir,
+            trajectories_format=self._trajectories_format,
+            goal=goal,
+            include_invalid=True,
+        )
+        logger.debug("Found %d total cache files", len(entries))
 
         available: list[str] = []
         invalid_count = 0
-        unreadable_count = 0
-
-        for f in all_files:
-            try:
-                cache_file = CacheManager.read_cache_file(f)
-
-                # Check if we should include this cache
-                if not include_invalid and not cache_file.metadata.is_valid:
-                    invalid_count += 1
-                    logger.debug(
-                        "Excluding invalid cache: %s (reason: %s)",
-                        f.name,
-                        cache_file.metadata.invalidation_reason,
-                    )
-                    continue
-
-                # Add cache info with filename and parameters
-                available.append(
-                    f"filename: {f!s} (parameters: {cache_file.cache_parameters})"
-                )
 
-            except Exception:  # noqa: PERF203
-                unreadable_count += 1
-                logger.exception("Failed to read cache file %s", f.name)
+        for entry in entries:
+            # Check if we should include this cache
+            if not include_invalid and not entry.is_valid:
+                invalid_count += 1
+                logger.debug(
+                    "Excluding invalid cache: %s (reason: %s)",
+                    entry.path.name,
+                    entry.invalidation_reason,
+                )
                 continue
 
+            # Add cache info with filename and parameters
+            available.append(
+                f"filename: {entry.path!s} (parameters: {entry.cache_parameters})"
+            )
+
         logger.info(
-            "Found %d cache(s), excluded %d invalid, %d unreadable",
+            "Found %d cache(s), excluded %d invalid",
             len(available),
             invalid_count,
-            unreadable_count,
         )
 
         if not available:
@@ -13,6 +13,7 @@ class ComputerGetMousePositionTool(ComputerBaseTool):
             required_tags=[ToolTags.SCALED_AGENT_OS.value],
         )
         self.is_cacheable = True
+        self.is_read_only = True
 
     def __call__(self) -> str:
         cursor_position = self.agent_os.get_mouse_position()
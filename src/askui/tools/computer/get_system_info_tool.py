@@ -27,6 +27,7 @@ class ComputerGetSystemInfoTool(ComputerBaseTool):
             """,
             agent_os=agent_os,
         )
+        self.is_read_only = True
 
     def __call__(self) -> str:
         return str(self.agent_os.get_system_info().model_dump_json())
@@ -12,6 +12,7 @@ class ComputerListDisplaysTool(ComputerBaseTool):
             agent_os=agent_os,
         )
         self.is_cacheable = True
+        self.is_read_only = True
 
     def __call__(self) -> str:
         return self.agent_os.list_displays().model_dump_json(
@@ -13,6 +13,7 @@ class ComputerRetrieveActiveDisplayTool(ComputerBaseTool):
             agent_os=agent_os,
         )
         self.is_cacheable = True
+        self.is_read_only = True
 
     def __call__(self) -> str:
         return str(
@@ -15,6 +15,7 @@ class ComputerScreenshotTool(ComputerBaseTool):
             required_tags=[ToolTags.SCALED_AGENT_OS.value],
         )
         self.is_cacheable = True
+        self.is_read_only = True
 
     def __call__(self) -> tuple[str, Image.Image]:
         screenshot = self.agent_os.screenshot()
@@ -1,8 +1,11 @@
+import contextlib
+from collections.abc import Iterator
 from typing import TYPE_CHECKING
 
 from PIL import Image
 
 from askui.models.shared.tool_tags import ToolTags
+from askui.models.types.geometry import CaptureRegion
 from askui.tools.agent_os import (
     AgentOs,
     Coordinate,
@@ -15,7 +18,11 @@ from askui.tools.agent_os import (
     PcKey,
 )
 from askui.tools.askui.askui_controller import RenderObjectStyle  # noqa: TC001
-from askui.utils.image_utils import scale_coordinates, scale_image_to_fit
+from askui.utils.image_utils import (
+    capture_scaled_region,
+    scale_coordinates,
+    scale_image_to_fit,
+)
 
 if TYPE_CHECKING:
     from askui.tools.askui.askui_ui_controller_grpc.generated import (
@@ -50,7 +57,25 @@ class ComputerAgentOsFacade(AgentOs):
         self._agent_os.disconnect()
         self._real_screen_resolution = None
 
-    def screenshot(self, report: bool = True) -> Image.Image:
+    def screenshot(
+        self, report: bool = True, region: CaptureRegion | None = None
+    ) -> Image.Image:
+        if region is not None:
+            if self._real_screen_resolution is None:
+                self._real_screen_resolution = (
+                    self._agent_os.retrieve_active_display().size
+                )
+            return capture_scaled_region(
+                lambda real_region: self._agent_os.screenshot(
+                    report=report, region=real_region
+                ),
+                region,
+                (
+                    self._real_screen_resolution.width,
+                    self._real_screen_resolution.height,
+                ),
+                self._target_resolution,
+            )
         screenshot = self._agent_os.screenshot(report=report)
         self._real_screen_resolution = DisplaySize(
             width=screenshot.width, height=screenshot.height
@@ -105,6 +130,11 @@ class ComputerAgentOsFacade(AgentOs):
     ) -> None:
         self._agent_os.keyboard_tap(key, modifier_keys, count)
 
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        with self._agent_os.batch():
+            yield
+
     def list_displays(self) -> DisplaysListResponse:
         return self._agent_os.list_displays()
 
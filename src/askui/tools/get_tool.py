@@ -59,6 +59,7 @@ class GetTool(ToolWithAgentOS):
             },
         )
         self._provider = provider
+        self.is_read_only = True
         self._get_settings = get_settings or GetSettings()
 
     @override
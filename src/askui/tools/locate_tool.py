@@ -10,6 +10,11 @@ from askui.models.shared.tool_tags import ToolTags
 from askui.models.shared.tools import ToolCallResult, ToolWithAgentOS
 from askui.models.types.geometry import PointList
 from askui.utils.image_utils import ImageSource
+from askui.utils.locate_cache import (
+    LocateCache,
+    locate_cache_key,
+    provider_identity,
+)
 
 
 class LocateTool(ToolWithAgentOS):
@@ -23,6 +28,9 @@ class LocateTool(ToolWithAgentOS):
         provider (DetectionProvider): The provider to use for element detection.
         locate_settings (LocateSettings | None, optional): Default settings for
             locate operations. Defaults to `LocateSettings()`.
+        locate_cache (LocateCache | None, optional): Cache of the results of
+            locating elements so that an element is not located again on an
+            unchanged screen. Defaults to `None`, i.e., no caching.
 
     Example:
         ```python
@@ -38,6 +46,7 @@ class LocateTool(ToolWithAgentOS):
         self,
         provider: DetectionProvider,
         locate_settings: LocateSettings | None = None,
+        locate_cache: LocateCache | None = None,
     ) -> None:
         super().__init__(
             required_tags=[ToolTags.SCALED_AGENT_OS.value],
@@ -58,7 +67,9 @@ class LocateTool(ToolWithAgentOS):
             },
         )
         self._provider = provider
+        self.is_read_only = True
         self._locate_settings = locate_settings or LocateSettings()
+        self._locate_cache = locate_cache
 
     @override
     def __call__(self, locator: str) -> ToolCallResult:
@@ -77,7 +88,7 @@ class LocateTool(ToolWithAgentOS):
 
         screenshot = self.agent_os.screenshot()
         image = ImageSource(screenshot)
-        points = self._provider.detect(
+        points = self._detect(
             locator=locator,
             image=image,
             locate_settings=self._locate_settings,
@@ -103,12 +114,36 @@ class LocateTool(ToolWithAgentOS):
             PointList: List of (x, y) coordinate tuples.
         """
         _settings = locate_settings or self._locate_settings
-        return self._provider.detect(
+        return self._detect(
             locator=locator,
             image=image,
             locate_settings=_settings,
         )
 
+    def _detect(
+        self,
+        locator: str | Locator,
+        image: ImageSource,
+        locate_settings: LocateSettings,
+    ) -> PointList:
+        """Detect an element using the provider, unless the result is cached."""
+
+        def detect() -> PointList:
+            return self._provider.detect(
+                locator=locator,
+                image=image,
+                locate_settings=locate_settings,
+            )
+
+        if self._locate_cache is None:
+            return detect()
+        key = locate_cache_key(
+            model=provider_identity(self._provider),
+            locator=locator,
+            locate_settings=locate_settings,
+        )
+        return self._locate_cache.get_or_locate(key, image.root, detect)
+
     def run_all(
         self,
         image: ImageSource,
@@ -0,0 +1,279 @@
+"""Pool of long-lived MCP client sessions.
+
+Opening an MCP client session, e.g., starting a stdio server process and
+initializing the session, can take seconds. `McpSessionPool` keeps one session
+per client open on a dedicated event loop thread instead of opening a new one
+for every tool listing and tool call. Tool listings are cached per client until
+they are invalidated explicitly or the server notifies the client that its
+tools changed (`notifications/tools/list_changed`, see
+`McpSessionPool.handle_message()`).
+
+A `ToolCollection` with an MCP client owns a pool unless one is passed to it, so
+the sessions (and, e.g., the stdio server processes) live as long as the
+collection: they are closed by `ToolCollection.close()` or once the collection
+is garbage collected.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from fastmcp.client.client import CallToolResult
+from mcp import Tool as McpTool
+
+if TYPE_CHECKING:
+    from askui.models.shared.tools import McpClientProtocol
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_TOOL_LIST_CHANGED_METHOD = "notifications/tools/list_changed"
+_CLOSE_TIMEOUT_SECONDS = 10.0
+
+
+def _is_tool_list_changed(message: object) -> bool:
+    # Notifications may be wrapped in a `ServerNotification` root model
+    notification = getattr(message, "root", message)
+    return getattr(notification, "method", None) == _TOOL_LIST_CHANGED_METHOD
+
+
+class _McpSession:
+    """Session of a client kept open by a task on the pool's event loop.
+
+    Holds on to the client so that the id of the client, which the pool keys
+    sessions by, is not reused while the session exists.
+    """
+
+    def __init__(self, client: "McpClientProtocol") -> None:
+        self.client = client
+        # Tool listing of the session and the number of invalidations of it
+        self.tools: list[McpTool] | None = None
+        self.tools_version = 0
+        self._opened: concurrent.futures.Future[None] = concurrent.futures.Future()
+        self._stop: asyncio.Event | None = None
+        self._task: concurrent.futures.Future[None] | None = None
+
+    def open(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._task = asyncio.run_coroutine_threadsafe(self._keep_open(), loop)
+        self._task.add_done_callback(self._on_closed)
+
+    async def _keep_open(self) -> None:
+        self._stop = asyncio.Event()
+        async with self.client:
+            self._opened.set_result(None)
+            await self._stop.wait()
+
+    def _on_closed(self, task: concurrent.futures.Future[None]) -> None:
+        if self._opened.done() and not task.cancelled() and task.exception():
+            logger.warning("MCP session closed unexpectedly", exc_info=task.exception())
+
+    @property
+    def is_closed(self) -> bool:
+        return self._task is None or self._task.done()
+
+    def wait_until_open(self) -> None:
+        """Wait until the session is open.
+
+        Raises:
+            Exception: The error the session could not be opened because of.
+        """
+        if self._task is None:
+            msg = "MCP session was not opened"
+            raise RuntimeError(msg)
+        concurrent.futures.wait(
+            [self._opened, self._task],
+            return_when=concurrent.futures.FIRST_COMPLETED,
+        )
+        if not self._opened.done():
+            self._task.result()
+
+    def close(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._task is None or self._task.done():
+            return
+        stop = self._stop
+        if stop is not None and self._opened.done():
+            loop.call_soon_threadsafe(stop.set)
+        else:
+            self._task.cancel()
+        _, not_done = concurrent.futures.wait(
+            [self._task], timeout=_CLOSE_TIMEOUT_SECONDS
+        )
+        if not_done:
+            logger.warning("Failed to close MCP session in time")
+
+
+class McpSessionPool:
+    """Keeps MCP client sessions open and caches their tool listings.
+
+    Sessions are opened lazily on first use and live on a dedicated event loop
+    thread, so they can be used from any thread, including threads that run an
+    event loop themselves. A session that closes unexpectedly (e.g., because the
+    server crashed) is reopened on next use. Sessions stay open until `close()`
+    is called.
+
+    To invalidate the cached tool listing of a client when its server changes its
+    tools, pass `handle_message()` as the `message_handler` of the client.
+
+    Example:
+        ```python
+        from fastmcp import Client
+
+        from askui.tools.mcp.session_pool import McpSessionPool
+
+        pool = McpSessionPool()
+        client = Client("path/to/server.py", message_handler=pool.handle_message)
+        tools = pool.list_tools(client)  # opens the session
+        tools = pool.list_tools(client)  # cached, no request
+        result = pool.call_tool(client, tools[0].name, {})  # reuses the session
+        pool.close()
+        ```
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._sessions: dict[int, _McpSession] = {}
+        self._n_sessions_opened = 0
+
+    @property
+    def n_sessions_opened(self) -> int:
+        """Number of sessions opened (including reopened ones) so far."""
+        return self._n_sessions_opened
+
+    def list_tools(self, client: "McpClientProtocol") -> list[McpTool]:
+        """List the tools of a client, using the cached listing if available.
+
+        Args:
+            client (McpClientProtocol): The MCP client.
+
+        Returns:
+            list[McpTool]: The tools of the client. Must not be modified.
+        """
+        session, loop = self._get_open_session(client)
+        with self._lock:
+            tools, version = session.tools, session.tools_version
+        if tools is not None:
+            return tools
+        tools = self._run(loop, client.list_tools)
+        with self._lock:
+            # Do not cache a listing that was invalidated while being fetched
+            if session.tools_version == version:
+                session.tools = tools
+        return tools
+
+    def call_tool(
+        self,
+        client: "McpClientProtocol",
+        name: str,
+        arguments: dict[str, Any] | None = None,
+    ) -> CallToolResult:
+        """Call a tool of a client using the client's pooled session.
+
+        Args:
+            client (McpClientProtocol): The MCP client.
+            name (str): The name of the tool.
+            arguments (dict[str, Any] | None, optional): The tool arguments.
+                Defaults to `None`.
+
+        Returns:
+            CallToolResult: The result of the tool call.
+        """
+        _, loop = self._get_open_session(client)
+        return self._run(loop, lambda: client.call_tool(name, arguments))
+
+    def invalidate_tools(self, client: "McpClientProtocol | None" = None) -> None:
+        """Invalidate cached tool listings.
+
+        Args:
+            client (McpClientProtocol | None, optional): The client to
+                invalidate the listing of. Defaults to `None`, i.e., all clients.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                if client is None or session.client is client:
+                    session.tools = None
+                    session.tools_version += 1
+
+    async def handle_message(self, message: Any) -> None:
+        """Invalidate all cached tool listings if a server changed its tools.
+
+        Pass it as the `message_handler` of `fastmcp.Client`s whose sessions are
+        kept open by this pool to react to `notifications/tools/list_changed`.
+
+        Args:
+            message (Any): The message received from the server.
+        """
+        if _is_tool_list_changed(message):
+            self.invalidate_tools()
+
+    def close(self) -> None:
+        """Close all sessions and stop the event loop thread.
+
+        The pool can still be used afterwards; sessions are reopened on use.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None:
+            return
+        if threading.current_thread() is thread:
+            # e.g., garbage collected on the event loop thread; cannot wait there
+            loop.call_soon(loop.stop)
+            return
+        for session in sessions:
+            session.close(loop)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=_CLOSE_TIMEOUT_SECONDS)
+
+    @staticmethod
+    def _run(
+        loop: asyncio.AbstractEventLoop, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        async def _request() -> _T:
+            return await request()
+
+        return asyncio.run_coroutine_threadsafe(_request(), loop).result()
+
+    def _get_open_session(
+        self, client: "McpClientProtocol"
+    ) -> tuple[_McpSession, asyncio.AbstractEventLoop]:
+        key = id(client)
+        with self._lock:
+            loop = self._get_loop()
+            session = self._sessions.get(key)
+            if session is None or session.client is not client or session.is_closed:
+                session = _McpSession(client)
+                session.open(loop)
+                self._sessions[key] = session
+                self._n_sessions_opened += 1
+        try:
+            session.wait_until_open()
+        except Exception:
+            with self._lock:
+                if self._sessions.get(key) is session:
+                    del self._sessions[key]
+            raise
+        return session, loop
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="askui-mcp-sessions", daemon=True
+            )
+            thread.start()
+            self._loop, self._thread = loop, thread
+        return self._loop
+
+
+__all__ = [
+    "McpSessionPool",
+]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import io
 import subprocess
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 from PIL import Image
 from playwright.sync_api import (
@@ -21,6 +21,9 @@ from askui.utils.annotated_image import AnnotatedImage
 
 from ..agent_os import AgentOs, Display, DisplaySize, InputEvent, ModifierKey, PcKey
 
+if TYPE_CHECKING:
+    from askui.models.types.geometry import CaptureRegion
+
 
 class PlaywrightAgentOs(AgentOs):
     """Playwright-based implementation of `AgentOs`.
@@ -197,12 +200,17 @@ class PlaywrightAgentOs(AgentOs):
         )
 
     @override
-    def screenshot(self, report: bool = True) -> Image.Image:
+    def screenshot(
+        self, report: bool = True, region: CaptureRegion | None = None
+    ) -> Image.Image:
         """Capture a screenshot of the current page.
 
         Args:
             report (bool, optional): Whether to include the screenshot in
                 reporting. Defaults to `True`.
+            region (CaptureRegion | None, optional): The region of the viewport
+                to capture (in CSS pixels). Defaults to `None`, i.e., the whole
+                viewport.
 
         Returns:
             Image.Image: A PIL Image object containing the screenshot.
@@ -211,7 +219,27 @@ class PlaywrightAgentOs(AgentOs):
             error_msg = "No active page. Call connect() first."
             raise RuntimeError(error_msg)
 
-        screenshot_bytes = self._page.screenshot(scale="css")
+        if region is None:
+            screenshot_bytes = self._page.screenshot(scale="css")
+        else:
+            viewport_size = self._page.viewport_size
+            if viewport_size is not None:
+                clipped_region = region.clip(
+                    viewport_size["width"], viewport_size["height"]
+                )
+                if clipped_region is None:
+                    error_msg = f"Region {region!r} is outside of the viewport"
+                    raise ValueError(error_msg)
+                region = clipped_region
+            screenshot_bytes = self._page.screenshot(
+                scale="css",
+                clip={
+                    "x": region.x,
+                    "y": region.y,
+                    "width": region.width,
+                    "height": region.height,
+                },
+            )
         screenshot = Image.open(io.BytesIO(screenshot_bytes))
         if report:
             self._reporter.add_message(
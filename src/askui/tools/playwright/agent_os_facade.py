@@ -3,9 +3,14 @@ from typing import Literal
 from PIL import Image
 
 from askui.models.shared.tool_tags import ToolTags
+from askui.models.types.geometry import CaptureRegion
 from askui.tools.agent_os import Display, ModifierKey, PcKey
 from askui.tools.playwright.agent_os import PlaywrightAgentOs
-from askui.utils.image_utils import scale_coordinates, scale_image_to_fit
+from askui.utils.image_utils import (
+    capture_scaled_region,
+    scale_coordinates,
+    scale_image_to_fit,
+)
 
 
 class PlaywrightAgentOsFacade(PlaywrightAgentOs):
@@ -36,7 +41,22 @@ class PlaywrightAgentOsFacade(PlaywrightAgentOs):
         self._agent_os.disconnect()
         self._real_screen_resolution = None
 
-    def screenshot(self, report: bool = True) -> Image.Image:
+    def screenshot(
+        self, report: bool = True, region: CaptureRegion | None = None
+    ) -> Image.Image:
+        if region is not None:
+            if self._real_screen_resolution is None:
+                self._real_screen_resolution = self._agent_os.screenshot(
+                    report=False,
+                ).size
+            return capture_scaled_region(
+                lambda real_region: self._agent_os.screenshot(
+                    report=report, region=real_region
+                ),
+                region,
+                self._real_screen_resolution,
+                self._target_resolution,
+            )
         screenshot = self._agent_os.screenshot(report=report)
         self._real_screen_resolution = screenshot.size
         return scale_image_to_fit(screenshot, self._target_resolution)
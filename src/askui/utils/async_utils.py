@@ -0,0 +1,41 @@
+"""Helpers for bridging between synchronous and asynchronous code."""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+def run_coroutine_blocking(
+    coro: Coroutine[Any, Any, _T], loop: asyncio.AbstractEventLoop
+) -> _T:
+    """Run a coroutine on an event loop running in another thread and wait for it.
+
+    Used to call asynchronous implementations (e.g., an `AsyncAgentOs`) from
+    synchronous code (e.g., tools) that is executed in a worker thread while
+    the event loop keeps running.
+
+    Args:
+        coro (Coroutine[Any, Any, _T]): The coroutine to run.
+        loop (asyncio.AbstractEventLoop): The event loop to run the coroutine on.
+
+    Returns:
+        _T: The result of the coroutine.
+
+    Raises:
+        RuntimeError: If called from the thread running `loop` which would
+            block the loop forever.
+    """
+    try:
+        running_loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        coro.close()
+        msg = (
+            "Cannot block on a coroutine from the thread running its event loop; "
+            "run the calling code in a worker thread instead"
+        )
+        raise RuntimeError(msg)
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
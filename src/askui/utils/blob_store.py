@@ -0,0 +1,278 @@
+"""Content-addressed blob store for large payloads such as screenshots.
+
+Blobs are keyed by the SHA-256 digest of their content so identical payloads
+(e.g., unchanged screenshots across steps) are stored only once. Blobs are held
+in memory up to a configurable budget; least recently used blobs are spilled to
+disk beyond that budget and loaded back transparently on access.
+
+Blobs are reference counted through `BlobRef` handles: as soon as the last
+handle of a blob is garbage collected, the blob is removed from memory and
+disk.
+"""
+
+import hashlib
+import logging
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStoreSettings(BaseSettings):
+    """Settings of the default `BlobStore`."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="ASKUI__VA__BLOB_STORE__",
+    )
+
+    max_memory_bytes: int | None = Field(
+        default=128 * 1024 * 1024,
+        description=(
+            "Maximum number of bytes held in memory before least recently used "
+            "blobs are spilled to disk. `None` disables spilling."
+        ),
+    )
+    spill_dir: Path | None = Field(
+        default=None,
+        description=(
+            "Directory to spill blobs to. Defaults to a temporary directory "
+            "that is created on first spill and removed with the store."
+        ),
+    )
+
+
+class BlobRef:
+    """Lightweight handle of a blob within a `BlobStore`.
+
+    Holding a handle keeps the blob alive. Handles are immutable and therefore
+    shared (not duplicated) on copy.
+
+    Args:
+        store (BlobStore): The store holding the blob.
+        key (str): The content hash of the blob.
+    """
+
+    __slots__ = ("__weakref__", "_key", "_size", "_store")
+
+    def __init__(self, store: "BlobStore", key: str, size: int) -> None:
+        self._store = store
+        self._key = key
+        self._size = size
+        weakref.finalize(self, store.release, key)
+
+    @property
+    def key(self) -> str:
+        """The content hash (SHA-256 hex digest) of the blob."""
+        return self._key
+
+    @property
+    def size(self) -> int:
+        """The size of the blob in bytes."""
+        return self._size
+
+    def read(self) -> bytes:
+        """Read the content of the blob.
+
+        Returns:
+            bytes: The content of the blob.
+        """
+        return self._store.get(self._key)
+
+    def __copy__(self) -> "BlobRef":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, object]) -> "BlobRef":
+        return self
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BlobRef):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __repr__(self) -> str:
+        return f"BlobRef(key={self._key[:12]}..., size={self._size})"
+
+
+class BlobStore:
+    """Content-addressed blob store held in memory with optional spill to disk.
+
+    Args:
+        settings (BlobStoreSettings | None, optional): The settings of the store.
+            Defaults to `BlobStoreSettings()`.
+
+    Example:
+        ```python
+        from askui.utils.blob_store import BlobStore, BlobStoreSettings
+
+        store = BlobStore(BlobStoreSettings(max_memory_bytes=64 * 1024 * 1024))
+        ref = store.put(b"...")
+        data = ref.read()
+        ```
+    """
+
+    def __init__(self, settings: BlobStoreSettings | None = None) -> None:
+        self._settings = settings or BlobStoreSettings()
+        self._lock = threading.RLock()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._spilled: dict[str, int] = {}
+        self._ref_counts: dict[str, int] = {}
+        self._temp_dir: tempfile.TemporaryDirectory[str] | None = None
+
+    def put(self, data: bytes) -> BlobRef:
+        """Store a blob (if not already stored) and return a handle to it.
+
+        Args:
+            data (bytes): The content of the blob.
+
+        Returns:
+            BlobRef: The handle of the blob.
+        """
+        key = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._ref_counts[key] = self._ref_counts.get(key, 0) + 1
+            if key in self._memory:
+                self._memory.move_to_end(key)
+            elif key not in self._spilled:
+                self._add_to_memory(key, data)
+        return BlobRef(self, key, len(data))
+
+    def get(self, key: str) -> bytes:
+        """Get the content of a blob.
+
+        Args:
+            key (str): The content hash of the blob.
+
+        Returns:
+            bytes: The content of the blob.
+
+        Raises:
+            KeyError: If the blob is not (or no longer) stored.
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+            if key not in self._spilled:
+                raise KeyError(key)
+            path = self._spill_path(key)
+            data = path.read_bytes()
+            path.unlink(missing_ok=True)
+            del self._spilled[key]
+            self._add_to_memory(key, data)
+            return data
+
+    def release(self, key: str) -> None:
+        """Release a reference to a blob, removing the blob if unreferenced.
+
+        Called automatically when a `BlobRef` is garbage collected.
+
+        Args:
+            key (str): The content hash of the blob.
+        """
+        with self._lock:
+            count = self._ref_counts.get(key, 0) - 1
+            if count > 0:
+                self._ref_counts[key] = count
+                return
+            self._ref_counts.pop(key, None)
+            data = self._memory.pop(key, None)
+            if data is not None:
+                self._memory_bytes -= len(data)
+            if self._spilled.pop(key, None) is not None:
+                self._spill_path(key).unlink(missing_ok=True)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._memory or key in self._spilled
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory) + len(self._spilled)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Number of bytes currently held in memory."""
+        return self._memory_bytes
+
+    @property
+    def disk_bytes(self) -> int:
+        """Number of bytes currently spilled to disk."""
+        with self._lock:
+            return sum(self._spilled.values())
+
+    def _add_to_memory(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        self._spill_if_needed()
+
+    def _spill_if_needed(self) -> None:
+        max_memory_bytes = self._settings.max_memory_bytes
+        if max_memory_bytes is None:
+            return
+        # Always keep the most recently used blob in memory
+        while self._memory_bytes > max_memory_bytes and len(self._memory) > 1:
+            key, data = self._memory.popitem(last=False)
+            self._memory_bytes -= len(data)
+            self._spill_path(key).write_bytes(data)
+            self._spilled[key] = len(data)
+            logger.debug("Spilled blob %s (%d bytes) to disk", key, len(data))
+
+    def _spill_path(self, key: str) -> Path:
+        spill_dir = self._settings.spill_dir
+        if spill_dir is None:
+            if self._temp_dir is None:
+                self._temp_dir = tempfile.TemporaryDirectory(prefix="askui_blobs_")
+            spill_dir = Path(self._temp_dir.name)
+        else:
+            spill_dir.mkdir(parents=True, exist_ok=True)
+        return spill_dir / key
+
+
+_default_blob_store: BlobStore | None = None
+_default_blob_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Get the default blob store, creating it on first use.
+
+    Returns:
+        BlobStore: The default blob store.
+    """
+    global _default_blob_store
+    with _default_blob_store_lock:
+        if _default_blob_store is None:
+            _default_blob_store = BlobStore()
+        return _default_blob_store
+
+
+def set_blob_store(store: BlobStore) -> None:
+    """Replace the default blob store used for newly stored blobs.
+
+    Blobs stored before keep living in the store they were stored in.
+
+    Args:
+        store (BlobStore): The new default blob store.
+    """
+    global _default_blob_store
+    with _default_blob_store_lock:
+        _default_blob_store = store
+
+
+__all__ = [
+    "BlobRef",
+    "BlobStore",
+    "BlobStoreSettings",
+    "get_blob_store",
+    "set_blob_store",
+]
@@ -2,10 +2,12 @@
 
 This module provides:
 - `CacheManager`: High-level cache operations (recording, validation, playback)
+- `CacheIndex`: Index of cache metadata for lookups without reading trajectories
 - `CacheParameterHandler`: Parameter identification and substitution
 - `CacheValidator`: Validation strategies for cache invalidation
 """
 
+from .cache_index import CacheIndex, CacheIndexEntry
 from .cache_manager import CacheManager
 from .cache_parameter_handler import CacheParameterHandler
 from .cache_validator import (
@@ -17,6 +19,8 @@ from .cache_validator import (
 )
 
 __all__ = [
+    "CacheIndex",
+    "CacheIndexEntry",
     "CacheManager",
     "CacheParameterHandler",
     "CacheValidator",
@@ -0,0 +1,429 @@
+"""Index of the metadata of the cache files of a cache directory.
+
+Listing the available trajectories used to read and parse every cache file of
+the cache directory, including its (possibly long) trajectory. `CacheIndex`
+keeps the metadata of the cache files in an SQLite database within the cache
+directory so that they can be listed and filtered without touching the cache
+files. A cache file is only read again when it or its metadata journal (see
+`CacheJournal`) was changed (modification time or size) since it was indexed.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from types import TracebackType
+
+from pydantic import BaseModel, Field
+from typing_extensions import Self
+
+from askui.models.shared.settings import CacheFile
+from askui.utils.caching.cache_journal import JOURNAL_SUFFIX, journal_path
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = ".askui_cache_index.sqlite3"
+
+# Increase when changing the schema to rebuild existing indexes
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_files (
+    file_name TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    journal_mtime_ns INTEGER NOT NULL,
+    journal_size INTEGER NOT NULL,
+    goal TEXT,
+    created_at TEXT,
+    last_executed_at TEXT,
+    execution_attempts INTEGER NOT NULL DEFAULT 0,
+    failure_count INTEGER NOT NULL DEFAULT 0,
+    is_valid INTEGER NOT NULL DEFAULT 1,
+    invalidation_reason TEXT,
+    cache_parameters TEXT NOT NULL DEFAULT '{}',
+    step_count INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+)
+"""
+_COLUMNS = (
+    "file_name",
+    "mtime_ns",
+    "size",
+    "journal_mtime_ns",
+    "journal_size",
+    "goal",
+    "created_at",
+    "last_executed_at",
+    "execution_attempts",
+    "failure_count",
+    "is_valid",
+    "invalidation_reason",
+    "cache_parameters",
+    "step_count",
+    "error",
+)
+_UPSERT = (
+    f"INSERT OR REPLACE INTO cache_files ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+
+# Modification time and size of a cache file and of its journal (0 if missing)
+_FileState = tuple[int, int, int, int]
+_Row = tuple[
+    str,
+    int,
+    int,
+    int,
+    int,
+    str | None,
+    str | None,
+    str | None,
+    int,
+    int,
+    bool,
+    str | None,
+    str,
+    int,
+    str | None,
+]
+
+
+class CacheIndexEntry(BaseModel):
+    """Metadata of a cache file as stored in the `CacheIndex`.
+
+    Args:
+        path: Path to the cache file
+        goal: Original goal text (may be parameterized)
+        created_at: When the cache was created
+        last_executed_at: When the cache was last executed
+        execution_attempts: Total number of execution attempts
+        failure_count: Total number of recorded failures
+        is_valid: Whether cache is still valid
+        invalidation_reason: Why cache was invalidated (if applicable)
+        cache_parameters: Dict mapping parameter names to descriptions
+        step_count: Number of steps of the trajectory
+    """
+
+    path: Path
+    goal: str | None = None
+    created_at: datetime | None = None
+    last_executed_at: datetime | None = None
+    execution_attempts: int = 0
+    failure_count: int = 0
+    is_valid: bool = True
+    invalidation_reason: str | None = None
+    cache_parameters: dict[str, str] = Field(default_factory=dict)
+    step_count: int = 0
+
+
+def _to_utc_isoformat(value: datetime | None) -> str | None:
+    """Format timestamps uniformly so that they can be compared as strings."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _file_state(
+    stat: os.stat_result, journal_stat: os.stat_result | None
+) -> _FileState:
+    if journal_stat is None:
+        return (stat.st_mtime_ns, stat.st_size, 0, 0)
+    return (
+        stat.st_mtime_ns,
+        stat.st_size,
+        journal_stat.st_mtime_ns,
+        journal_stat.st_size,
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class CacheIndex:
+    """Index of the metadata of the cache files of a cache directory.
+
+    The index is stored in the file `INDEX_FILE_NAME` within the cache directory.
+    If it cannot be opened, e.g., because the cache directory is read-only, the
+    index is kept in memory instead. It can always be rebuilt from the cache files
+    (see `rebuild()`) as these remain the source of truth.
+
+    Example:
+        ```python
+        with CacheIndex(".askui_cache") as index:
+            index.sync(".json", CacheManager.read_cache_file)
+            entries = index.query(goal="login")
+        ```
+
+    Args:
+        cache_dir (str | Path): The cache directory.
+    """
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        self._cache_dir = Path(cache_dir)
+        self._lock = threading.Lock()
+        self._connection = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        index_path = self._cache_dir / INDEX_FILE_NAME
+        try:
+            return self._open_database(str(index_path))
+        except sqlite3.OperationalError:
+            pass
+        except sqlite3.DatabaseError:
+            logger.warning("Rebuilding corrupt cache index %s", index_path)
+            with contextlib.suppress(OSError, sqlite3.Error):
+                index_path.unlink(missing_ok=True)
+                return self._open_database(str(index_path))
+        logger.warning(
+            "Failed to open cache index %s, keeping index in memory", index_path
+        )
+        return self._open_database(":memory:")
+
+    @staticmethod
+    def _open_database(database: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(database, check_same_thread=False)
+        try:
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            with connection:
+                if version != _SCHEMA_VERSION:
+                    connection.execute("DROP TABLE IF EXISTS cache_files")
+                    connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                connection.execute(_SCHEMA)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def close(self) -> None:
+        """Close the index."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def update(self, cache_file_path: Path, cache_file: CacheFile) -> None:
+        """Index a cache file that was just written.
+
+        Args:
+            cache_file_path: Path to the cache file
+            cache_file: The cache file as written to `cache_file_path`
+        """
+        try:
+            journal_stat: os.stat_result | None = journal_path(cache_file_path).stat()
+        except FileNotFoundError:
+            journal_stat = None
+        row = self._to_row(
+            cache_file_path,
+            _file_state(cache_file_path.stat(), journal_stat),
+            cache_file,
+        )
+        with self._lock, self._connection:
+            self._connection.execute(_UPSERT, row)
+
+    def sync(
+        self,
+        trajectories_format: str,
+        read_cache_file: Callable[[Path], CacheFile],
+    ) -> None:
+        """Index new and changed cache files and remove deleted ones.
+
+        Cache files that cannot be read are indexed as unreadable and are not
+        read again until they are changed.
+
+        Args:
+            trajectories_format: File extension of the cache files
+            read_cache_file: Reads a cache file, e.g., `CacheManager.read_cache_file`
+        """
+        stats: dict[str, os.stat_result] = {}
+        journal_stats: dict[str, os.stat_result] = {}
+        for entry in os.scandir(self._cache_dir):
+            if entry.name.endswith(trajectories_format) and entry.is_file():
+                stats[entry.name] = entry.stat()
+            elif entry.name.endswith(JOURNAL_SUFFIX):
+                journal_stats[entry.name] = entry.stat()
+        states = {
+            file_name: _file_state(
+                stat, journal_stats.get(f"{file_name}{JOURNAL_SUFFIX}")
+            )
+            for file_name, stat in stats.items()
+        }
+        with self._lock:
+            indexed = {
+                file_name: tuple(state)
+                for file_name, *state in self._connection.execute(
+                    "SELECT file_name, mtime_ns, size, journal_mtime_ns, journal_size "
+                    "FROM cache_files"
+                )
+                if file_name.endswith(trajectories_format)
+            }
+        removed = [(file_name,) for file_name in indexed.keys() - states.keys()]
+        rows = [
+            self._read_row(self._cache_dir / file_name, state, read_cache_file)
+            for file_name, state in states.items()
+            if indexed.get(file_name) != state
+        ]
+        if not removed and not rows:
+            return
+        logger.debug(
+            "Updating cache index: %d changed, %d removed file(s)",
+            len(rows),
+            len(removed),
+        )
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM cache_files WHERE file_name = ?", removed
+            )
+            self._connection.executemany(_UPSERT, rows)
+
+    def rebuild(
+        self,
+        trajectories_format: str,
+        read_cache_file: Callable[[Path], CacheFile],
+    ) -> None:
+        """Rebuild the index from the cache files.
+
+        Args:
+            trajectories_format: File extension of the cache files
+            read_cache_file: Reads a cache file, e.g., `CacheManager.read_cache_file`
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM cache_files")
+        self.sync(trajectories_format, read_cache_file)
+
+    def query(
+        self,
+        trajectories_format: str = ".json",
+        goal: str | None = None,
+        include_invalid: bool = False,
+        max_failure_count: int | None = None,
+        created_after: datetime | None = None,
+    ) -> list[CacheIndexEntry]:
+        """Query the indexed (readable) cache files ordered by file name.
+
+        Does not check whether the index is up to date (see `sync()`).
+
+        Args:
+            trajectories_format: File extension of the cache files
+            goal: Only include caches whose goal contains this text (ignoring
+                case)
+            include_invalid: Whether to include invalidated caches
+            max_failure_count: Only include caches with at most this many
+                recorded failures
+            created_after: Only include caches created after this time
+
+        Returns:
+            The metadata of the matching cache files
+        """
+        conditions = ["error IS NULL", "substr(file_name, -?) = ?"]
+        parameters: list[object] = [len(trajectories_format), trajectories_format]
+        if goal is not None:
+            conditions.append("goal LIKE ? ESCAPE '\\'")
+            parameters.append(f"%{_escape_like(goal)}%")
+        if not include_invalid:
+            conditions.append("is_valid")
+        if max_failure_count is not None:
+            conditions.append("failure_count <= ?")
+            parameters.append(max_failure_count)
+        if created_after is not None:
+            conditions.append("created_at > ?")
+            parameters.append(_to_utc_isoformat(created_after))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM cache_files "  # noqa: S608
+                f"WHERE {' AND '.join(conditions)} ORDER BY file_name",
+                parameters,
+            ).fetchall()
+        return [
+            CacheIndexEntry(
+                path=self._cache_dir / file_name,
+                goal=goal_,
+                created_at=created_at,
+                last_executed_at=last_executed_at,
+                execution_attempts=execution_attempts,
+                failure_count=failure_count,
+                is_valid=is_valid,
+                invalidation_reason=invalidation_reason,
+                cache_parameters=json.loads(cache_parameters),
+                step_count=step_count,
+            )
+            for (
+                file_name,
+                _,
+                _,
+                _,
+                _,
+                goal_,
+                created_at,
+                last_executed_at,
+                execution_attempts,
+                failure_count,
+                is_valid,
+                invalidation_reason,
+                cache_parameters,
+                step_count,
+                _,
+            ) in rows
+        ]
+
+    @staticmethod
+    def _to_row(
+        cache_file_path: Path, state: _FileState, cache_file: CacheFile
+    ) -> _Row:
+        metadata = cache_file.metadata
+        return (
+            cache_file_path.name,
+            *state,
+            metadata.goal,
+            _to_utc_isoformat(metadata.created_at),
+            _to_utc_isoformat(metadata.last_executed_at),
+            metadata.execution_attempts,
+            len(metadata.failures),
+            metadata.is_valid,
+            metadata.invalidation_reason,
+            json.dumps(cache_file.cache_parameters),
+            len(cache_file.trajectory),
+            None,
+        )
+
+    @classmethod
+    def _read_row(
+        cls,
+        cache_file_path: Path,
+        state: _FileState,
+        read_cache_file: Callable[[Path], CacheFile],
+    ) -> _Row:
+        try:
+            return cls._to_row(cache_file_path, state, read_cache_file(cache_file_path))
+        except Exception as e:
+            logger.exception("Failed to read cache file %s", cache_file_path.name)
+            return (
+                cache_file_path.name,
+                *state,
+                None,
+                None,
+                None,
+                0,
+                0,
+                False,
+                None,
+                "{}",
+                0,
+                str(e) or type(e).__name__,
+            )
@@ -0,0 +1,279 @@
+"""Append-only journal of the execution metadata of cache files.
+
+Updating the execution metadata of a cache file (execution attempts, failures,
+validity, screen settle timings) used to rewrite the whole cache file including
+its trajectory. Instead, the changes are appended as JSON lines to a journal
+beside the cache file (see `journal_path()`) and folded into the cache file only
+once the journal has grown (see `CacheManager`).
+
+Every entry of a journal has a sequence number and the cache file records the
+sequence number of the last entry folded into it (`CacheMetadata.journal_sequence`).
+The cache file and the journal are both replaced atomically, so a crash at any
+point leaves a consistent state: entries already folded into the cache file are
+skipped and partially written entries are ignored.
+
+Cache files and journals of a cache directory must only be read and written while
+holding the lock of the cache directory (see `cache_dir_lock()`) so that agents
+sharing a cache directory do not lose updates.
+"""
+
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Literal
+
+from pydantic import BaseModel, ValidationError
+
+from askui.models.shared.settings import (
+    CacheFailure,
+    CacheMetadata,
+    ScreenSettleTiming,
+)
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock_file(file: IO[bytes]) -> None:
+        file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            except OSError:  # noqa: PERF203
+                # gives up after 10 attempts, 1 second apart
+                continue
+            else:
+                return
+
+    def _unlock_file(file: IO[bytes]) -> None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(file: IO[bytes]) -> None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(file: IO[bytes]) -> None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+LOCK_FILE_NAME = ".askui_cache.lock"
+
+CACHE_METADATA_EVENT_TYPE = Literal[
+    "execution_attempt",
+    "failure",
+    "invalidation",
+    "revalidation",
+    "screen_settle_timings",
+    "compaction",
+]
+
+
+class CacheMetadataEvent(BaseModel):
+    """Change of the execution metadata of a cache file (entry of its journal).
+
+    Args:
+        type: Type of the change:
+            - "execution_attempt": The cache was executed (at `timestamp`)
+            - "failure": A step failed (see `failure`)
+            - "invalidation": The cache was invalidated (for `reason`)
+            - "revalidation": The cache was marked as valid again
+            - "screen_settle_timings": Screen settle timings of steps were learned
+              (see `screen_settle_timings`)
+            - "compaction": All previous entries were folded into the cache file
+        timestamp: When the change happened
+        failure: The failure (only for "failure")
+        reason: Why the cache was invalidated (only for "invalidation")
+        screen_settle_timings: The learned timings by step index (only for
+            "screen_settle_timings")
+        sequence: Sequence number within the journal, assigned when appended
+    """
+
+    type: CACHE_METADATA_EVENT_TYPE
+    timestamp: datetime
+    failure: CacheFailure | None = None
+    reason: str | None = None
+    screen_settle_timings: dict[int, ScreenSettleTiming] | None = None
+    sequence: int = 0
+
+
+def journal_path(cache_file_path: Path) -> Path:
+    """Get the path of the journal of a cache file."""
+    return cache_file_path.with_name(f"{cache_file_path.name}{JOURNAL_SUFFIX}")
+
+
+@contextlib.contextmanager
+def cache_dir_lock(cache_dir: Path) -> Iterator[None]:
+    """Lock a cache directory against other threads and processes.
+
+    Not reentrant. If the lock file cannot be created, e.g., because the cache
+    directory is read-only and, hence, cannot be written by anyone, the cache
+    directory is not locked.
+
+    Args:
+        cache_dir: The cache directory
+    """
+    try:
+        lock_file = (cache_dir / LOCK_FILE_NAME).open("a+b")
+    except OSError:
+        logger.debug("Failed to create lock file in %s, not locking", cache_dir)
+        yield
+        return
+    with lock_file:
+        _lock_file(lock_file)
+        try:
+            yield
+        finally:
+            _unlock_file(lock_file)
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    """Write a file by replacing it so that it is never partially written.
+
+    Args:
+        path: Path to the file
+        data: The new content of the file
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as file:
+        try:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            file.close()
+            Path(file.name).unlink()
+            raise
+    Path(file.name).replace(path)
+
+
+def apply_events(metadata: CacheMetadata, events: list[CacheMetadataEvent]) -> bool:
+    """Apply the journal entries not yet applied to cache metadata.
+
+    Args:
+        metadata: The metadata to apply the entries to (in place)
+        events: The entries of the journal
+
+    Returns:
+        `False` if entries newer than the metadata are missing from the journal,
+        i.e., they were folded into the cache file after the metadata was read,
+        so that the metadata must be read again; `True` otherwise.
+    """
+    for event in events:
+        if event.sequence <= metadata.journal_sequence:
+            continue
+        if event.type == "compaction" or event.sequence != (
+            metadata.journal_sequence + 1
+        ):
+            return False
+        if event.type == "execution_attempt":
+            metadata.execution_attempts += 1
+            metadata.last_executed_at = event.timestamp
+        elif event.type == "failure" and event.failure is not None:
+            metadata.failures.append(event.failure)
+        elif event.type == "invalidation":
+            metadata.is_valid = False
+            metadata.invalidation_reason = event.reason
+        elif event.type == "revalidation":
+            metadata.is_valid = True
+            metadata.invalidation_reason = None
+        elif (
+            event.type == "screen_settle_timings"
+            and event.screen_settle_timings is not None
+        ):
+            metadata.screen_settle_timings.update(event.screen_settle_timings)
+        metadata.journal_sequence = event.sequence
+    return True
+
+
+class CacheJournal:
+    """Journal of the execution metadata changes of a cache file.
+
+    Must only be used while holding the `cache_dir_lock()` of the cache directory.
+
+    Args:
+        cache_file_path: Path to the cache file
+    """
+
+    def __init__(self, cache_file_path: Path) -> None:
+        self.path = journal_path(cache_file_path)
+
+    def read(self) -> list[CacheMetadataEvent]:
+        """Read the entries of the journal, skipping partially written ones.
+
+        Returns:
+            The entries in order of their sequence numbers
+        """
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return []
+        events: list[CacheMetadataEvent] = []
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(CacheMetadataEvent.model_validate_json(line))
+            except ValidationError:  # noqa: PERF203
+                logger.warning("Skipping corrupt entry of journal %s", self.path)
+        return events
+
+    def append(self, events: list[CacheMetadataEvent]) -> int:
+        """Append entries to the journal, assigning their sequence numbers.
+
+        Args:
+            events: The entries to append (modified in place)
+
+        Returns:
+            The number of entries in the journal since it was last compacted
+        """
+        existing_events = self.read()
+        sequence = existing_events[-1].sequence if existing_events else 0
+        for event in events:
+            sequence += 1
+            event.sequence = sequence
+        lines = b"".join(
+            f"{event.model_dump_json(exclude_none=True)}\n".encode() for event in events
+        )
+        with self.path.open("a+b") as file:
+            # terminate an entry that was only partially written, e.g., on a crash
+            if file.seek(0, os.SEEK_END) > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    lines = b"\n" + lines
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+        return sum(
+            1 for event in [*existing_events, *events] if event.type != "compaction"
+        )
+
+    def reset(self, sequence: int) -> None:
+        """Mark all entries up to a sequence number as folded into the cache file.
+
+        Args:
+            sequence: The sequence number of the last entry folded into the cache
+                file (see `CacheMetadata.journal_sequence`)
+        """
+        event = CacheMetadataEvent(
+            type="compaction",
+            timestamp=datetime.now(tz=timezone.utc),
+            sequence=sequence,
+        )
+        write_atomically(
+            self.path, f"{event.model_dump_json(exclude_none=True)}\n".encode()
+        )
+
+    def delete(self) -> None:
+        """Delete the journal, e.g., when the cache file is replaced."""
+        self.path.unlink(missing_ok=True)
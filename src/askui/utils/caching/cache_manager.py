@@ -1,5 +1,6 @@
 """Cache manager for handling cache metadata, validation, and recording."""
 
+import itertools
 import json
 import logging
 from datetime import datetime, timezone
@@ -9,6 +10,7 @@ from typing import TYPE_CHECKING, Any
 from PIL import Image
 
 from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
     MessageParam,
     ToolUseBlockParam,
     UsageParam,
@@ -18,9 +20,18 @@ from askui.models.shared.settings import (
     CacheFile,
     CacheMetadata,
     CacheWritingSettings,
+    ScreenSettleTiming,
     VisualValidationMetadata,
 )
 from askui.models.shared.tools import ToolCollection
+from askui.utils.caching.cache_index import CacheIndex, CacheIndexEntry
+from askui.utils.caching.cache_journal import (
+    CacheJournal,
+    CacheMetadataEvent,
+    apply_events,
+    cache_dir_lock,
+    write_atomically,
+)
 from askui.utils.caching.cache_parameter_handler import CacheParameterHandler
 from askui.utils.caching.cache_validator import (
     CacheValidator,
@@ -29,11 +40,11 @@ from askui.utils.caching.cache_validator import (
     StepFailureCountValidator,
     TotalFailureRateValidator,
 )
+from askui.utils.image_hashing import ahash_batch, hash_to_hex, phash_batch
+from askui.utils.image_utils import base64_to_image
 from askui.utils.visual_validation import (
-    compute_ahash,
-    compute_phash,
     extract_region,
-    find_recent_screenshot,
+    find_recent_screenshot_sources,
     get_validation_coordinate,
 )
 
@@ -49,20 +60,33 @@ class CacheManager:
     This class provides high-level operations for cache management including:
     - Reading cache files from disk
     - Writing cache files to disk
+    - Finding cache files by their metadata (see `CacheIndex`)
     - Recording trajectories during execution (write mode)
     - Recording execution attempts and failures
     - Validating caches using pluggable validation strategies
     - Invalidating caches when they fail validation
     - Updating metadata on disk
+
+    Execution metadata updates are appended to the journal of a cache file
+    (see `CacheJournal`) instead of rewriting the cache file. The journal is
+    folded into the cache file once it holds `journal_compaction_threshold`
+    entries.
     """
 
-    def __init__(self, validators: list[CacheValidator] | None = None) -> None:
+    def __init__(
+        self,
+        validators: list[CacheValidator] | None = None,
+        journal_compaction_threshold: int = 100,
+    ) -> None:
         """Initialize cache manager.
 
         Args:
             validators: Optional list of cache validators. If None, uses default
                 validators (StepFailureCount, TotalFailureRate, StaleCache).
+            journal_compaction_threshold: Number of journal entries of a cache
+                file at which they are folded into the cache file.
         """
+        self._journal_compaction_threshold = journal_compaction_threshold
         # Validation
         if validators is None:
             # Use default validators
@@ -215,21 +239,46 @@ class CacheManager:
             error_message: Error message describing the failure
         """
         try:
-            # Record the attempt and failure
-            self.record_execution_attempt(cache_file, success=False)
-            self.record_step_failure(
-                cache_file, step_index=step_index, error_message=error_message
-            )
+            cache_path = Path(cache_file_path)
+            with cache_dir_lock(cache_path.parent):
+                # Include updates of other agents before validating
+                self._refresh_metadata(cache_file, cache_path)
+
+                # Record the attempt and failure
+                self.record_execution_attempt(cache_file, success=False)
+                self.record_step_failure(
+                    cache_file, step_index=step_index, error_message=error_message
+                )
+                metadata = cache_file.metadata
+                assert metadata.last_executed_at is not None
+                events = [
+                    CacheMetadataEvent(
+                        type="execution_attempt", timestamp=metadata.last_executed_at
+                    ),
+                    CacheMetadataEvent(
+                        type="failure",
+                        timestamp=metadata.failures[-1].timestamp,
+                        failure=metadata.failures[-1],
+                    ),
+                ]
 
-            # Check if cache should be invalidated
-            should_inv, reason = self.should_invalidate(
-                cache_file, step_index=step_index
-            )
-            if should_inv and reason:
-                self.invalidate_cache(cache_file, reason=reason)
+                # Check if cache should be invalidated
+                should_inv, reason = self.should_invalidate(
+                    cache_file, step_index=step_index
+                )
+                if should_inv and reason:
+                    self.invalidate_cache(cache_file, reason=reason)
+                    events.append(
+                        CacheMetadataEvent(
+                            type="invalidation",
+                            timestamp=metadata.last_executed_at,
+                            reason=reason,
+                        )
+                    )
 
-            # Write updated metadata back to disk
-            self._write_cache_file(cache_file, cache_file_path)
+                # Append updated metadata to the journal
+                self._append_to_journal(cache_file, cache_path, events)
+            self._update_index(cache_file, cache_path)
             logger.debug(
                 "Updated cache metadata after failure: %s", Path(cache_file_path).name
             )
@@ -250,28 +299,165 @@ class CacheManager:
             success: Whether the execution was successful
         """
         try:
-            self.record_execution_attempt(cache_file, success=success)
-
-            # Write updated metadata back to disk
-            self._write_cache_file(cache_file, cache_file_path)
+            cache_path = Path(cache_file_path)
+            with cache_dir_lock(cache_path.parent):
+                self._refresh_metadata(cache_file, cache_path)
+                self.record_execution_attempt(cache_file, success=success)
+                assert cache_file.metadata.last_executed_at is not None
+
+                # Append updated metadata to the journal
+                self._append_to_journal(
+                    cache_file,
+                    cache_path,
+                    [
+                        CacheMetadataEvent(
+                            type="execution_attempt",
+                            timestamp=cache_file.metadata.last_executed_at,
+                        )
+                    ],
+                )
+            self._update_index(cache_file, cache_path)
             logger.info("Updated cache metadata: %s", Path(cache_file_path).name)
         except Exception:
             logger.exception("Failed to update cache metadata")
 
-    def _write_cache_file(self, cache_file: CacheFile, cache_file_path: str) -> None:
-        """Write cache file to disk.
+    def update_screen_settle_timings(
+        self,
+        cache_file: CacheFile,
+        cache_file_path: str,
+        screen_settle_timings: dict[int, ScreenSettleTiming],
+    ) -> None:
+        """Update the learned screen settle timings of steps and write to disk.
+
+        Args:
+            cache_file: The cache file to update
+            cache_file_path: Path to write the updated cache file
+            screen_settle_timings: The timings learned during a replay by step
+                index (replacing the previous timings of these steps)
+        """
+        try:
+            cache_path = Path(cache_file_path)
+            with cache_dir_lock(cache_path.parent):
+                self._refresh_metadata(cache_file, cache_path)
+                cache_file.metadata.screen_settle_timings.update(screen_settle_timings)
+                self._append_to_journal(
+                    cache_file,
+                    cache_path,
+                    [
+                        CacheMetadataEvent(
+                            type="screen_settle_timings",
+                            timestamp=datetime.now(tz=timezone.utc),
+                            screen_settle_timings=screen_settle_timings,
+                        )
+                    ],
+                )
+            logger.debug(
+                "Updated screen settle timings: %s", Path(cache_file_path).name
+            )
+        except Exception:
+            logger.exception("Failed to update screen settle timings")
+
+    def _refresh_metadata(self, cache_file: CacheFile, cache_file_path: Path) -> None:
+        """Apply the journal entries appended since the cache file was read.
+
+        Must be called while holding the lock of the cache directory.
+
+        Args:
+            cache_file: The cache file to update (in place)
+            cache_file_path: Path to the cache file
+        """
+        if not apply_events(cache_file.metadata, CacheJournal(cache_file_path).read()):
+            # the journal was compacted in the meantime
+            cache_file.metadata = self._read_cache_file(cache_file_path).metadata
+
+    def _append_to_journal(
+        self,
+        cache_file: CacheFile,
+        cache_file_path: Path,
+        events: list[CacheMetadataEvent],
+    ) -> None:
+        """Append metadata updates to the journal, compacting it if it grew too long.
+
+        Must be called while holding the lock of the cache directory.
+
+        Args:
+            cache_file: The cache file the updates were applied to
+            cache_file_path: Path to the cache file
+            events: The updates (already applied to `cache_file`)
+        """
+        journal = CacheJournal(cache_file_path)
+        n_events = journal.append(events)
+        cache_file.metadata.journal_sequence = events[-1].sequence
+        if n_events >= self._journal_compaction_threshold:
+            compacted_cache_file = self._read_cache_file(cache_file_path)
+            self._write_cache_file(compacted_cache_file, cache_file_path)
+            journal.reset(compacted_cache_file.metadata.journal_sequence)
+            logger.debug("Compacted journal of %s", cache_file_path.name)
+
+    def _write_cache_file(self, cache_file: CacheFile, cache_file_path: Path) -> None:
+        """Write cache file to disk atomically.
+
+        Must be called while holding the lock of the cache directory.
 
         Args:
             cache_file: The cache file to write
             cache_file_path: Path to write the cache file
         """
-        cache_path = Path(cache_file_path)
-        with cache_path.open("w", encoding="utf-8") as f:
-            json.dump(
+        write_atomically(
+            cache_file_path,
+            json.dumps(
                 cache_file.model_dump(mode="json"),
-                f,
                 indent=2,
                 default=str,
+            ).encode(),
+        )
+
+    @staticmethod
+    def _update_index(cache_file: CacheFile, cache_file_path: Path) -> None:
+        """Update the index entry of a cache file that was just written.
+
+        Args:
+            cache_file: The cache file that was written
+            cache_file_path: Path the cache file was written to
+        """
+        try:
+            with CacheIndex(cache_file_path.parent) as index:
+                index.update(cache_file_path, cache_file)
+        except Exception:
+            # the index is updated from the cache file on the next lookup
+            logger.exception("Failed to update cache index")
+
+    @staticmethod
+    def find_cache_files(
+        cache_dir: str | Path,
+        trajectories_format: str = ".json",
+        goal: str | None = None,
+        include_invalid: bool = False,
+        max_failure_count: int | None = None,
+    ) -> list[CacheIndexEntry]:
+        """Find cache files by their metadata without reading their trajectories.
+
+        Only cache files that were added or changed since the last lookup are read
+        (see `CacheIndex`).
+
+        Args:
+            cache_dir: Directory containing the cache files
+            trajectories_format: File extension of the cache files
+            goal: Only include caches whose goal contains this text (ignoring case)
+            include_invalid: Whether to include invalidated caches
+            max_failure_count: Only include caches with at most this many
+                recorded failures
+
+        Returns:
+            Metadata of the matching cache files ordered by file name
+        """
+        with CacheIndex(cache_dir) as index:
+            index.sync(trajectories_format, CacheManager.read_cache_file)
+            return index.query(
+                trajectories_format=trajectories_format,
+                goal=goal,
+                include_invalid=include_invalid,
+                max_failure_count=max_failure_count,
             )
 
     @staticmethod
@@ -282,6 +468,21 @@ class CacheManager:
         1. Legacy format: Just a list of ToolUseBlockParam dicts
         2. New format: CacheFile with metadata and trajectory
 
+        The metadata updates of the journal of the cache file are applied.
+
+        Args:
+            cache_file_path: Path to the cache file
+
+        Returns:
+            CacheFile object with metadata and trajectory
+        """
+        with cache_dir_lock(cache_file_path.parent):
+            return CacheManager._read_cache_file(cache_file_path)
+
+    @staticmethod
+    def _read_cache_file(cache_file_path: Path) -> CacheFile:
+        """Read cache file while holding the lock of the cache directory.
+
         Args:
             cache_file_path: Path to the cache file
 
@@ -305,6 +506,8 @@ class CacheManager:
             )
         else:
             cache_file = CacheFile(**raw_data)
+        if not apply_events(cache_file.metadata, CacheJournal(cache_file_path).read()):
+            logger.warning("Journal of cache file %s is incomplete", cache_file_path)
 
         logger.info(
             "Successfully loaded cache: %s steps, %s parameters",
@@ -527,8 +730,14 @@ class CacheManager:
             block.id: block for block in trajectory
         }
 
-        # Iterate through messages to find tool uses and their context
-        validated_count = 0
+        # Find the screenshot before each message in a single pass; the
+        # screenshots are only decoded when computing the hashes below
+        screenshot_sources = find_recent_screenshot_sources(messages)
+
+        # Collect the regions to hash in order of the messages
+        pending: list[
+            tuple[ToolUseBlockParam, Base64ImageSourceParam, tuple[int, int]]
+        ] = []
         for i, message in enumerate(messages):
             if message.role != "assistant":
                 continue
@@ -557,9 +766,9 @@ class CacheManager:
                     trajectory_block.visual_representation = None
                     continue
 
-                # Find most recent screenshot BEFORE this tool use
-                screenshot = find_recent_screenshot(messages, from_index=i - 1)
-                if not screenshot:
+                # Most recent screenshot BEFORE this tool use
+                screenshot_source = screenshot_sources[i]
+                if screenshot_source is None:
                     logger.warning(
                         "No screenshot found before tool_id=%s, "
                         "skipping visual validation",
@@ -568,28 +777,34 @@ class CacheManager:
                     trajectory_block.visual_representation = None
                     continue
 
-                # Extract region and compute hash
-                try:
-                    # Pass coordinate in the format extract_region expects
-                    region = extract_region(
-                        screenshot,
-                        {"coordinate": list(coordinate)},
-                        region_size=self._cache_writer_settings.visual_validation_region_size,
-                    )
-                    visual_hash = self._compute_visual_hash(
-                        region, self._cache_writer_settings.visual_verification_method
+                pending.append((trajectory_block, screenshot_source, coordinate))
+
+        validated_count = 0
+        for _, group in itertools.groupby(pending, key=lambda item: item[1].blob_key):
+            # Decode each screenshot once for all the regions to hash within it
+            items = list(group)
+            tool_ids = [trajectory_block.id for trajectory_block, _, _ in items]
+            visual_hashes: list[str | None]
+            try:
+                screenshot = base64_to_image(items[0][1].data)
+                visual_hashes = list(
+                    self._compute_region_hashes(
+                        screenshot, [coordinate for _, _, coordinate in items]
                     )
-                    trajectory_block.visual_representation = visual_hash
+                )
+            except Exception:
+                logger.exception(
+                    "Failed to compute visual hashes for tool_ids=%s", tool_ids
+                )
+                visual_hashes = [None] * len(items)
+            else:
+                logger.debug("Added visual validation hashes for tool_ids=%s", tool_ids)
+            for (trajectory_block, _, _), visual_hash in zip(
+                items, visual_hashes, strict=True
+            ):
+                trajectory_block.visual_representation = visual_hash
+                if visual_hash is not None:
                     validated_count += 1
-                    logger.debug(
-                        "Added visual validation hash for tool_id=%s",
-                        block.id,
-                    )
-                except Exception:
-                    logger.exception(
-                        "Failed to compute visual hash for tool_id=%s", block.id
-                    )
-                    trajectory_block.visual_representation = None
 
         if validated_count > 0:
             logger.info(
@@ -597,27 +812,56 @@ class CacheManager:
                 validated_count,
             )
 
-    def _compute_visual_hash(self, image: Image.Image, method: str) -> str:
-        """Compute visual hash using specified method.
+    def _compute_region_hashes(
+        self, screenshot: Image.Image, coordinates: list[tuple[int, int]]
+    ) -> list[str]:
+        """Compute the visual hashes of the regions of a screenshot around actions.
 
         Args:
-            image: PIL Image to hash
+            screenshot: Screenshot taken before the actions
+            coordinates: Coordinates of the actions
+
+        Returns:
+            String representations of the hashes in order of the coordinates
+        """
+        regions = [
+            # Pass coordinate in the format extract_region expects
+            extract_region(
+                screenshot,
+                {"coordinate": list(coordinate)},
+                region_size=self._cache_writer_settings.visual_validation_region_size,
+            )
+            for coordinate in coordinates
+        ]
+        return self._compute_visual_hashes(
+            regions, self._cache_writer_settings.visual_verification_method
+        )
+
+    def _compute_visual_hashes(
+        self, images: list[Image.Image], method: str
+    ) -> list[str]:
+        """Compute visual hashes of images at once using specified method.
+
+        Args:
+            images: PIL Images to hash
             method: Hash method ("phash", "ahash", or "none")
 
         Returns:
-            String representation of the hash
+            String representations of the hashes in order of the images
 
         Raises:
             ValueError: If method is not supported
         """
         if method == "phash":
-            return compute_phash(image, hash_size=8)
-        if method == "ahash":
-            return compute_ahash(image, hash_size=8)
-        if method == "none":
-            return ""
-        msg = f"Unsupported visual verification method: {method}"
-        raise ValueError(msg)
+            image_hashes = phash_batch(images, hash_size=8)
+        elif method == "ahash":
+            image_hashes = ahash_batch(images, hash_size=8)
+        elif method == "none":
+            return [""] * len(images)
+        else:
+            msg = f"Unsupported visual verification method: {method}"
+            raise ValueError(msg)
+        return [hash_to_hex(image_hash, hash_size=8) for image_hash in image_hashes]
 
     def _generate_cache_file(
         self,
@@ -655,8 +899,12 @@ class CacheManager:
             cache_parameters=parameters_dict,
         )
 
-        with cache_file_path.open("w", encoding="utf-8") as f:
-            json.dump(cache_file.model_dump(mode="json"), f, indent=4)
+        with cache_dir_lock(cache_file_path.parent):
+            with cache_file_path.open("w", encoding="utf-8") as f:
+                json.dump(cache_file.model_dump(mode="json"), f, indent=4)
+            # the journal of a replaced cache file does not apply anymore
+            CacheJournal(cache_file_path).delete()
+        self._update_index(cache_file, cache_file_path)
         logger.info("Cache file successfully written: %s", cache_file_path)
 
     def _accumulate_usage(self, step_usage: UsageParam) -> None:
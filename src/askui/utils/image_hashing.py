@@ -0,0 +1,188 @@
+"""Perceptual image hashes of many images at once.
+
+Computes the same hashes as the `imagehash` library, bit for bit, but for a batch
+of images (e.g., the regions around the actions of a trajectory) with a single
+vectorized computation and represented as integers instead of `ImageHash` objects:
+
+- Perceptual hash (pHash): Sign of the low frequencies of the DCT of the image
+  relative to their median
+- Average hash (aHash): Brightness of each pixel relative to the mean brightness
+- Difference hash (dHash): Brightness gradient between horizontally adjacent
+  pixels
+
+The bits of a hash are ordered row by row with the first bit being the most
+significant one, so that `hash_to_hex()` produces the same hex strings as
+`str(imagehash.ImageHash)`, which is the format of hashes in cache files.
+"""
+
+import math
+from collections.abc import Callable, Sequence
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+import scipy.fftpack
+from PIL import Image
+
+IMAGE_HASH_METHOD = Literal["phash", "ahash", "dhash"]
+
+
+def _grayscale_pixels(
+    images: Sequence[Image.Image], size: tuple[int, int]
+) -> npt.NDArray[np.uint8]:
+    """Downscale images to grayscale pixel arrays stacked along the first axis."""
+    return np.stack(
+        [
+            np.asarray(image.convert("L").resize(size, Image.Resampling.LANCZOS))
+            for image in images
+        ]
+    )
+
+
+def _bits_to_ints(bits: npt.NDArray[np.bool_]) -> list[int]:
+    """Convert the bits of each hash (first axis) to an integer."""
+    flat_bits = bits.reshape(len(bits), -1)
+    padding = -flat_bits.shape[1] % 8
+    return [
+        int.from_bytes(row.tobytes(), "big") >> padding
+        for row in np.packbits(flat_bits, axis=1)
+    ]
+
+
+def phash_batch(
+    images: Sequence[Image.Image], hash_size: int = 8, highfreq_factor: int = 4
+) -> list[int]:
+    """Compute perceptual hashes (pHash) of images.
+
+    Equivalent to `imagehash.phash()` for each image.
+
+    Args:
+        images: PIL Images to hash
+        hash_size: Size of the hash (default: 8, produces 64-bit hash)
+        highfreq_factor: Factor by which the images are downscaled less than
+            `hash_size` before computing the DCT (default: 4)
+
+    Returns:
+        Hashes of the images in order
+    """
+    if not images:
+        return []
+    image_size = hash_size * highfreq_factor
+    pixels = _grayscale_pixels(images, (image_size, image_size))
+    # Same DCT implementation as `imagehash` to get the same bits for flat images
+    # whose frequencies differ only by rounding errors
+    dct = scipy.fftpack.dct(scipy.fftpack.dct(pixels, axis=1), axis=2)
+    low_frequencies = dct[:, :hash_size, :hash_size]
+    medians = np.median(low_frequencies.reshape(len(images), -1), axis=1)
+    return _bits_to_ints(low_frequencies > medians[:, np.newaxis, np.newaxis])
+
+
+def ahash_batch(images: Sequence[Image.Image], hash_size: int = 8) -> list[int]:
+    """Compute average hashes (aHash) of images.
+
+    Equivalent to `imagehash.average_hash()` for each image.
+
+    Args:
+        images: PIL Images to hash
+        hash_size: Size of the hash (default: 8, produces 64-bit hash)
+
+    Returns:
+        Hashes of the images in order
+    """
+    if not images:
+        return []
+    pixels = _grayscale_pixels(images, (hash_size, hash_size))
+    means = pixels.mean(axis=(1, 2))
+    return _bits_to_ints(pixels > means[:, np.newaxis, np.newaxis])
+
+
+def dhash_batch(images: Sequence[Image.Image], hash_size: int = 8) -> list[int]:
+    """Compute difference hashes (dHash) of images.
+
+    Equivalent to `imagehash.dhash()` for each image.
+
+    Args:
+        images: PIL Images to hash
+        hash_size: Size of the hash (default: 8, produces 64-bit hash)
+
+    Returns:
+        Hashes of the images in order
+    """
+    if not images:
+        return []
+    pixels = _grayscale_pixels(images, (hash_size + 1, hash_size))
+    return _bits_to_ints(pixels[:, :, 1:] > pixels[:, :, :-1])
+
+
+_HASH_BATCH_FUNCTIONS: dict[
+    IMAGE_HASH_METHOD, Callable[[Sequence[Image.Image], int], list[int]]
+] = {
+    "phash": phash_batch,
+    "ahash": ahash_batch,
+    "dhash": dhash_batch,
+}
+
+
+def compute_image_hashes(
+    images: Sequence[Image.Image], method: IMAGE_HASH_METHOD, hash_size: int = 8
+) -> list[int]:
+    """Compute hashes of images using the specified method.
+
+    Args:
+        images: PIL Images to hash
+        method: Hash method ("phash", "ahash", or "dhash")
+        hash_size: Size of the hash (default: 8, produces 64-bit hash)
+
+    Returns:
+        Hashes of the images in order
+
+    Raises:
+        ValueError: If method is not supported
+    """
+    hash_batch = _HASH_BATCH_FUNCTIONS.get(method)
+    if hash_batch is None:
+        msg = f"Unsupported image hash method: {method}"
+        raise ValueError(msg)
+    return hash_batch(images, hash_size)
+
+
+def hash_to_hex(image_hash: int, hash_size: int = 8) -> str:
+    """Serialize a hash as hex string (format of `str(imagehash.ImageHash)`).
+
+    Args:
+        image_hash: The hash
+        hash_size: Size of the hash (default: 8, i.e., 64-bit hash)
+
+    Returns:
+        Hex string of the hash, zero-padded to the number of bits of the hash
+    """
+    width = math.ceil(hash_size * hash_size / 4)
+    return f"{image_hash:0{width}x}"
+
+
+def hex_to_hash(hex_str: str) -> int:
+    """Parse a hash serialized by `hash_to_hex()` (or by `imagehash`).
+
+    Args:
+        hex_str: Hex string of the hash
+
+    Returns:
+        The hash
+
+    Raises:
+        ValueError: If the string is not a hex string
+    """
+    return int(hex_str, 16)
+
+
+def hamming_distance(hash1: int, hash2: int) -> int:
+    """Compute the number of bits in which two hashes of the same size differ.
+
+    Args:
+        hash1: First hash
+        hash2: Second hash
+
+    Returns:
+        Hamming distance (number of differing bits)
+    """
+    return (hash1 ^ hash2).bit_count()
@@ -4,11 +4,16 @@ import io
 import pathlib
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Union
+from typing import TYPE_CHECKING, Any, Callable, Literal, Union
 
 from PIL import Image, ImageDraw, UnidentifiedImageError
 from PIL import Image as PILImage
-from pydantic import ConfigDict, RootModel
+from pydantic import ConfigDict, PrivateAttr, RootModel
+
+from askui.models.types.geometry import CaptureRegion
+
+if TYPE_CHECKING:
+    from askui.models.shared.settings import ImageEncoding
 
 
 def image_to_data_url(image: PILImage.Image) -> str:
@@ -66,6 +71,130 @@ def data_url_to_image(data_url: str) -> Image.Image:
         raise ValueError(error_msg) from e
 
 
+# JPEG start of frame markers (holding the image size); excludes DHT (0xC4),
+# JPG (0xC8) and DAC (0xCC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# JPEG markers without a length (and payload)
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD9)})
+# Bytes (base64 characters) to decode first when reading the size of an image;
+# enough for PNG, GIF and WebP headers and the SOF segment of most JPEGs
+_IMAGE_HEADER_BASE64_LENGTH = 4096
+
+
+def _read_header_image_size(data: bytes) -> tuple[int, int] | None:
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR" and len(data) >= 24:
+        return (
+            int.from_bytes(data[16:20], "big"),
+            int.from_bytes(data[20:24], "big"),
+        )
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return (
+            int.from_bytes(data[6:8], "little"),
+            int.from_bytes(data[8:10], "little"),
+        )
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        return _read_webp_size(data)
+    if data[:2] == b"\xff\xd8":
+        return _read_jpeg_size(data)
+    return None
+
+
+def _read_webp_size(data: bytes) -> tuple[int, int] | None:
+    chunk = data[12:16]
+    if chunk == b"VP8 " and data[23:26] == b"\x9d\x01\x2a":
+        return (
+            int.from_bytes(data[26:28], "little") & 0x3FFF,
+            int.from_bytes(data[28:30], "little") & 0x3FFF,
+        )
+    if chunk == b"VP8L" and data[20] == 0x2F:
+        bits = int.from_bytes(data[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return (
+            int.from_bytes(data[24:27], "little") + 1,
+            int.from_bytes(data[27:30], "little") + 1,
+        )
+    return None
+
+
+def _read_jpeg_size(data: bytes) -> tuple[int, int] | None:
+    offset = 2
+    while offset + 9 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # fill byte
+            offset += 1
+        elif marker in _JPEG_STANDALONE_MARKERS:
+            offset += 2
+        elif marker in _JPEG_SOF_MARKERS:
+            return (
+                int.from_bytes(data[offset + 7 : offset + 9], "big"),
+                int.from_bytes(data[offset + 5 : offset + 7], "big"),
+            )
+        else:
+            offset += 2 + int.from_bytes(data[offset + 2 : offset + 4], "big")
+    return None
+
+
+def read_image_size(data: bytes) -> tuple[int, int]:
+    """Read the size of an encoded image.
+
+    The size is read from the header of PNG, GIF, WebP and JPEG images without
+    decoding the image. Other formats are opened with PIL.
+
+    Args:
+        data (bytes): The encoded image.
+
+    Returns:
+        tuple[int, int]: The (width, height) of the image.
+
+    Raises:
+        ValueError: If the image cannot be read.
+    """
+    size = _read_header_image_size(data)
+    if size is not None:
+        return size
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return image.size
+    except UnidentifiedImageError as e:
+        error_msg = f"Could not read image size: {e}"
+        raise ValueError(error_msg) from e
+
+
+def read_base64_image_size(base64_string: str) -> tuple[int, int]:
+    """Read the size of a base64 encoded image.
+
+    Like `read_image_size()` but only decodes the beginning of `base64_string` if
+    that holds the header of the image.
+
+    Args:
+        base64_string (str): The base64 encoded image.
+
+    Returns:
+        tuple[int, int]: The (width, height) of the image.
+
+    Raises:
+        ValueError: If the base64 string is invalid or the image cannot be read.
+    """
+    length = _IMAGE_HEADER_BASE64_LENGTH
+    try:
+        while length < len(base64_string):
+            header = base64.b64decode(base64_string[:length])
+            size = _read_header_image_size(header)
+            if size is not None:
+                return size
+            if header[:2] != b"\xff\xd8":
+                break
+            # The SOF segment of a JPEG may follow large segments, e.g., EXIF data
+            length *= 8
+        return read_image_size(base64.b64decode(base64_string))
+    except binascii.Error as e:
+        error_msg = f"Could not convert base64 string to image: {e}"
+        raise ValueError(error_msg) from e
+
+
 def draw_point_on_image(
     image: Image.Image, x: int, y: int, size: int = 3
 ) -> Image.Image:
@@ -113,6 +242,86 @@ def image_to_base64(
     return base64.b64encode(image_bytes).decode("utf-8")
 
 
+EncodedImageMediaType = Literal["image/png", "image/jpeg", "image/webp"]
+
+
+@dataclass
+class EncodedImage:
+    """An image encoded for sending it to a model.
+
+    Args:
+        data (str): The base64 encoded image.
+        media_type (EncodedImageMediaType): The media type of the encoded image.
+    """
+
+    data: str
+    media_type: EncodedImageMediaType
+
+    @property
+    def data_url(self) -> str:
+        """The encoded image as data URL."""
+        return f"data:{self.media_type};base64,{self.data}"
+
+
+# Nearest-neighbour sample used to count the colors of an image for "auto"
+_AUTO_ENCODING_SAMPLE_SIZE = (128, 128)
+# Screenshots of user interfaces (flat areas, text) have fewer distinct colors
+# in the sample than photos (gradients, noise)
+_AUTO_ENCODING_MAX_SCREENSHOT_COLORS = 4096
+
+
+def _is_screenshot_like(image: Image.Image) -> bool:
+    sample = image.convert("RGB").resize(
+        _AUTO_ENCODING_SAMPLE_SIZE, Image.Resampling.NEAREST
+    )
+    return sample.getcolors(maxcolors=_AUTO_ENCODING_MAX_SCREENSHOT_COLORS) is not None
+
+
+def _encode_image_bytes(
+    image: Image.Image, encoding: "ImageEncoding | None"
+) -> tuple[bytes, EncodedImageMediaType]:
+    format_ = "png" if encoding is None else encoding.format
+    lossless = encoding is not None and encoding.lossless
+    if format_ == "auto" and _is_screenshot_like(image):
+        format_, lossless = "webp", True
+    elif format_ == "auto":
+        format_ = "jpeg"
+    with io.BytesIO() as buffer:
+        if format_ == "png" or encoding is None:
+            image.save(buffer, format="PNG")
+            return buffer.getvalue(), "image/png"
+        if format_ == "jpeg":
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(buffer, format="JPEG", quality=encoding.quality)
+            return buffer.getvalue(), "image/jpeg"
+        image.save(buffer, format="WEBP", quality=encoding.quality, lossless=lossless)
+        return buffer.getvalue(), "image/webp"
+
+
+def encode_image(
+    image: Image.Image, encoding: "ImageEncoding | None" = None
+) -> EncodedImage:
+    """Encode an image for sending it to a model.
+
+    With the `"auto"` format, screenshots (few distinct colors) are encoded as
+    lossless WebP, so that text and edges and, hence, located coordinates are not
+    affected, and photos as JPEG at the configured quality.
+
+    Args:
+        image (Image.Image): The image to encode.
+        encoding (ImageEncoding | None, optional): The encoding to use. Defaults to
+            PNG.
+
+    Returns:
+        EncodedImage: The base64 encoded image and its media type.
+    """
+    data, media_type = _encode_image_bytes(image, encoding)
+    return EncodedImage(
+        data=base64.b64encode(data).decode("utf-8"), media_type=media_type
+    )
+
+
 def _calc_center_offset(
     image_size: tuple[int, int],
     container_size: tuple[int, int],
@@ -224,9 +433,33 @@ def scale_image_to_fit(
     """
     scaling_results = _calculate_scaling_for_fit(image.size, target_size)
     scaled_image = image.resize(scaling_results.size, Image.Resampling.LANCZOS)
+    if scaled_image.size == target_size and scaled_image.mode == "RGB":
+        # Nothing to pad, so pasting it on a background would only copy it
+        return scaled_image
     return _center_image_in_background(scaled_image, target_size)
 
 
+def bgra_bitmap_to_image(
+    data: bytes,
+    size: tuple[int, int],
+) -> Image.Image:
+    """Decode a raw 32-bit BGRA (or BGRX) bitmap into an RGB image.
+
+    The channels are reordered and the alpha (padding) byte is dropped by PIL's
+    raw decoder in a single pass over the data, i.e., without intermediate
+    full-size images.
+
+    Args:
+        data (bytes): The pixel data, 4 bytes per pixel in the order blue, green,
+            red, alpha (or unused), row by row.
+        size (tuple[int, int]): The size of the bitmap (width, height).
+
+    Returns:
+        Image.Image: The decoded RGB image.
+    """
+    return Image.frombytes("RGB", size, data, "raw", "BGRX")
+
+
 def _scale_coordinates(
     coordinates: tuple[int, int],
     offset: tuple[int, int],
@@ -310,6 +543,87 @@ def scale_coordinates(
     return result
 
 
+def scale_region(
+    region: CaptureRegion,
+    original_size: tuple[int, int],
+    target_size: tuple[int, int],
+    inverse: bool = False,
+) -> CaptureRegion | None:
+    """Scale a region between original and scaled image sizes.
+
+    The scaled region is clipped to the bounds of the image it is scaled to.
+
+    Args:
+        region (CaptureRegion): The region to scale.
+        original_size (tuple[int, int]): The original image size (width, height).
+        target_size (tuple[int, int]): The target size (width, height).
+        inverse (bool, optional): Whether to scale from target to original.
+            Defaults to `False`.
+
+    Returns:
+        CaptureRegion | None: The scaled region or `None` if it lies completely
+            outside of the image it is scaled to.
+    """
+    left, top = scale_coordinates(
+        (region.x, region.y),
+        original_size,
+        target_size,
+        inverse=inverse,
+        check_coordinates_in_bounds=False,
+    )
+    right, bottom = scale_coordinates(
+        (region.right, region.bottom),
+        original_size,
+        target_size,
+        inverse=inverse,
+        check_coordinates_in_bounds=False,
+    )
+    bounds = original_size if inverse else target_size
+    scaled_region = CaptureRegion.from_box(left, top, right, bottom)
+    return scaled_region.clip(*bounds) if scaled_region is not None else None
+
+
+def capture_scaled_region(
+    capture: Callable[[CaptureRegion], Image.Image],
+    region: CaptureRegion,
+    original_size: tuple[int, int],
+    target_size: tuple[int, int],
+) -> Image.Image:
+    """Capture a region given in the coordinates of a scaled screen.
+
+    Used by agent OS facades that present the screen scaled to fit a target size
+    (see `scale_image_to_fit()`) to capture only the pixels of the region on the
+    real screen.
+
+    Args:
+        capture (Callable[[CaptureRegion], Image.Image]): Captures a region of the
+            real screen.
+        region (CaptureRegion): The region in the coordinates of the scaled screen.
+        original_size (tuple[int, int]): The size of the real screen
+            (width, height).
+        target_size (tuple[int, int]): The size of the scaled screen
+            (width, height).
+
+    Returns:
+        Image.Image: The captured region scaled like the screen. Parts of the
+            region outside of the real screen (e.g., padding) are cut off.
+
+    Raises:
+        ValueError: If the region lies completely outside of the real screen.
+    """
+    original_region = scale_region(region, original_size, target_size, inverse=True)
+    if original_region is None:
+        error_msg = f"Region {region!r} is outside of the screen"
+        raise ValueError(error_msg)
+    image = capture(original_region)
+    scaling_results = _calculate_scaling_for_fit(original_size, target_size)
+    size = (
+        max(1, round(image.width * scaling_results.factor)),
+        max(1, round(image.height * scaling_results.factor)),
+    )
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+
 class ImageSource(RootModel):
     """A class that represents an image source and provides methods to convert it to different formats.
 
@@ -318,6 +632,10 @@ class ImageSource(RootModel):
     - A file path (str or pathlib.Path)
     - A data URL string
 
+    Encodings of the image are computed once per format and parameters and then
+    reused. They are recomputed if `root` is replaced or changes its size or mode.
+    Call `clear_encoding_cache()` after changing the pixels of `root` in place.
+
     Attributes:
         root (PILImage.Image): The underlying PIL Image object.
 
@@ -327,6 +645,58 @@ class ImageSource(RootModel):
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
     root: PILImage.Image
+    # Keyed by `ImageEncoding` (`None` for PNG)
+    _encoded_bytes: dict[object, tuple[bytes, EncodedImageMediaType]] = PrivateAttr(
+        default_factory=dict
+    )
+    _encoded_images: dict[object, EncodedImage] = PrivateAttr(default_factory=dict)
+    _encoded_state: tuple[int, tuple[int, int], str] | None = PrivateAttr(default=None)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ImageSource":
+        """Create an image source from an encoded image (e.g., a PNG file).
+
+        The image is only decoded when its pixels are accessed. If `data` is a PNG,
+        it is used as is as PNG encoding of the image instead of re-encoding the
+        image.
+
+        Args:
+            data (bytes): The encoded image.
+
+        Returns:
+            ImageSource: The image source.
+        """
+        image_source = cls(Image.open(io.BytesIO(data)))
+        if image_source.root.format == "PNG":
+            image_source._encodings()[None] = (data, "image/png")
+        return image_source
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "root":
+            self.clear_encoding_cache()
+        super().__setattr__(name, value)
+
+    def clear_encoding_cache(self) -> None:
+        """Clear the cached encodings of the image."""
+        self._encoded_bytes.clear()
+        self._encoded_images.clear()
+        self._encoded_state = None
+
+    def _encodings(self) -> dict[object, tuple[bytes, EncodedImageMediaType]]:
+        state = (id(self.root), self.root.size, self.root.mode)
+        if self._encoded_state != state:
+            self.clear_encoding_cache()
+            self._encoded_state = state
+        return self._encoded_bytes
+
+    def _encode(
+        self, encoding: "ImageEncoding | None"
+    ) -> tuple[object, bytes, EncodedImageMediaType]:
+        key = None if encoding is None or encoding.format == "png" else encoding
+        encodings = self._encodings()
+        if key not in encodings:
+            encodings[key] = _encode_image_bytes(self.root, key)
+        return key, *encodings[key]
 
     def to_data_url(self) -> str:
         """Convert the image to a data URL.
@@ -334,7 +704,7 @@ class ImageSource(RootModel):
         Returns:
             str: A data URL string in the format `"data:image/png;base64,..."`
         """
-        return image_to_data_url(image=self.root)
+        return self.to_encoded().data_url
 
     def to_base64(self) -> str:
         """Convert the image to a base64 string.
@@ -342,7 +712,26 @@ class ImageSource(RootModel):
         Returns:
             str: A base64 encoded string of the image.
         """
-        return image_to_base64(image=self.root)
+        return self.to_encoded().data
+
+    def to_encoded(self, encoding: "ImageEncoding | None" = None) -> EncodedImage:
+        """Encode the image for sending it to a model.
+
+        Args:
+            encoding (ImageEncoding | None, optional): The encoding to use.
+                Defaults to PNG.
+
+        Returns:
+            EncodedImage: The base64 encoded image and its media type.
+        """
+        key, data, media_type = self._encode(encoding)
+        encoded_image = self._encoded_images.get(key)
+        if encoded_image is None:
+            encoded_image = EncodedImage(
+                data=base64.b64encode(data).decode("utf-8"), media_type=media_type
+            )
+            self._encoded_images[key] = encoded_image
+        return encoded_image
 
     def to_bytes(self) -> bytes:
         """Convert the image to bytes.
@@ -350,9 +739,8 @@ class ImageSource(RootModel):
         Returns:
             bytes: The image as bytes.
         """
-        img_byte_arr = io.BytesIO()
-        self.root.save(img_byte_arr, format="PNG")
-        return img_byte_arr.getvalue()
+        _, data, _ = self._encode(None)
+        return data
 
 
 __all__ = [
@@ -360,7 +748,11 @@ __all__ = [
     "data_url_to_image",
     "draw_point_on_image",
     "base64_to_image",
+    "read_image_size",
+    "read_base64_image_size",
     "image_to_base64",
+    "EncodedImage",
+    "encode_image",
     "scale_image_to_fit",
     "scale_coordinates",
     "ScalingResults",
@@ -0,0 +1,394 @@
+"""Cache of the results of locating UI elements in screenshots.
+
+Locating the same element again on a screen that has not changed, e.g., when
+polling with `Agent.wait()` or when clicking an element right after locating it,
+returns the same result without sending the screenshot to the detection provider
+again.
+
+Results are keyed by a fast fingerprint of the screenshot (hash of a downsampled
+grayscale frame) and a `LocateCacheKey` of the locator (serialized like for the
+detection provider), the detection provider and the locate settings. If the
+fingerprint of a screenshot is unknown, a result for the same key is still reused
+as long as the regions around the located points are unchanged (region-local
+invalidation), e.g., if only a clock or a spinner elsewhere on the screen changed.
+
+Results (including `ElementNotFoundError`s) expire after a time to live and the
+least recently used results are evicted once the cache is full. A cache can be
+shared by agents running in multiple threads.
+"""
+
+import contextlib
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal, NamedTuple
+
+from opentelemetry import trace
+from PIL import Image
+from pydantic import BaseModel
+
+from askui.locators.locators import Locator
+from askui.locators.serializers import AskUiLocatorSerializer, VlmLocatorSerializer
+from askui.models.askui.ai_element_utils import AiElementCollection
+from askui.models.exceptions import ElementNotFoundError
+from askui.models.shared.settings import LocateSettings
+from askui.models.types.geometry import PointList
+from askui.reporting import NULL_REPORTER
+
+logger = logging.getLogger(__name__)
+
+LOCATE_CACHE_LOOKUP_RESULT = Literal["hit", "region_hit", "miss"]
+
+
+class LocateCacheKey(NamedTuple):
+    """Key of the results of locating an element (besides the screenshot).
+
+    Args:
+        model: The detection provider (model) locating the element
+        locator: The serialized locator
+        settings: The serialized locate settings
+    """
+
+    model: str
+    locator: str
+    settings: str
+
+
+class LocateCacheStatistics(BaseModel):
+    """Statistics of the lookups in a `LocateCache`.
+
+    Args:
+        hits: Lookups of a screenshot with a known fingerprint
+        region_hits: Lookups of a screenshot with an unknown fingerprint whose
+            regions around the located points were unchanged
+        misses: Lookups that had to locate the element
+        evictions: Results evicted because the cache was full
+        expirations: Results removed because their time to live passed
+    """
+
+    hits: int = 0
+    region_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups (0.0-1.0) answered from the cache."""
+        n_lookups = self.hits + self.region_hits + self.misses
+        return (self.hits + self.region_hits) / n_lookups if n_lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    points: PointList
+    error: ElementNotFoundError | None
+    created_at: float
+    image_size: tuple[int, int]
+    # grayscale pixels of the regions around the points by box
+    regions: dict[tuple[int, int, int, int], bytes]
+
+
+# Errors of serializing a locator, e.g., if the AI elements cannot be found or the
+# relations are not supported
+_SERIALIZATION_ERRORS = (NotImplementedError, OSError, TypeError, ValueError)
+
+
+@functools.lru_cache(maxsize=1)
+def _askui_locator_serializer(
+    _workspace_id: str | None, _ai_element_locations: str | None
+) -> AskUiLocatorSerializer:
+    """Get the serializer for the AI elements configured by the environment.
+
+    Reused across lookups as long as the environment variables read by the
+    `AiElementCollection` (passed as arguments) are unchanged.
+    """
+    return AskUiLocatorSerializer(
+        ai_element_collection=AiElementCollection(), reporter=NULL_REPORTER
+    )
+
+
+def serialize_locator(locator: str | Locator) -> str | None:
+    """Serialize a locator as for the detection provider.
+
+    Uses the `AskUiLocatorSerializer` (which includes the images of image
+    locators) and falls back to the `VlmLocatorSerializer`.
+
+    Args:
+        locator: The locator
+
+    Returns:
+        The serialized locator, or None if it cannot be serialized
+    """
+    if isinstance(locator, str):
+        return locator
+    with contextlib.suppress(*_SERIALIZATION_ERRORS):
+        serializer = _askui_locator_serializer(
+            os.getenv("ASKUI_WORKSPACE_ID"), os.getenv("ASKUI_AI_ELEMENT_LOCATIONS")
+        )
+        return json.dumps(serializer.serialize(locator), sort_keys=True)
+    with contextlib.suppress(*_SERIALIZATION_ERRORS):
+        return VlmLocatorSerializer().serialize(locator)
+    return None
+
+
+_provider_ids: "weakref.WeakKeyDictionary[object, int]" = weakref.WeakKeyDictionary()
+_next_provider_id = itertools.count()
+_provider_ids_lock = threading.Lock()
+
+
+def provider_identity(provider: object) -> str:
+    """Identify a detection provider (instance) in `LocateCacheKey`s.
+
+    Providers of the same type may be configured differently (e.g., use another
+    model or workspace), so each instance gets its own identity. Unlike `id()`,
+    an identity is never reused after the provider is garbage collected, i.e.,
+    results of a former provider cannot be returned for another one.
+
+    Args:
+        provider: The detection provider
+
+    Returns:
+        The type of the provider and a number unique to the instance
+    """
+    provider_type = type(provider)
+    with _provider_ids_lock:
+        provider_id = _provider_ids.get(provider)
+        if provider_id is None:
+            provider_id = _provider_ids[provider] = next(_next_provider_id)
+    return f"{provider_type.__module__}.{provider_type.__qualname__}#{provider_id}"
+
+
+def locate_cache_key(
+    model: str, locator: str | Locator, locate_settings: LocateSettings
+) -> LocateCacheKey | None:
+    """Build the key of the results of locating an element.
+
+    Args:
+        model: The detection provider (model) locating the element, see
+            `provider_identity()`
+        locator: The locator of the element
+        locate_settings: The settings the element is located with
+
+    Returns:
+        The key, or None if the locator cannot be serialized, i.e., the results
+        cannot be cached
+    """
+    serialized_locator = serialize_locator(locator)
+    if serialized_locator is None:
+        return None
+    return LocateCacheKey(
+        model=model, locator=serialized_locator, settings=repr(locate_settings)
+    )
+
+
+def frame_fingerprint(image: Image.Image, size: int = 64) -> str:
+    """Compute a fast fingerprint of a screenshot.
+
+    Args:
+        image: The screenshot
+        size: Width and height in pixels the screenshot is downsampled to
+
+    Returns:
+        Hash of the downsampled grayscale screenshot and its original size
+    """
+    frame = image.resize((size, size), Image.Resampling.BILINEAR).convert("L")
+    digest = hashlib.blake2b(frame.tobytes(), digest_size=16)
+    digest.update(f"{image.width}x{image.height}".encode())
+    return digest.hexdigest()
+
+
+class LocateCache:
+    """Cache of the results of locating UI elements by screenshot and locator.
+
+    Args:
+        ttl: Time in seconds after which results expire
+        max_entries: Max number of results, the least recently used results are
+            evicted first
+        region_size: Width and height in pixels of the regions around located
+            points that must be unchanged to reuse results for screenshots with
+            an unknown fingerprint. If None, results are only reused for
+            screenshots with the same fingerprint.
+        fingerprint_size: Width and height in pixels screenshots are downsampled
+            to for computing their fingerprint
+        clock: Monotonic clock in seconds (default: `time.monotonic`)
+
+    Example:
+        ```python
+        from askui import AgentSettings, ComputerAgent
+        from askui.utils.locate_cache import LocateCache
+
+        locate_cache = LocateCache(ttl=10)
+        with ComputerAgent(settings=AgentSettings(locate_cache=locate_cache)) as agent:
+            agent.wait("Submit button")
+            agent.click("Submit button")  # located from cache
+            print(locate_cache.statistics)
+        ```
+    """
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        max_entries: int = 256,
+        region_size: int | None = 50,
+        fingerprint_size: int = 64,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._region_size = region_size
+        self._fingerprint_size = fingerprint_size
+        self._clock = clock or time.monotonic
+        self._entries: OrderedDict[tuple[LocateCacheKey, str], _Entry] = OrderedDict()
+        # guards the entries and statistics, but not locating elements
+        self._lock = threading.Lock()
+        self.statistics = LocateCacheStatistics()
+
+    def get_or_locate(
+        self,
+        key: LocateCacheKey | None,
+        image: Image.Image,
+        locate: Callable[[], PointList],
+    ) -> PointList:
+        """Get the cached result of locating an element or locate it.
+
+        Args:
+            key: Key of the element (see `locate_cache_key()`). If None, the
+                element is located without caching.
+            image: The screenshot the element is located in
+            locate: Function locating the element in the screenshot
+
+        Returns:
+            The located points
+
+        Raises:
+            ElementNotFoundError: If the element was not found (again)
+        """
+        if key is None:
+            return locate()
+        fingerprint = frame_fingerprint(image, size=self._fingerprint_size)
+        lookup_result, entry = self._lookup(key, fingerprint, image)
+        trace.get_current_span().set_attribute(
+            "askui.locate_cache.lookup", lookup_result
+        )
+        logger.debug("Locate cache %s for %s", lookup_result, key.locator)
+        if entry is not None:
+            if entry.error is not None:
+                raise ElementNotFoundError(
+                    entry.error.locator, entry.error.locator_serialized
+                )
+            return list(entry.points)
+
+        try:
+            points = locate()
+        except ElementNotFoundError as e:
+            self._add(key, fingerprint, image, [], e)
+            raise
+        self._add(key, fingerprint, image, points, None)
+        return points
+
+    def clear(self) -> None:
+        """Remove all cached results, e.g., after the screen was switched."""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(
+        self, key: LocateCacheKey, fingerprint: str, image: Image.Image
+    ) -> tuple[LOCATE_CACHE_LOOKUP_RESULT, _Entry | None]:
+        """Look up a result, counting the lookup in the statistics."""
+        with self._lock:
+            self._remove_expired()
+            entry = self._entries.get((key, fingerprint))
+            if entry is not None:
+                self._entries.move_to_end((key, fingerprint))
+                self.statistics.hits += 1
+                return "hit", entry
+            if self._region_size is not None:
+                for (entry_key, _), entry in reversed(self._entries.items()):
+                    if entry_key == key and self._has_unchanged_regions(entry, image):
+                        # Reuse the result for the same screenshot without checking
+                        self._entries[(key, fingerprint)] = entry
+                        self._evict()
+                        self.statistics.region_hits += 1
+                        return "region_hit", entry
+            self.statistics.misses += 1
+            return "miss", None
+
+    def _has_unchanged_regions(self, entry: _Entry, image: Image.Image) -> bool:
+        """Check if the regions around the points of a result are unchanged.
+
+        Results of elements that were not found are not reused as the elements
+        may have appeared anywhere.
+        """
+        return (
+            entry.error is None
+            and bool(entry.regions)
+            and entry.image_size == image.size
+            and all(
+                image.crop(box).convert("L").tobytes() == pixels
+                for box, pixels in entry.regions.items()
+            )
+        )
+
+    def _add(
+        self,
+        key: LocateCacheKey,
+        fingerprint: str,
+        image: Image.Image,
+        points: PointList,
+        error: ElementNotFoundError | None,
+    ) -> None:
+        """Add the result of locating an element in a screenshot."""
+        regions: dict[tuple[int, int, int, int], bytes] = {}
+        if self._region_size is not None:
+            half_size = self._region_size // 2
+            for x, y in points:
+                box = (
+                    max(0, x - half_size),
+                    max(0, y - half_size),
+                    min(image.width, x + half_size),
+                    min(image.height, y + half_size),
+                )
+                if box[0] < box[2] and box[1] < box[3]:
+                    regions[box] = image.crop(box).convert("L").tobytes()
+        entry = _Entry(
+            points=list(points),
+            error=error,
+            created_at=self._clock(),
+            image_size=image.size,
+            regions=regions,
+        )
+        with self._lock:
+            self._entries[(key, fingerprint)] = entry
+            self._entries.move_to_end((key, fingerprint))
+            self._evict()
+
+    def _evict(self) -> None:
+        """Evict the least recently used results if the cache is full.
+
+        Must be called with the lock held, like `_remove_expired()`.
+        """
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.statistics.evictions += 1
+
+    def _remove_expired(self) -> None:
+        """Remove the results whose time to live passed."""
+        expired_before = self._clock() - self._ttl
+        expired = [
+            entry_key
+            for entry_key, entry in self._entries.items()
+            if entry.created_at <= expired_before
+        ]
+        for entry_key in expired:
+            del self._entries[entry_key]
+        self.statistics.expirations += len(expired)
@@ -0,0 +1,148 @@
+"""Waiting for the screen to settle after an action, e.g., of a cached trajectory.
+
+Instead of waiting a fixed time after each action, low-resolution frames of the
+screen are sampled until consecutive frames stay unchanged (within a tolerance)
+for a while, i.e., until animations, page loads etc. triggered by the action have
+finished, but at most for a maximum time.
+
+The time the screen took to settle can be passed as `initial_wait` to the next
+wait after the same action so that frames are only sampled once the screen is
+expected to have settled.
+"""
+
+import time
+from collections.abc import Callable
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+from pydantic import BaseModel
+
+from askui.models.shared.settings import ScreenSettleSettings
+
+# Factor by which the estimated settle time is decreased if the screen did not
+# change after the initial wait, i.e., it may have settled earlier
+_UNCHANGED_SETTLE_TIME_FACTOR = 0.8
+
+
+class ScreenSettleResult(BaseModel):
+    """Result of waiting for the screen to settle.
+
+    Attributes:
+        settled: Whether the screen settled within the max wait
+        settle_time: Estimated time in seconds until the screen stopped changing
+            (max wait if it did not settle)
+        duration: Time in seconds waited in total
+        n_frames: Number of frames sampled
+    """
+
+    settled: bool
+    settle_time: float
+    duration: float
+    n_frames: int
+
+
+def frame_difference(
+    frame1: npt.NDArray[np.uint8], frame2: npt.NDArray[np.uint8]
+) -> float:
+    """Compute the mean absolute pixel difference of two frames.
+
+    Args:
+        frame1: First grayscale frame
+        frame2: Second grayscale frame of the same size
+
+    Returns:
+        Difference between 0.0 (equal) and 1.0 (black vs. white)
+    """
+    difference = np.abs(frame1.astype(np.int16) - frame2.astype(np.int16))
+    return float(difference.mean()) / 255
+
+
+class ScreenSettleDetector:
+    """Waits for the screen to settle by comparing sampled frames.
+
+    Args:
+        settings: Settings for sampling and comparing frames
+        clock: Monotonic clock in seconds (default: `time.monotonic`)
+        sleep: Function to sleep for a number of seconds (default: `time.sleep`)
+    """
+
+    def __init__(
+        self,
+        settings: ScreenSettleSettings,
+        clock: Callable[[], float] | None = None,
+        sleep: Callable[[float], None] | None = None,
+    ) -> None:
+        self._settings = settings
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+
+    def wait(
+        self,
+        capture: Callable[[], Image.Image],
+        initial_wait: float = 0.0,
+        max_wait: float | None = None,
+    ) -> ScreenSettleResult:
+        """Wait until consecutive frames stay unchanged for the stable duration.
+
+        Args:
+            capture: Function capturing a frame of the screen
+            initial_wait: Time in seconds to wait before sampling the first frame,
+                e.g., the settle time of the last wait after the same action
+            max_wait: Max time in seconds to wait (default: `max_wait` of the
+                settings)
+
+        Returns:
+            Result with whether and when the screen settled
+
+        Raises:
+            ValueError: If neither `max_wait` nor the settings set the max wait
+        """
+        if max_wait is None:
+            max_wait = self._settings.max_wait
+        if max_wait is None:
+            msg = "max_wait must be given if it is not set in the settings"
+            raise ValueError(msg)
+        start = self._clock()
+        deadline = start + max_wait
+        initial_wait = min(initial_wait, max_wait)
+        if initial_wait > 0:
+            self._sleep(initial_wait)
+        previous_frame = self._sample(capture)
+        n_frames = 1
+        stable_since = self._clock()
+        changed = False
+        while True:
+            now = self._clock()
+            if now - stable_since >= self._settings.stable_duration:
+                settle_time = (
+                    stable_since - start
+                    if changed
+                    else initial_wait * _UNCHANGED_SETTLE_TIME_FACTOR
+                )
+                return ScreenSettleResult(
+                    settled=True,
+                    settle_time=settle_time,
+                    duration=now - start,
+                    n_frames=n_frames,
+                )
+            if now >= deadline:
+                return ScreenSettleResult(
+                    settled=False,
+                    settle_time=max_wait,
+                    duration=now - start,
+                    n_frames=n_frames,
+                )
+            self._sleep(min(self._settings.sample_interval, deadline - now))
+            frame = self._sample(capture)
+            n_frames += 1
+            if frame_difference(previous_frame, frame) > self._settings.tolerance:
+                stable_since = self._clock()
+                changed = True
+            previous_frame = frame
+
+    def _sample(self, capture: Callable[[], Image.Image]) -> npt.NDArray[np.uint8]:
+        """Capture a frame downscaled to a grayscale pixel array."""
+        size = (self._settings.frame_size, self._settings.frame_size)
+        frame = capture().resize(size, Image.Resampling.BILINEAR).convert("L")
+        return np.asarray(frame)
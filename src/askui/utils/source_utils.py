@@ -2,7 +2,6 @@ import base64
 import re
 from dataclasses import dataclass
 from enum import Enum
-from io import BytesIO
 from pathlib import Path
 from typing import Literal, Union
 
@@ -167,12 +166,10 @@ def load_source(source: Union[str, Path, PILImage.Image]) -> Source:
     if source_analysis.is_supported_office_document:
         return OfficeDocumentSource(source_analysis.content)
     if source_analysis.is_image:
-        return ImageSource(
-            PILImage.open(
-                BytesIO(source_analysis.content)
-                if isinstance(source_analysis.content, bytes)
-                else source_analysis.content
-            )
+        return ImageSource.from_bytes(
+            source_analysis.content
+            if isinstance(source_analysis.content, bytes)
+            else source_analysis.content.read_bytes()
         )
     msg = "Unsupported source type"
     raise ValueError(msg)
@@ -1,7 +1,8 @@
 """Visual validation utilities for cache execution.
 
 This module provides utilities for visual validation of cached trajectories:
-- Image hashing functions (perceptual hash, average hash)
+- Image hashing functions (perceptual hash, average hash, see
+  `askui.utils.image_hashing` for hashing many images at once)
 - Hamming distance computation
 - Region extraction from images
 - Screenshot extraction from message history
@@ -10,11 +11,22 @@ This module provides utilities for visual validation of cached trajectories:
 import logging
 from typing import TYPE_CHECKING, Any
 
-import imagehash
 from PIL import Image
 
+from askui.models.shared.agent_message_param import Base64ImageSourceParam
+from askui.utils.image_hashing import (
+    ahash_batch,
+    hamming_distance,
+    hash_to_hex,
+    hex_to_hash,
+    phash_batch,
+)
+
 if TYPE_CHECKING:
-    from askui.models.shared.agent_message_param import MessageParam
+    from askui.models.shared.agent_message_param import (
+        ContentBlockParam,
+        MessageParam,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +44,8 @@ def compute_phash(image: Image.Image, hash_size: int = 8) -> str:
     Returns:
         String representation of the hash (hex format)
     """
-    phash = imagehash.phash(image, hash_size=hash_size)
-    return str(phash)
+    (phash,) = phash_batch([image], hash_size=hash_size)
+    return hash_to_hex(phash, hash_size=hash_size)
 
 
 def compute_ahash(image: Image.Image, hash_size: int = 8) -> str:
@@ -49,8 +61,8 @@ def compute_ahash(image: Image.Image, hash_size: int = 8) -> str:
     Returns:
         String representation of the hash (hex format)
     """
-    ahash = imagehash.average_hash(image, hash_size=hash_size)
-    return str(ahash)
+    (ahash,) = ahash_batch([image], hash_size=hash_size)
+    return hash_to_hex(ahash, hash_size=hash_size)
 
 
 def compute_hamming_distance(hash1: str, hash2: str) -> int:
@@ -79,12 +91,7 @@ def compute_hamming_distance(hash1: str, hash2: str) -> int:
         msg = f"Hashes must have same length. Got {len(hash1)} and {len(hash2)}"
         raise ValueError(msg)
 
-    # Convert hex strings to imagehash objects
-    ihash1 = imagehash.hex_to_hash(hash1)
-    ihash2 = imagehash.hex_to_hash(hash2)
-
-    # Compute Hamming distance
-    return ihash1 - ihash2
+    return hamming_distance(hex_to_hash(hash1), hex_to_hash(hash2))
 
 
 def extract_region(
@@ -155,31 +162,79 @@ def find_recent_screenshot(
 
     # Look backwards from start index
     for i in range(start_idx, -1, -1):
-        message = messages[i]
-        if message.role != "user":
-            continue
-
-        # Check if message content is a list of blocks
-        if isinstance(message.content, str):
-            continue
-
-        # Look for tool result blocks with images
-        for block in message.content:
-            if block.type == "tool_result":
-                # Check for image blocks within tool result
-                if isinstance(block.content, list):
-                    for content_item in block.content:
-                        if content_item.type == "image":
-                            # Found screenshot - decode and return
-                            from askui.utils.image_utils import base64_to_image
-
-                            # Only base64 images have data attribute
-                            if hasattr(content_item.source, "data"):
-                                return base64_to_image(content_item.source.data)
+        source = _find_screenshot_source(messages[i])
+        if source is not None:
+            # Found screenshot - decode and return
+            from askui.utils.image_utils import base64_to_image
+
+            return base64_to_image(source.data)
+
+    return None
+
+
+def find_recent_screenshot_sources(
+    messages: list["MessageParam"],
+) -> list[Base64ImageSourceParam | None]:
+    """Find the most recent screenshot before each message of a message history.
+
+    Unlike calling `find_recent_screenshot()` for each message, this takes a
+    single pass over the message history and does not decode any screenshot, so
+    that callers can decode each screenshot once, and only if needed.
+
+    Args:
+        messages: Message history to search through
+
+    Returns:
+        For each message, the source of the most recent screenshot of the
+        messages before it (see `find_recent_screenshot()`), or None if not found
+    """
+    sources: list[Base64ImageSourceParam | None] = []
+    recent_source: Base64ImageSourceParam | None = None
+    for message in messages:
+        sources.append(recent_source)
+        recent_source = _find_screenshot_source(message) or recent_source
+    return sources
+
+
+def find_tool_result_screenshot_source(
+    content: list["ContentBlockParam"],
+) -> Base64ImageSourceParam | None:
+    """Find the first screenshot of the tool results among content blocks.
+
+    Args:
+        content: Content blocks, e.g., the results of tool calls
+
+    Returns:
+        Source of the first base64 image within a tool result block, or None if
+        not found
+    """
+    # Look for tool result blocks with images
+    for block in content:
+        if block.type == "tool_result":
+            # Check for image blocks within tool result
+            if isinstance(block.content, list):
+                for content_item in block.content:
+                    # Only base64 images have data
+                    if content_item.type == "image" and isinstance(
+                        content_item.source, Base64ImageSourceParam
+                    ):
+                        return content_item.source
 
     return None
 
 
+def _find_screenshot_source(message: "MessageParam") -> Base64ImageSourceParam | None:
+    """Find the source of the first screenshot of a tool result of a message."""
+    if message.role != "user":
+        return None
+
+    # Check if message content is a list of blocks
+    if isinstance(message.content, str):
+        return None
+
+    return find_tool_result_screenshot_source(message.content)
+
+
 def get_validation_coordinate(tool_input: dict[str, Any]) -> tuple[int, int] | None:
     """Extract the coordinate for visual validation from tool input.
 
@@ -0,0 +1,12 @@
+import time
+from collections.abc import Callable
+
+
+def best_duration(func: Callable[[], object], repeat: int = 3) -> float:
+    """Measures the shortest duration of `repeat` calls of `func` in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
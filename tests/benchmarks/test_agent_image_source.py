@@ -0,0 +1,110 @@
+"""Benchmarks of the image encodings on the `Agent.get()`/`Agent.locate()` paths."""
+
+from typing import Any, Type
+
+import pytest
+from PIL import Image
+from typing_extensions import override
+
+from askui.agent_base import Agent
+from askui.agent_settings import AgentSettings
+from askui.locators.locators import Locator
+from askui.model_providers.detection_provider import DetectionProvider
+from askui.model_providers.image_qa_provider import ImageQAProvider
+from askui.model_providers.vlm_provider import VlmProvider
+from askui.models.shared.agent_message_param import MessageParam
+from askui.models.shared.settings import GetSettings, LocateSettings
+from askui.models.types.geometry import PointList
+from askui.models.types.response_schemas import ResponseSchema
+from askui.utils.image_utils import ImageSource, image_to_data_url
+from askui.utils.source_utils import Source
+
+from .conftest import best_duration
+
+pytestmark = pytest.mark.benchmark
+
+# Number of times providers encode the same image per call, e.g., the locate
+# API request and the serialized image locator
+_N_ENCODINGS_PER_CALL = 3
+
+
+class _FakeVlmProvider(VlmProvider):
+    @property
+    @override
+    def model_id(self) -> str:
+        return "fake-model"
+
+    @override
+    def create_message(self, *args: Any, **kwargs: Any) -> MessageParam:
+        return MessageParam(role="assistant", content="done")
+
+
+class _FakeDetectionProvider(DetectionProvider):
+    def __init__(self, cached: bool = True) -> None:
+        self._cached = cached
+
+    @override
+    def detect(
+        self,
+        locator: str | Locator,
+        image: ImageSource,
+        locate_settings: LocateSettings,
+    ) -> PointList:
+        for _ in range(_N_ENCODINGS_PER_CALL):
+            if self._cached:
+                image.to_data_url()
+            else:
+                image_to_data_url(image.root)
+        return [(1, 2)]
+
+
+class _FakeImageQAProvider(ImageQAProvider):
+    def __init__(self, cached: bool = True) -> None:
+        self._cached = cached
+
+    @override
+    def query(
+        self,
+        query: str,
+        source: Source,
+        response_schema: Type[ResponseSchema] | None,
+        get_settings: GetSettings,
+    ) -> ResponseSchema | str:
+        assert isinstance(source, ImageSource)
+        for _ in range(_N_ENCODINGS_PER_CALL):
+            if self._cached:
+                source.to_data_url()
+            else:
+                image_to_data_url(source.root)
+        return "answer"
+
+
+def _agent(cached: bool = True) -> Agent:
+    return Agent(
+        settings=AgentSettings(
+            vlm_provider=_FakeVlmProvider(),
+            image_qa_provider=_FakeImageQAProvider(cached),
+            detection_provider=_FakeDetectionProvider(cached),
+        )
+    )
+
+
+def test_locate(github_login_screenshot: Image.Image) -> None:
+    agent, reference_agent = _agent(), _agent(cached=False)
+    duration = best_duration(
+        lambda: agent.locate("Sign in", screenshot=github_login_screenshot)
+    )
+    reference_duration = best_duration(
+        lambda: reference_agent.locate("Sign in", screenshot=github_login_screenshot)
+    )
+    assert duration < reference_duration
+
+
+def test_get(github_login_screenshot: Image.Image) -> None:
+    data_url = image_to_data_url(github_login_screenshot)
+    agent, reference_agent = _agent(), _agent(cached=False)
+    duration = best_duration(lambda: agent.get("What?", source=data_url))
+    reference_duration = best_duration(
+        lambda: reference_agent.get("What?", source=data_url)
+    )
+    assert duration < reference_duration
@@ -0,0 +1,54 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from askui.models.shared.agent_message_param import ToolUseBlockParam
+from askui.models.shared.settings import CacheFile, CacheMetadata
+from askui.tools.caching_tools import RetrieveCachedTestExecutions
+from askui.utils.caching import CacheManager
+
+from .conftest import best_duration
+
+pytestmark = pytest.mark.benchmark
+
+_N_CACHE_FILES = 10_000
+
+
+def _cache_file_content() -> str:
+    cache_file = CacheFile(
+        metadata=CacheMetadata(
+            created_at=datetime(2025, 1, 1, tzinfo=timezone.utc), goal="Log in"
+        ),
+        trajectory=[
+            ToolUseBlockParam(
+                id=f"tu_{i}",
+                name="computer",
+                input={"action": "left_click", "coordinate": [i, i]},
+            )
+            for i in range(20)
+        ],
+    )
+    return json.dumps(cache_file.model_dump(mode="json"))
+
+
+def _read_all_cache_files(cache_dir: Path) -> None:
+    """Reads the cache files as previously done by `RetrieveCachedTestExecutions`."""
+    for path in cache_dir.iterdir():
+        if path.name.endswith(".json"):
+            CacheManager.read_cache_file(path)
+
+
+def test_retrieve_10k_cache_files(tmp_path: Path) -> None:
+    content = _cache_file_content()
+    for i in range(_N_CACHE_FILES):
+        (tmp_path / f"cache_{i:05}.json").write_text(content, encoding="utf-8")
+    tool = RetrieveCachedTestExecutions(cache_dir=str(tmp_path))
+    assert len(tool()) == _N_CACHE_FILES  # builds the index
+
+    duration = best_duration(tool)
+    reference_duration = best_duration(
+        lambda: _read_all_cache_files(tmp_path), repeat=1
+    )
+    assert duration < reference_duration
@@ -0,0 +1,25 @@
+import os
+
+import pytest
+from PIL import Image
+
+from askui.utils.image_utils import bgra_bitmap_to_image
+
+from .conftest import best_duration
+
+pytestmark = pytest.mark.benchmark
+
+_SIZE_4K = (3840, 2160)
+
+
+def _split_merge_decode(data: bytes, size: tuple[int, int]) -> Image.Image:
+    """The decoding previously used by `AskUiControllerClient.screenshot()`."""
+    r, g, b, _ = Image.frombytes("RGBA", size, data).split()
+    return Image.merge("RGB", (b, g, r))
+
+
+def test_decode_4k_bgra_bitmap() -> None:
+    bitmap = os.urandom(_SIZE_4K[0] * _SIZE_4K[1] * 4)
+    duration = best_duration(lambda: bgra_bitmap_to_image(bitmap, _SIZE_4K))
+    reference_duration = best_duration(lambda: _split_merge_decode(bitmap, _SIZE_4K))
+    assert duration < reference_duration
@@ -0,0 +1,68 @@
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    ImageBlockParam,
+    MessageParam,
+    TextBlockParam,
+    ToolResultBlockParam,
+)
+from askui.models.shared.token_counter import SimpleTokenCounter
+from askui.utils.image_utils import base64_to_image
+
+from .conftest import best_duration
+
+pytestmark = pytest.mark.benchmark
+
+_NOISE = Image.effect_noise((64, 64), 32)
+
+
+def _image_block(offset: int) -> ImageBlockParam:
+    """Encodes a white image with a noisy (i.e., hardly compressible) patch."""
+    image = Image.new("RGB", (640, 400), (255, 255, 255))
+    image.paste(_NOISE, (offset, offset))
+    with io.BytesIO() as buffer:
+        image.save(buffer, format="PNG", compress_level=1)
+        data = base64.b64encode(buffer.getvalue()).decode()
+    return ImageBlockParam(
+        source=Base64ImageSourceParam(data=data, media_type="image/png")
+    )
+
+
+def _history(n_images: int) -> list[MessageParam]:
+    return [
+        MessageParam(
+            role="user",
+            content=[
+                ToolResultBlockParam(
+                    tool_use_id=f"tu_{i}",
+                    content=[TextBlockParam(text=f"Screenshot {i}"), _image_block(i)],
+                )
+            ],
+        )
+        for i in range(n_images)
+    ]
+
+
+def _read_image_sizes_by_decoding(messages: list[MessageParam]) -> None:
+    """Reads the image sizes as previously done by `SimpleTokenCounter`."""
+    for message in messages:
+        for block in message.content:
+            assert isinstance(block, ToolResultBlockParam)
+            for nested_block in block.content:
+                if isinstance(nested_block, ImageBlockParam):
+                    assert isinstance(nested_block.source, Base64ImageSourceParam)
+                    _ = base64_to_image(nested_block.source.data).size
+
+
+def test_count_tokens_of_200_image_history() -> None:
+    history = _history(200)
+    duration = best_duration(
+        lambda: SimpleTokenCounter().count_tokens(messages=history)
+    )
+    reference_duration = best_duration(lambda: _read_image_sizes_by_decoding(history))
+    assert duration < reference_duration
@@ -0,0 +1,151 @@
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageDraw
+
+from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    ImageBlockParam,
+    MessageParam,
+    TextBlockParam,
+    ToolResultBlockParam,
+    ToolUseBlockParam,
+)
+from askui.models.shared.settings import (
+    CACHING_VISUAL_VERIFICATION_METHOD,
+    CacheWritingSettings,
+)
+from askui.utils.caching import CacheManager
+from askui.utils.image_utils import image_to_base64
+from askui.utils.visual_validation import (
+    compute_ahash,
+    compute_phash,
+    extract_region,
+    find_recent_screenshot,
+    get_validation_coordinate,
+)
+
+from .conftest import best_duration
+
+pytestmark = pytest.mark.benchmark
+
+_N_STEPS = 1_000
+_SCREENSHOT_INTERVAL = 10
+
+
+def _screenshot(index: int) -> ImageBlockParam:
+    image = Image.new("RGB", (320, 240), "white")
+    draw = ImageDraw.Draw(image)
+    for i in range(8):
+        offset = (index * 7 + i * 37) % 280
+        draw.rectangle(
+            (offset, i * 30, offset + 40, i * 30 + 20), fill=(i * 30, index % 256, 90)
+        )
+    return ImageBlockParam(
+        source=Base64ImageSourceParam(
+            data=image_to_base64(image), media_type="image/png"
+        )
+    )
+
+
+def _tool_use(step: int, tool_input: dict[str, object]) -> ToolUseBlockParam:
+    return ToolUseBlockParam(id=f"tu_{step}", name="computer", input=tool_input)
+
+
+def _tool_result(
+    step: int, content: list[TextBlockParam | ImageBlockParam]
+) -> MessageParam:
+    return MessageParam(
+        role="user",
+        content=[ToolResultBlockParam(tool_use_id=f"tu_{step}", content=content)],
+    )
+
+
+def _trajectory_messages(n_steps: int) -> list[MessageParam]:
+    """Clicks and typing with a screenshot after every few steps."""
+    messages = [MessageParam(role="user", content="Fill in the form")]
+    for step in range(n_steps):
+        tool_input: dict[str, object] = (
+            {"action": "type", "text": "hello"}
+            if step % 3 == 2
+            else {"action": "left_click", "coordinate": [step % 320, step % 240]}
+        )
+        messages.append(
+            MessageParam(role="assistant", content=[_tool_use(step, tool_input)])
+        )
+        content: list[TextBlockParam | ImageBlockParam] = [TextBlockParam(text="done")]
+        if step % _SCREENSHOT_INTERVAL == 0:
+            content.append(_screenshot(step))
+        messages.append(_tool_result(step, content))
+    return messages
+
+
+def _trajectory(messages: list[MessageParam]) -> list[ToolUseBlockParam]:
+    return [
+        block.model_copy()
+        for message in messages
+        if message.role == "assistant" and not isinstance(message.content, str)
+        for block in message.content
+        if block.type == "tool_use"
+    ]
+
+
+def _reference_visual_representations(
+    trajectory: list[ToolUseBlockParam],
+    messages: list[MessageParam],
+    method: CACHING_VISUAL_VERIFICATION_METHOD,
+) -> dict[str, str | None]:
+    """Computes the hashes by searching the screenshot for each tool use."""
+    compute_hash = compute_phash if method == "phash" else compute_ahash
+    tool_ids = {block.id for block in trajectory}
+    representations: dict[str, str | None] = {}
+    for i, message in enumerate(messages):
+        if message.role != "assistant" or isinstance(message.content, str):
+            continue
+        for block in message.content:
+            if block.type != "tool_use" or block.id not in tool_ids:
+                continue
+            tool_input = block.input if isinstance(block.input, dict) else {}
+            coordinate = get_validation_coordinate(tool_input)
+            screenshot = find_recent_screenshot(messages, from_index=i - 1)
+            if coordinate is None or screenshot is None:
+                representations[block.id] = None
+                continue
+            region = extract_region(
+                screenshot, {"coordinate": list(coordinate)}, region_size=100
+            )
+            representations[block.id] = compute_hash(region)
+    return representations
+
+
+def _add_visual_validation(
+    trajectory: list[ToolUseBlockParam],
+    messages: list[MessageParam],
+    method: CACHING_VISUAL_VERIFICATION_METHOD,
+    cache_dir: Path,
+) -> dict[str, str | None]:
+    cache_manager = CacheManager()
+    cache_manager.start_recording(
+        cache_dir,
+        cache_writer_settings=CacheWritingSettings(
+            visual_verification_method=method, visual_validation_region_size=100
+        ),
+    )
+    cache_manager._add_visual_validation_to_trajectory(  # noqa: SLF001
+        trajectory, messages
+    )
+    return {block.id: block.visual_representation for block in trajectory}
+
+
+def test_visual_validation_of_1k_steps(tmp_path: Path) -> None:
+    messages = _trajectory_messages(_N_STEPS)
+    trajectory = _trajectory(messages)
+
+    duration = best_duration(
+        lambda: _add_visual_validation(trajectory, messages, "phash", tmp_path)
+    )
+    reference_duration = best_duration(
+        lambda: _reference_visual_representations(trajectory, messages, "phash"),
+        repeat=1,
+    )
+    assert duration < reference_duration
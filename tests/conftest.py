@@ -9,6 +9,27 @@ from askui.tools.agent_os import AgentOs, Display, DisplaySize
 from askui.tools.toolbox import AgentToolbox
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the benchmarks (marked with `benchmark`), which are skipped "
+        "by default as their timings are unreliable on loaded machines.",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="needs --benchmark to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture
 def path_fixtures() -> pathlib.Path:
     """Fixture providing the path to the fixtures directory."""
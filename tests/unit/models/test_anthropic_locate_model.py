@@ -0,0 +1,77 @@
+from typing import Any
+
+import pytest
+from PIL import Image
+
+from askui.locators.serializers import VlmLocatorSerializer
+from askui.models.askui.locate_models.anthropic_locate_model import (
+    AnthropicLocateModel,
+)
+from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    ImageBlockParam,
+    MessageParam,
+)
+from askui.models.shared.messages_api import MessagesApi
+from askui.models.shared.settings import ImageEncoding, LocateSettings
+from askui.utils.image_utils import ImageSource, base64_to_image
+
+_MARKER_COLOR = (255, 0, 255)
+
+
+class _MarkerLocatingMessagesApi(MessagesApi):
+    """Answers with the position of the marker in the image it receives."""
+
+    def __init__(self) -> None:
+        self.media_types: list[str] = []
+
+    def create_message(
+        self, messages: list[MessageParam], *_args: Any, **_kwargs: Any
+    ) -> MessageParam:
+        content = messages[0].content
+        assert isinstance(content, list)
+        image_block = content[0]
+        assert isinstance(image_block, ImageBlockParam)
+        assert isinstance(image_block.source, Base64ImageSourceParam)
+        self.media_types.append(image_block.source.media_type)
+        image = base64_to_image(image_block.source.data).convert("RGB")
+        pixels = image.load()
+        assert pixels is not None
+        x, y = next(
+            (x, y)
+            for y in range(image.height)
+            for x in range(image.width)
+            if pixels[x, y] == _MARKER_COLOR
+        )
+        return MessageParam(role="assistant", content=f"<click>{x}, {y}</click>")
+
+
+@pytest.fixture
+def screenshot_with_marker(github_login_screenshot: Image.Image) -> ImageSource:
+    image = github_login_screenshot.convert("RGB")
+    image.paste(_MARKER_COLOR, (700, 400, 720, 420))
+    return ImageSource(image)
+
+
+class TestAnthropicLocateModelImageEncoding:
+    @pytest.mark.parametrize(
+        "encoding",
+        [ImageEncoding(format="auto"), ImageEncoding(format="webp", lossless=True)],
+    )
+    def test_coordinates_stable_across_encodings(
+        self, screenshot_with_marker: ImageSource, encoding: ImageEncoding
+    ) -> None:
+        messages_api = _MarkerLocatingMessagesApi()
+        model = AnthropicLocateModel(
+            model_id="claude-sonnet-4-6",
+            messages_api=messages_api,
+            locator_serializer=VlmLocatorSerializer(),
+        )
+
+        expected = model.locate("marker", screenshot_with_marker, LocateSettings())
+        actual = model.locate(
+            "marker", screenshot_with_marker, LocateSettings(image_encoding=encoding)
+        )
+
+        assert messages_api.media_types == ["image/png", "image/webp"]
+        assert actual == expected
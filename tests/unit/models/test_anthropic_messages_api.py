@@ -0,0 +1,498 @@
+import base64
+import gc
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+from anthropic import Anthropic, AnthropicBedrock, Omit
+from anthropic.types.beta import BetaMessage, BetaTextBlock, BetaToolUseBlock, BetaUsage
+from typing_extensions import override
+
+from askui.callbacks.conversation_statistics_callback import UsageSummary
+from askui.model_providers.vlm_provider import VlmProvider
+from askui.models.anthropic.messages_api import (
+    AnthropicMessagesApi,
+    from_message_param,
+)
+from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    CacheControlEphemeralParam,
+    ImageBlockParam,
+    MessageParam,
+    TextBlockParam,
+    ToolResultBlockParam,
+    ToolUseBlockParam,
+)
+from askui.models.shared.message_cache import SerializedMessageCache
+from askui.models.shared.prompts import SystemPrompt
+from askui.models.shared.tools import Tool, ToolCollection
+from askui.models.shared.truncation_strategies import SummarizingTruncationStrategy
+
+
+class _FakeBetaMessageStream:
+    def __init__(self, message: BetaMessage) -> None:
+        self._message = message
+        self.closed = False
+
+    def __iter__(self) -> Any:
+        for index, block in enumerate(self._message.content):
+            yield SimpleNamespace(type="content_block_start", index=index)
+            yield SimpleNamespace(
+                type="content_block_stop", index=index, content_block=block
+            )
+        yield SimpleNamespace(type="message_stop")
+
+    def get_final_message(self) -> BetaMessage:
+        return self._message
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _tool_use_message() -> BetaMessage:
+    return BetaMessage(
+        id="msg_1",
+        type="message",
+        role="assistant",
+        model="claude-sonnet-4-6",
+        content=[
+            BetaTextBlock(type="text", text="Clicking"),
+            BetaToolUseBlock(type="tool_use", id="tu_1", name="click", input={"x": 1}),
+        ],
+        stop_reason="tool_use",
+        usage=BetaUsage(input_tokens=10, output_tokens=5),
+    )
+
+
+class TestAnthropicMessagesApiStream:
+    def test_yields_completed_blocks_and_final_message(self) -> None:
+        message = _tool_use_message()
+        fake_stream = _FakeBetaMessageStream(message)
+        client = MagicMock(spec=Anthropic)
+        client.beta.messages.stream.return_value.__enter__.return_value = fake_stream
+        api = AnthropicMessagesApi(client=client)
+
+        stream = api.create_message_stream(
+            messages=[MessageParam(role="user", content="Click")],
+            model_id="claude-sonnet-4-6",
+        )
+        blocks = list(stream)
+        final_message = stream.get_final_message()
+
+        assert blocks == [
+            TextBlockParam(text="Clicking"),
+            ToolUseBlockParam(id="tu_1", name="click", input={"x": 1}),
+        ]
+        assert final_message.content == blocks
+        assert final_message.stop_reason == "tool_use"
+        assert final_message.usage is not None
+        assert final_message.usage.output_tokens == 5
+        assert fake_stream.closed
+        assert client.beta.messages.stream.call_args.kwargs["timeout"] == 300.0
+
+    def test_falls_back_to_create_for_clients_without_streaming(self) -> None:
+        client = MagicMock(spec=AnthropicBedrock)
+        client.beta = MagicMock()
+        client.beta.messages.create.return_value = _tool_use_message()
+        api = AnthropicMessagesApi(client=client)
+
+        stream = api.create_message_stream(
+            messages=[MessageParam(role="user", content="Click")],
+            model_id="claude-sonnet-4-6",
+        )
+
+        assert list(stream) == [
+            TextBlockParam(text="Clicking"),
+            ToolUseBlockParam(id="tu_1", name="click", input={"x": 1}),
+        ]
+        assert stream.get_final_message().stop_reason == "tool_use"
+        client.beta.messages.create.assert_called_once()
+        client.beta.messages.stream.assert_not_called()
+
+
+def _screenshot_block(step: int) -> ImageBlockParam:
+    return ImageBlockParam(
+        source=Base64ImageSourceParam(
+            data=base64.b64encode(f"screenshot {step}".encode()).decode(),
+            media_type="image/png",
+        )
+    )
+
+
+def _step(step: int) -> list[MessageParam]:
+    return [
+        MessageParam(
+            role="assistant",
+            content=[
+                TextBlockParam(text=f"Step {step}"),
+                ToolUseBlockParam(
+                    id=f"tu_{step}",
+                    name="computer",
+                    input={"action": "screenshot"},
+                    visual_representation="abc",
+                ),
+            ],
+        ),
+        MessageParam(
+            role="user",
+            content=[
+                ToolResultBlockParam(
+                    tool_use_id=f"tu_{step}", content=[_screenshot_block(step)]
+                )
+            ],
+        ),
+    ]
+
+
+def _sent_messages_json(client: MagicMock) -> bytes:
+    return json.dumps(client.beta.messages.create.call_args.kwargs["messages"]).encode()
+
+
+def _expected_messages_json(messages: list[MessageParam]) -> bytes:
+    return json.dumps([from_message_param(message) for message in messages]).encode()
+
+
+class TestAnthropicMessagesApiMessageCache:
+    def _create_message(
+        self, api: AnthropicMessagesApi, messages: list[MessageParam]
+    ) -> None:
+        api.create_message(messages=messages, model_id="claude-sonnet-4-6")
+
+    def test_payloads_are_byte_identical(self) -> None:
+        client = MagicMock()
+        client.beta.messages.create.return_value.model_dump.return_value = {
+            "role": "assistant",
+            "content": "done",
+        }
+        api = AnthropicMessagesApi(client=client)
+        messages = [MessageParam(role="user", content="Take screenshots")]
+        for step in range(3):
+            messages.extend(_step(step))
+            self._create_message(api, messages)
+            assert _sent_messages_json(client) == _expected_messages_json(messages)
+
+        # Cache breakpoints are moved within the history in place
+        tool_result = messages[-1].content[-1]
+        assert isinstance(tool_result, ToolResultBlockParam)
+        tool_result.cache_control = CacheControlEphemeralParam()
+        self._create_message(api, messages)
+        assert _sent_messages_json(client) == _expected_messages_json(messages)
+        tool_result.cache_control = None
+        self._create_message(api, messages)
+        assert _sent_messages_json(client) == _expected_messages_json(messages)
+
+        # Truncation replaces images and summarizes the history
+        messages[2] = MessageParam(
+            role="user",
+            content=[
+                ToolResultBlockParam(
+                    tool_use_id="tu_0", content=[TextBlockParam(text="[removed]")]
+                )
+            ],
+        )
+        self._create_message(api, messages)
+        assert _sent_messages_json(client) == _expected_messages_json(messages)
+        messages[:5] = [MessageParam(role="user", content="Summary")]
+        self._create_message(api, messages)
+        assert _sent_messages_json(client) == _expected_messages_json(messages)
+
+
+class TestSerializedMessageCache:
+    def test_serializes_only_new_or_changed_messages(self) -> None:
+        serialized: list[MessageParam] = []
+
+        def serialize(message: MessageParam) -> dict[str, Any]:
+            serialized.append(message)
+            return from_message_param(message)  # type: ignore[return-value]
+
+        cache = SerializedMessageCache(serialize)
+        messages = _step(0)
+        cache.serialize_all(messages)
+        messages.extend(_step(1))
+        cache.serialize_all(messages)
+        assert serialized == messages
+
+        serialized.clear()
+        tool_use = messages[2].content[1]
+        assert isinstance(tool_use, ToolUseBlockParam)
+        tool_use.input = {"action": "left_click"}
+        cache.serialize_all(messages)
+        assert serialized == [messages[2]]
+
+        serialized.clear()
+        tool_use.input["action"] = "right_click"
+        assert cache.serialize(messages[2])["content"][1]["input"] == {
+            "action": "right_click"
+        }
+        assert serialized == [messages[2]]
+
+    def test_drops_serializations_of_collected_messages(self) -> None:
+        cache = SerializedMessageCache(from_message_param)
+        messages = _step(0)
+        cache.serialize_all(messages)
+        assert len(cache) == 2
+        del messages
+        gc.collect()
+        assert len(cache) == 0
+
+
+def _dump_model(model: CacheControlEphemeralParam) -> dict[str, Any]:
+    return model.model_dump()
+
+
+class _RecordingMessages:
+    """Records the payloads of `client.beta.messages.create()`."""
+
+    def __init__(self) -> None:
+        self.payloads: list[dict[str, Any]] = []
+
+    def create(self, **kwargs: Any) -> BetaMessage:
+        # serialize to record the payload as sent, not as (possibly) modified later
+        self.payloads.append(
+            {
+                key: json.loads(json.dumps(value, default=_dump_model))
+                for key, value in kwargs.items()
+                if key in ("messages", "system", "tools", "cache_control")
+                and not isinstance(value, Omit)
+            }
+        )
+        return BetaMessage(
+            id=f"msg_{len(self.payloads)}",
+            type="message",
+            role="assistant",
+            model="claude-sonnet-4-6",
+            content=[BetaTextBlock(type="text", text="done")],
+            stop_reason="end_turn",
+            usage=BetaUsage(
+                input_tokens=10,
+                output_tokens=5,
+                cache_creation_input_tokens=100,
+                cache_read_input_tokens=1000,
+            ),
+        )
+
+
+class _RecordingClient:
+    def __init__(self) -> None:
+        self.beta = SimpleNamespace(messages=_RecordingMessages())
+
+    @property
+    def payloads(self) -> list[dict[str, Any]]:
+        return self.beta.messages.payloads  # type: ignore[no-any-return]
+
+
+class _MessagesApiVlmProvider(VlmProvider):
+    def __init__(self, api: AnthropicMessagesApi) -> None:
+        self._api = api
+
+    @property
+    @override
+    def model_id(self) -> str:
+        return "claude-sonnet-4-6"
+
+    @override
+    def create_message(
+        self, messages: list[MessageParam], *args: Any, **kwargs: Any
+    ) -> MessageParam:
+        return self._api.create_message(messages, self.model_id, *args, **kwargs)
+
+
+class _ScreenshotTool(Tool):
+    def __init__(self) -> None:
+        super().__init__(
+            name="screenshot",
+            description="Takes a screenshot.",
+            input_schema={"type": "object", "properties": {}},
+        )
+
+    @override
+    def __call__(self) -> str:
+        return "screenshot"
+
+
+def _cache_breakpoints(payload: dict[str, Any]) -> list[str]:
+    """Locations of the cache breakpoints of a payload."""
+    breakpoints = ["top-level"] if payload.get("cache_control") else []
+    breakpoints.extend(
+        f"tools[{i}]"
+        for i, tool in enumerate(payload.get("tools", []))
+        if tool.get("cache_control")
+    )
+    if isinstance(payload.get("system"), list):
+        breakpoints.extend(
+            f"system[{i}]"
+            for i, block in enumerate(payload["system"])
+            if block.get("cache_control")
+        )
+    for i, message in enumerate(payload["messages"]):
+        if isinstance(message["content"], str):
+            continue
+        for j, block in enumerate(message["content"]):
+            if isinstance(block.get("content"), list):
+                breakpoints.extend(
+                    f"messages[{i}][{j}][{k}]"
+                    for k, nested_block in enumerate(block["content"])
+                    if nested_block.get("cache_control")
+                )
+            if block.get("cache_control"):
+                breakpoints.append(f"messages[{i}][{j}]")
+    return breakpoints
+
+
+_SYSTEM = SystemPrompt(prompt="You are a helpful agent.")
+
+
+class TestAnthropicMessagesApiCacheBreakpoints:
+    def _create_message(
+        self,
+        api: AnthropicMessagesApi,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        **kwargs: Any,
+    ) -> MessageParam:
+        return api.create_message(
+            messages=messages,
+            model_id="claude-sonnet-4-6",
+            tools=tools or ToolCollection(tools=[_ScreenshotTool()]),
+            system=_SYSTEM,
+            **kwargs,
+        )
+
+    def test_places_breakpoints_on_tools_system_and_rolling_history(self) -> None:
+        client = _RecordingClient()
+        api = AnthropicMessagesApi(client=client)  # type: ignore[arg-type]
+        messages = [MessageParam(role="user", content="Take screenshots")]
+        for step in range(3):
+            messages.extend(_step(step))
+            self._create_message(api, messages)
+            assert _cache_breakpoints(client.payloads[-1]) == [
+                "tools[0]",
+                "system[0]",
+                f"messages[{len(messages) - 1}][0]",
+            ]
+
+        # The rolling breakpoint is neither set on the messages nor on their
+        # serializations shared between requests
+        shared_payloads = api._message_cache.serialize_all(messages)  # noqa: SLF001
+        assert _cache_breakpoints({"messages": shared_payloads}) == []
+        assert all(
+            block.cache_control is None
+            for message in messages[1:]
+            for block in message.content
+            if isinstance(block, (TextBlockParam, ToolResultBlockParam))
+        )
+
+    def test_does_not_place_breakpoints_without_tools(self) -> None:
+        client = _RecordingClient()
+        api = AnthropicMessagesApi(client=client)  # type: ignore[arg-type]
+        api.create_message(
+            messages=[MessageParam(role="user", content="What is shown?")],
+            model_id="claude-sonnet-4-6",
+            system=SystemPrompt(prompt="You are a helpful agent."),
+        )
+        assert client.payloads[-1]["system"] == "You are a helpful agent."
+        assert _cache_breakpoints(client.payloads[-1]) == []
+
+    def test_respects_breakpoint_limit(self) -> None:
+        client = _RecordingClient()
+        api = AnthropicMessagesApi(client=client)  # type: ignore[arg-type]
+        messages = [MessageParam(role="user", content="Take screenshots")]
+        for step in range(4):
+            messages.extend(_step(step))
+            tool_result = messages[-1].content[0]
+            assert isinstance(tool_result, ToolResultBlockParam)
+            tool_result.cache_control = CacheControlEphemeralParam()
+
+        self._create_message(api, messages)
+        assert _cache_breakpoints(client.payloads[-1]) == [
+            "system[0]",
+            "messages[4][0]",
+            "messages[6][0]",
+            "messages[8][0]",
+        ]
+
+        self._create_message(
+            api,
+            messages,
+            provider_options={"cache_control": CacheControlEphemeralParam()},
+        )
+        assert _cache_breakpoints(client.payloads[-1]) == [
+            "top-level",
+            "system[0]",
+            "messages[6][0]",
+            "messages[8][0]",
+        ]
+
+    def test_can_be_disabled(self) -> None:
+        client = _RecordingClient()
+        api = AnthropicMessagesApi(
+            client=client,  # type: ignore[arg-type]
+            prompt_caching=False,
+        )
+        self._create_message(api, [MessageParam(role="user", content="Hello")])
+        assert client.payloads[-1]["system"] == "You are a helpful agent."
+        assert _cache_breakpoints(client.payloads[-1]) == ["tools[0]"]
+
+    def test_keeps_breakpoints_of_summarizing_truncation_strategy(self) -> None:
+        client = _RecordingClient()
+        api = AnthropicMessagesApi(client=client)  # type: ignore[arg-type]
+        strategy = SummarizingTruncationStrategy(n_messages_to_keep=2)
+        strategy.vlm_provider = _MessagesApiVlmProvider(api)
+        # the tool names are unique per collection, so the requests share one
+        tools = ToolCollection(tools=[_ScreenshotTool()])
+        # request context of the regular conversation calls
+        strategy.conversation = SimpleNamespace(  # type: ignore[assignment]
+            settings=SimpleNamespace(
+                messages=SimpleNamespace(system=_SYSTEM, provider_options=None)
+            ),
+            tools=tools,
+        )
+        strategy.append_message(
+            MessageParam(role="user", content=[TextBlockParam(text="Go")])
+        )
+        for step in range(3):
+            for message in _step(step):
+                strategy.append_message(message)
+        self._create_message(api, strategy.truncated_messages, tools)
+        request_payload = client.payloads[-1]
+        assert _cache_breakpoints(request_payload) == [
+            "tools[0]",
+            "system[0]",
+            "messages[6][0]",
+        ]
+
+        strategy.truncate()
+        # The summarization request shares the cached prefix up to the
+        # breakpoint of the strategy with the previous request
+        summarization_payload = client.payloads[-1]
+        assert _cache_breakpoints(summarization_payload) == [
+            "tools[0]",
+            "system[0]",
+            "messages[6][0]",
+        ]
+        assert summarization_payload["messages"][:7] == request_payload["messages"]
+
+        # After the history was rewritten, tools and system prompt are still
+        # read from the cache
+        self._create_message(api, strategy.truncated_messages, tools)
+        assert client.payloads[-1]["tools"] == request_payload["tools"]
+        assert client.payloads[-1]["system"] == request_payload["system"]
+        assert _cache_breakpoints(client.payloads[-1]) == [
+            "tools[0]",
+            "system[0]",
+            f"messages[{len(strategy.truncated_messages) - 1}][0]",
+        ]
+
+    def test_reports_cache_tokens(self) -> None:
+        client = _RecordingClient()
+        api = AnthropicMessagesApi(client=client)  # type: ignore[arg-type]
+        summary = UsageSummary()
+        for _ in range(2):
+            response = self._create_message(
+                api, [MessageParam(role="user", content="Hello")]
+            )
+            assert response.usage is not None
+            summary.add_usage(response.usage)
+        assert summary.cache_creation_input_tokens == 200
+        assert summary.cache_read_input_tokens == 2000
@@ -0,0 +1,115 @@
+import base64
+import io
+from typing import Literal
+
+import pytest
+from PIL import Image
+
+from askui.models.shared import token_counter
+from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    ImageBlockParam,
+    MessageParam,
+    TextBlockParam,
+    ToolResultBlockParam,
+)
+from askui.models.shared.token_counter import SimpleTokenCounter
+
+_N_IMAGES = 200
+_NOISE = Image.effect_noise((64, 64), 32)
+
+
+def _image_block(
+    size: tuple[int, int], format_: str = "PNG", offset: int = 0
+) -> ImageBlockParam:
+    """Encodes a white image with a noisy (i.e., hardly compressible) patch."""
+    image = Image.new("RGB", size, (255, 255, 255))
+    image.paste(_NOISE, (offset, offset))
+    with io.BytesIO() as buffer:
+        # fastest compression as encoding the history dominates the test duration
+        image.save(buffer, format=format_, compress_level=1)
+        data = base64.b64encode(buffer.getvalue()).decode()
+    media_type: Literal["image/png", "image/jpeg"] = (
+        "image/png" if format_ == "PNG" else "image/jpeg"
+    )
+    return ImageBlockParam(
+        source=Base64ImageSourceParam(data=data, media_type=media_type)
+    )
+
+
+def _history(n_images: int) -> list[MessageParam]:
+    return [
+        MessageParam(
+            role="user",
+            content=[
+                ToolResultBlockParam(
+                    tool_use_id=f"tu_{i}",
+                    content=[
+                        TextBlockParam(text=f"Screenshot {i}"),
+                        _image_block((640, 400), offset=i),
+                    ],
+                )
+            ],
+        )
+        for i in range(n_images)
+    ]
+
+
+@pytest.fixture(scope="module")
+def history() -> list[MessageParam]:
+    return _history(_N_IMAGES)
+
+
+class TestSimpleTokenCounterImages:
+    @pytest.mark.parametrize("format_", ["PNG", "JPEG"])
+    def test_counts_image_tokens_from_size(self, format_: str) -> None:
+        block = _image_block((1500, 1000), format_)
+        counter = SimpleTokenCounter()
+        assert counter.count_message_tokens(
+            MessageParam(role="user", content=[block])
+        ) == 10 + int((1500 * 1000) / 750)
+
+    def test_caches_image_sizes(
+        self, history: list[MessageParam], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        counter = SimpleTokenCounter()
+        counter.count_tokens(messages=history)
+        expected = counter.count_tokens(messages=history).total
+
+        def fail(_base64_string: str) -> tuple[int, int]:
+            pytest.fail("Image size was not cached")
+
+        monkeypatch.setattr(token_counter, "read_base64_image_size", fail)
+        assert counter.count_tokens(messages=history).total == expected
+
+    def test_evicts_least_recently_used_sizes(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(token_counter, "_IMAGE_SIZE_CACHE_MAX_SIZE", 2)
+        counter = SimpleTokenCounter()
+        first, second, third = (_image_block((width, 300)) for width in (1, 2, 3))
+        for block in (first, second, first, third):
+            counter.count_message_tokens(MessageParam(role="user", content=[block]))
+        cache = counter._image_size_cache  # noqa: SLF001
+        assert list(cache.values()) == [(1, 300), (3, 300)]
+
+    @pytest.mark.parametrize("format_", ["PNG", "JPEG"])
+    def test_decodes_only_image_header(
+        self, format_: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        block = _image_block((640, 400), format_)
+        assert isinstance(block.source, Base64ImageSourceParam)
+        decoded_lengths: list[int] = []
+        b64decode = base64.b64decode
+
+        def spy(s: str | bytes) -> bytes:
+            decoded_lengths.append(len(s))
+            return b64decode(s)
+
+        monkeypatch.setattr(base64, "b64decode", spy)
+        SimpleTokenCounter().count_message_tokens(
+            MessageParam(role="user", content=[block])
+        )
+        # only the beginning holding the header is decoded
+        assert decoded_lengths
+        assert max(decoded_lengths) < len(block.source.data)
@@ -0,0 +1,396 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+from typing_extensions import override
+
+from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    CacheControlEphemeralParam,
+    ContentBlockParam,
+    ImageBlockParam,
+    TextBlockParam,
+    ToolResultBlockParam,
+    ToolUseBlockParam,
+)
+from askui.models.shared.settings import ImageEncoding
+from askui.models.shared.tools import Tool, ToolCollection, ToolWithAgentOS
+from askui.tools.agent_os import AgentOs
+
+_DURATION = 0.01
+_TIMEOUT = 5.0
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str]] = []
+        self.threads: dict[str, threading.Thread] = {}
+        self.running = 0
+        self.max_running = 0
+        # labels of calls that only finish once all parties of the value run
+        self.barriers: dict[str, threading.Barrier] = {}
+        # labels of calls that only finish once the call of the value has ended
+        self.awaits: dict[str, str] = {}
+        self._ended: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _ended_event(self, label: str) -> threading.Event:
+        with self._lock:
+            return self._ended.setdefault(label, threading.Event())
+
+    def record(self, label: str) -> None:
+        with self._lock:
+            self.events.append(("start", label))
+            self.threads[label] = threading.current_thread()
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        if label in self.barriers:
+            self.barriers[label].wait(timeout=_TIMEOUT)
+        if label in self.awaits:
+            awaited = self._ended_event(self.awaits[label])
+            assert awaited.wait(timeout=_TIMEOUT), f"{label} did not overlap"
+        time.sleep(_DURATION)
+        with self._lock:
+            self.running -= 1
+            self.events.append(("end", label))
+        self._ended_event(label).set()
+
+
+class _RecordingTool(ToolWithAgentOS):
+    def __init__(
+        self,
+        name: str,
+        recorder: _Recorder,
+        agent_os: AgentOs,
+        read_only: bool,
+    ) -> None:
+        super().__init__(
+            name=name,
+            description="Records when it is called.",
+            required_tags=[],
+            agent_os=agent_os,
+        )
+        self.is_read_only = read_only
+        self._recorder = recorder
+
+    @override
+    def __call__(self, label: str) -> str:
+        self._recorder.record(label)
+        return label
+
+
+@pytest.fixture
+def recorder() -> _Recorder:
+    return _Recorder()
+
+
+def _make_tools(
+    recorder: _Recorder, agent_os: AgentOs | None = None
+) -> tuple[_RecordingTool, _RecordingTool]:
+    agent_os = agent_os or MagicMock(spec=AgentOs)
+    return (
+        _RecordingTool("observe", recorder, agent_os, read_only=True),
+        _RecordingTool("act", recorder, agent_os, read_only=False),
+    )
+
+
+def _call(tool: _RecordingTool, label: str) -> ToolUseBlockParam:
+    return ToolUseBlockParam(id=f"tu_{label}", name=tool.name, input={"label": label})
+
+
+def _media_type(result: ContentBlockParam) -> str:
+    assert isinstance(result, ToolResultBlockParam)
+    assert isinstance(result.content, list)
+    (image_block,) = result.content
+    assert isinstance(image_block, ImageBlockParam)
+    assert isinstance(image_block.source, Base64ImageSourceParam)
+    return image_block.source.media_type
+
+
+def _labels(results: list[ToolResultBlockParam]) -> list[str]:
+    labels = []
+    for result in results:
+        assert isinstance(result.content, list)
+        assert isinstance(result.content[0], TextBlockParam)
+        labels.append(result.content[0].text)
+    return labels
+
+
+class TestToolCollectionRun:
+    def test_read_only_tools_run_concurrently(self, recorder: _Recorder) -> None:
+        observe, _ = _make_tools(recorder)
+        tools = ToolCollection(tools=[observe], max_concurrent_tool_calls=4)
+        labels = [str(i) for i in range(4)]
+        recorder.barriers = dict.fromkeys(labels, threading.Barrier(4))
+        results = tools.run([_call(observe, label) for label in labels])
+        assert recorder.max_running == 4
+        assert _labels(results) == ["0", "1", "2", "3"]  # type: ignore[arg-type]
+        assert [result.tool_use_id for result in results] == [  # type: ignore[union-attr]
+            "tu_0",
+            "tu_1",
+            "tu_2",
+            "tu_3",
+        ]
+
+    def test_concurrency_is_bounded(self, recorder: _Recorder) -> None:
+        observe, _ = _make_tools(recorder)
+        tools = ToolCollection(tools=[observe], max_concurrent_tool_calls=2)
+        tools.run([_call(observe, str(i)) for i in range(6)])
+        assert recorder.max_running == 2
+
+    def test_mutating_tools_are_serialized_on_calling_thread(
+        self, recorder: _Recorder
+    ) -> None:
+        observe, act = _make_tools(recorder)
+        tools = ToolCollection(tools=[observe, act], max_concurrent_tool_calls=4)
+        recorder.barriers = {
+            **dict.fromkeys(["o1", "o2"], threading.Barrier(2)),
+            **dict.fromkeys(["o3", "o4"], threading.Barrier(2)),
+        }
+        results = tools.run(
+            [
+                _call(observe, "o1"),
+                _call(observe, "o2"),
+                _call(act, "a1"),
+                _call(act, "a2"),
+                _call(observe, "o3"),
+                _call(observe, "o4"),
+            ]
+        )
+        assert _labels(results) == ["o1", "o2", "a1", "a2", "o3", "o4"]  # type: ignore[arg-type]
+        events = recorder.events
+        # a1 waits for preceding observations, observations after a2 wait for it
+        assert events.index(("start", "a1")) > events.index(("end", "o1"))
+        assert events.index(("start", "a1")) > events.index(("end", "o2"))
+        assert events.index(("start", "a2")) == events.index(("end", "a1")) + 1
+        assert events.index(("start", "o3")) > events.index(("end", "a2"))
+        assert events.index(("start", "o4")) > events.index(("end", "a2"))
+        assert recorder.threads["a1"] is threading.current_thread()
+        assert recorder.threads["a2"] is threading.current_thread()
+        assert recorder.max_running == 2
+
+    def test_observations_of_other_agent_os_overlap_mutations(
+        self, recorder: _Recorder
+    ) -> None:
+        observe_1, _ = _make_tools(recorder)
+        observe_2, act_2 = _make_tools(recorder)
+        tools = ToolCollection(
+            tools=[observe_1, observe_2, act_2], max_concurrent_tool_calls=4
+        )
+        # "slow" only finishes after the mutation of the other agent OS ended
+        recorder.awaits["slow"] = "a"
+        results = tools.run(
+            [
+                _call(observe_1, "slow"),
+                _call(observe_2, "o"),
+                _call(act_2, "a"),
+            ]
+        )
+        assert not any(result.is_error for result in results)  # type: ignore[union-attr]
+        events = recorder.events
+        assert events.index(("start", "a")) > events.index(("end", "o"))
+        assert events.index(("end", "a")) < events.index(("end", "slow"))
+
+    def test_runs_in_order_by_default(self, recorder: _Recorder) -> None:
+        observe, act = _make_tools(recorder)
+        tools = ToolCollection(tools=[observe, act])
+        tools.run([_call(observe, "o1"), _call(observe, "o2"), _call(act, "a")])
+        assert recorder.events == [
+            ("start", "o1"),
+            ("end", "o1"),
+            ("start", "o2"),
+            ("end", "o2"),
+            ("start", "a"),
+            ("end", "a"),
+        ]
+
+    def test_unknown_tool_result_keeps_position(self, recorder: _Recorder) -> None:
+        observe, _ = _make_tools(recorder)
+        tools = ToolCollection(tools=[observe])
+        results = tools.run(
+            [
+                _call(observe, "o1"),
+                ToolUseBlockParam(id="tu_unknown", name="unknown", input={}),
+                _call(observe, "o2"),
+            ]
+        )
+        assert [result.tool_use_id for result in results] == [  # type: ignore[union-attr]
+            "tu_o1",
+            "tu_unknown",
+            "tu_o2",
+        ]
+        assert results[1].is_error  # type: ignore[union-attr]
+
+    def test_consecutive_mutating_tools_run_within_one_batch(
+        self, recorder: _Recorder
+    ) -> None:
+        agent_os = MagicMock(spec=AgentOs)
+        observe, act = _make_tools(recorder, agent_os)
+        tools = ToolCollection(tools=[observe, act])
+        results = tools.run(
+            [_call(act, "a1"), _call(act, "a2"), _call(observe, "o"), _call(act, "a3")]
+        )
+        assert _labels(results) == ["a1", "a2", "o", "a3"]  # type: ignore[arg-type]
+        agent_os.batch.assert_called_once_with()
+        agent_os.batch.return_value.__exit__.assert_called_once()
+
+    def test_failing_batch_is_reported_for_all_its_calls(
+        self, recorder: _Recorder
+    ) -> None:
+        agent_os = MagicMock(spec=AgentOs)
+        agent_os.batch.return_value.__exit__.side_effect = RuntimeError("timeout")
+        _, act = _make_tools(recorder, agent_os)
+        tools = ToolCollection(tools=[act])
+        results = tools.run([_call(act, "a1"), _call(act, "a2")])
+        assert [result.tool_use_id for result in results] == ["tu_a1", "tu_a2"]  # type: ignore[union-attr]
+        assert all(result.is_error for result in results)  # type: ignore[union-attr]
+        assert "timeout" in str(results[0].content)  # type: ignore[union-attr]
+
+    def test_grouping_key_groups_mutating_tools_by_agent_os(
+        self, recorder: _Recorder
+    ) -> None:
+        observe, act = _make_tools(recorder)
+        other_act = _RecordingTool(
+            "other_act", recorder, MagicMock(spec=AgentOs), read_only=False
+        )
+        tools = ToolCollection(
+            tools=[observe, act, other_act], max_concurrent_tool_calls=2
+        )
+        assert tools.grouping_key(_call(act, "a1")) is act.agent_os
+        assert tools.grouping_key(_call(other_act, "a2")) is other_act.agent_os
+        assert tools.grouping_key(_call(observe, "o")) == "read_only"
+        assert ToolCollection(tools=[observe]).grouping_key(_call(observe, "o")) is None
+
+    def test_images_are_encoded_as_passed_to_run(self) -> None:
+        class _ScreenshotTool(Tool):
+            def __init__(self) -> None:
+                super().__init__(name="screenshot", description="Takes a screenshot.")
+
+            @override
+            def __call__(self) -> Image.Image:
+                return Image.new("RGB", (8, 8))
+
+        screenshot = _ScreenshotTool()
+        tools = ToolCollection(tools=[screenshot])
+        call = ToolUseBlockParam(id="tu_s", name=screenshot.name, input={})
+        (png_result,) = tools.run([call])
+        (jpeg_result,) = tools.run([call], image_encoding=ImageEncoding(format="jpeg"))
+        assert _media_type(png_result) == "image/png"
+        assert _media_type(jpeg_result) == "image/jpeg"
+        assert tools.image_encoding is None
+
+    def test_invalid_max_concurrent_tool_calls(self) -> None:
+        with pytest.raises(ValueError, match="max_concurrent_tool_calls"):
+            ToolCollection(max_concurrent_tool_calls=0)
+
+
+class _EchoTool(Tool):
+    def __init__(self, name: str) -> None:
+        super().__init__(
+            name=name,
+            description=f"Echoes the input of {name}.",
+            input_schema={
+                "type": "object",
+                "properties": {"text": {"type": "string"}},
+                "required": ["text"],
+            },
+        )
+
+    @override
+    def __call__(self, text: str) -> str:
+        return text
+
+
+def _step(tools: ToolCollection, tool_names: list[str]) -> None:
+    """Tool related work done per step of the control loop."""
+    tools.to_params()
+    for tool_name in tool_names[:5]:
+        tools.tool_map.get(tool_name)
+    tools.find_tool_by_prefix("echo_199_00000000-0000-0000-0000-000000000000")
+
+
+class TestToolRegistry:
+    def test_name_is_memoized_and_follows_changes(self) -> None:
+        tool = _EchoTool("echo")
+        name = tool.name
+        assert tool.name is name
+        tool.name = "renamed tool"
+        assert tool.name.startswith("renamed_tool_")
+        tool.required_tags.append("computer")
+        assert tool.name.startswith("renamed_tool_tags_computer_")
+
+    def test_params_are_built_once(self) -> None:
+        tools = ToolCollection(tools=[_EchoTool("echo")])
+        with patch.object(
+            _EchoTool, "to_params", autospec=True, side_effect=Tool.to_params
+        ) as to_params:
+            for _ in range(10):
+                tools.to_params()
+        assert to_params.call_count == 1
+
+    def test_params_are_not_mutated_by_cache_control(self) -> None:
+        tool_1, tool_2 = _EchoTool("echo_1"), _EchoTool("echo_2")
+        tools = ToolCollection(tools=[tool_1, tool_2])
+        params = tools.to_params()
+        assert params[-1]["cache_control"] == CacheControlEphemeralParam()
+        assert "cache_control" not in tool_2.to_params()
+        tools.append_tool(_EchoTool("echo_3"))
+        params = tools.to_params()
+        assert [param.get("cache_control") for param in params] == [
+            None,
+            None,
+            CacheControlEphemeralParam(),
+        ]
+
+    def test_registry_is_invalidated_on_append_and_reset(self) -> None:
+        tool_1, tool_2 = _EchoTool("echo_1"), _EchoTool("echo_2")
+        tools = ToolCollection(tools=[tool_1])
+        assert list(tools.tool_map) == [tool_1.name]
+        tools.append_tool(tool_2)
+        assert list(tools.tool_map) == [tool_1.name, tool_2.name]
+        assert [param["name"] for param in tools.to_params()] == [
+            tool_1.name,
+            tool_2.name,
+        ]
+        tools.reset_tools([tool_2])
+        assert list(tools.tool_map) == [tool_2.name]
+        assert tools.find_tool_by_prefix(tool_1.name) is None
+
+    def test_tools_list_passed_in_is_not_aliased(self) -> None:
+        tool_list: list[Tool] = [_EchoTool("echo_1")]
+        tools = ToolCollection(tools=tool_list)
+        tool_list.append(_EchoTool("echo_2"))
+        assert len(tools.tool_map) == 1
+
+    def test_find_tool_by_prefix(self) -> None:
+        tool = _EchoTool("echo")
+        tools = ToolCollection(tools=[tool, _EchoTool("other")])
+        assert (
+            tools.find_tool_by_prefix("echo_12345678-1234-1234-1234-123456789abc")
+            is tool
+        )
+        assert tools.find_tool_by_prefix("echo") is None
+        assert (
+            tools.find_tool_by_prefix("unknown_12345678-1234-1234-1234-123456789abc")
+            is None
+        )
+
+    def test_include_filters_params(self) -> None:
+        tool_1, tool_2 = _EchoTool("echo_1"), _EchoTool("echo_2")
+        tools = ToolCollection(tools=[tool_1, tool_2], include={tool_2.name})
+        assert [param["name"] for param in tools.to_params()] == [tool_2.name]
+
+    def test_steps_reuse_registry_of_200_tools(self) -> None:
+        tool_list: list[Tool] = [_EchoTool(f"echo_{i}") for i in range(200)]
+        tools = ToolCollection(tools=tool_list)
+        tool_names = [tool.name for tool in tool_list]
+        with patch.object(
+            _EchoTool, "to_params", autospec=True, side_effect=Tool.to_params
+        ) as to_params:
+            tool_map = tools.tool_map
+            for _ in range(50):
+                _step(tools, tool_names)
+        assert to_params.call_count == 200
+        assert tools.tool_map is tool_map
@@ -14,9 +14,11 @@ from askui.models.shared.agent_message_param import (
     UrlImageSourceParam,
     UsageParam,
 )
+from askui.models.shared.token_counter import SimpleTokenCounter
 from askui.models.shared.truncation_strategies import (
     SlidingImageWindowSummarizingTruncationStrategy,
     SummarizingTruncationStrategy,
+    TruncationStrategy,
 )
 
 IMAGE_REMOVED_PLACEHOLDER = "[Screenshot removed to reduce message history length]"
@@ -1008,3 +1010,104 @@ class TestSummarizationRequestContext:
         assert call_kwargs["system"] is None
         assert call_kwargs["tools"] is None
         assert call_kwargs["provider_options"] is None
+
+
+# ---------------------------------------------------------------------------
+# Incremental token accounting
+# ---------------------------------------------------------------------------
+
+
+def _make_step_messages(i: int) -> list[MessageParam]:
+    """Assistant tool_use followed by a user tool_result with an image."""
+    return [
+        MessageParam(
+            role="assistant",
+            content=[
+                TextBlockParam(text=f"step {i}"),
+                ToolUseBlockParam(
+                    id=f"tu_{i}", input={"i": i}, name="tool", type="tool_use"
+                ),
+            ],
+        ),
+        MessageParam(
+            role="user",
+            content=[_make_tool_result_with_image(f"tu_{i}")],
+        ),
+    ]
+
+
+def _full_recount(strategy: TruncationStrategy) -> int:
+    return SimpleTokenCounter().count_tokens(messages=strategy.truncated_messages).total
+
+
+class _CountingTokenCounter(SimpleTokenCounter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def count_message_tokens(self, message: MessageParam) -> int:
+        self.calls += 1
+        return super().count_message_tokens(message)
+
+
+class TestIncrementalTokenCounts:
+    def test_sliding_totals_match_full_recount(self) -> None:
+        strategy = _make_strategy(
+            n_images_to_keep=2, n_messages_to_keep=4, max_input_tokens=2_000
+        )
+        strategy.append_message(MessageParam(role="user", content="start"))
+        for i in range(30):
+            for msg in _make_step_messages(i):
+                strategy.append_message(msg)
+                assert strategy.token_counts.total == _full_recount(strategy)
+        # summarization must have happened for the test to be meaningful
+        assert strategy.vlm_provider is not None
+        assert strategy.vlm_provider.create_message.called  # type: ignore[attr-defined]
+
+    def test_summarizing_totals_match_full_recount(self) -> None:
+        strategy = _make_summarizing_strategy(
+            n_messages_to_keep=4, max_input_tokens=2_000
+        )
+        strategy.append_message(MessageParam(role="user", content="start"))
+        for i in range(30):
+            for msg in _make_step_messages(i):
+                strategy.append_message(msg)
+                assert strategy.token_counts.total == _full_recount(strategy)
+        assert strategy.vlm_provider is not None
+        assert strategy.vlm_provider.create_message.called  # type: ignore[attr-defined]
+
+    def test_reset_recounts_history(self) -> None:
+        strategy = _make_summarizing_strategy()
+        strategy.reset(
+            [MessageParam(role="user", content="x" * 300), *_make_step_messages(0)]
+        )
+        assert strategy.token_counts.total == _full_recount(strategy)
+        strategy.reset()
+        assert strategy.token_counts.total == 0
+
+    def test_forced_truncate_keeps_totals_in_sync(self) -> None:
+        strategy = _make_strategy(n_messages_to_keep=2)
+        for i in range(6):
+            role = "user" if i % 2 == 0 else "assistant"
+            strategy.append_message(MessageParam(role=role, content=f"msg {i}"))
+        strategy.truncate()
+        assert strategy.token_counts.total == _full_recount(strategy)
+
+    def test_per_append_counting_cost_is_constant(self) -> None:
+        for strategy in (
+            _make_strategy(max_input_tokens=10**9),
+            _make_summarizing_strategy(max_input_tokens=10**9),
+        ):
+            counter = _CountingTokenCounter()
+            strategy._token_counter = counter
+            strategy.append_message(MessageParam(role="user", content="start"))
+            calls_per_append: list[int] = []
+            for i in range(1_500):
+                for msg in _make_step_messages(i):
+                    before = counter.calls
+                    strategy.append_message(msg)
+                    calls_per_append.append(counter.calls - before)
+            assert len(strategy.truncated_messages) == 3_001
+            # independent of history length (full recount would be ~n per append)
+            assert max(calls_per_append) <= 8
+            assert max(calls_per_append[-100:]) == max(calls_per_append[:100])
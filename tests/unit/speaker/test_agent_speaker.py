@@ -0,0 +1,285 @@
+"""Unit tests for streaming agent responses with early tool dispatch."""
+
+import time
+from typing import Any, Generator
+from unittest.mock import MagicMock
+
+import pytest
+from typing_extensions import override
+
+from askui.model_providers.vlm_provider import VlmProvider
+from askui.models.shared.agent_message_param import (
+    ContentBlockParam,
+    MessageParam,
+    TextBlockParam,
+    ThinkingConfigParam,
+    ToolChoiceParam,
+    ToolResultBlockParam,
+    ToolUseBlockParam,
+)
+from askui.models.shared.conversation import Conversation
+from askui.models.shared.messages_api import MessageStream
+from askui.models.shared.prompts import SystemPrompt
+from askui.models.shared.settings import ActSettings, MessageSettings
+from askui.models.shared.tools import Tool, ToolCollection, ToolWithAgentOS
+from askui.speaker import Speakers
+from askui.tools.agent_os import AgentOs
+
+_BLOCK_DELAY = 0.2
+_TOOL_DURATION = 0.2
+
+
+class _RecordingTool(Tool):
+    events: list[tuple[str, str]] = []
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(
+            **kwargs,
+            name="record",
+            description="Records the label it is called with.",
+            input_schema={
+                "type": "object",
+                "properties": {"label": {"type": "string"}},
+                "required": ["label"],
+            },
+        )
+
+    @override
+    def __call__(self, label: str) -> str:
+        self.events.append(("tool_start", label))
+        time.sleep(_TOOL_DURATION)
+        self.events.append(("tool_end", label))
+        return f"recorded {label}"
+
+
+class _AgentOsRecordingTool(ToolWithAgentOS, _RecordingTool):
+    def __init__(self, agent_os: AgentOs) -> None:
+        super().__init__(required_tags=[], agent_os=agent_os)
+
+
+class _FakeStreamingVlmProvider(VlmProvider):
+    """Streams one block every `_BLOCK_DELAY` seconds, then answers with text."""
+
+    def __init__(self, tool: _RecordingTool, labels: list[str]) -> None:
+        self._tool = tool
+        self._labels = labels
+        self.n_create_message_calls = 0
+        self.n_create_message_stream_calls = 0
+
+    @property
+    @override
+    def model_id(self) -> str:
+        return "fake-streaming-model"
+
+    def _next_content(self, messages: list[MessageParam]) -> list[ContentBlockParam]:
+        if messages[-1].role == "user" and isinstance(messages[-1].content, str):
+            return [
+                ToolUseBlockParam(
+                    id=f"tu_{label}",
+                    name=self._tool.name,
+                    input={"label": label},
+                )
+                for label in self._labels
+            ]
+        return [TextBlockParam(text="done")]
+
+    @staticmethod
+    def _to_message(content: list[ContentBlockParam]) -> MessageParam:
+        has_tool_use = any(block.type == "tool_use" for block in content)
+        return MessageParam(
+            role="assistant",
+            content=content,
+            stop_reason="tool_use" if has_tool_use else "end_turn",
+        )
+
+    @override
+    def create_message(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageParam:
+        self.n_create_message_calls += 1
+        content = self._next_content(messages)
+        time.sleep(_BLOCK_DELAY * len(content))
+        return self._to_message(content)
+
+    @override
+    def create_message_stream(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageStream:
+        self.n_create_message_stream_calls += 1
+        content = self._next_content(messages)
+
+        def _blocks() -> Generator[ContentBlockParam, None, MessageParam]:
+            for block in content:
+                time.sleep(_BLOCK_DELAY)
+                if isinstance(block, ToolUseBlockParam):
+                    self._tool.events.append(("streamed", block.input["label"]))  # type: ignore[index]
+                yield block
+            return self._to_message(content)
+
+        return MessageStream(_blocks())
+
+
+def _run(
+    labels: list[str],
+    stream: bool,
+    read_only: bool = False,
+    max_concurrent_tool_calls: int = 1,
+) -> tuple[Conversation, _RecordingTool, _FakeStreamingVlmProvider, float]:
+    tool = _RecordingTool()
+    tool.events = []
+    tool.is_read_only = read_only
+    provider = _FakeStreamingVlmProvider(tool, labels)
+    conversation = Conversation(speakers=Speakers(), vlm_provider=provider)
+    start = time.perf_counter()
+    conversation.execute_conversation(
+        messages=[MessageParam(role="user", content="Record a, b and c")],
+        tools=ToolCollection(
+            tools=[tool], max_concurrent_tool_calls=max_concurrent_tool_calls
+        ),
+        settings=ActSettings(messages=MessageSettings(stream=stream)),
+    )
+    return conversation, tool, provider, time.perf_counter() - start
+
+
+class TestMessageStream:
+    def test_from_message_yields_blocks_and_final_message(self) -> None:
+        message = MessageParam(
+            role="assistant",
+            content=[TextBlockParam(text="a"), TextBlockParam(text="b")],
+            stop_reason="end_turn",
+        )
+        stream = MessageStream.from_message(message)
+        assert list(stream) == message.content
+        assert stream.get_final_message() == message
+
+    def test_get_final_message_consumes_rest_of_stream(self) -> None:
+        message = MessageParam(role="assistant", content=[TextBlockParam(text="a")])
+        stream = MessageStream.from_message(message)
+        assert stream.get_final_message() == message
+        assert list(stream) == []
+
+
+class TestAgentSpeakerStreaming:
+    def test_tools_start_before_response_is_complete(self) -> None:
+        _, tool, provider, _ = _run(["a", "b", "c"], stream=True)
+        assert provider.n_create_message_stream_calls == 2
+        assert provider.n_create_message_calls == 0
+        assert tool.events.index(("tool_start", "a")) < tool.events.index(
+            ("streamed", "c")
+        )
+        # tool calls are still executed one after another in the streamed order
+        tool_events = [event for event in tool.events if event[0] != "streamed"]
+        assert tool_events == [
+            ("tool_start", "a"),
+            ("tool_end", "a"),
+            ("tool_start", "b"),
+            ("tool_end", "b"),
+            ("tool_start", "c"),
+            ("tool_end", "c"),
+        ]
+
+    def test_tool_results_keep_order_of_tool_calls(self) -> None:
+        conversation, _, _, _ = _run(["a", "b", "c"], stream=True)
+        messages = conversation.get_messages()
+        assert [message.role for message in messages] == [
+            "user",
+            "assistant",
+            "user",
+            "assistant",
+        ]
+        tool_results = messages[2].content
+        assert isinstance(tool_results, list)
+        assert [
+            (block.tool_use_id, block.content)
+            for block in tool_results
+            if isinstance(block, ToolResultBlockParam)
+        ] == [
+            ("tu_a", [TextBlockParam(text="recorded a")]),
+            ("tu_b", [TextBlockParam(text="recorded b")]),
+            ("tu_c", [TextBlockParam(text="recorded c")]),
+        ]
+
+    def test_streaming_is_faster_than_waiting_for_whole_response(self) -> None:
+        *_, streaming_duration = _run(["a", "b", "c"], stream=True)
+        *_, blocking_duration = _run(["a", "b", "c"], stream=False)
+        # blocking: 3 blocks + 3 tools + 1 block, streaming: 3 blocks + 1 tool + 1
+        assert streaming_duration < blocking_duration - _TOOL_DURATION
+
+    @pytest.mark.parametrize("stream", [True, False])
+    def test_read_only_tools_run_concurrently(self, stream: bool) -> None:
+        conversation, tool, _, _ = _run(
+            ["a", "b", "c"], stream=stream, read_only=True, max_concurrent_tool_calls=3
+        )
+        tool_events = [event[0] for event in tool.events if event[0] != "streamed"]
+        assert tool_events == ["tool_start"] * 3 + ["tool_end"] * 3
+        tool_results = conversation.get_messages()[2].content
+        assert isinstance(tool_results, list)
+        assert [
+            block.tool_use_id
+            for block in tool_results
+            if isinstance(block, ToolResultBlockParam)
+        ] == ["tu_a", "tu_b", "tu_c"]
+
+    def test_mutating_tools_on_same_agent_os_run_within_one_batch(self) -> None:
+        agent_os = MagicMock(spec=AgentOs)
+        tool = _AgentOsRecordingTool(agent_os)
+        tool.events = []
+        provider = _FakeStreamingVlmProvider(tool, ["a", "b", "c"])
+        conversation = Conversation(speakers=Speakers(), vlm_provider=provider)
+        conversation.execute_conversation(
+            messages=[MessageParam(role="user", content="Record a, b and c")],
+            tools=ToolCollection(tools=[tool]),
+            settings=ActSettings(messages=MessageSettings(stream=True)),
+        )
+        agent_os.batch.assert_called_once_with()
+        assert [event for event in tool.events if event[0] == "tool_start"] == [
+            ("tool_start", "a"),
+            ("tool_start", "b"),
+            ("tool_start", "c"),
+        ]
+
+    def test_stream_disabled_uses_create_message(self) -> None:
+        conversation, tool, provider, _ = _run(["a", "b"], stream=False)
+        assert provider.n_create_message_calls == 2
+        assert provider.n_create_message_stream_calls == 0
+        assert [event for event in tool.events if event[0] == "tool_start"] == [
+            ("tool_start", "a"),
+            ("tool_start", "b"),
+        ]
+        assert len(conversation.get_messages()) == 4
+
+    def test_stream_error_is_raised_in_callers_thread(self) -> None:
+        tool = _RecordingTool()
+        provider = _FakeStreamingVlmProvider(tool, ["a"])
+
+        def _failing_blocks() -> Generator[ContentBlockParam, None, MessageParam]:
+            yield TextBlockParam(text="partial")
+            error_msg = "connection lost"
+            raise ConnectionError(error_msg)
+
+        provider.create_message_stream = (  # type: ignore[method-assign]
+            lambda **_: MessageStream(_failing_blocks())
+        )
+        conversation = Conversation(speakers=Speakers(), vlm_provider=provider)
+        with pytest.raises(ConnectionError, match="connection lost"):
+            conversation.execute_conversation(
+                messages=[MessageParam(role="user", content="Record a")],
+                tools=ToolCollection(tools=[tool]),
+                settings=ActSettings(messages=MessageSettings(stream=True)),
+            )
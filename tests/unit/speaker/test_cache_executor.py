@@ -0,0 +1,609 @@
+"""Unit tests for replaying cached trajectories directly against the tools."""
+
+import itertools
+import json
+import math
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image, ImageDraw
+from typing_extensions import override
+
+from askui.callbacks import ConversationCallback
+from askui.model_providers.vlm_provider import VlmProvider
+from askui.models.shared import ComputerBaseTool
+from askui.models.shared import tools as tools_module
+from askui.models.shared.agent_message_param import (
+    MessageParam,
+    TextBlockParam,
+    ThinkingConfigParam,
+    ToolChoiceParam,
+    ToolUseBlockParam,
+)
+from askui.models.shared.conversation import Conversation
+from askui.models.shared.prompts import SystemPrompt
+from askui.models.shared.settings import (
+    CACHE_REPLAY_MODE,
+    ActSettings,
+    CacheExecutionSettings,
+    CacheFile,
+    CacheMetadata,
+    MessageSettings,
+    ScreenSettleSettings,
+    VisualValidationMetadata,
+)
+from askui.models.shared.tools import Tool, ToolCollection
+from askui.models.types.geometry import CaptureRegion
+from askui.speaker import AgentSpeaker, CacheExecutor, Speakers
+from askui.speaker import cache_executor as cache_executor_module
+from askui.tools.agent_os import AgentOs
+from askui.utils import screen_settle as screen_settle_module
+from askui.utils.caching import CacheManager
+from askui.utils.visual_validation import compute_phash, extract_region
+
+_CACHE_FILE_NAME = "login.json"
+
+
+def _screenshot() -> Image.Image:
+    image = Image.new("RGB", (200, 100), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((5, 5, 40, 20), fill="blue")
+    draw.text((8, 8), "OK", fill="white")
+    draw.rectangle((60, 50, 190, 70), outline="black")
+    return image
+
+
+class _ClickTool(ComputerBaseTool):
+    def __init__(self, agent_os: AgentOs) -> None:
+        super().__init__(
+            name="click",
+            description="Clicks at a position.",
+            input_schema={
+                "type": "object",
+                "properties": {"x": {"type": "integer"}, "y": {"type": "integer"}},
+                "required": ["x", "y"],
+            },
+            required_tags=[],
+            agent_os=agent_os,
+        )
+        self.is_cacheable = True
+
+    @override
+    def __call__(self, x: int, y: int) -> str:
+        self.agent_os.mouse_move(x, y)
+        self.agent_os.click("left")
+        return f"Clicked at ({x}, {y})."
+
+
+class _TypeTool(ComputerBaseTool):
+    def __init__(self, agent_os: AgentOs) -> None:
+        super().__init__(
+            name="type",
+            description="Types text.",
+            input_schema={
+                "type": "object",
+                "properties": {"text": {"type": "string"}},
+                "required": ["text"],
+            },
+            required_tags=[],
+            agent_os=agent_os,
+        )
+        self.is_cacheable = True
+
+    @override
+    def __call__(self, text: str) -> str:
+        self.agent_os.type(text)
+        return f"Typed {text}."
+
+
+class _ScreenshotTool(ComputerBaseTool):
+    def __init__(self, agent_os: AgentOs) -> None:
+        super().__init__(
+            name="screenshot",
+            description="Takes a screenshot.",
+            required_tags=[],
+            agent_os=agent_os,
+        )
+        self.is_cacheable = True
+        self.is_read_only = True
+
+    @override
+    def __call__(self) -> tuple[str, Image.Image]:
+        return "Screenshot was taken.", self.agent_os.screenshot()
+
+
+class _AskUserTool(Tool):
+    def __init__(self) -> None:
+        super().__init__(name="ask_user", description="Asks the user.")
+
+    @override
+    def __call__(self) -> str:
+        return "The user answered."
+
+
+class _ScriptedVlmProvider(VlmProvider):
+    """Switches to the `CacheExecutor` and finishes once it hands back."""
+
+    def __init__(self) -> None:
+        self.n_calls = 0
+
+    @property
+    @override
+    def model_id(self) -> str:
+        return "scripted-model"
+
+    @override
+    def create_message(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageParam:
+        self.n_calls += 1
+        if self.n_calls > 1:
+            return MessageParam(
+                role="assistant",
+                content=[TextBlockParam(text="Done.")],
+                stop_reason="end_turn",
+            )
+        assert tools is not None
+        switch_speaker_tool_name = next(
+            name for name in tools.tool_map if name.startswith("switch_speaker")
+        )
+        return MessageParam(
+            role="assistant",
+            content=[
+                ToolUseBlockParam(
+                    id="tu_switch",
+                    name=switch_speaker_tool_name,
+                    input={
+                        "speaker_name": "CacheExecutor",
+                        "speaker_context": {
+                            "trajectory_file": _CACHE_FILE_NAME,
+                            "parameter_values": {"user": "admin"},
+                        },
+                    },
+                )
+            ],
+            stop_reason="tool_use",
+        )
+
+
+class _ToolExecutionRecorder(ConversationCallback):
+    def __init__(self) -> None:
+        self.events: list[tuple[str, list[str]]] = []
+
+    @override
+    def on_tool_execution_start(
+        self, conversation: Conversation, tool_names: list[str]
+    ) -> None:
+        self.events.append(("start", tool_names))
+
+    @override
+    def on_tool_execution_end(
+        self, conversation: Conversation, tool_names: list[str]
+    ) -> None:
+        self.events.append(("end", tool_names))
+
+
+class _Replay:
+    def __init__(
+        self,
+        cache_dir: Path,
+        agent_os: MagicMock,
+        conversation: Conversation,
+        executor: CacheExecutor,
+        provider: _ScriptedVlmProvider,
+        recorder: _ToolExecutionRecorder,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.agent_os = agent_os
+        self.conversation = conversation
+        self.executor = executor
+        self.provider = provider
+        self.recorder = recorder
+
+    @property
+    def messages(self) -> list[dict[str, Any]]:
+        return [
+            message.model_dump(mode="json")
+            for message in self.conversation.get_messages()
+        ]
+
+    @property
+    def metadata(self) -> CacheMetadata:
+        return CacheManager.read_cache_file(self.cache_dir / _CACHE_FILE_NAME).metadata
+
+
+_Step = tuple[str, dict[str, Any], str | None]
+
+
+def _replay(
+    steps: list[_Step],
+    replay_mode: CACHE_REPLAY_MODE,
+    cache_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    agent_os: MagicMock | None = None,
+    execution_settings: CacheExecutionSettings | None = None,
+) -> _Replay:
+    """Replays steps (tool, input, visual representation) within `cache_dir`.
+
+    The cache file is only written by the first replay within `cache_dir`.
+    """
+    # Same tool names in every replay so that their messages can be compared
+    ids = itertools.count()
+    monkeypatch.setattr(
+        tools_module,
+        "uuid",
+        SimpleNamespace(uuid4=lambda: uuid.UUID(int=next(ids))),
+    )
+    if agent_os is None:
+        agent_os = MagicMock(spec=AgentOs)
+        agent_os.screenshot.return_value = _screenshot()
+    tools: list[Tool] = [
+        _ClickTool(agent_os),
+        _TypeTool(agent_os),
+        _ScreenshotTool(agent_os),
+        _AskUserTool(),
+    ]
+    tool_names = {tool.base_name: tool.name for tool in tools}
+    cache_file = CacheFile(
+        metadata=CacheMetadata(
+            created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            visual_validation=VisualValidationMetadata(
+                enabled=True, method="phash", region_size=50
+            ),
+        ),
+        trajectory=[
+            ToolUseBlockParam(
+                id=f"tu_{i}",
+                name=tool_names[tool_name],
+                input=tool_input,
+                visual_representation=visual_representation,
+            )
+            for i, (tool_name, tool_input, visual_representation) in enumerate(steps)
+        ],
+        cache_parameters={"user": "The user to log in as"},
+    )
+    cache_dir.mkdir(exist_ok=True)
+    monkeypatch.chdir(cache_dir)
+    if not Path(_CACHE_FILE_NAME).exists():
+        Path(_CACHE_FILE_NAME).write_text(
+            json.dumps(cache_file.model_dump(mode="json")), encoding="utf-8"
+        )
+
+    if execution_settings is None:
+        execution_settings = CacheExecutionSettings(
+            delay_time_between_actions=0, screen_settle=None
+        )
+    executor = CacheExecutor(
+        execution_settings.model_copy(update={"replay_mode": replay_mode})
+    )
+    provider = _ScriptedVlmProvider()
+    recorder = _ToolExecutionRecorder()
+    conversation = Conversation(
+        speakers=Speakers({"AgentSpeaker": AgentSpeaker(), "CacheExecutor": executor}),
+        vlm_provider=provider,
+        cache_manager=CacheManager(),
+        callbacks=[recorder],
+    )
+    conversation.execute_conversation(
+        messages=[MessageParam(role="user", content="Log in as admin")],
+        tools=ToolCollection(tools=tools),
+        settings=ActSettings(messages=MessageSettings(stream=False)),
+    )
+    return _Replay(cache_dir, agent_os, conversation, executor, provider, recorder)
+
+
+def _replay_in_both_modes(
+    steps: list[_Step], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> tuple[_Replay, _Replay]:
+    direct = _replay(steps, "direct", tmp_path / "direct", monkeypatch)
+    conversation = _replay(
+        steps, "conversation", tmp_path / "conversation", monkeypatch
+    )
+    return direct, conversation
+
+
+def _visual_representation(x: int, y: int, invert: bool = False) -> str:
+    region = extract_region(_screenshot(), {"coordinate": [x, y]}, region_size=50)
+    visual_hash = int(compute_phash(region), 16)
+    if invert:
+        visual_hash ^= (1 << 64) - 1
+    return f"{visual_hash:016x}"
+
+
+def _assert_same_side_effects(direct: _Replay, conversation: _Replay) -> None:
+    assert direct.agent_os.mock_calls == conversation.agent_os.mock_calls
+    assert direct.messages == conversation.messages
+    assert direct.recorder.events == conversation.recorder.events
+    assert direct.provider.n_calls == conversation.provider.n_calls == 2
+    assert [
+        (failure.step_index, failure.error_message)
+        for failure in direct.metadata.failures
+    ] == [
+        (failure.step_index, failure.error_message)
+        for failure in conversation.metadata.failures
+    ]
+
+
+class TestDirectReplay:
+    def test_completed_trajectory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        steps: list[_Step] = [
+            ("screenshot", {}, None),
+            ("click", {"x": 20, "y": 12}, _visual_representation(20, 12)),
+            ("type", {"text": "{{user}}"}, None),
+            ("click", {"x": 120, "y": 60}, _visual_representation(120, 60)),
+        ]
+        direct, conversation = _replay_in_both_modes(steps, tmp_path, monkeypatch)
+
+        _assert_same_side_effects(direct, conversation)
+        direct.agent_os.type.assert_called_once_with("admin")
+        assert "[CACHE EXECUTION COMPLETED]" in json.dumps(direct.messages[-2])
+        assert [
+            (entry.step_index, entry.tool_name.split("_")[0], entry.is_error)
+            for entry in direct.executor.replay_log
+        ] == [
+            (0, "screenshot", False),
+            (1, "click", False),
+            (2, "type", False),
+            (3, "click", False),
+        ]
+        assert conversation.executor.replay_log == []
+
+    def test_pauses_for_non_cacheable_step(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        steps: list[_Step] = [
+            ("click", {"x": 20, "y": 12}, None),
+            ("ask_user", {}, None),
+            ("type", {"text": "{{user}}"}, None),
+        ]
+        direct, conversation = _replay_in_both_modes(steps, tmp_path, monkeypatch)
+
+        _assert_same_side_effects(direct, conversation)
+        direct.agent_os.type.assert_not_called()
+        assert "Cache execution paused at step 1" in json.dumps(direct.messages[-2])
+        assert len(direct.executor.replay_log) == 1
+
+    def test_fails_visual_validation(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        steps: list[_Step] = [
+            ("screenshot", {}, None),
+            ("click", {"x": 20, "y": 12}, _visual_representation(20, 12)),
+            ("click", {"x": 120, "y": 60}, _visual_representation(120, 60, True)),
+            ("type", {"text": "{{user}}"}, None),
+        ]
+        direct, conversation = _replay_in_both_modes(steps, tmp_path, monkeypatch)
+
+        _assert_same_side_effects(direct, conversation)
+        assert direct.agent_os.click.call_count == 1
+        assert "[CACHE EXECUTION FAILED]" in json.dumps(direct.messages[-2])
+        (failure,) = direct.metadata.failures
+        assert failure.step_index == 2
+
+
+class _AnimatedScreen:
+    """Screen animating for a while after every click, on a fake clock."""
+
+    def __init__(self, animation_duration: float) -> None:
+        self.now = 0.0
+        self._animation_duration = animation_duration
+        self._n_clicks = 0
+        self._last_click_at = -math.inf
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    def click(self, *_args: Any, **_kwargs: Any) -> None:
+        self._n_clicks += 1
+        self._last_click_at = self.now
+
+    def screenshot(self, *_args: Any, **_kwargs: Any) -> Image.Image:
+        self.now += 0.02
+        state = self._n_clicks * 100
+        if self.now < self._last_click_at + self._animation_duration:
+            state += int((self.now - self._last_click_at) * 20) + 1
+        image = Image.new("RGB", (320, 200), "white")
+        draw = ImageDraw.Draw(image)
+        left = state * 37 % 280
+        draw.rectangle((left, 80, left + 40, 120), fill="black")
+        return image
+
+    def agent_os(self) -> MagicMock:
+        agent_os = MagicMock(spec=AgentOs)
+        agent_os.click.side_effect = self.click
+        agent_os.screenshot.side_effect = self.screenshot
+        return agent_os
+
+
+_CLICKS: list[_Step] = [
+    ("click", {"x": 20, "y": 12}, None),
+    ("click", {"x": 120, "y": 60}, None),
+    ("click", {"x": 20, "y": 12}, None),
+]
+
+
+class TestScreenSettle:
+    def _replay(
+        self,
+        screen: _AnimatedScreen,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        max_wait: float | None = 3.0,
+    ) -> tuple[_Replay, float]:
+        """Replays `_CLICKS`, returning the replay and the (fake) time it took."""
+        monkeypatch.setattr(screen_settle_module, "time", screen)
+        start = screen.now
+        replay = _replay(
+            _CLICKS,
+            "direct",
+            tmp_path / "cache",
+            monkeypatch,
+            agent_os=screen.agent_os(),
+            execution_settings=CacheExecutionSettings(
+                delay_time_between_actions=0.5,
+                screen_settle=ScreenSettleSettings(max_wait=max_wait),
+            ),
+        )
+        return replay, screen.now - start
+
+    def test_waits_until_screen_settled(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        screen = _AnimatedScreen(animation_duration=0.4)
+        replay, duration = self._replay(screen, tmp_path, monkeypatch)
+
+        timings = replay.metadata.screen_settle_timings
+        assert sorted(timings) == [0, 1]
+        for timing in timings.values():
+            assert timing.settled
+            assert 0.4 <= timing.settle_time < 0.6
+        # waits for the animation and the stable duration of each of the 2 waits
+        assert 2 * (0.4 + 0.3) <= duration < 2 * 1.0
+        assert replay.agent_os.click.call_count == 3
+
+    def test_samples_frames_after_learned_settle_time(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        screen = _AnimatedScreen(animation_duration=0.4)
+        first_replay, _ = self._replay(screen, tmp_path, monkeypatch)
+        second_replay, _ = self._replay(screen, tmp_path, monkeypatch)
+
+        n_first_frames = first_replay.agent_os.screenshot.call_count
+        n_second_frames = second_replay.agent_os.screenshot.call_count
+        assert n_second_frames < n_first_frames
+        assert all(
+            timing.settled
+            for timing in second_replay.metadata.screen_settle_timings.values()
+        )
+
+    def test_falls_back_to_fixed_delay_if_screen_does_not_settle(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        screen = _AnimatedScreen(animation_duration=math.inf)
+        first_replay, first_duration = self._replay(
+            screen, tmp_path, monkeypatch, max_wait=2.0
+        )
+        timings = first_replay.metadata.screen_settle_timings
+        assert sorted(timings) == [0, 1]
+        assert not any(timing.settled for timing in timings.values())
+        assert 2 * 2.0 <= first_duration < 2 * 2.1
+
+        _, second_duration = self._replay(screen, tmp_path, monkeypatch, max_wait=2.0)
+        # waits at most the fixed delay of 0.5s
+        assert 2 * 0.5 <= second_duration < 2 * 0.6
+
+    def test_waits_at_most_fixed_delay_by_default(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        screen = _AnimatedScreen(animation_duration=math.inf)
+        replay, duration = self._replay(screen, tmp_path, monkeypatch, max_wait=None)
+
+        assert not any(
+            timing.settled for timing in replay.metadata.screen_settle_timings.values()
+        )
+        assert 2 * 0.5 <= duration < 2 * 0.6
+
+    def test_captures_region_around_click(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        screen = _AnimatedScreen(animation_duration=0.4)
+        replay, _ = self._replay(screen, tmp_path, monkeypatch)
+
+        regions = {
+            call.kwargs["region"] for call in replay.agent_os.screenshot.call_args_list
+        }
+        assert regions == {
+            CaptureRegion.around((20, 12), 400),
+            CaptureRegion.around((120, 60), 400),
+        }
+
+    def test_batches_steps_after_which_screen_settled_right_away(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        screen = _AnimatedScreen(animation_duration=0.4)
+        steps: list[_Step] = [
+            ("type", {"text": "admin"}, None),
+            ("type", {"text": "secret"}, None),
+            ("click", {"x": 20, "y": 12}, None),
+            ("type", {"text": "done"}, None),
+        ]
+        monkeypatch.setattr(screen_settle_module, "time", screen)
+        settings = CacheExecutionSettings(
+            delay_time_between_actions=0.5,
+            screen_settle=ScreenSettleSettings(max_wait=3.0),
+        )
+        first_replay = _replay(
+            steps,
+            "direct",
+            tmp_path / "cache",
+            monkeypatch,
+            agent_os=screen.agent_os(),
+            execution_settings=settings,
+        )
+        first_replay.agent_os.batch.assert_not_called()
+
+        second_replay = _replay(
+            steps,
+            "direct",
+            tmp_path / "cache",
+            monkeypatch,
+            agent_os=screen.agent_os(),
+            execution_settings=settings,
+        )
+        # typing does not change the screen, so both type steps and the click
+        # are executed in one batch and the screen is only observed after it
+        second_replay.agent_os.batch.assert_called_once_with()
+        assert second_replay.agent_os.type.call_count == 3
+        assert second_replay.agent_os.click.call_count == 1
+        assert [entry.step_index for entry in second_replay.executor.replay_log] == [
+            0,
+            1,
+            2,
+            3,
+        ]
+        assert (
+            second_replay.agent_os.screenshot.call_count
+            < first_replay.agent_os.screenshot.call_count
+        )
+
+    def test_falls_back_to_fixed_delay_if_screen_cannot_be_captured(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sleeps: list[float] = []
+        monkeypatch.setattr(
+            cache_executor_module,
+            "time",
+            SimpleNamespace(sleep=sleeps.append, perf_counter=lambda: 0.0),
+        )
+        agent_os = MagicMock(spec=AgentOs)
+        agent_os.screenshot.side_effect = RuntimeError("Display disconnected")
+        replay = _replay(
+            _CLICKS,
+            "direct",
+            tmp_path / "cache",
+            monkeypatch,
+            agent_os=agent_os,
+            execution_settings=CacheExecutionSettings(delay_time_between_actions=0.5),
+        )
+
+        assert sleeps == [0.5, 0.5]
+        assert replay.agent_os.click.call_count == 3
+        assert replay.metadata.screen_settle_timings == {}
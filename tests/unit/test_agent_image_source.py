@@ -0,0 +1,102 @@
+"""Tests of the image encodings on the `Agent.get()`/`Agent.locate()` paths."""
+
+from typing import Any, Type
+
+import pytest
+from PIL import Image
+from typing_extensions import override
+
+from askui.agent_base import Agent
+from askui.agent_settings import AgentSettings
+from askui.locators.locators import Locator
+from askui.model_providers.detection_provider import DetectionProvider
+from askui.model_providers.image_qa_provider import ImageQAProvider
+from askui.model_providers.vlm_provider import VlmProvider
+from askui.models.shared.agent_message_param import MessageParam
+from askui.models.shared.settings import GetSettings, LocateSettings
+from askui.models.types.geometry import PointList
+from askui.models.types.response_schemas import ResponseSchema
+from askui.utils import image_utils
+from askui.utils.image_utils import ImageSource, image_to_data_url
+from askui.utils.source_utils import Source
+
+# Number of times providers encode the same image per call, e.g., the locate
+# API request and the serialized image locator
+_N_ENCODINGS_PER_CALL = 3
+
+
+class _FakeVlmProvider(VlmProvider):
+    @property
+    @override
+    def model_id(self) -> str:
+        return "fake-model"
+
+    @override
+    def create_message(self, *args: Any, **kwargs: Any) -> MessageParam:
+        return MessageParam(role="assistant", content="done")
+
+
+class _FakeDetectionProvider(DetectionProvider):
+    @override
+    def detect(
+        self,
+        locator: str | Locator,
+        image: ImageSource,
+        locate_settings: LocateSettings,
+    ) -> PointList:
+        for _ in range(_N_ENCODINGS_PER_CALL):
+            image.to_data_url()
+        return [(1, 2)]
+
+
+class _FakeImageQAProvider(ImageQAProvider):
+    @override
+    def query(
+        self,
+        query: str,
+        source: Source,
+        response_schema: Type[ResponseSchema] | None,
+        get_settings: GetSettings,
+    ) -> ResponseSchema | str:
+        assert isinstance(source, ImageSource)
+        for _ in range(_N_ENCODINGS_PER_CALL):
+            source.to_data_url()
+        return "answer"
+
+
+def _agent() -> Agent:
+    return Agent(
+        settings=AgentSettings(
+            vlm_provider=_FakeVlmProvider(),
+            image_qa_provider=_FakeImageQAProvider(),
+            detection_provider=_FakeDetectionProvider(),
+        )
+    )
+
+
+@pytest.fixture
+def n_encodings(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    n_calls = [0]
+    encode = image_utils._encode_image_bytes  # noqa: SLF001
+
+    def counting_encode(*args: Any, **kwargs: Any) -> Any:
+        n_calls[0] += 1
+        return encode(*args, **kwargs)
+
+    monkeypatch.setattr(image_utils, "_encode_image_bytes", counting_encode)
+    return n_calls
+
+
+class TestAgentImageEncodings:
+    def test_locate_encodes_screenshot_once(
+        self, github_login_screenshot: Image.Image, n_encodings: list[int]
+    ) -> None:
+        assert _agent().locate("Sign in", screenshot=github_login_screenshot) == (1, 2)
+        assert n_encodings == [1]
+
+    def test_get_from_png_data_url_does_not_encode(
+        self, github_login_screenshot: Image.Image, n_encodings: list[int]
+    ) -> None:
+        data_url = image_to_data_url(github_login_screenshot)
+        assert _agent().get("What is shown?", source=data_url) == "answer"
+        assert n_encodings == [0]
@@ -0,0 +1,513 @@
+"""Unit tests for `AsyncAgent` and the async provider / agent OS adapters."""
+
+import asyncio
+import threading
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+from typing_extensions import override
+
+from askui import AsyncAgent
+from askui.locators.locators import Locator
+from askui.model_providers.async_detection_provider import AsyncDetectionProvider
+from askui.model_providers.async_vlm_provider import AsyncVlmProvider
+from askui.model_providers.vlm_provider import VlmProvider
+from askui.models.shared.agent_message_param import (
+    MessageParam,
+    TextBlockParam,
+    ThinkingConfigParam,
+    ToolChoiceParam,
+    ToolUseBlockParam,
+)
+from askui.models.shared.prompts import SystemPrompt
+from askui.models.shared.settings import LocateSettings
+from askui.models.shared.tools import Tool, ToolCollection, ToolWithAgentOS
+from askui.models.types.geometry import CaptureRegion, PointList
+from askui.reporting import Reporter
+from askui.tools.agent_os import (
+    AgentOs,
+    Display,
+    DisplaySize,
+    ModifierKey,
+    MouseButton,
+    PcKey,
+)
+from askui.tools.async_agent_os import AsyncAgentOs, AsyncAgentOsAdapter
+from askui.utils.image_utils import ImageSource
+
+_VLM_DELAY = 0.05
+
+
+class _Log:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str, int]] = []
+        self._lock = threading.Lock()
+
+    def add(self, agent: str, kind: str, step: int) -> None:
+        with self._lock:
+            self.events.append((agent, kind, step))
+
+    def of(self, kind: str) -> list[tuple[str, int]]:
+        return [(agent, step) for agent, k, step in self.events if k == kind]
+
+
+class _RecordingTool(Tool):
+    def __init__(self, log: _Log, block: threading.Event | None = None) -> None:
+        super().__init__(
+            name="record",
+            description="Records the agent and step it is called with.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "agent": {"type": "string"},
+                    "step": {"type": "integer"},
+                },
+                "required": ["agent", "step"],
+            },
+        )
+        self._log = log
+        self._block = block
+
+    @override
+    def __call__(self, agent: str, step: int) -> str:
+        if self._block is not None:
+            self._block.wait()
+        self._log.add(agent, "tool", step)
+        return "recorded"
+
+
+def _tool_call(tools: ToolCollection | None, agent: str, step: int) -> MessageParam:
+    assert tools is not None
+    # tool names get a unique suffix
+    (name,) = (name for name in tools.tool_map if name.startswith("record"))
+    return MessageParam(
+        role="assistant",
+        content=[
+            ToolUseBlockParam(
+                id=f"tu_{agent}_{step}",
+                name=name,
+                input={"agent": agent, "step": step},
+            )
+        ],
+        stop_reason="tool_use",
+    )
+
+
+_DONE = MessageParam(
+    role="assistant", content=[TextBlockParam(text="done")], stop_reason="end_turn"
+)
+
+
+class _FakeAsyncVlmProvider(AsyncVlmProvider):
+    """Calls the recording tool `n_steps` times, then answers with text."""
+
+    def __init__(
+        self,
+        agent: str,
+        log: _Log,
+        n_steps: int,
+        started: asyncio.Event | None = None,
+        hang: bool = False,
+    ) -> None:
+        self._agent = agent
+        self._log = log
+        self._n_steps = n_steps
+        self._started = started
+        self._hang = hang
+        self.n_calls = 0
+
+    @property
+    @override
+    def model_id(self) -> str:
+        return "fake-async-model"
+
+    @override
+    async def create_message(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageParam:
+        step = self.n_calls
+        self.n_calls += 1
+        self._log.add(self._agent, "vlm", step)
+        if self._started is not None:
+            self._started.set()
+        if self._hang:
+            await asyncio.Event().wait()
+        await asyncio.sleep(_VLM_DELAY)
+        self._log.add(self._agent, "vlm_end", step)
+        return _tool_call(tools, self._agent, step) if step < self._n_steps else _DONE
+
+
+class _BlockingVlmProvider(VlmProvider):
+    """Synchronous provider whose requests block until they are released."""
+
+    def __init__(self, release: threading.Event) -> None:
+        self._release = release
+
+    @property
+    @override
+    def model_id(self) -> str:
+        return "fake-blocking-model"
+
+    @override
+    def create_message(
+        self,
+        messages: list[MessageParam],
+        tools: ToolCollection | None = None,
+        max_tokens: int | None = None,
+        system: SystemPrompt | None = None,
+        thinking: ThinkingConfigParam | None = None,
+        tool_choice: ToolChoiceParam | None = None,
+        temperature: float | None = None,
+        provider_options: dict[str, Any] | None = None,
+    ) -> MessageParam:
+        self._release.wait(timeout=10.0)
+        return _DONE
+
+
+class _FakeAsyncDetectionProvider(AsyncDetectionProvider):
+    def __init__(self) -> None:
+        self.image_sizes: list[tuple[int, int]] = []
+
+    @override
+    async def detect(
+        self,
+        locator: str | Locator,
+        image: ImageSource,
+        locate_settings: LocateSettings,
+    ) -> PointList:
+        self.image_sizes.append(image.root.size)
+        return [(1, 2), (3, 4)]
+
+
+class _FakeAsyncAgentOs(AsyncAgentOs):
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    @override
+    async def connect(self) -> None:
+        self.calls.append("connect")
+
+    @override
+    async def disconnect(self) -> None:
+        self.calls.append("disconnect")
+
+    @override
+    async def screenshot(
+        self, report: bool = True, region: CaptureRegion | None = None
+    ) -> Image.Image:
+        if region is None:
+            self.calls.append("screenshot")
+            return Image.new("RGB", (32, 16))
+        self.calls.append(f"screenshot({region.x}, {region.y})")
+        captured_region = region.clip(32, 16)
+        assert captured_region is not None
+        return Image.new("RGB", (captured_region.width, captured_region.height))
+
+    @override
+    async def mouse_move(self, x: int, y: int, duration: int = 500) -> None:
+        self.calls.append(f"mouse_move({x}, {y})")
+
+    @override
+    async def type(self, text: str, typing_speed: int = 50) -> None:
+        self.calls.append(f"type({text})")
+
+    @override
+    async def click(self, button: MouseButton = "left", count: int = 1) -> None:
+        self.calls.append(f"click({button})")
+
+    @override
+    async def mouse_down(self, button: MouseButton = "left") -> None:
+        self.calls.append("mouse_down")
+
+    @override
+    async def mouse_up(self, button: MouseButton = "left") -> None:
+        self.calls.append("mouse_up")
+
+    @override
+    async def mouse_scroll(self, dx: int, dy: int) -> None:
+        self.calls.append("mouse_scroll")
+
+    @override
+    async def keyboard_pressed(
+        self, key: PcKey | ModifierKey, modifier_keys: list[ModifierKey] | None = None
+    ) -> None:
+        self.calls.append("keyboard_pressed")
+
+    @override
+    async def keyboard_release(
+        self, key: PcKey | ModifierKey, modifier_keys: list[ModifierKey] | None = None
+    ) -> None:
+        self.calls.append("keyboard_release")
+
+    @override
+    async def keyboard_tap(
+        self,
+        key: PcKey | ModifierKey,
+        modifier_keys: list[ModifierKey] | None = None,
+        count: int = 1,
+    ) -> None:
+        self.calls.append("keyboard_tap")
+
+    @override
+    async def retrieve_active_display(self) -> Display:
+        return Display(id=1, name="fake", size=DisplaySize(width=32, height=16))
+
+
+class _ClickTool(ToolWithAgentOS):
+    def __init__(self) -> None:
+        super().__init__(
+            name="record",
+            description="Clicks at the given step.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "agent": {"type": "string"},
+                    "step": {"type": "integer"},
+                },
+                "required": ["agent", "step"],
+            },
+            required_tags=[],
+        )
+
+    @override
+    def __call__(self, agent: str, step: int) -> str:
+        agent_os = self.agent_os
+        assert isinstance(agent_os, AgentOs)
+        agent_os.mouse_move(step, step)
+        agent_os.click()
+        return "clicked"
+
+
+def _agent(
+    vlm_provider: AsyncVlmProvider | VlmProvider,
+    tools: list[Tool] | None = None,
+    agent_os: AsyncAgentOs | None = None,
+) -> AsyncAgent:
+    return AsyncAgent(
+        vlm_provider=vlm_provider,
+        detection_provider=_FakeAsyncDetectionProvider(),
+        tools=tools,
+        agent_os=agent_os,
+    )
+
+
+class TestAsyncAgentScheduling:
+    @pytest.mark.asyncio
+    async def test_concurrent_agents_interleave_steps(self) -> None:
+        log = _Log()
+        n_agents, n_steps = 4, 3
+        agents = [
+            _agent(_FakeAsyncVlmProvider(f"a{i}", log, n_steps), [_RecordingTool(log)])
+            for i in range(n_agents)
+        ]
+        await asyncio.gather(*(agent.act("go") for agent in agents))
+
+        vlm_calls = log.of("vlm")
+        assert len(vlm_calls) == n_agents * (n_steps + 1)
+        # every agent gets its turn before any agent takes its next step
+        for step in range(n_steps + 1):
+            calls_of_step = vlm_calls[step * n_agents : (step + 1) * n_agents]
+            assert {s for _, s in calls_of_step} == {step}
+        assert sorted(log.of("tool")) == sorted(
+            (f"a{i}", step) for i in range(n_agents) for step in range(n_steps)
+        )
+        # requests of different agents are awaited at the same time
+        n_requests, max_n_requests = 0, 0
+        for _, kind, _ in log.events:
+            n_requests += {"vlm": 1, "vlm_end": -1}.get(kind, 0)
+            max_n_requests = max(max_n_requests, n_requests)
+        assert max_n_requests > 1
+
+    @pytest.mark.asyncio
+    async def test_blocking_sync_provider_does_not_block_other_agents(self) -> None:
+        log = _Log()
+        release = threading.Event()
+        slow = _agent(_BlockingVlmProvider(release))
+        fast = _agent(_FakeAsyncVlmProvider("fast", log, 5), [_RecordingTool(log)])
+
+        slow_task = asyncio.create_task(slow.act("go"))
+        await fast.act("go")
+        assert not slow_task.done()
+        release.set()
+        await slow_task
+
+        assert len(log.of("tool")) == 5
+
+
+class TestAsyncAgentLifecycle:
+    @pytest.mark.asyncio
+    async def test_reporter_is_called_off_the_event_loop(self) -> None:
+        threads: set[int] = set()
+        reporter = MagicMock(spec=Reporter)
+        reporter.add_message.side_effect = lambda *_: threads.add(threading.get_ident())
+        reporter.generate.side_effect = lambda: threads.add(threading.get_ident())
+        agent = AsyncAgent(
+            vlm_provider=_FakeAsyncVlmProvider("a", _Log(), 1),
+            detection_provider=_FakeAsyncDetectionProvider(),
+            reporter=reporter,
+            tools=[_RecordingTool(_Log())],
+        )
+        async with agent:
+            await agent.act("go")
+            await agent.locate("Submit button", screenshot=Image.new("RGB", (8, 8)))
+        assert reporter.add_message.call_count == 6
+        assert len(threads) == 1
+        assert threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_close_closes_tool_collections(self) -> None:
+        agent = _agent(_FakeAsyncVlmProvider("a", _Log(), 0))
+        tools = agent._build_tools(None)
+        with patch.object(ToolCollection, "close", autospec=True) as close:
+            await agent.close()
+        close.assert_called_once_with(tools)
+
+
+class TestAsyncAgentCancellation:
+    @pytest.mark.asyncio
+    async def test_cancel_while_awaiting_vlm(self) -> None:
+        log = _Log()
+        started = asyncio.Event()
+        provider = _FakeAsyncVlmProvider("a", log, 3, started=started, hang=True)
+        agent = _agent(provider, [_RecordingTool(log)])
+
+        task = asyncio.create_task(agent.act("go"))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert provider.n_calls == 1
+        assert log.of("tool") == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_while_tool_runs_stops_loop(self) -> None:
+        log = _Log()
+        release = threading.Event()
+        provider = _FakeAsyncVlmProvider("a", log, 3)
+        agent = _agent(provider, [_RecordingTool(log, block=release)])
+
+        task = asyncio.create_task(agent.act("go"))
+        while provider.n_calls == 0:  # noqa: ASYNC110
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(2 * _VLM_DELAY)  # tool is running and blocked
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        await asyncio.sleep(4 * _VLM_DELAY)
+        # the running tool call finishes but no further step is taken
+        assert log.of("tool") == [("a", 0)]
+        assert provider.n_calls == 1
+
+
+class TestAsyncAgentOs:
+    @pytest.mark.asyncio
+    async def test_sync_tools_act_through_async_agent_os(self) -> None:
+        log = _Log()
+        agent_os = _FakeAsyncAgentOs()
+        agent = _agent(_FakeAsyncVlmProvider("a", log, 2), [_ClickTool()], agent_os)
+        async with agent:
+            await agent.act("go")
+        assert agent_os.calls == [
+            "connect",
+            "mouse_move(0, 0)",
+            "click(left)",
+            "mouse_move(1, 1)",
+            "click(left)",
+            "disconnect",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_read_only_tools_are_not_run_concurrently(self) -> None:
+        tool = _RecordingTool(_Log())
+        tool.is_read_only = True
+        agent = _agent(_FakeAsyncVlmProvider("a", _Log(), 0), agent_os=None)
+        tools = agent._build_tools(
+            ToolCollection(tools=[tool], max_concurrent_tool_calls=4)
+        )
+        call = ToolUseBlockParam(id="tu", name=tool.name, input={})
+        assert tools.grouping_key(call) is None
+
+    @pytest.mark.asyncio
+    async def test_locate_uses_agent_os_screenshot(self) -> None:
+        detection_provider = _FakeAsyncDetectionProvider()
+        agent_os = _FakeAsyncAgentOs()
+        agent = AsyncAgent(
+            vlm_provider=_FakeAsyncVlmProvider("a", _Log(), 0),
+            detection_provider=detection_provider,
+            agent_os=agent_os,
+        )
+        assert await agent.locate("Submit button") == (1, 2)
+        assert detection_provider.image_sizes == [(32, 16)]
+        assert agent_os.calls == ["screenshot"]
+
+    @pytest.mark.asyncio
+    async def test_adapter_runs_sync_agent_os_on_one_thread(self) -> None:
+        threads: set[int] = set()
+        agent_os = MagicMock(spec=AgentOs)
+        agent_os.click.side_effect = lambda **_: threads.add(threading.get_ident())
+        adapter = AsyncAgentOsAdapter(agent_os)
+        await asyncio.gather(*(adapter.click(count=i) for i in range(10)))
+        await adapter.disconnect()
+        assert [call.kwargs["count"] for call in agent_os.click.call_args_list] == list(
+            range(10)
+        )
+        assert len(threads) == 1
+        assert threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_locate_in_region_captures_only_region(self) -> None:
+        detection_provider = _FakeAsyncDetectionProvider()
+        agent_os = _FakeAsyncAgentOs()
+        agent = AsyncAgent(
+            vlm_provider=_FakeAsyncVlmProvider("a", _Log(), 0),
+            detection_provider=detection_provider,
+            agent_os=agent_os,
+        )
+        region = CaptureRegion(x=10, y=4, width=8, height=6)
+        assert await agent.locate_all("Submit button", region=region) == [
+            (11, 6),
+            (13, 8),
+        ]
+        assert detection_provider.image_sizes == [(8, 6)]
+        assert agent_os.calls == ["screenshot(10, 4)"]
+
+    @pytest.mark.asyncio
+    async def test_locate_in_region_beyond_screen_edge_offsets_captured_area(
+        self,
+    ) -> None:
+        detection_provider = _FakeAsyncDetectionProvider()
+        agent_os = _FakeAsyncAgentOs()
+        agent = AsyncAgent(
+            vlm_provider=_FakeAsyncVlmProvider("a", _Log(), 0),
+            detection_provider=detection_provider,
+            agent_os=agent_os,
+        )
+        region = CaptureRegion(x=-4, y=-2, width=8, height=6)
+        assert await agent.locate("Submit button", region=region) == (1, 2)
+        assert detection_provider.image_sizes == [(4, 4)]
+
+    @pytest.mark.asyncio
+    async def test_locate_in_region_crops_given_screenshot(self) -> None:
+        detection_provider = _FakeAsyncDetectionProvider()
+        agent = AsyncAgent(
+            vlm_provider=_FakeAsyncVlmProvider("a", _Log(), 0),
+            detection_provider=detection_provider,
+        )
+        point = await agent.locate(
+            "Submit button",
+            screenshot=Image.new("RGB", (32, 16)),
+            region=CaptureRegion(x=28, y=-2, width=8, height=6),
+        )
+        assert point == (29, 2)
+        assert detection_provider.image_sizes == [(4, 4)]
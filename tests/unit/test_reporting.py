@@ -0,0 +1,375 @@
+import gc
+import threading
+import weakref
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import pytest
+from PIL import Image
+from typing_extensions import override
+
+import askui.reporting
+from askui.reporting import (
+    BackgroundReporter,
+    CompositeReporter,
+    ImageStorage,
+    Reporter,
+    SimpleHtmlReporter,
+)
+from askui.utils.annotated_image import AnnotatedImage
+
+
+class _FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz: Any = None) -> "_FixedDatetime":  # noqa: ARG003
+        return cls(2026, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+
+
+class _RecordingReporter(Reporter):
+    def __init__(self, release: threading.Event | None = None) -> None:
+        self.messages: list[tuple[str, Any, int]] = []
+        self.threads: set[threading.Thread] = set()
+        self.generated = False
+        self._release = release
+
+    @override
+    def add_message(
+        self,
+        role: str,
+        content: Union[str, dict[str, Any], list[Any]],
+        image: Optional[Image.Image | list[Image.Image] | AnnotatedImage] = None,
+    ) -> None:
+        if self._release is not None:
+            self._release.wait()
+        if content == "fail":
+            error_msg = "reporter failed"
+            raise RuntimeError(error_msg)
+        self.threads.add(threading.current_thread())
+        self.messages.append(
+            (role, content, len(askui.reporting.normalize_to_pil_images(image)))
+        )
+
+    @override
+    def add_usage_summary(self, usage: Any) -> None:
+        pass
+
+    @override
+    def add_cache_execution_statistics(
+        self, original_usage: dict[str, int | None]
+    ) -> None:
+        pass
+
+    @override
+    def generate(self) -> None:
+        self.generated = True
+
+
+def _report(reporter: Reporter, image: Image.Image) -> None:
+    reporter.add_message("User", 'click "Edit"')
+    reporter.add_message("AgentOS", "screenshot()", image)
+    reporter.add_message(
+        "Assistant",
+        [
+            {"type": "text", "text": "Done"},
+            {
+                "type": "image",
+                "source": {"type": "base64", "media_type": "image/png", "data": "a"},
+            },
+        ],
+    )
+    reporter.add_message("AgentOS", "mouse_move(1, 2)", [image, image])
+    reporter.generate()
+
+
+def _read_report(report_dir: Path) -> str:
+    (report_path,) = report_dir.glob("*.html")
+    return report_path.read_text(encoding="utf-8")
+
+
+class TestBackgroundReporter:
+    def test_report_is_identical_to_synchronous_reporter(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(askui.reporting, "datetime", _FixedDatetime)
+        image = Image.new("RGB", (64, 32), color=(255, 0, 0))
+
+        _report(SimpleHtmlReporter(report_dir=str(tmp_path / "sync")), image)
+        _report(
+            BackgroundReporter(
+                SimpleHtmlReporter(report_dir=str(tmp_path / "background")),
+                max_queue_size=1,
+            ),
+            image,
+        )
+
+        assert _read_report(tmp_path / "sync") == _read_report(tmp_path / "background")
+
+    def test_forwards_in_order_on_background_thread(self) -> None:
+        recording_reporter = _RecordingReporter()
+        reporter = BackgroundReporter(recording_reporter)
+        for i in range(100):
+            reporter.add_message("User", str(i))
+        reporter.generate()
+        assert [content for _, content, _ in recording_reporter.messages] == [
+            str(i) for i in range(100)
+        ]
+        assert recording_reporter.generated
+        assert threading.current_thread() not in recording_reporter.threads
+
+    def test_keeps_timestamps_of_added_messages(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        release = threading.Event()
+        reporter = BackgroundReporter(
+            CompositeReporter(
+                [_RecordingReporter(release), SimpleHtmlReporter(str(tmp_path))]
+            )
+        )
+        monkeypatch.setattr(askui.reporting, "datetime", _FixedDatetime)
+        reporter.add_message("User", "message")
+        monkeypatch.undo()
+        release.set()
+        reporter.generate()
+        assert "03:04:05.678 UTC" in _read_report(tmp_path)
+
+    def test_errors_do_not_stop_following_messages(self) -> None:
+        recording_reporter = _RecordingReporter()
+        reporter = BackgroundReporter(recording_reporter)
+        reporter.add_message("User", "fail")
+        reporter.add_message("User", "after")
+        reporter.generate()
+        assert recording_reporter.messages == [("User", "after", 0)]
+
+    def test_drop_images_when_queue_is_full(self) -> None:
+        release = threading.Event()
+        recording_reporter = _RecordingReporter(release)
+        reporter = BackgroundReporter(
+            recording_reporter, max_queue_size=2, backpressure="drop_images"
+        )
+        reporter.add_message("User", "first")
+        reporter.flush(timeout=0.1)  # the worker waits for the release
+        image = Image.new("RGB", (8, 8))
+        for i in range(4):
+            reporter.add_message("AgentOS", str(i), image)
+        release.set()
+        reporter.generate()
+        assert [
+            (content, n_images) for _, content, n_images in recording_reporter.messages
+        ] == [("first", 0), ("0", 1), ("1", 1), ("2", 0), ("3", 0)]
+        assert reporter.dropped_images == 2
+
+    def test_drop_images_waits_if_queue_is_full_without_images(self) -> None:
+        release = threading.Event()
+        recording_reporter = _RecordingReporter(release)
+        reporter = BackgroundReporter(
+            recording_reporter, max_queue_size=1, backpressure="drop_images"
+        )
+        reporter.add_message("User", "first")
+        reporter.flush(timeout=0.1)  # the worker waits for the release
+        reporter.add_message("User", "0")
+        reporter.add_message("User", "1")
+        added = threading.Event()
+
+        def add() -> None:
+            reporter.add_message("User", "2")
+            added.set()
+
+        threading.Thread(target=add).start()
+        assert not added.wait(timeout=0.1)
+        release.set()
+        assert added.wait(timeout=1.0)
+        reporter.generate()
+        assert len(recording_reporter.messages) == 4
+
+    def test_sample_when_queue_is_full(self) -> None:
+        release = threading.Event()
+        recording_reporter = _RecordingReporter(release)
+        reporter = BackgroundReporter(
+            recording_reporter, max_queue_size=1, backpressure="sample", sample_rate=3
+        )
+        reporter.add_message("User", "first")
+        reporter.flush(timeout=0.1)  # the worker waits for the release
+        for i in range(7):
+            reporter.add_message("User", str(i))
+        release.set()
+        reporter.generate()
+        assert [content for _, content, _ in recording_reporter.messages] == [
+            "first",
+            "0",
+            "1",
+            "4",
+        ]
+        assert reporter.dropped_messages == 4
+
+    def test_block_waits_for_room_in_queue(self) -> None:
+        release = threading.Event()
+        recording_reporter = _RecordingReporter(release)
+        reporter = BackgroundReporter(recording_reporter, max_queue_size=1)
+        reporter.add_message("User", "0")
+        reporter.add_message("User", "1")
+        added = threading.Event()
+
+        def add() -> None:
+            reporter.add_message("User", "2")
+            added.set()
+
+        threading.Thread(target=add).start()
+        assert not added.wait(timeout=0.1)
+        release.set()
+        assert added.wait(timeout=1.0)
+        reporter.generate()
+        assert len(recording_reporter.messages) == 3
+
+    def test_worker_exits_after_generate_and_restarts(self) -> None:
+        recording_reporter = _RecordingReporter()
+        reporter = BackgroundReporter(recording_reporter)
+        reporter.add_message("User", "before")
+        worker = reporter._worker
+        assert worker is not None
+        reporter.generate()
+        worker.join(timeout=5.0)
+        assert not worker.is_alive()
+        reporter.add_message("User", "after")
+        reporter.generate()
+        assert recording_reporter.messages == [
+            ("User", "before", 0),
+            ("User", "after", 0),
+        ]
+
+    def test_is_garbage_collected_after_generate(self) -> None:
+        reporter = BackgroundReporter(_RecordingReporter())
+        reporter.add_message("User", "message")
+        worker = reporter._worker
+        assert worker is not None
+        reporter.generate()
+        reporter_ref = weakref.ref(reporter)
+        del reporter
+        worker.join(timeout=5.0)
+        gc.collect()
+        assert reporter_ref() is None
+
+    def test_does_not_register_exit_handler_per_instance(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        registered: list[Any] = []
+        monkeypatch.setattr(askui.reporting.atexit, "register", registered.append)
+        for _ in range(3):
+            BackgroundReporter(_RecordingReporter())
+        assert registered == []
+
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(ValueError, match="max_queue_size"):
+            BackgroundReporter(_RecordingReporter(), max_queue_size=0)
+        with pytest.raises(ValueError, match="sample_rate"):
+            BackgroundReporter(_RecordingReporter(), sample_rate=0)
+
+
+class TestSimpleHtmlReporterImageStorage:
+    def test_inline_report_is_self_contained(self, tmp_path: Path) -> None:
+        reporter = SimpleHtmlReporter(report_dir=str(tmp_path))
+        reporter.add_message("AgentOS", "screenshot()", Image.new("RGB", (64, 32)))
+        reporter.generate()
+        assert [path.name for path in tmp_path.iterdir()] == [
+            next(tmp_path.glob("*.html")).name
+        ]
+        assert "data:image/png;base64," in _read_report(tmp_path)
+
+    @pytest.mark.parametrize(
+        ("image_format", "extension"),
+        [("webp", "webp"), ("jpeg", "jpg"), ("png", "png")],
+    )
+    def test_images_are_written_once_and_referenced(
+        self, tmp_path: Path, image_format: Any, extension: str
+    ) -> None:
+        reporter = SimpleHtmlReporter(
+            report_dir=str(tmp_path), image_storage="files", image_format=image_format
+        )
+        first = Image.new("RGB", (1280, 800), color=(255, 0, 0))
+        second = Image.new("RGB", (1280, 800), color=(0, 0, 255))
+        small = Image.new("RGBA", (100, 50), color=(0, 255, 0, 128))
+        reporter.add_message("AgentOS", "screenshot()", first)
+        reporter.add_message("AgentOS", "screenshot()", first.copy())
+        reporter.add_message("AgentOS", "screenshot()", [second, small])
+        reporter.generate()
+
+        assets = sorted((tmp_path / "assets").iterdir())
+        # full size and thumbnail of the two large images, only the small image
+        assert len(assets) == 5
+        assert all(asset.suffix == f".{extension}" for asset in assets)
+        thumbnails = [asset for asset in assets if asset.stem.endswith("_thumb")]
+        assert len(thumbnails) == 2
+        for thumbnail in thumbnails:
+            with Image.open(thumbnail) as image:
+                assert image.size == (480, 300)
+
+        html = _read_report(tmp_path)
+        assert "base64" not in html
+        assert html.count('loading="lazy"') == 4
+        # the first image is shown twice but written once
+        assert sorted(
+            html.count(f'src="assets/{thumbnail.name}"') for thumbnail in thumbnails
+        ) == [1, 2]
+        for thumbnail in thumbnails:
+            full_name = thumbnail.name.replace("_thumb", "")
+            assert f'href="assets/{full_name}"' in html
+
+    def test_assets_are_shared_by_reports_in_the_same_directory(
+        self, tmp_path: Path
+    ) -> None:
+        image = Image.new("RGB", (1280, 800), color=(255, 0, 0))
+        for _ in range(2):
+            reporter = SimpleHtmlReporter(
+                report_dir=str(tmp_path), image_storage="files"
+            )
+            reporter.add_message("AgentOS", "screenshot()", image)
+            reporter.generate()
+        assert len(list(tmp_path.glob("*.html"))) == 2
+        assert len(list((tmp_path / "assets").iterdir())) == 2
+
+    def test_failed_asset_write_leaves_no_partial_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        image = Image.new("RGB", (64, 32), color=(255, 0, 0))
+        save = Image.Image.save
+
+        def failing_save(
+            _image: Image.Image, fp: Any, *_args: Any, **_kwargs: Any
+        ) -> None:
+            fp.write(b"partial")
+            error_msg = "disk full"
+            raise OSError(error_msg)
+
+        reporter = SimpleHtmlReporter(report_dir=str(tmp_path), image_storage="files")
+        monkeypatch.setattr(Image.Image, "save", failing_save)
+        with pytest.raises(OSError, match="disk full"):
+            reporter.add_message("AgentOS", "screenshot()", image)
+        assert list((tmp_path / "assets").iterdir()) == []
+
+        monkeypatch.setattr(Image.Image, "save", save)
+        reporter.add_message("AgentOS", "screenshot()", image)
+        (asset,) = (tmp_path / "assets").iterdir()
+        with Image.open(asset) as written_image:
+            assert written_image.size == (64, 32)
+
+    def test_report_is_smaller_than_inline_report(self, tmp_path: Path) -> None:
+        images = [
+            Image.effect_noise((1280, 800), sigma=64).convert("RGB") for _ in range(3)
+        ]
+        image_storages: tuple[ImageStorage, ...] = ("inline", "files")
+        for image_storage in image_storages:
+            reporter = SimpleHtmlReporter(
+                report_dir=str(tmp_path / image_storage), image_storage=image_storage
+            )
+            for image in images:
+                reporter.add_message("AgentOS", "screenshot()", image)
+            reporter.generate()
+
+        (inline_report,) = (tmp_path / "inline").glob("*.html")
+        (files_report,) = (tmp_path / "files").glob("*.html")
+        assets_size = sum(
+            asset.stat().st_size for asset in (tmp_path / "files" / "assets").iterdir()
+        )
+        assert files_report.stat().st_size < 100_000
+        assert files_report.stat().st_size * 10 < inline_report.stat().st_size
+        assert assets_size < inline_report.stat().st_size
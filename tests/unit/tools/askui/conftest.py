@@ -0,0 +1,247 @@
+import collections
+import math
+import time
+from collections.abc import Callable, Iterator
+from concurrent import futures
+
+import grpc
+import numpy as np
+import pytest
+
+from askui.tools.askui.askui_controller import AskUiControllerClient
+from askui.tools.askui.askui_controller_client_settings import (
+    AskUiControllerClientSettings,
+)
+from askui.tools.askui.askui_ui_controller_grpc.generated import (
+    Controller_V1_pb2 as controller_v1_pbs,
+)
+from askui.tools.askui.askui_ui_controller_grpc.generated import (
+    Controller_V1_pb2_grpc as controller_v1,
+)
+
+SCREEN_WIDTH = 1920
+SCREEN_HEIGHT = 1080
+
+
+class FakeControllerServicer(controller_v1.ControllerAPIServicer):
+    """In-process stand-in for the AskUI Remote Device Controller.
+
+    Serves a `SCREEN_WIDTH`x`SCREEN_HEIGHT` screen whose pixels encode their
+    coordinates and records the requests it receives.
+
+    Recorded actions take `action_duration` seconds (forever if `None`) while the
+    controller estimates them to take `required_ms` milliseconds. If
+    `holds_polls` is set, polls are answered as soon as the action finished (or
+    the deadline of the poll is reached), otherwise they are answered right away.
+    Batched actions take `action_duration` seconds each and are reported as
+    finished once the last action of the batch finished. The durations are
+    measured with `clock`.
+    """
+
+    def __init__(self) -> None:
+        self.capture_requests: list[controller_v1_pbs.Request_CaptureScreen] = []
+        self.response_sizes: list[int] = []
+        self.holds_polls = True
+        self.required_ms = 100
+        self.action_duration: float | None = 0.01
+        self.poll_count = 0
+        self.rpc_counts: collections.Counter[str] = collections.Counter()
+        self.batched_actions: list[controller_v1_pbs.Request_ScheduleBatchedAction] = []
+        self.batch_runs: list[
+            list[controller_v1_pbs.Request_ScheduleBatchedAction]
+        ] = []
+        self.clock: Callable[[], float] = time.monotonic
+        self._action_id = 0
+        self._action_finished_at = 0.0
+
+    def RunRecordedAction(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_RunRecordedAction,  # noqa: ARG002
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_RunRecordedAction:
+        self.rpc_counts["RunRecordedAction"] += 1
+        self._action_id += 1
+        self._action_finished_at = (
+            self.clock() + self.action_duration
+            if self.action_duration is not None
+            else math.inf
+        )
+        return controller_v1_pbs.Response_RunRecordedAction(
+            actionID=self._action_id, requiredMilliseconds=self.required_ms
+        )
+
+    def Poll(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_Poll,  # noqa: ARG002
+        context: grpc.ServicerContext,
+    ) -> controller_v1_pbs.Response_Poll:
+        self.poll_count += 1
+        self.rpc_counts["Poll"] += 1
+        if self.holds_polls:
+            time_remaining = context.time_remaining()
+            timeout = min(
+                self._action_finished_at - self.clock(),
+                time_remaining if time_remaining is not None else math.inf,
+            )
+            time.sleep(max(0.0, min(timeout, 10.0)))
+        if self.clock() < self._action_finished_at:
+            return controller_v1_pbs.Response_Poll(
+                pollEventID=controller_v1_pbs.PollEventID.PollEventID_Undefined
+            )
+        return controller_v1_pbs.Response_Poll(
+            pollEventID=controller_v1_pbs.PollEventID.PollEventID_ActionFinished,
+            pollEventParameters=controller_v1_pbs.PollEventParameters(
+                actionFinished=controller_v1_pbs.PollEventParameters_ActionFinished(
+                    actionID=self._action_id
+                )
+            ),
+        )
+
+    def ScheduleBatchedAction(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_ScheduleBatchedAction,
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_ScheduleBatchedAction:
+        self.rpc_counts["ScheduleBatchedAction"] += 1
+        self._action_id += 1
+        self.batched_actions.append(request)
+        return controller_v1_pbs.Response_ScheduleBatchedAction(
+            actionID=self._action_id
+        )
+
+    def StartBatchRun(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_StartBatchRun,  # noqa: ARG002
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_Void:
+        self.rpc_counts["StartBatchRun"] += 1
+        self.batch_runs.append(list(self.batched_actions))
+        self._action_finished_at = (
+            self.clock() + self.action_duration * len(self.batched_actions)
+            if self.action_duration is not None
+            else math.inf
+        )
+        return controller_v1_pbs.Response_Void()
+
+    def StopBatchRun(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_StopBatchRun,  # noqa: ARG002
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_Void:
+        self.rpc_counts["StopBatchRun"] += 1
+        return controller_v1_pbs.Response_Void()
+
+    def RemoveAllActions(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_RemoveAllActions,  # noqa: ARG002
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_Void:
+        self.rpc_counts["RemoveAllActions"] += 1
+        self.batched_actions = []
+        return controller_v1_pbs.Response_Void()
+
+    def StartSession(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_StartSession,  # noqa: ARG002
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_StartSession:
+        return controller_v1_pbs.Response_StartSession(
+            sessionInfo=controller_v1_pbs.SessionInfo(sessionID=1)
+        )
+
+    def EndSession(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_EndSession,  # noqa: ARG002
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_Void:
+        return controller_v1_pbs.Response_Void()
+
+    def StartExecution(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_StartExecution,  # noqa: ARG002
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_Void:
+        return controller_v1_pbs.Response_Void()
+
+    def StopExecution(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_StopExecution,  # noqa: ARG002
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_Void:
+        return controller_v1_pbs.Response_Void()
+
+    def SetActiveDisplay(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_SetActiveDisplay,  # noqa: ARG002
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_Void:
+        return controller_v1_pbs.Response_Void()
+
+    def CaptureScreen(  # noqa: N802
+        self,
+        request: controller_v1_pbs.Request_CaptureScreen,
+        context: grpc.ServicerContext,  # noqa: ARG002
+    ) -> controller_v1_pbs.Response_CaptureScreen:
+        self.rpc_counts["CaptureScreen"] += 1
+        self.capture_requests.append(request)
+        x, y, width, height = 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT
+        if request.captureParameters.HasField("captureArea"):
+            area = request.captureParameters.captureArea
+            x, y = area.coordinate.x, area.coordinate.y
+            width, height = area.size.width, area.size.height
+        # BGRA pixels with blue = x % 256 and green = y % 256
+        pixels = np.zeros((height, width, 4), dtype=np.uint8)
+        pixels[..., 0] = (np.arange(x, x + width) % 256)[np.newaxis, :]
+        pixels[..., 1] = (np.arange(y, y + height) % 256)[:, np.newaxis]
+        pixels[..., 3] = 255
+        data = pixels.tobytes()
+        self.response_sizes.append(len(data))
+        return controller_v1_pbs.Response_CaptureScreen(
+            bitmap=controller_v1_pbs.Bitmap(width=width, height=height, data=data)
+        )
+
+
+class FakeClock:
+    """Stand-in for the `time` module whose clock only advances on `sleep()`."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_controller() -> Iterator[tuple[FakeControllerServicer, str]]:
+    servicer = FakeControllerServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    controller_v1.add_ControllerAPIServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    try:
+        yield servicer, f"localhost:{port}"
+    finally:
+        server.stop(grace=None)
+
+
+@pytest.fixture
+def controller_client(
+    fake_controller: tuple[FakeControllerServicer, str],
+) -> Iterator[AskUiControllerClient]:
+    _, address = fake_controller
+    client = AskUiControllerClient(
+        settings=AskUiControllerClientSettings(
+            server_address=address, server_autostart=False
+        )
+    )
+    client.connect()
+    try:
+        yield client
+    finally:
+        client.disconnect()
@@ -0,0 +1,116 @@
+import pytest
+
+from askui.tools.askui import askui_controller
+from askui.tools.askui.askui_controller import AskUiControllerClient
+from askui.tools.askui.askui_controller_client_settings import (
+    AskUiControllerClientSettings,
+)
+from askui.tools.askui.exceptions import AskUiControllerOperationTimeoutError
+
+from .conftest import FakeClock, FakeControllerServicer
+
+
+class TestAskUiControllerClientActionCompletion:
+    def test_held_poll_returns_when_action_finished(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        servicer, _ = fake_controller
+        # only the client's clock is fake, i.e., it only advances if the client
+        # sleeps, while the controller holds the poll for 20 ms in real time
+        clock = FakeClock()
+        monkeypatch.setattr(askui_controller, "time", clock)
+        servicer.required_ms = 500
+        servicer.action_duration = 0.02
+
+        controller_client.mouse_move(10, 10)
+
+        (latency,) = controller_client.action_latencies
+        assert latency.action_class == "ActionClassID_MouseMove"
+        assert latency.required_ms == 500
+        assert latency.poll_count == 1
+        # the completion is observed without waiting for the estimated duration
+        assert latency.latency_ms == 0
+        assert clock.now == 0
+        assert servicer.poll_count == 1
+
+    def test_falls_back_to_backoff_for_controllers_answering_polls_immediately(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        servicer, _ = fake_controller
+        clock = FakeClock()
+        servicer.clock = clock.monotonic
+        monkeypatch.setattr(askui_controller, "time", clock)
+        servicer.holds_polls = False
+        servicer.required_ms = 50
+        servicer.action_duration = 0.06
+
+        controller_client.mouse_move(10, 10)
+        controller_client.click()
+
+        first, second = controller_client.action_latencies
+        # polls at 50 ms (estimated duration), 55 ms and 65 ms (backoff)
+        assert first.latency_ms == pytest.approx(65)
+        assert second.latency_ms == pytest.approx(65)
+        # the immediate poll is only tried until the controller is known not to
+        # hold polls; afterwards, polling starts at the estimated duration
+        assert first.poll_count == 4
+        assert second.poll_count == 3
+        assert servicer.poll_count == 7
+
+    @pytest.mark.parametrize("holds_polls", [True, False])
+    def test_raises_if_action_does_not_finish(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        holds_polls: bool,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        servicer, address = fake_controller
+        clock = FakeClock()
+        servicer.clock = clock.monotonic
+        monkeypatch.setattr(askui_controller, "time", clock)
+        servicer.holds_polls = holds_polls
+        servicer.required_ms = 10
+        servicer.action_duration = None
+        client = AskUiControllerClient(
+            settings=AskUiControllerClientSettings(
+                server_address=address,
+                server_autostart=False,
+                action_timeout=0.1,
+                raise_on_action_timeout=True,
+            )
+        )
+        client.connect()
+        try:
+            with pytest.raises(AskUiControllerOperationTimeoutError):
+                client.mouse_move(10, 10)
+            # gives up within the estimated 10 ms plus the timeout of 100 ms
+            assert clock.now <= 0.11
+            assert client.action_latencies == []
+        finally:
+            client.disconnect()
+
+    def test_continues_if_action_does_not_finish_by_default(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        servicer, _ = fake_controller
+        clock = FakeClock()
+        servicer.clock = clock.monotonic
+        monkeypatch.setattr(askui_controller, "time", clock)
+        servicer.holds_polls = False
+        servicer.required_ms = 10
+        servicer.action_duration = None
+
+        controller_client.mouse_move(10, 10)
+
+        assert "ActionClassID_MouseMove did not finish" in caplog.text
+        assert controller_client.action_latencies == []
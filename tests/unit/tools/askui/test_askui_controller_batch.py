@@ -0,0 +1,207 @@
+from typing import Any, Optional, Union
+
+import pytest
+from PIL import Image
+from typing_extensions import override
+
+from askui.reporting import NullReporter
+from askui.tools.askui.askui_controller import AskUiControllerClient
+from askui.tools.askui.askui_controller_client_settings import (
+    AskUiControllerClientSettings,
+)
+from askui.tools.askui.askui_ui_controller_grpc.generated import (
+    Controller_V1_pb2 as controller_v1_pbs,
+)
+from askui.tools.askui.exceptions import AskUiControllerOperationTimeoutError
+from askui.utils.annotated_image import AnnotatedImage
+
+from .conftest import FakeControllerServicer
+
+_ACTION_RPCS = (
+    "RunRecordedAction",
+    "Poll",
+    "ScheduleBatchedAction",
+    "StartBatchRun",
+    "StopBatchRun",
+    "RemoveAllActions",
+)
+
+
+class _ScreenshotReporter(NullReporter):
+    """Takes the screenshots of the messages right away."""
+
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+
+    @override
+    def add_message(
+        self,
+        role: str,
+        content: Union[str, dict[str, Any], list[Any]],
+        image: Optional[Image.Image | list[Image.Image] | AnnotatedImage] = None,
+    ) -> None:
+        if isinstance(image, AnnotatedImage):
+            image.get_images()
+        self.messages.append(str(content))
+
+
+def _action_rpc_count(servicer: FakeControllerServicer) -> int:
+    return sum(servicer.rpc_counts[rpc] for rpc in _ACTION_RPCS)
+
+
+class TestAskUiControllerClientBatch:
+    @pytest.mark.parametrize("holds_polls", [True, False])
+    def test_keyboard_tap_with_count_runs_a_single_batch(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+        holds_polls: bool,
+    ) -> None:
+        servicer, _ = fake_controller
+        servicer.holds_polls = holds_polls
+        servicer.required_ms = 10
+        servicer.action_duration = 0.005
+
+        controller_client.keyboard_tap("a", count=10)
+
+        assert servicer.rpc_counts["RunRecordedAction"] == 0
+        assert servicer.rpc_counts["ScheduleBatchedAction"] == 10
+        assert servicer.rpc_counts["StartBatchRun"] == 1
+        assert servicer.rpc_counts["RemoveAllActions"] == 1
+        (batch_run,) = servicer.batch_runs
+        assert [request.actionClassID for request in batch_run] == [
+            controller_v1_pbs.ActionClassID_KeyboardKey_PressAndRelease
+        ] * 10
+        batched_rpc_count = _action_rpc_count(servicer)
+
+        servicer.rpc_counts.clear()
+        for _ in range(10):
+            controller_client.keyboard_tap("a")
+
+        assert servicer.rpc_counts["RunRecordedAction"] == 10
+        assert batched_rpc_count < _action_rpc_count(servicer)
+
+    def test_batch_coalesces_consecutive_input_actions(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+    ) -> None:
+        servicer, _ = fake_controller
+
+        with controller_client.batch():
+            controller_client.mouse_move(10, 20)
+            controller_client.click()
+            controller_client.type("hello")
+            assert servicer.rpc_counts["ScheduleBatchedAction"] == 0
+
+        (batch_run,) = servicer.batch_runs
+        assert [request.actionClassID for request in batch_run] == [
+            controller_v1_pbs.ActionClassID_MouseMove,
+            controller_v1_pbs.ActionClassID_MouseButton_PressAndRelease,
+            controller_v1_pbs.ActionClassID_KeyboardType_UnicodeText,
+        ]
+        assert servicer.rpc_counts["RunRecordedAction"] == 0
+
+    def test_other_requests_run_the_collected_actions_first(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+    ) -> None:
+        servicer, _ = fake_controller
+
+        with controller_client.batch():
+            controller_client.mouse_move(10, 20)
+            controller_client.click()
+            controller_client.screenshot()
+            assert len(servicer.batch_runs) == 1
+            assert servicer.rpc_counts["CaptureScreen"] == 1
+            controller_client.click()
+
+        # a single remaining action is run as a recorded action
+        assert len(servicer.batch_runs) == 1
+        assert servicer.rpc_counts["RunRecordedAction"] == 1
+
+    def test_reports_batched_actions_after_the_batch_run(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+    ) -> None:
+        servicer, address = fake_controller
+        reporter = _ScreenshotReporter()
+        client = AskUiControllerClient(
+            reporter=reporter,
+            settings=AskUiControllerClientSettings(
+                server_address=address, server_autostart=False
+            ),
+        )
+        client.connect()
+        try:
+            with client.batch():
+                client.click()
+                client.mouse_move(10, 20)
+                client.click()
+                assert servicer.rpc_counts["CaptureScreen"] == 0
+
+            (batch_run,) = servicer.batch_runs
+            assert len(batch_run) == 3
+            assert servicer.rpc_counts["CaptureScreen"] == 1
+            assert "mouse_move(10, 20, duration=500)" in reporter.messages
+        finally:
+            client.disconnect()
+
+    def test_nested_batches_run_when_the_outermost_is_left(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+    ) -> None:
+        servicer, _ = fake_controller
+
+        with controller_client.batch():
+            controller_client.mouse_move(10, 20)
+            controller_client.keyboard_tap("a", count=2)
+            assert servicer.batch_runs == []
+
+        (batch_run,) = servicer.batch_runs
+        assert len(batch_run) == 3
+
+    def test_raises_and_stops_batch_run_if_batch_does_not_finish(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+    ) -> None:
+        servicer, address = fake_controller
+        servicer.action_duration = None
+        client = AskUiControllerClient(
+            settings=AskUiControllerClientSettings(
+                server_address=address, server_autostart=False, batch_run_timeout=0.1
+            )
+        )
+        client.connect()
+        try:
+            with pytest.raises(AskUiControllerOperationTimeoutError):
+                client.keyboard_tap("a", count=2)
+            assert servicer.rpc_counts["StopBatchRun"] == 1
+            assert servicer.rpc_counts["RemoveAllActions"] == 1
+        finally:
+            client.disconnect()
+
+    def test_error_running_batch_does_not_mask_error_within_batch(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+    ) -> None:
+        servicer, address = fake_controller
+        servicer.action_duration = None
+        client = AskUiControllerClient(
+            settings=AskUiControllerClientSettings(
+                server_address=address, server_autostart=False, batch_run_timeout=0.1
+            )
+        )
+        client.connect()
+        try:
+            with pytest.raises(ValueError, match="within batch"), client.batch():
+                client.mouse_move(10, 10)
+                client.click()
+                error_msg = "within batch"
+                raise ValueError(error_msg)
+            assert servicer.rpc_counts["StartBatchRun"] == 1
+            assert servicer.rpc_counts["StopBatchRun"] == 1
+        finally:
+            client.disconnect()
@@ -0,0 +1,50 @@
+from askui.models.types.geometry import CaptureRegion
+from askui.tools.askui.askui_controller import AskUiControllerClient
+
+from .conftest import SCREEN_HEIGHT, SCREEN_WIDTH, FakeControllerServicer
+
+
+class TestAskUiControllerClientScreenshot:
+    def test_screenshot_captures_whole_display_by_default(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+    ) -> None:
+        servicer, _ = fake_controller
+        image = controller_client.screenshot()
+        assert image.size == (SCREEN_WIDTH, SCREEN_HEIGHT)
+        (request,) = servicer.capture_requests
+        assert not request.captureParameters.HasField("captureArea")
+
+    def test_screenshot_captures_only_region(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+    ) -> None:
+        servicer, _ = fake_controller
+        region = CaptureRegion(x=300, y=200, width=64, height=32)
+        image = controller_client.screenshot(region=region)
+
+        (request,) = servicer.capture_requests
+        area = request.captureParameters.captureArea
+        assert (area.coordinate.x, area.coordinate.y) == (300, 200)
+        assert (area.size.width, area.size.height) == (64, 32)
+        assert image.size == (64, 32)
+        # pixels are decoded from BGRA and belong to the requested region
+        assert image.getpixel((0, 0)) == (0, 200, 300 % 256)
+        assert image.getpixel((63, 31)) == (0, 231, 363 % 256)
+
+    def test_region_reduces_transferred_bytes(
+        self,
+        fake_controller: tuple[FakeControllerServicer, str],
+        controller_client: AskUiControllerClient,
+    ) -> None:
+        servicer, _ = fake_controller
+        controller_client.screenshot()
+        controller_client.screenshot(
+            region=CaptureRegion(x=0, y=0, width=200, height=100)
+        )
+        full_size, region_size = servicer.response_sizes
+        assert full_size == SCREEN_WIDTH * SCREEN_HEIGHT * 4
+        assert region_size == 200 * 100 * 4
+        assert region_size * 100 < full_size
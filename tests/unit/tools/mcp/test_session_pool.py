@@ -0,0 +1,197 @@
+import asyncio
+import gc
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import mcp.types
+import pytest
+from fastmcp import Client, Context, FastMCP
+from fastmcp.mcp_config import MCPConfig
+
+from askui.models.shared.agent_message_param import TextBlockParam, ToolUseBlockParam
+from askui.models.shared.tools import ToolCollection
+from askui.tools.mcp.config import StdioMCPServer
+from askui.tools.mcp.session_pool import McpSessionPool
+
+
+@pytest.fixture(scope="module")
+def pool() -> Iterator[McpSessionPool]:
+    pool = McpSessionPool()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="module")
+def stdio_client() -> Client[Any]:
+    """Client of the bundled sample stdio server."""
+    return Client(
+        MCPConfig(
+            mcpServers={
+                "test_stdio_server": StdioMCPServer(
+                    command=sys.executable,
+                    args=["-m", "askui.tools.mcp.servers.stdio"],
+                )
+            }
+        )
+    )
+
+
+def _dynamic_server() -> FastMCP[Any]:
+    server: FastMCP[Any] = FastMCP("Dynamic Tools App")
+
+    def greet() -> str:
+        return "Hello"
+
+    @server.tool
+    async def add_greet_tool(ctx: Context) -> str:
+        server.tool(greet)
+        await ctx.send_notification(mcp.types.ToolListChangedNotification())
+        return "added"
+
+    return server
+
+
+def _tool_names(pool: McpSessionPool, client: Client[Any]) -> list[str]:
+    return [tool.name for tool in pool.list_tools(client)]
+
+
+def _n_session_threads() -> int:
+    return sum(thread.name == "askui-mcp-sessions" for thread in threading.enumerate())
+
+
+class TestMcpSessionPoolStdio:
+    def test_session_is_reused(
+        self, pool: McpSessionPool, stdio_client: Client[Any]
+    ) -> None:
+        n_sessions_opened = pool.n_sessions_opened
+        tools = pool.list_tools(stdio_client)
+        assert {"test_stdio_tool", "list_values"} <= {tool.name for tool in tools}
+        for _ in range(3):
+            result = pool.call_tool(stdio_client, "list_values", {})
+            assert not result.is_error
+        assert pool.list_tools(stdio_client) is tools
+        assert pool.n_sessions_opened <= n_sessions_opened + 1
+
+    def test_invalidate_tools_refetches_listing(
+        self, pool: McpSessionPool, stdio_client: Client[Any]
+    ) -> None:
+        tools = pool.list_tools(stdio_client)
+        pool.invalidate_tools(stdio_client)
+        refetched = pool.list_tools(stdio_client)
+        assert refetched is not tools
+        assert [tool.name for tool in refetched] == [tool.name for tool in tools]
+
+    def test_tool_collection_uses_pooled_session(
+        self, pool: McpSessionPool, stdio_client: Client[Any]
+    ) -> None:
+        listing = pool.list_tools(stdio_client)
+        n_sessions_opened = pool.n_sessions_opened
+        tools = ToolCollection(mcp_client=stdio_client, mcp_session_pool=pool)
+        for _ in range(5):
+            params = tools.to_params()
+            results = tools.run(
+                [ToolUseBlockParam(id="tu_1", name="list_values", input={})]
+            )
+        assert "list_values" in [param["name"] for param in params]
+        assert results[0].content == [  # type: ignore[union-attr]
+            TextBlockParam(text='["Optimism","Creativity","Intelligence"]')
+        ]
+        # 5 steps without starting the server process or listing the tools again
+        assert pool.n_sessions_opened == n_sessions_opened
+        assert pool.list_tools(stdio_client) is listing
+
+    def test_usable_from_running_event_loop(
+        self, pool: McpSessionPool, stdio_client: Client[Any]
+    ) -> None:
+        async def _list_values() -> bool:
+            return pool.call_tool(stdio_client, "list_values", {}).is_error
+
+        assert asyncio.run(_list_values()) is False
+
+
+class TestMcpSessionPool:
+    def test_tool_list_changed_notification_invalidates_listing(self) -> None:
+        pool = McpSessionPool()
+        client: Client[Any] = Client(
+            _dynamic_server(), message_handler=pool.handle_message
+        )
+        try:
+            assert _tool_names(pool, client) == ["add_greet_tool"]
+            assert _tool_names(pool, client) == ["add_greet_tool"]
+            pool.call_tool(client, "add_greet_tool", {})
+            deadline = time.monotonic() + 5.0
+            while "greet" not in _tool_names(pool, client):
+                assert time.monotonic() < deadline, "listing not invalidated"
+                time.sleep(0.01)
+            assert pool.n_sessions_opened == 1
+        finally:
+            pool.close()
+
+    def test_session_is_reopened_after_close(self) -> None:
+        pool = McpSessionPool()
+        client: Client[Any] = Client(_dynamic_server())
+        try:
+            pool.list_tools(client)
+            pool.close()
+            assert _tool_names(pool, client) == ["add_greet_tool"]
+            assert pool.n_sessions_opened == 2
+        finally:
+            pool.close()
+
+    def test_failing_connection_raises_and_is_retried(self) -> None:
+        pool = McpSessionPool()
+        client: Client[Any] = Client(
+            MCPConfig(
+                mcpServers={
+                    "broken": StdioMCPServer(
+                        command=sys.executable, args=["-c", "import sys; sys.exit(1)"]
+                    )
+                }
+            )
+        )
+        try:
+            with pytest.raises(Exception):  # noqa: B017, PT011
+                pool.list_tools(client)
+            with pytest.raises(Exception):  # noqa: B017, PT011
+                pool.list_tools(client)
+            assert pool.n_sessions_opened == 2
+        finally:
+            pool.close()
+
+
+class TestToolCollectionMcpSessionLifetime:
+    def test_close_closes_session_of_owned_pool(self) -> None:
+        tools = ToolCollection(mcp_client=Client(_dynamic_server()))
+        pool = tools.mcp_session_pool
+        assert pool is not None
+        n_session_threads = _n_session_threads()
+        assert "add_greet_tool" in [param["name"] for param in tools.to_params()]
+        assert _n_session_threads() == n_session_threads + 1
+
+        tools.close()
+        assert _n_session_threads() == n_session_threads
+        tools.to_params()
+        assert pool.n_sessions_opened == 2
+        tools.close()
+
+    def test_session_is_closed_when_collection_is_collected(self) -> None:
+        tools = ToolCollection(mcp_client=Client(_dynamic_server()))
+        n_session_threads = _n_session_threads()
+        tools.to_params()
+        assert _n_session_threads() == n_session_threads + 1
+
+        del tools
+        gc.collect()
+        assert _n_session_threads() == n_session_threads
+
+    def test_does_not_close_passed_pool(self, pool: McpSessionPool) -> None:
+        client: Client[Any] = Client(_dynamic_server())
+        tools = ToolCollection(mcp_client=client, mcp_session_pool=pool)
+        tools.to_params()
+        n_sessions_opened = pool.n_sessions_opened
+        tools.close()
+        (ToolCollection() + tools).to_params()
+        assert pool.n_sessions_opened == n_sessions_opened
@@ -0,0 +1,185 @@
+import base64
+import gc
+import os
+import pathlib
+from collections.abc import Iterator
+
+import pytest
+
+from askui.models.anthropic.messages_api import from_message_param
+from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    ImageBlockParam,
+    MessageParam,
+    TextBlockParam,
+    ToolResultBlockParam,
+)
+from askui.models.shared.truncation_strategies import SummarizingTruncationStrategy
+from askui.utils.blob_store import (
+    BlobStore,
+    BlobStoreSettings,
+    get_blob_store,
+    set_blob_store,
+)
+
+
+@pytest.fixture
+def blob_store(tmp_path: pathlib.Path) -> Iterator[BlobStore]:
+    previous = get_blob_store()
+    store = BlobStore(
+        BlobStoreSettings(max_memory_bytes=1024 * 1024, spill_dir=tmp_path)
+    )
+    set_blob_store(store)
+    yield store
+    set_blob_store(previous)
+
+
+def _frame(i: int, size: int = 64 * 1024) -> str:
+    """Base64 encoded pseudo screenshot that is unique per `i`."""
+    return base64.b64encode(i.to_bytes(4, "big") + os.urandom(size)).decode()
+
+
+def _image_block(data: str) -> ImageBlockParam:
+    return ImageBlockParam(
+        source=Base64ImageSourceParam(data=data, media_type="image/png")
+    )
+
+
+class TestBlobStore:
+    def test_put_and_read(self, blob_store: BlobStore) -> None:
+        ref = blob_store.put(b"hello")
+        assert ref.read() == b"hello"
+        assert ref.size == 5
+        assert ref.key in blob_store
+
+    def test_identical_content_is_stored_once(self, blob_store: BlobStore) -> None:
+        ref_1 = blob_store.put(b"same")
+        ref_2 = blob_store.put(b"same")
+        assert ref_1 == ref_2
+        assert len(blob_store) == 1
+        assert blob_store.memory_bytes == 4
+
+    def test_blob_removed_when_last_ref_is_collected(
+        self, blob_store: BlobStore
+    ) -> None:
+        ref_1 = blob_store.put(b"same")
+        ref_2 = blob_store.put(b"same")
+        key = ref_1.key
+        del ref_1
+        gc.collect()
+        assert key in blob_store
+        del ref_2
+        gc.collect()
+        assert key not in blob_store
+        assert blob_store.memory_bytes == 0
+
+    def test_spills_least_recently_used_to_disk(
+        self, blob_store: BlobStore, tmp_path: pathlib.Path
+    ) -> None:
+        refs = [blob_store.put(os.urandom(400 * 1024)) for _ in range(5)]
+        assert blob_store.memory_bytes <= 1024 * 1024
+        assert blob_store.disk_bytes > 0
+        assert (tmp_path / refs[0].key).exists()
+        # reading a spilled blob loads it back transparently
+        assert len(refs[0].read()) == 400 * 1024
+        assert not (tmp_path / refs[0].key).exists()
+        assert blob_store.memory_bytes <= 1024 * 1024
+
+    def test_spilled_blob_file_removed_when_released(
+        self, blob_store: BlobStore, tmp_path: pathlib.Path
+    ) -> None:
+        refs = [blob_store.put(os.urandom(600 * 1024)) for _ in range(3)]
+        key = refs[0].key
+        assert (tmp_path / key).exists()
+        del refs[0]
+        gc.collect()
+        assert not (tmp_path / key).exists()
+
+    def test_no_spill_without_memory_limit(self, tmp_path: pathlib.Path) -> None:
+        store = BlobStore(BlobStoreSettings(max_memory_bytes=None, spill_dir=tmp_path))
+        refs = [store.put(os.urandom(1024 * 1024)) for _ in range(3)]
+        assert store.memory_bytes == 3 * 1024 * 1024
+        assert store.disk_bytes == 0
+        assert len(refs) == 3
+
+
+class TestBase64ImageSourceParam:
+    def test_data_round_trip(self, blob_store: BlobStore) -> None:
+        data = _frame(0)
+        source = Base64ImageSourceParam(data=data, media_type="image/png")
+        assert source.data == data
+        assert source.blob_key in blob_store
+        assert source.model_dump() == {
+            "data": data,
+            "media_type": "image/png",
+            "type": "base64",
+        }
+
+    def test_model_validate_from_dump(self, blob_store: BlobStore) -> None:
+        message = MessageParam(
+            role="user",
+            content=[
+                ToolResultBlockParam(
+                    tool_use_id="tu_1",
+                    content=[TextBlockParam(text="done"), _image_block(_frame(1))],
+                )
+            ],
+        )
+        restored = MessageParam.model_validate(message.model_dump(mode="json"))
+        assert restored == message
+        assert len(blob_store) == 1
+
+    def test_missing_data_raises(self) -> None:
+        with pytest.raises(ValueError, match="data"):
+            Base64ImageSourceParam.model_validate({"media_type": "image/png"})
+
+    def test_copies_share_blob(self, blob_store: BlobStore) -> None:
+        block = _image_block(_frame(2))
+        copied = block.model_copy(deep=True)
+        assert isinstance(copied.source, Base64ImageSourceParam)
+        assert isinstance(block.source, Base64ImageSourceParam)
+        assert copied.source.blob_key == block.source.blob_key
+        assert len(blob_store) == 1
+
+    @pytest.mark.usefixtures("blob_store")
+    def test_provider_payload_materializes_base64(self) -> None:
+        data = _frame(3)
+        payload = from_message_param(
+            MessageParam(role="user", content=[_image_block(data)])
+        )
+        assert isinstance(payload["content"], list)
+        assert payload["content"][0] == {
+            "source": {"data": data, "media_type": "image/png", "type": "base64"},
+            "type": "image",
+            "cache_control": None,
+        }
+
+    def test_history_memory_bounded_and_frames_deduped(
+        self, blob_store: BlobStore
+    ) -> None:
+        strategy = SummarizingTruncationStrategy(max_input_tokens=10**9)
+        # every fifth frame is a new screen, others repeat the previous one
+        frames = [_frame(i) for i in range(100)]
+        for step in range(500):
+            strategy.append_message(
+                MessageParam(
+                    role="user",
+                    content=[
+                        ToolResultBlockParam(
+                            tool_use_id=f"tu_{step}",
+                            content=[_image_block(frames[step // 5])],
+                        )
+                    ],
+                )
+            )
+            strategy.append_message(MessageParam(role="assistant", content="ok"))
+            assert blob_store.memory_bytes <= 1024 * 1024
+        assert len(strategy.full_messages) == 1_000
+        assert len(blob_store) == len(frames)
+        last = strategy.full_messages[-2].content[0]
+        assert isinstance(last, ToolResultBlockParam)
+        assert isinstance(last.content, list)
+        image = last.content[0]
+        assert isinstance(image, ImageBlockParam)
+        assert isinstance(image.source, Base64ImageSourceParam)
+        assert image.source.data == frames[-1]
@@ -0,0 +1,148 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from askui.models.shared.agent_message_param import ToolUseBlockParam
+from askui.models.shared.settings import CacheFile, CacheMetadata
+from askui.utils.caching import CacheIndex, CacheManager
+from askui.utils.caching.cache_index import INDEX_FILE_NAME
+
+
+def _cache_file(
+    goal: str, is_valid: bool = True, n_failures: int = 0, n_steps: int = 3
+) -> CacheFile:
+    cache_file = CacheFile(
+        metadata=CacheMetadata(
+            created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            goal=goal,
+            is_valid=is_valid,
+        ),
+        trajectory=[
+            ToolUseBlockParam(
+                id=f"tu_{i}",
+                name="computer",
+                input={"action": "left_click", "coordinate": [i, i]},
+            )
+            for i in range(n_steps)
+        ],
+        cache_parameters={"user": "The user to log in"},
+    )
+    for i in range(n_failures):
+        CacheManager().record_step_failure(cache_file, step_index=i, error_message="")
+    return cache_file
+
+
+def _write(path: Path, cache_file: CacheFile) -> None:
+    path.write_text(json.dumps(cache_file.model_dump(mode="json")), encoding="utf-8")
+
+
+class _CountingReader:
+    def __init__(self) -> None:
+        self.paths: list[Path] = []
+
+    def __call__(self, path: Path) -> CacheFile:
+        self.paths.append(path)
+        return CacheManager.read_cache_file(path)
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    _write(tmp_path / "login.json", _cache_file("Log in as {{user}}"))
+    _write(tmp_path / "logout.json", _cache_file("Log out", n_failures=2))
+    _write(tmp_path / "search.json", _cache_file("Search", is_valid=False))
+    return tmp_path
+
+
+class TestCacheIndex:
+    def test_queries_metadata(self, cache_dir: Path) -> None:
+        with CacheIndex(cache_dir) as index:
+            index.sync(".json", CacheManager.read_cache_file)
+            (entry,) = index.query(goal="LOG IN")
+            assert entry.path == cache_dir / "login.json"
+            assert entry.goal == "Log in as {{user}}"
+            assert entry.created_at == datetime(2025, 1, 1, tzinfo=timezone.utc)
+            assert entry.cache_parameters == {"user": "The user to log in"}
+            assert entry.step_count == 3
+
+            assert [e.path.name for e in index.query()] == ["login.json", "logout.json"]
+            assert [e.path.name for e in index.query(include_invalid=True)] == [
+                "login.json",
+                "logout.json",
+                "search.json",
+            ]
+            assert [e.path.name for e in index.query(max_failure_count=1)] == [
+                "login.json"
+            ]
+            assert index.query(goal="%") == []
+            assert index.query(trajectories_format=".traj") == []
+
+    def test_reads_only_new_and_changed_files(self, cache_dir: Path) -> None:
+        reader = _CountingReader()
+        with CacheIndex(cache_dir) as index:
+            index.sync(".json", reader)
+        assert len(reader.paths) == 3
+
+        reader.paths.clear()
+        _write(cache_dir / "logout.json", _cache_file("Log out", n_steps=4))
+        _write(cache_dir / "new.json", _cache_file("New"))
+        (cache_dir / "search.json").unlink()
+        with CacheIndex(cache_dir) as index:
+            index.sync(".json", reader)
+            assert sorted(path.name for path in reader.paths) == [
+                "logout.json",
+                "new.json",
+            ]
+            entries = index.query(include_invalid=True)
+        assert [(e.path.name, e.step_count) for e in entries] == [
+            ("login.json", 3),
+            ("logout.json", 4),
+            ("new.json", 3),
+        ]
+
+    def test_excludes_unreadable_files_until_changed(self, cache_dir: Path) -> None:
+        (cache_dir / "broken.json").write_text("{", encoding="utf-8")
+        reader = _CountingReader()
+        with CacheIndex(cache_dir) as index:
+            index.sync(".json", reader)
+            index.sync(".json", reader)
+            assert len(reader.paths) == 4
+            assert len(index.query(include_invalid=True)) == 3
+
+            _write(cache_dir / "broken.json", _cache_file("Fixed"))
+            index.sync(".json", reader)
+            assert [e.path.name for e in index.query(goal="Fixed")] == ["broken.json"]
+
+    def test_cache_manager_writes_update_index(
+        self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        CacheManager.find_cache_files(cache_dir)
+        cache_file = CacheManager.read_cache_file(cache_dir / "login.json")
+        cache_manager = CacheManager()
+        cache_manager.update_metadata_on_failure(
+            cache_file, str(cache_dir / "login.json"), 1, "Element not found"
+        )
+
+        def fail(path: Path) -> CacheFile:
+            pytest.fail(f"Cache file {path} was read")
+
+        monkeypatch.setattr(CacheManager, "read_cache_file", fail)
+        (entry,) = CacheManager.find_cache_files(
+            cache_dir, goal="log in", include_invalid=True
+        )
+        assert entry.execution_attempts == 1
+        assert entry.failure_count == 1
+
+    def test_rebuilds_corrupt_index(self, cache_dir: Path) -> None:
+        CacheManager.find_cache_files(cache_dir)
+        (cache_dir / INDEX_FILE_NAME).write_bytes(b"not a database")
+        assert len(CacheManager.find_cache_files(cache_dir)) == 2
+
+    def test_rebuild(self, cache_dir: Path) -> None:
+        reader = _CountingReader()
+        with CacheIndex(cache_dir) as index:
+            index.sync(".json", reader)
+            index.rebuild(".json", reader)
+            assert len(reader.paths) == 6
+            assert len(index.query()) == 2
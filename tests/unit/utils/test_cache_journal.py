@@ -0,0 +1,190 @@
+import json
+import multiprocessing
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from askui.models.shared.agent_message_param import ToolUseBlockParam
+from askui.models.shared.settings import CacheFile, CacheMetadata
+from askui.utils.caching import CacheManager, StepFailureCountValidator
+from askui.utils.caching import cache_manager as cache_manager_module
+from askui.utils.caching.cache_journal import CacheJournal, journal_path
+
+_N_PROCESSES = 4
+_N_UPDATES_PER_PROCESS = 20
+
+
+def _write_cache_file(path: Path) -> None:
+    cache_file = CacheFile(
+        metadata=CacheMetadata(
+            created_at=datetime(2025, 1, 1, tzinfo=timezone.utc), goal="Log in"
+        ),
+        trajectory=[
+            ToolUseBlockParam(
+                id="tu_1",
+                name="computer",
+                input={"action": "left_click", "coordinate": [1, 2]},
+            )
+        ],
+    )
+    path.write_text(json.dumps(cache_file.model_dump(mode="json")), encoding="utf-8")
+
+
+def _complete(
+    cache_file_path: Path, n_updates: int = 1, compaction_threshold: int = 100
+) -> None:
+    cache_manager = CacheManager(
+        validators=[], journal_compaction_threshold=compaction_threshold
+    )
+    cache_file = CacheManager.read_cache_file(cache_file_path)
+    for _ in range(n_updates):
+        cache_manager.update_metadata_on_completion(
+            cache_file, str(cache_file_path), success=True
+        )
+
+
+def _fail(cache_file_path: Path, n_updates: int, compaction_threshold: int) -> None:
+    cache_manager = CacheManager(
+        validators=[], journal_compaction_threshold=compaction_threshold
+    )
+    cache_file = CacheManager.read_cache_file(cache_file_path)
+    for i in range(n_updates):
+        cache_manager.update_metadata_on_failure(
+            cache_file, str(cache_file_path), step_index=0, error_message=str(i)
+        )
+
+
+def _complete_and_crash_during_compaction(cache_file_path: Path, crash: str) -> None:
+    def exit_process(*_args: object, **_kwargs: object) -> None:
+        os._exit(1)
+
+    if crash == "before_replacing_cache_file":
+        cache_manager_module.write_atomically = exit_process
+    else:
+        CacheJournal.reset = exit_process  # type: ignore[method-assign]
+    _complete(cache_file_path, compaction_threshold=2)
+
+
+def _run_in_processes(
+    target: object, *args_list: tuple[object, ...]
+) -> list[int | None]:
+    processes = [
+        multiprocessing.Process(target=target, args=args)  # type: ignore[arg-type]
+        for args in args_list
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+    return [process.exitcode for process in processes]
+
+
+@pytest.fixture
+def cache_file_path(tmp_path: Path) -> Path:
+    path = tmp_path / "login.json"
+    _write_cache_file(path)
+    return path
+
+
+class TestCacheJournal:
+    def test_appends_updates_without_rewriting_cache_file(
+        self, cache_file_path: Path
+    ) -> None:
+        content = cache_file_path.read_bytes()
+        _complete(cache_file_path, n_updates=3)
+
+        assert cache_file_path.read_bytes() == content
+        assert len(journal_path(cache_file_path).read_text().splitlines()) == 3
+        metadata = CacheManager.read_cache_file(cache_file_path).metadata
+        assert metadata.execution_attempts == 3
+        assert metadata.journal_sequence == 3
+
+    def test_compacts_journal(self, cache_file_path: Path) -> None:
+        _complete(cache_file_path, n_updates=3, compaction_threshold=3)
+
+        raw_cache_file = json.loads(cache_file_path.read_text())
+        assert raw_cache_file["metadata"]["execution_attempts"] == 3
+        assert raw_cache_file["metadata"]["journal_sequence"] == 3
+        (event,) = CacheJournal(cache_file_path).read()
+        assert (event.type, event.sequence) == ("compaction", 3)
+
+        _complete(cache_file_path, n_updates=1, compaction_threshold=3)
+        metadata = CacheManager.read_cache_file(cache_file_path).metadata
+        assert metadata.execution_attempts == 4
+        assert metadata.journal_sequence == 4
+
+    def test_ignores_partially_written_entries(self, cache_file_path: Path) -> None:
+        _complete(cache_file_path)
+        with journal_path(cache_file_path).open("ab") as journal:
+            journal.write(b'{"type": "execution_attempt", "timesta')
+
+        metadata = CacheManager.read_cache_file(cache_file_path).metadata
+        assert metadata.execution_attempts == 1
+        _complete(cache_file_path)
+        metadata = CacheManager.read_cache_file(cache_file_path).metadata
+        assert metadata.execution_attempts == 2
+        assert metadata.journal_sequence == 2
+
+    def test_invalidates_with_updates_of_other_agents(
+        self, cache_file_path: Path
+    ) -> None:
+        # Both agents read the cache file before any failure was recorded
+        cache_file = CacheManager.read_cache_file(cache_file_path)
+        other_cache_file = CacheManager.read_cache_file(cache_file_path)
+        cache_manager = CacheManager(
+            validators=[StepFailureCountValidator(max_failures_per_step=2)]
+        )
+        cache_manager.update_metadata_on_failure(
+            other_cache_file, str(cache_file_path), step_index=0, error_message=""
+        )
+        cache_manager.update_metadata_on_failure(
+            cache_file, str(cache_file_path), step_index=0, error_message=""
+        )
+
+        metadata = CacheManager.read_cache_file(cache_file_path).metadata
+        assert len(metadata.failures) == 2
+        assert not metadata.is_valid
+        assert cache_file.metadata == metadata
+
+    @pytest.mark.parametrize(
+        "crash", ["before_replacing_cache_file", "before_resetting_journal"]
+    )
+    def test_recovers_from_crash_during_compaction(
+        self, cache_file_path: Path, crash: str
+    ) -> None:
+        _complete(cache_file_path)
+        exit_codes = _run_in_processes(
+            _complete_and_crash_during_compaction, (cache_file_path, crash)
+        )
+        assert exit_codes == [1]
+
+        metadata = CacheManager.read_cache_file(cache_file_path).metadata
+        assert metadata.execution_attempts == 2
+        _complete(cache_file_path, compaction_threshold=2)
+        metadata = CacheManager.read_cache_file(cache_file_path).metadata
+        assert metadata.execution_attempts == 3
+        assert CacheManager.find_cache_files(cache_file_path.parent)[0].path == (
+            cache_file_path
+        )
+
+    def test_concurrent_writers_do_not_lose_updates(
+        self, cache_file_path: Path
+    ) -> None:
+        exit_codes = _run_in_processes(
+            _fail,
+            *[
+                (cache_file_path, _N_UPDATES_PER_PROCESS, 7)
+                for _ in range(_N_PROCESSES)
+            ],
+        )
+        assert exit_codes == [0] * _N_PROCESSES
+
+        metadata = CacheManager.read_cache_file(cache_file_path).metadata
+        n_updates = _N_PROCESSES * _N_UPDATES_PER_PROCESS
+        assert metadata.execution_attempts == n_updates
+        assert len(metadata.failures) == n_updates
+        assert metadata.journal_sequence == 2 * n_updates
+        (entry,) = CacheManager.find_cache_files(cache_file_path.parent)
+        assert entry.execution_attempts == n_updates
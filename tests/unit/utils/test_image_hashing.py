@@ -0,0 +1,131 @@
+import random
+from collections.abc import Callable
+
+import imagehash
+import pytest
+from PIL import Image, ImageDraw
+
+from askui.utils.image_hashing import (
+    IMAGE_HASH_METHOD,
+    compute_image_hashes,
+    hamming_distance,
+    hash_to_hex,
+    hex_to_hash,
+)
+from askui.utils.visual_validation import (
+    compute_ahash,
+    compute_hamming_distance,
+    compute_phash,
+)
+
+_IMAGEHASH_FUNCTIONS: dict[
+    IMAGE_HASH_METHOD, Callable[[Image.Image, int], imagehash.ImageHash]
+] = {
+    "phash": lambda image, hash_size: imagehash.phash(image, hash_size=hash_size),
+    "ahash": lambda image, hash_size: imagehash.average_hash(
+        image, hash_size=hash_size
+    ),
+    "dhash": lambda image, hash_size: imagehash.dhash(image, hash_size=hash_size),
+}
+
+
+def _noise(size: tuple[int, int], seed: int) -> Image.Image:
+    rng = random.Random(seed)
+    return Image.frombytes("RGB", size, rng.randbytes(size[0] * size[1] * 3))
+
+
+def _ui_region(seed: int) -> Image.Image:
+    rng = random.Random(seed)
+    image = Image.new("RGB", (100, 100), (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    for _ in range(5):
+        left, top = rng.randrange(90), rng.randrange(90)
+        draw.rectangle(
+            (left, top, left + rng.randrange(5, 50), top + rng.randrange(5, 30)),
+            fill=(rng.randrange(256), rng.randrange(256), rng.randrange(256)),
+        )
+    draw.text((10, 40), f"Button {seed}", fill="black")
+    return image
+
+
+def _gradient() -> Image.Image:
+    image = Image.new("L", (64, 48))
+    image.putdata([(x * 4 + y) % 256 for y in range(48) for x in range(64)])
+    return image
+
+
+def _checkerboard() -> Image.Image:
+    image = Image.new("1", (40, 40))
+    image.putdata(
+        [((x // 5) + (y // 5)) % 2 * 255 for y in range(40) for x in range(40)]
+    )
+    return image
+
+
+_FIXTURES: list[Image.Image] = [
+    Image.new("RGB", (100, 100), "white"),
+    Image.new("RGB", (100, 100), "black"),
+    Image.new("RGB", (1, 1), (12, 34, 56)),
+    Image.new("RGBA", (30, 70), (0, 128, 255, 100)),
+    _gradient(),
+    _checkerboard(),
+    *[_noise((50, 50), seed) for seed in range(5)],
+    *[_ui_region(seed) for seed in range(20)],
+    _ui_region(0).crop((0, 0, 17, 100)),
+]
+
+
+class TestComputeImageHashes:
+    @pytest.mark.parametrize("hash_size", [8, 5, 16])
+    @pytest.mark.parametrize("method", ["phash", "ahash", "dhash"])
+    def test_equals_imagehash(self, method: IMAGE_HASH_METHOD, hash_size: int) -> None:
+        image_hashes = compute_image_hashes(_FIXTURES, method, hash_size=hash_size)
+        expected = [
+            _IMAGEHASH_FUNCTIONS[method](image, hash_size) for image in _FIXTURES
+        ]
+        assert [hash_to_hex(h, hash_size=hash_size) for h in image_hashes] == [
+            str(h) for h in expected
+        ]
+
+    @pytest.mark.parametrize("method", ["phash", "ahash", "dhash"])
+    def test_batch_equals_single_images(self, method: IMAGE_HASH_METHOD) -> None:
+        assert compute_image_hashes(_FIXTURES, method) == [
+            compute_image_hashes([image], method)[0] for image in _FIXTURES
+        ]
+
+    def test_empty_batch(self) -> None:
+        assert compute_image_hashes([], "phash") == []
+
+    def test_unsupported_method(self) -> None:
+        with pytest.raises(ValueError, match="Unsupported"):
+            compute_image_hashes(_FIXTURES, "whash")  # type: ignore[arg-type]
+
+
+class TestHashSerialization:
+    def test_round_trips_hex(self) -> None:
+        for image_hash in compute_image_hashes(_FIXTURES, "phash"):
+            hex_str = hash_to_hex(image_hash)
+            assert len(hex_str) == 16
+            assert hex_to_hash(hex_str) == image_hash
+
+    def test_hamming_distance_equals_imagehash(self) -> None:
+        hex_strs = [str(imagehash.phash(image)) for image in _FIXTURES]
+        for hex_str1 in hex_strs:
+            for hex_str2 in hex_strs:
+                expected = imagehash.hex_to_hash(hex_str1) - imagehash.hex_to_hash(
+                    hex_str2
+                )
+                assert (
+                    hamming_distance(hex_to_hash(hex_str1), hex_to_hash(hex_str2))
+                    == compute_hamming_distance(hex_str1, hex_str2)
+                    == expected
+                )
+
+    def test_visual_validation_hashes_are_compatible(self) -> None:
+        for image in _FIXTURES:
+            assert compute_phash(image) == str(imagehash.phash(image))
+            assert compute_ahash(image) == str(imagehash.average_hash(image))
+
+    def test_hamming_distance_rejects_hashes_of_different_sizes(self) -> None:
+        with pytest.raises(ValueError, match="same length"):
+            compute_hamming_distance("ff", "00ff")
@@ -1,19 +1,31 @@
 import base64
+import io
+import os
 import pathlib
+from typing import Any
 
 import pytest
 from PIL import Image
 
+from askui.models.shared.settings import ImageEncoding
+from askui.models.types.geometry import CaptureRegion
+from askui.utils import image_utils
 from askui.utils.image_utils import (
     ImageSource,
     ScalingResults,
     base64_to_image,
+    bgra_bitmap_to_image,
+    capture_scaled_region,
     data_url_to_image,
     draw_point_on_image,
+    encode_image,
     image_to_base64,
     image_to_data_url,
+    read_base64_image_size,
+    read_image_size,
     scale_coordinates,
     scale_image_to_fit,
+    scale_region,
 )
 
 
@@ -304,3 +316,289 @@ class TestEdgeCases:
 
         with pytest.raises(ValueError):
             data_url_to_image("data:image/png;base64,")  # Empty base64
+
+
+class TestCaptureRegion:
+    def test_around_is_centered(self) -> None:
+        region = CaptureRegion.around((100, 50), 20)
+        assert region == CaptureRegion(x=90, y=40, width=20, height=20)
+        assert region.box == (90, 40, 110, 60)
+
+    def test_clip_cuts_off_parts_outside(self) -> None:
+        region = CaptureRegion(x=-10, y=90, width=30, height=30)
+        assert region.clip(100, 100) == CaptureRegion(x=0, y=90, width=20, height=10)
+
+    def test_clip_returns_none_if_outside(self) -> None:
+        assert CaptureRegion(x=200, y=0, width=10, height=10).clip(100, 100) is None
+
+    def test_captured_area_starts_at_screen_edge(self) -> None:
+        region = CaptureRegion(x=-10, y=5, width=30, height=30)
+        assert region.captured_area(20, 30) == CaptureRegion(
+            x=0, y=5, width=20, height=30
+        )
+
+    def test_offset_translates_to_screen_coordinates(self) -> None:
+        region = CaptureRegion(x=300, y=200, width=64, height=32)
+        assert region.offset((5, 6)) == (305, 206)
+
+    def test_size_must_be_positive(self) -> None:
+        with pytest.raises(ValueError):
+            CaptureRegion(x=0, y=0, width=0, height=10)
+
+
+class TestScaledRegion:
+    def test_scale_region_to_real_screen(self) -> None:
+        # 2048x1536 is scaled to 1024x768 by a factor of 0.5
+        region = CaptureRegion(x=100, y=50, width=20, height=10)
+        assert scale_region(
+            region, (2048, 1536), (1024, 768), inverse=True
+        ) == CaptureRegion(x=200, y=100, width=40, height=20)
+
+    def test_scale_region_outside_of_screen(self) -> None:
+        region = CaptureRegion(x=1100, y=50, width=20, height=10)
+        assert scale_region(region, (2048, 1536), (1024, 768), inverse=True) is None
+
+    def test_capture_scaled_region_captures_real_pixels_only(self) -> None:
+        captured: list[CaptureRegion] = []
+
+        def capture(region: CaptureRegion) -> Image.Image:
+            captured.append(region)
+            return Image.new("RGB", (region.width, region.height), "red")
+
+        image = capture_scaled_region(
+            capture,
+            CaptureRegion(x=100, y=50, width=20, height=10),
+            (2048, 1536),
+            (1024, 768),
+        )
+        assert captured == [CaptureRegion(x=200, y=100, width=40, height=20)]
+        assert image.size == (20, 10)
+        assert image.getpixel((0, 0)) == (255, 0, 0)
+
+
+def _split_merge_decode(data: bytes, size: tuple[int, int]) -> Image.Image:
+    """The decoding previously used by `AskUiControllerClient.screenshot()`."""
+    r, g, b, _ = Image.frombytes("RGBA", size, data).split()
+    return Image.merge("RGB", (b, g, r))
+
+
+_SIZE_4K = (3840, 2160)
+
+
+@pytest.fixture(scope="module")
+def bitmap_4k() -> bytes:
+    return os.urandom(_SIZE_4K[0] * _SIZE_4K[1] * 4)
+
+
+class TestBgraBitmapToImage:
+    def test_decodes_bgra_to_rgb(self) -> None:
+        image = bgra_bitmap_to_image(bytes([1, 2, 3, 4, 5, 6, 7, 8]), (2, 1))
+        assert image.mode == "RGB"
+        assert image.getpixel((0, 0)) == (3, 2, 1)
+        assert image.getpixel((1, 0)) == (7, 6, 5)
+
+    def test_4k_matches_split_merge_decode(self, bitmap_4k: bytes) -> None:
+        image = bgra_bitmap_to_image(bitmap_4k, _SIZE_4K)
+        assert image.tobytes() == _split_merge_decode(bitmap_4k, _SIZE_4K).tobytes()
+
+    def test_scale_to_fit_without_padding_matches_padded(
+        self, bitmap_4k: bytes
+    ) -> None:
+        image = bgra_bitmap_to_image(bitmap_4k, _SIZE_4K)
+        scaled = scale_image_to_fit(image, (1280, 720))
+        background = Image.new("RGB", (1280, 720))
+        background.paste(image.resize((1280, 720), Image.Resampling.LANCZOS), (0, 0))
+        assert scaled.tobytes() == background.tobytes()
+
+
+def _photo() -> Image.Image:
+    noise = Image.effect_noise((512, 512), 64)
+    gradient = Image.linear_gradient("L").resize((512, 512))
+    return Image.merge("RGB", (noise, gradient, gradient.rotate(90)))
+
+
+class TestEncodeImage:
+    def test_png_by_default(self, github_login_screenshot: Image.Image) -> None:
+        encoded = encode_image(github_login_screenshot)
+        assert encoded.media_type == "image/png"
+        assert encoded.data == image_to_base64(github_login_screenshot)
+        assert encoded.data_url.startswith("data:image/png;base64,")
+
+    @pytest.mark.parametrize(
+        ("encoding", "media_type"),
+        [
+            (ImageEncoding(format="webp", quality=80), "image/webp"),
+            (ImageEncoding(format="webp", lossless=True), "image/webp"),
+            (ImageEncoding(format="auto"), "image/webp"),
+        ],
+    )
+    def test_reduces_size_of_screenshot(
+        self,
+        github_login_screenshot: Image.Image,
+        encoding: ImageEncoding,
+        media_type: str,
+    ) -> None:
+        encoded = encode_image(github_login_screenshot, encoding)
+        assert encoded.media_type == media_type
+        assert len(encoded.data) < len(image_to_base64(github_login_screenshot))
+
+    def test_auto_encodes_screenshot_losslessly(
+        self, github_login_screenshot: Image.Image
+    ) -> None:
+        encoded = encode_image(github_login_screenshot, ImageEncoding(format="auto"))
+        decoded = base64_to_image(encoded.data)
+        assert decoded.size == github_login_screenshot.size
+        assert (
+            decoded.convert("RGB").tobytes()
+            == github_login_screenshot.convert("RGB").tobytes()
+        )
+
+    def test_auto_encodes_photo_as_jpeg(self) -> None:
+        photo = _photo()
+        encoded = encode_image(photo, ImageEncoding(format="auto", quality=80))
+        assert encoded.media_type == "image/jpeg"
+        assert len(encoded.data) < len(image_to_base64(photo))
+
+    def test_jpeg_of_image_with_alpha(self) -> None:
+        image = Image.new("RGBA", (10, 10), (255, 0, 0, 128))
+        encoded = encode_image(image, ImageEncoding(format="jpeg"))
+        assert base64_to_image(encoded.data).mode == "RGB"
+
+    def test_image_source_to_encoded(
+        self, path_fixtures_github_com__icon: pathlib.Path
+    ) -> None:
+        source = ImageSource(Image.open(path_fixtures_github_com__icon))
+        encoded = source.to_encoded(ImageEncoding(format="webp"))
+        assert encoded.data_url.startswith("data:image/webp;base64,")
+
+
+class _EncodeCounter:
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.n_calls = 0
+        encode = image_utils._encode_image_bytes  # noqa: SLF001
+
+        def counting_encode(*args: Any, **kwargs: Any) -> Any:
+            self.n_calls += 1
+            return encode(*args, **kwargs)
+
+        monkeypatch.setattr(image_utils, "_encode_image_bytes", counting_encode)
+
+
+@pytest.fixture
+def encode_counter(monkeypatch: pytest.MonkeyPatch) -> _EncodeCounter:
+    return _EncodeCounter(monkeypatch)
+
+
+class TestImageSourceEncodingCache:
+    def test_encodes_png_once(
+        self, github_login_screenshot: Image.Image, encode_counter: _EncodeCounter
+    ) -> None:
+        source = ImageSource(github_login_screenshot)
+        data_url = source.to_data_url()
+        assert source.to_data_url() == data_url
+        assert source.to_base64() == image_to_base64(github_login_screenshot)
+        assert base64.b64encode(source.to_bytes()).decode() == source.to_base64()
+        assert source.to_encoded(ImageEncoding()) is source.to_encoded()
+        assert encode_counter.n_calls == 1
+
+    def test_caches_per_encoding(
+        self, github_login_screenshot: Image.Image, encode_counter: _EncodeCounter
+    ) -> None:
+        source = ImageSource(github_login_screenshot)
+        for _ in range(2):
+            source.to_encoded(ImageEncoding(format="webp", quality=80))
+            source.to_encoded(ImageEncoding(format="webp", quality=60))
+            source.to_encoded()
+        assert encode_counter.n_calls == 3
+
+    def test_invalidated_on_root_replacement(
+        self, encode_counter: _EncodeCounter
+    ) -> None:
+        source = ImageSource(Image.new("RGB", (8, 8), (255, 0, 0)))
+        red = source.to_base64()
+        source.root = Image.new("RGB", (8, 8), (0, 0, 255))
+        assert base64_to_image(source.to_base64()).getpixel((0, 0)) == (0, 0, 255)
+        assert source.to_base64() != red
+        assert encode_counter.n_calls == 2
+
+    def test_invalidated_on_in_place_resize(self) -> None:
+        source = ImageSource(Image.new("RGB", (8, 8)))
+        source.to_bytes()
+        source.root.thumbnail((4, 4))
+        assert base64_to_image(source.to_base64()).size == (4, 4)
+
+    def test_clear_encoding_cache_after_pixel_change(self) -> None:
+        source = ImageSource(Image.new("RGB", (8, 8)))
+        source.to_bytes()
+        source.root.paste((0, 255, 0), (0, 0, 8, 8))
+        source.clear_encoding_cache()
+        assert base64_to_image(source.to_base64()).getpixel((0, 0)) == (0, 255, 0)
+
+    def test_from_bytes_reuses_png(
+        self,
+        path_fixtures_github_com__icon: pathlib.Path,
+        encode_counter: _EncodeCounter,
+    ) -> None:
+        data = path_fixtures_github_com__icon.read_bytes()
+        source = ImageSource.from_bytes(data)
+        assert source.to_bytes() == data
+        assert source.to_base64() == base64.b64encode(data).decode()
+        assert source.root.size == (128, 125)
+        assert encode_counter.n_calls == 0
+
+    def test_from_bytes_reencodes_other_formats(
+        self, encode_counter: _EncodeCounter
+    ) -> None:
+        with io.BytesIO() as buffer:
+            Image.new("RGB", (8, 8), (255, 0, 0)).save(buffer, format="JPEG")
+            data = buffer.getvalue()
+        source = ImageSource.from_bytes(data)
+        assert base64_to_image(source.to_base64()).format == "PNG"
+        assert encode_counter.n_calls == 1
+
+
+def _encoded(image: Image.Image, format_: str, **params: Any) -> bytes:
+    with io.BytesIO() as buffer:
+        image.save(buffer, format=format_, **params)
+        return buffer.getvalue()
+
+
+_IMAGE_SIZE_CORPUS: dict[str, tuple[str, str, dict[str, Any]]] = {
+    "png_rgb": ("RGB", "PNG", {}),
+    "png_rgba": ("RGBA", "PNG", {}),
+    "png_palette": ("P", "PNG", {}),
+    "png_grayscale": ("L", "PNG", {}),
+    "gif": ("P", "GIF", {}),
+    "jpeg": ("RGB", "JPEG", {}),
+    "jpeg_progressive": ("RGB", "JPEG", {"progressive": True}),
+    "jpeg_grayscale": ("L", "JPEG", {}),
+    "jpeg_large_icc_profile": ("RGB", "JPEG", {"icc_profile": bytes(20_000)}),
+    "webp_lossy": ("RGB", "WEBP", {"quality": 80}),
+    "webp_lossless": ("RGB", "WEBP", {"lossless": True}),
+    "webp_alpha": ("RGBA", "WEBP", {"quality": 80}),
+    "webp_icc_profile": ("RGB", "WEBP", {"icc_profile": bytes(100)}),
+    "bmp": ("RGB", "BMP", {}),
+    "tiff": ("RGB", "TIFF", {}),
+}
+
+
+class TestReadImageSize:
+    @pytest.mark.parametrize("name", list(_IMAGE_SIZE_CORPUS))
+    @pytest.mark.parametrize("size", [(1, 1), (640, 480), (1280, 800), (333, 4097)])
+    def test_reads_size(self, name: str, size: tuple[int, int]) -> None:
+        mode, format_, params = _IMAGE_SIZE_CORPUS[name]
+        data = _encoded(Image.new(mode, size), format_, **params)
+        assert read_image_size(data) == size
+        assert read_base64_image_size(base64.b64encode(data).decode()) == size
+
+    def test_reads_size_of_screenshot(
+        self, github_login_screenshot: Image.Image
+    ) -> None:
+        base64_str = image_to_base64(github_login_screenshot)
+        assert read_base64_image_size(base64_str) == github_login_screenshot.size
+
+    def test_invalid_image(self) -> None:
+        with pytest.raises(ValueError):
+            read_image_size(b"not an image")
+        with pytest.raises(ValueError):
+            read_base64_image_size(base64.b64encode(b"not an image" * 1000).decode())
@@ -0,0 +1,279 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image, ImageDraw
+from typing_extensions import override
+
+from askui.locators import Image as ImageLocator
+from askui.locators import Locator, Text
+from askui.model_providers.detection_provider import DetectionProvider
+from askui.models.askui.ai_element_utils import AiElementCollection
+from askui.models.exceptions import ElementNotFoundError
+from askui.models.shared.settings import LocateSettings
+from askui.models.types.geometry import PointList
+from askui.tools.locate_tool import LocateTool
+from askui.utils import locate_cache as locate_cache_module
+from askui.utils.image_utils import ImageSource
+from askui.utils.locate_cache import (
+    LocateCache,
+    LocateCacheKey,
+    provider_identity,
+    serialize_locator,
+)
+
+_BUTTON = (20, 20, 80, 40)
+
+
+class _CountingDetectionProvider(DetectionProvider):
+    """Finds a black button in the screenshot, counting the detections."""
+
+    def __init__(self) -> None:
+        self.n_calls = 0
+
+    @override
+    def detect(
+        self,
+        locator: str | Locator,
+        image: ImageSource,
+        locate_settings: LocateSettings,
+    ) -> PointList:
+        self.n_calls += 1
+        if image.root.getpixel((75, 38)) != (0, 0, 0):
+            raise ElementNotFoundError(locator, str(locator))
+        return [(50, 30)]
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _screenshot(
+    button: bool = True, clock_text: str = "12:00", button_text: str = "OK"
+) -> ImageSource:
+    image = Image.new("RGB", (400, 300), "white")
+    draw = ImageDraw.Draw(image)
+    if button:
+        draw.rectangle(_BUTTON, fill="black")
+        draw.text((22, 22), button_text, fill="white")
+    draw.text((340, 280), clock_text, fill="black")
+    return ImageSource(image)
+
+
+def _locate_tool(
+    locate_cache: LocateCache,
+) -> tuple[LocateTool, _CountingDetectionProvider]:
+    provider = _CountingDetectionProvider()
+    return LocateTool(provider=provider, locate_cache=locate_cache), provider
+
+
+class TestLocateCache:
+    def test_reuses_result_for_same_screenshot_and_locator(self) -> None:
+        cache = LocateCache()
+        tool, provider = _locate_tool(cache)
+
+        for _ in range(3):
+            assert tool.run("OK button", _screenshot()) == [(50, 30)]
+
+        assert provider.n_calls == 1
+        assert (cache.statistics.hits, cache.statistics.misses) == (2, 1)
+        assert cache.statistics.hit_rate == pytest.approx(2 / 3)
+
+    def test_locates_again_for_other_locator_or_settings(self) -> None:
+        tool, provider = _locate_tool(LocateCache())
+
+        tool.run("OK button", _screenshot())
+        tool.run(Text("OK"), _screenshot())
+        tool.run(Text("OK"), _screenshot())
+        tool.run(
+            "OK button",
+            _screenshot(),
+            locate_settings=LocateSettings(confidence_threshold=0.5),
+        )
+
+        assert provider.n_calls == 3
+
+    def test_locates_again_with_other_provider_of_same_type(self) -> None:
+        cache = LocateCache()
+        tool, provider = _locate_tool(cache)
+        other_tool, other_provider = _locate_tool(cache)
+        same_provider_tool = LocateTool(provider=provider, locate_cache=cache)
+
+        tool.run("OK button", _screenshot())
+        other_tool.run("OK button", _screenshot())
+        same_provider_tool.run("OK button", _screenshot())
+
+        assert provider.n_calls == 1
+        assert other_provider.n_calls == 1
+
+    def test_does_not_reuse_identity_of_garbage_collected_provider(self) -> None:
+        identities = {
+            provider_identity(_CountingDetectionProvider()) for _ in range(100)
+        }
+        assert len(identities) == 100
+
+    def test_reuses_result_if_only_other_regions_changed(self) -> None:
+        cache = LocateCache(region_size=50)
+        tool, provider = _locate_tool(cache)
+
+        tool.run("OK button", _screenshot(clock_text="12:00"))
+        assert tool.run("OK button", _screenshot(clock_text="12:01")) == [(50, 30)]
+        assert provider.n_calls == 1
+        assert cache.statistics.region_hits == 1
+
+        tool.run("OK button", _screenshot(clock_text="12:01"))
+        assert provider.n_calls == 1
+        assert cache.statistics.hits == 1
+
+    def test_locates_again_if_region_of_element_changed(self) -> None:
+        cache = LocateCache(region_size=50)
+        tool, provider = _locate_tool(cache)
+
+        tool.run("OK button", _screenshot(button_text="OK"))
+        tool.run("OK button", _screenshot(button_text="Cancel"))
+
+        assert provider.n_calls == 2
+        assert cache.statistics.misses == 2
+
+    def test_without_region_check_locates_again_if_screenshot_changed(self) -> None:
+        tool, provider = _locate_tool(LocateCache(region_size=None))
+
+        tool.run("OK button", _screenshot(clock_text="12:00"))
+        tool.run("OK button", _screenshot(clock_text="12:01"))
+
+        assert provider.n_calls == 2
+
+    def test_caches_element_not_found(self) -> None:
+        cache = LocateCache()
+        tool, provider = _locate_tool(cache)
+
+        for _ in range(2):
+            with pytest.raises(ElementNotFoundError):
+                tool.run("OK button", _screenshot(button=False))
+        assert provider.n_calls == 1
+
+        # the element may have appeared anywhere
+        with pytest.raises(ElementNotFoundError):
+            tool.run("OK button", _screenshot(button=False, clock_text="12:01"))
+        assert provider.n_calls == 2
+        assert tool.run("OK button", _screenshot()) == [(50, 30)]
+        assert provider.n_calls == 3
+
+    def test_expires_results(self) -> None:
+        clock = _FakeClock()
+        cache = LocateCache(ttl=10, clock=clock)
+        tool, provider = _locate_tool(cache)
+
+        tool.run("OK button", _screenshot())
+        clock.now = 9.0
+        tool.run("OK button", _screenshot())
+        assert provider.n_calls == 1
+
+        clock.now = 10.0
+        tool.run("OK button", _screenshot())
+        assert provider.n_calls == 2
+        assert cache.statistics.expirations == 1
+
+    def test_evicts_least_recently_used_results(self) -> None:
+        cache = LocateCache(max_entries=2)
+        tool, provider = _locate_tool(cache)
+
+        tool.run("first", _screenshot())
+        tool.run("second", _screenshot())
+        tool.run("first", _screenshot())
+        tool.run("third", _screenshot())
+        assert provider.n_calls == 3
+        assert cache.statistics.evictions == 1
+
+        tool.run("first", _screenshot())
+        assert provider.n_calls == 3
+        tool.run("second", _screenshot())
+        assert provider.n_calls == 4
+
+    def test_clear(self) -> None:
+        cache = LocateCache()
+        tool, provider = _locate_tool(cache)
+
+        tool.run("OK button", _screenshot())
+        cache.clear()
+        tool.run("OK button", _screenshot())
+
+        assert provider.n_calls == 2
+
+    def test_without_cache_locates_every_time(self) -> None:
+        provider = _CountingDetectionProvider()
+        tool = LocateTool(provider=provider)
+
+        tool.run("OK button", _screenshot())
+        tool.run("OK button", _screenshot())
+
+        assert provider.n_calls == 2
+
+    def test_can_be_shared_between_threads(self) -> None:
+        cache = LocateCache(max_entries=4)
+        image = _screenshot().root
+        n_threads, n_lookups = 8, 50
+
+        def look_up(thread_index: int) -> None:
+            for i in range(n_lookups):
+                key = LocateCacheKey(
+                    model="model", locator=f"{thread_index}-{i % 8}", settings=""
+                )
+                assert cache.get_or_locate(key, image, lambda: [(50, 30)]) == [(50, 30)]
+
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            list(executor.map(look_up, range(n_threads)))
+
+        statistics = cache.statistics
+        assert (
+            statistics.hits + statistics.region_hits + statistics.misses
+            == n_threads * n_lookups
+        )
+
+
+class TestSerializeLocator:
+    def test_includes_image_of_image_locators(self) -> None:
+        black = Image.new("RGB", (10, 10), "black")
+        white = Image.new("RGB", (10, 10), "white")
+        black_icon = serialize_locator(ImageLocator(black, name="icon"))
+        white_icon = serialize_locator(ImageLocator(white, name="icon"))
+        assert black_icon is not None
+        assert black_icon != white_icon
+
+    def test_serializes_relations(self) -> None:
+        locator = Text("OK").right_of(Text("Cancel"))
+        serialized_locator = serialize_locator(locator)
+        assert serialized_locator is not None
+        assert "Cancel" in serialized_locator
+
+    def test_reuses_serializer_while_environment_is_unchanged(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        created: list[AiElementCollection] = []
+
+        class _RecordingAiElementCollection(AiElementCollection):
+            def __init__(self) -> None:
+                super().__init__()
+                created.append(self)
+
+        monkeypatch.setattr(
+            locate_cache_module, "AiElementCollection", _RecordingAiElementCollection
+        )
+        locate_cache_module._askui_locator_serializer.cache_clear()  # noqa: SLF001
+        serialize_locator(Text("OK"))
+        serialize_locator(Text("Cancel"))
+        assert len(created) == 1
+
+        monkeypatch.setenv("ASKUI_WORKSPACE_ID", "other_workspace_id")
+        serialize_locator(Text("OK"))
+        assert len(created) == 2
+        locate_cache_module._askui_locator_serializer.cache_clear()  # noqa: SLF001
+
+    def test_falls_back_to_vlm_serializer(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv("ASKUI_WORKSPACE_ID")
+        assert serialize_locator(Text("OK")) is not None
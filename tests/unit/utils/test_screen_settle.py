@@ -0,0 +1,99 @@
+import pytest
+from PIL import Image, ImageDraw
+
+from askui.models.shared.settings import ScreenSettleSettings
+from askui.utils.screen_settle import ScreenSettleDetector, ScreenSettleResult
+
+_CAPTURE_TIME = 0.02
+
+
+class _TimelineScreen:
+    """Screen changing at the given times of a fake clock."""
+
+    def __init__(self, changes: list[float]) -> None:
+        self.now = 0.0
+        self.n_captures = 0
+        self._changes = changes
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    def capture(self) -> Image.Image:
+        self.n_captures += 1
+        self.now += _CAPTURE_TIME
+        state = sum(1 for change in self._changes if change <= self.now)
+        image = Image.new("RGB", (320, 200), "white")
+        draw = ImageDraw.Draw(image)
+        left = state * 37 % 280
+        draw.rectangle((left, 80, left + 40, 120), fill="black")
+        # a blinking cursor changes a single pixel on every capture
+        image.putpixel((300, 10), (0, 0, 0) if self.n_captures % 2 else (255, 255, 255))
+        return image
+
+
+def _wait(
+    screen: _TimelineScreen,
+    initial_wait: float = 0.0,
+    max_wait: float | None = None,
+) -> ScreenSettleResult:
+    detector = ScreenSettleDetector(
+        ScreenSettleSettings(sample_interval=0.1, stable_duration=0.3, max_wait=3.0),
+        clock=screen.clock,
+        sleep=screen.sleep,
+    )
+    return detector.wait(screen.capture, initial_wait=initial_wait, max_wait=max_wait)
+
+
+class TestScreenSettleDetector:
+    def test_settles_after_last_change(self) -> None:
+        result = _wait(_TimelineScreen(changes=[0.1, 0.25, 0.4]))
+        assert result.settled
+        assert 0.4 <= result.settle_time < 0.4 + 0.1 + _CAPTURE_TIME
+        assert result.settle_time + 0.3 <= result.duration < result.settle_time + 0.45
+
+    def test_settles_immediately_if_screen_does_not_change(self) -> None:
+        screen = _TimelineScreen(changes=[])
+        result = _wait(screen)
+        assert result.settled
+        assert result.settle_time == 0.0
+        assert 0.3 <= result.duration < 0.45
+        assert result.n_frames == screen.n_captures == 4
+
+    def test_gives_up_at_max_wait(self) -> None:
+        result = _wait(_TimelineScreen(changes=[i * 0.05 for i in range(1, 100)]))
+        assert not result.settled
+        assert result.settle_time == 3.0
+        assert 3.0 <= result.duration < 3.0 + 2 * _CAPTURE_TIME
+
+    def test_max_wait_overrides_settings(self) -> None:
+        result = _wait(
+            _TimelineScreen(changes=[i * 0.05 for i in range(1, 100)]), max_wait=1.0
+        )
+        assert not result.settled
+        assert 1.0 <= result.duration < 1.0 + 2 * _CAPTURE_TIME
+
+    def test_requires_max_wait_if_not_set_in_settings(self) -> None:
+        screen = _TimelineScreen(changes=[])
+        detector = ScreenSettleDetector(
+            ScreenSettleSettings(), clock=screen.clock, sleep=screen.sleep
+        )
+        with pytest.raises(ValueError, match="max_wait"):
+            detector.wait(screen.capture)
+        assert screen.n_captures == 0
+
+    def test_samples_frames_after_initial_wait(self) -> None:
+        changes = [0.1, 0.25, 0.4]
+        without_initial_wait = _wait(_TimelineScreen(changes))
+        result = _wait(_TimelineScreen(changes), initial_wait=0.5)
+        assert result.settled
+        assert result.n_frames < without_initial_wait.n_frames
+        # the screen may have settled before the first frame
+        assert result.settle_time < 0.5
+
+    def test_initial_wait_too_short(self) -> None:
+        result = _wait(_TimelineScreen(changes=[0.1, 0.25, 0.4]), initial_wait=0.2)
+        assert result.settled
+        assert 0.4 <= result.settle_time < 0.4 + 0.1 + _CAPTURE_TIME
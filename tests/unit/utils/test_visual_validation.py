@@ -0,0 +1,271 @@
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageDraw
+
+from askui.models.shared.agent_message_param import (
+    Base64ImageSourceParam,
+    ImageBlockParam,
+    MessageParam,
+    TextBlockParam,
+    ToolResultBlockParam,
+    ToolUseBlockParam,
+    UrlImageSourceParam,
+)
+from askui.models.shared.settings import (
+    CACHING_VISUAL_VERIFICATION_METHOD,
+    CacheWritingSettings,
+)
+from askui.utils.caching import CacheManager
+from askui.utils.caching import cache_manager as cache_manager_module
+from askui.utils.image_utils import base64_to_image, image_to_base64
+from askui.utils.visual_validation import (
+    compute_ahash,
+    compute_phash,
+    extract_region,
+    find_recent_screenshot,
+    find_recent_screenshot_sources,
+    get_validation_coordinate,
+)
+
+_SCREENSHOT_INTERVAL = 10
+
+
+def _screenshot(index: int) -> ImageBlockParam:
+    image = Image.new("RGB", (320, 240), "white")
+    draw = ImageDraw.Draw(image)
+    for i in range(8):
+        offset = (index * 7 + i * 37) % 280
+        draw.rectangle(
+            (offset, i * 30, offset + 40, i * 30 + 20), fill=(i * 30, index % 256, 90)
+        )
+    return ImageBlockParam(
+        source=Base64ImageSourceParam(
+            data=image_to_base64(image), media_type="image/png"
+        )
+    )
+
+
+def _tool_use(step: int, tool_input: dict[str, object]) -> ToolUseBlockParam:
+    return ToolUseBlockParam(id=f"tu_{step}", name="computer", input=tool_input)
+
+
+def _tool_result(
+    step: int, content: list[TextBlockParam | ImageBlockParam]
+) -> MessageParam:
+    return MessageParam(
+        role="user",
+        content=[ToolResultBlockParam(tool_use_id=f"tu_{step}", content=content)],
+    )
+
+
+def _trajectory_messages(n_steps: int) -> list[MessageParam]:
+    """Clicks and typing with a screenshot after every few steps."""
+    messages = [MessageParam(role="user", content="Fill in the form")]
+    for step in range(n_steps):
+        tool_input: dict[str, object] = (
+            {"action": "type", "text": "hello"}
+            if step % 3 == 2
+            else {"action": "left_click", "coordinate": [step % 320, step % 240]}
+        )
+        messages.append(
+            MessageParam(role="assistant", content=[_tool_use(step, tool_input)])
+        )
+        content: list[TextBlockParam | ImageBlockParam] = [TextBlockParam(text="done")]
+        if step % _SCREENSHOT_INTERVAL == 0:
+            content.append(_screenshot(step))
+        messages.append(_tool_result(step, content))
+    return messages
+
+
+def _edge_case_messages() -> list[MessageParam]:
+    return [
+        MessageParam(role="user", content="Log in"),
+        # no screenshot yet
+        MessageParam(
+            role="assistant",
+            content=[_tool_use(0, {"action": "left_click", "coordinate": [5, 5]})],
+        ),
+        _tool_result(
+            0,
+            [
+                ImageBlockParam(
+                    source=UrlImageSourceParam(url="https://example.com/a.png")
+                )
+            ],
+        ),
+        # only a url image so far
+        MessageParam(
+            role="assistant",
+            content=[_tool_use(1, {"action": "left_click", "x": 5, "y": 5})],
+        ),
+        _tool_result(1, [_screenshot(1), _screenshot(2)]),
+        # several tool uses per message, out of bounds and without coordinate
+        MessageParam(
+            role="assistant",
+            content=[
+                TextBlockParam(text="Clicking"),
+                _tool_use(2, {"action": "left_click", "coordinate": [1000, 1000]}),
+                _tool_use(3, {"action": "left_click", "x1": "0", "y1": "239"}),
+                _tool_use(4, {"action": "key", "text": "Enter"}),
+                _tool_use(5, {"action": "left_click", "coordinate": [319, 0]}),
+            ],
+        ),
+        MessageParam(role="user", content="Continue"),
+        MessageParam(role="assistant", content="Continuing"),
+        # the screenshot before this tool use is two messages back
+        MessageParam(
+            role="assistant",
+            content=[_tool_use(6, {"action": "left_click", "coordinate": [160, 120]})],
+        ),
+        _tool_result(6, [_screenshot(6)]),
+        MessageParam(
+            role="assistant",
+            content=[_tool_use(7, {"action": "left_click", "coordinate": [160, 120]})],
+        ),
+    ]
+
+
+def _trajectory(messages: list[MessageParam]) -> list[ToolUseBlockParam]:
+    return [
+        block.model_copy()
+        for message in messages
+        if message.role == "assistant" and not isinstance(message.content, str)
+        for block in message.content
+        if block.type == "tool_use"
+    ]
+
+
+def _reference_visual_representations(
+    trajectory: list[ToolUseBlockParam],
+    messages: list[MessageParam],
+    method: CACHING_VISUAL_VERIFICATION_METHOD,
+) -> dict[str, str | None]:
+    """Computes the hashes by searching the screenshot for each tool use."""
+    compute_hash = compute_phash if method == "phash" else compute_ahash
+    tool_ids = {block.id for block in trajectory}
+    representations: dict[str, str | None] = {}
+    for i, message in enumerate(messages):
+        if message.role != "assistant" or isinstance(message.content, str):
+            continue
+        for block in message.content:
+            if block.type != "tool_use" or block.id not in tool_ids:
+                continue
+            tool_input = block.input if isinstance(block.input, dict) else {}
+            coordinate = get_validation_coordinate(tool_input)
+            screenshot = find_recent_screenshot(messages, from_index=i - 1)
+            if coordinate is None or screenshot is None:
+                representations[block.id] = None
+                continue
+            region = extract_region(
+                screenshot, {"coordinate": list(coordinate)}, region_size=100
+            )
+            representations[block.id] = compute_hash(region)
+    return representations
+
+
+def _add_visual_validation(
+    trajectory: list[ToolUseBlockParam],
+    messages: list[MessageParam],
+    method: CACHING_VISUAL_VERIFICATION_METHOD,
+    cache_dir: Path,
+) -> dict[str, str | None]:
+    cache_manager = CacheManager()
+    cache_manager.start_recording(
+        cache_dir,
+        cache_writer_settings=CacheWritingSettings(
+            visual_verification_method=method, visual_validation_region_size=100
+        ),
+    )
+    cache_manager._add_visual_validation_to_trajectory(  # noqa: SLF001
+        trajectory, messages
+    )
+    return {block.id: block.visual_representation for block in trajectory}
+
+
+class TestFindRecentScreenshotSources:
+    def test_matches_find_recent_screenshot(self) -> None:
+        messages = _edge_case_messages()
+        sources = find_recent_screenshot_sources(messages)
+        assert len(sources) == len(messages)
+        for i, source in enumerate(sources):
+            screenshot = find_recent_screenshot(messages, from_index=i - 1)
+            if source is None:
+                assert screenshot is None
+            else:
+                assert screenshot is not None
+                assert base64_to_image(source.data).tobytes() == screenshot.tobytes()
+
+    def test_empty_history(self) -> None:
+        assert find_recent_screenshot_sources([]) == []
+
+
+class TestAddVisualValidationToTrajectory:
+    @pytest.mark.parametrize("method", ["phash", "ahash"])
+    @pytest.mark.parametrize(
+        "messages",
+        [_edge_case_messages(), _trajectory_messages(100)],
+        ids=["edge_cases", "trajectory"],
+    )
+    def test_matches_searching_screenshot_per_tool_use(
+        self,
+        messages: list[MessageParam],
+        method: CACHING_VISUAL_VERIFICATION_METHOD,
+        tmp_path: Path,
+    ) -> None:
+        trajectory = _trajectory(messages)
+        representations = _add_visual_validation(trajectory, messages, method, tmp_path)
+        assert representations == _reference_visual_representations(
+            _trajectory(messages), messages, method
+        )
+        assert any(representations.values())
+
+    def test_skips_tool_uses_not_in_trajectory(self, tmp_path: Path) -> None:
+        messages = _edge_case_messages()
+        trajectory = _trajectory(messages)[5:6]
+        assert _add_visual_validation(trajectory, messages, "phash", tmp_path) == (
+            _reference_visual_representations(trajectory, messages, "phash")
+        )
+
+    def test_decodes_each_screenshot_once(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        decoded: list[str] = []
+
+        def count_decodes(base64_string: str) -> Image.Image:
+            decoded.append(base64_string)
+            return base64_to_image(base64_string)
+
+        monkeypatch.setattr(cache_manager_module, "base64_to_image", count_decodes)
+        messages = _trajectory_messages(100)
+        _add_visual_validation(_trajectory(messages), messages, "phash", tmp_path)
+        assert len(decoded) == len(set(decoded)) == 100 // _SCREENSHOT_INTERVAL
+
+    def test_skips_screenshots_that_cannot_be_decoded(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        messages = _trajectory_messages(2 * _SCREENSHOT_INTERVAL)
+        expected = _reference_visual_representations(
+            _trajectory(messages), messages, "phash"
+        )
+        undecodable: list[str] = []
+
+        def fail_first_decode(base64_string: str) -> Image.Image:
+            if not undecodable or undecodable[0] == base64_string:
+                undecodable.append(base64_string)
+                error_msg = "Corrupt screenshot"
+                raise ValueError(error_msg)
+            return base64_to_image(base64_string)
+
+        monkeypatch.setattr(cache_manager_module, "base64_to_image", fail_first_decode)
+        representations = _add_visual_validation(
+            _trajectory(messages), messages, "phash", tmp_path
+        )
+        skipped = [tool_id for tool_id, value in representations.items() if not value]
+        assert skipped
+        assert all(
+            representations[tool_id] == expected[tool_id]
+            for tool_id in representations
+            if tool_id not in skipped
+        )
+        assert any(representations.values())